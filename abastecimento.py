@@ -13,17 +13,36 @@ Responsabilidades:
 
 Classes:
 - RegistroAbastecimento: Representa um abastecimento completo
+- ResultadoLote: Resultados de vários abastecimentos em colunas
 
 Funções principais:
 - processar_abastecimento(): Processa um abastecimento completo
 - calcular_valor_total(): Fórmula básica (litros × preço)
 - exibir_resumo_abastecimento(): Mostra resultado formatado
+- processar_abastecimento_por_id(): Processa um abastecimento a partir de ids
+- processar_abastecimentos_em_lote(): Processa muitos abastecimentos de uma vez
 """
 
 # IMPORTAÇÕES DOS MÓDULOS DO SISTEMA
 import combustivel  # Para buscar preços e validar combustíveis
 import pagamento    # Para calcular descontos e validar formas de pagamento
+import recibo       # Para montar o comprovante exibido ao cliente
+import instrumentacao  # Métricas do caminho da venda (desligadas por padrão)
+import idempotencia    # Vendas repetidas pelas bombas devolvem o registro original
+import dinheiro       # Cálculo exato em centavos (sem erro de arredondamento do float)
+import math                    # Para rejeitar quantidades não finitas (nan, inf)
 from datetime import datetime  # Para registrar data/hora do abastecimento
+from array import array        # Colunas numéricas compactas do processamento em lote
+from functools import lru_cache  # Conversões de preço/percentual feitas uma vez por valor
+
+# ARREDONDAMENTO DOS VALORES DA VENDA - ver módulo dinheiro
+# Os valores (bruto, desconto, final) são calculados em centavos inteiros
+# e guardados no registro já arredondados: o que o cupom mostra é
+# exatamente o que entra nos totais.
+MODO_ARREDONDAMENTO = dinheiro.MEIO_CIMA
+
+# Casas decimais aceitas no preço por litro (ex: R$ 5,799)
+CASAS_PRECO = 3
 
 class RegistroAbastecimento:
     """
@@ -40,8 +59,19 @@ class RegistroAbastecimento:
     Atributos armazenados:
     - Dados de entrada (combustível, litros, pagamento)
     - Dados calculados (valores bruto, desconto, final)
-    - Metadados (data/hora, preço por litro)
+    - Metadados (data/hora, preço por litro, versão da tabela de preços)
+
+    __slots__: os atributos ficam em posições fixas do objeto, sem um
+    dicionário (__dict__) por instância, o que economiza memória quando
+    muitos registros são mantidos ao mesmo tempo.
     """
+    __slots__ = (
+        "tipo_combustivel", "quantidade_litros", "forma_pagamento",
+        "id_combustivel", "codigo_pagamento",
+        "valor_por_litro", "versao_preco", "data_abastecimento",
+        "valor_bruto", "valor_desconto", "valor_final", "percentual_desconto",
+    )
+
     def __init__(self, tipo_combustivel, quantidade_litros, forma_pagamento):
         """
         CONSTRUTOR DA CLASSE
@@ -54,64 +84,170 @@ class RegistroAbastecimento:
         self.quantidade_litros = quantidade_litros    # Ex: 30.0
         self.forma_pagamento = forma_pagamento        # Ex: "PIX"
         
-        # BUSCAR PREÇO ATUAL DO COMBUSTÍVEL NO MÓDULO COMBUSTÍVEL
-        self.valor_por_litro = combustivel.obter_preco_combustivel(tipo_combustivel)
+        # CONVERTER NOMES EM IDS NUMÉRICOS (uma única vez, na entrada)
+        self.id_combustivel = combustivel.obter_id_combustivel(tipo_combustivel)
+        self.codigo_pagamento = pagamento.obter_codigo_pagamento(forma_pagamento)
         
-        # REGISTRAR TIMESTAMP DO ABASTECIMENTO
-        self.data_abastecimento = datetime.now()
+        # BUSCAR PREÇO ATUAL NA TABELA DE PREÇOS VIGENTE (fotografia com versão)
+        if instrumentacao.ATIVO:
+            inicio = instrumentacao.agora()
+        tabela = combustivel.obter_tabela_precos()
+        self.valor_por_litro = tabela.precos.get(tipo_combustivel)
+        self.versao_preco = tabela.versao
+        if instrumentacao.ATIVO:
+            instrumentacao.registrar_etapa("consultar_preco", inicio)
         
-        # EXECUTAR TODOS OS CÁLCULOS AUTOMATICAMENTE
-        self.valor_bruto = self._calcular_valor_bruto()      # Litros × Preço
-        self.valor_desconto = self._calcular_desconto()      # Desconto aplicado
-        self.valor_final = self._calcular_valor_final()      # Valor bruto - desconto
+        self._finalizar()
     
-    def _calcular_valor_bruto(self):
+    @classmethod
+    def de_ids(cls, id_combustivel, quantidade_litros, codigo_pagamento):
         """
-        MÉTODO PRIVADO: Calcular valor bruto
-        ====================================
-        Implementa a fórmula básica: Quantidade × Preço por litro
+        CONSTRUTOR ALTERNATIVO: Criar registro a partir de ids
+        ======================================================
+        Usado quando os dados já chegam como ids numéricos. Nomes e preço
+        são obtidos por posição nas listas dos módulos, sem comparar textos.
         
-        Exemplo: 30 litros × R$ 5,79 = R$ 173,70
+        Args:
+            id_combustivel (int): Id do combustível (ver combustivel.obter_id_combustivel)
+            quantidade_litros (float): Quantidade de litros
+            codigo_pagamento (int): Código da forma de pagamento (ex: 2 para PIX)
         
         Returns:
-            float: Valor bruto antes de qualquer desconto
+            RegistroAbastecimento: Registro com todos os cálculos
         """
-        # VALIDAÇÃO: verificar se o preço foi encontrado
-        if self.valor_por_litro is None:
-            return 0.0
+        registro = cls.__new__(cls)
+        registro.id_combustivel = id_combustivel
+        registro.codigo_pagamento = codigo_pagamento
+        registro.tipo_combustivel = combustivel.obter_nome_combustivel(id_combustivel)
+        registro.quantidade_litros = quantidade_litros
+        registro.forma_pagamento = pagamento.obter_forma_por_codigo(codigo_pagamento)
+        if instrumentacao.ATIVO:
+            inicio = instrumentacao.agora()
+        tabela = combustivel.obter_tabela_precos()
+        registro.valor_por_litro = tabela.precos_por_id[id_combustivel]
+        registro.versao_preco = tabela.versao
+        if instrumentacao.ATIVO:
+            instrumentacao.registrar_etapa("consultar_preco", inicio)
+        registro._finalizar()
+        return registro
+    
+    @classmethod
+    def de_valores(cls, tipo_combustivel, quantidade_litros, forma_pagamento,
+                   id_combustivel, codigo_pagamento, valor_por_litro, versao_preco,
+                   percentual_desconto):
+        """
+        CONSTRUTOR ALTERNATIVO: Criar registro com preço e desconto já resolvidos
+        =========================================================================
+        Usado por quem tem seu próprio catálogo e suas próprias regras de
+        pagamento (ex: cada posto da rede, ver módulo posto), sem consultar
+        as tabelas globais dos módulos combustivel e pagamento.
+        
+        Args:
+            tipo_combustivel (str): Nome do combustível
+            quantidade_litros (float): Quantidade de litros
+            forma_pagamento (str): Nome da forma de pagamento
+            id_combustivel (int): Id do combustível no catálogo de origem
+            codigo_pagamento (int): Código da forma de pagamento
+            valor_por_litro (float): Preço por litro
+            versao_preco (int): Versão da tabela de preços usada
+            percentual_desconto (float): Desconto em fração (0.0 = sem desconto)
         
-        # FÓRMULA PRINCIPAL: Quantidade × Preço unitário
-        return self.quantidade_litros * self.valor_por_litro
+        Returns:
+            RegistroAbastecimento: Registro com todos os cálculos
+        """
+        registro = cls.__new__(cls)
+        registro.tipo_combustivel = tipo_combustivel
+        registro.quantidade_litros = quantidade_litros
+        registro.forma_pagamento = forma_pagamento
+        registro.id_combustivel = id_combustivel
+        registro.codigo_pagamento = codigo_pagamento
+        registro.valor_por_litro = valor_por_litro
+        registro.versao_preco = versao_preco
+        registro.data_abastecimento = datetime.now()
+        registro._precificar(percentual_desconto)
+        return registro
+    
+    def _finalizar(self):
+        """
+        MÉTODO PRIVADO: Registrar data/hora e executar os cálculos
+        ==========================================================
+        Etapa comum aos dois construtores.
+        """
+        # REGISTRAR TIMESTAMP DO ABASTECIMENTO
+        self.data_abastecimento = datetime.now()
+        
+        # EXECUTAR TODOS OS CÁLCULOS AUTOMATICAMENTE
+        if instrumentacao.ATIVO:
+            inicio = instrumentacao.agora()
+            percentual = self._percentual_desconto()
+            instrumentacao.registrar_etapa("calcular_desconto", inicio)
+        else:
+            percentual = self._percentual_desconto()  # Desconto da forma de pagamento
+        self._precificar(percentual)                    # Bruto, desconto e final
     
-    def _calcular_desconto(self):
+    def _percentual_desconto(self):
         """
-        MÉTODO PRIVADO: Calcular desconto
-        =================================
-        Utiliza o módulo de pagamento para calcular o desconto baseado
-        na forma de pagamento escolhida.
+        MÉTODO PRIVADO: Obter o percentual de desconto
+        ==============================================
+        Utiliza o módulo de pagamento para saber o desconto da forma de
+        pagamento escolhida.
         
         Integração entre módulos: abastecimento → pagamento
         
         Returns:
-            float: Valor do desconto em reais
+            float: Percentual em fração (0.10 = 10%)
         """
+        # FORMA DE PAGAMENTO DESCONHECIDA: sem desconto
+        if self.codigo_pagamento is None:
+            return 0.0
+        
         # DELEGAÇÃO: passar responsabilidade para o módulo pagamento
-        return pagamento.calcular_desconto(self.valor_bruto, self.forma_pagamento)
+        # (regra fixa ou motor de regras por combustível, volume e hora)
+        return pagamento.percentual_desconto_por_codigo(
+            self.codigo_pagamento, self.id_combustivel, self.quantidade_litros,
+            self.data_abastecimento.hour)
     
-    def _calcular_valor_final(self):
+    def _precificar(self, percentual_desconto):
         """
-        MÉTODO PRIVADO: Calcular valor final
-        ====================================
-        Aplica o desconto ao valor bruto para obter o valor que
-        o cliente efetivamente pagará.
+        MÉTODO PRIVADO: Calcular valor bruto, desconto e valor final
+        ============================================================
+        Fórmulas: bruto = litros × preço; desconto = bruto × percentual;
+        final = bruto - desconto.
         
-        Fórmula: Valor bruto - Desconto = Valor final
+        As contas são feitas em números inteiros (mililitros, milésimos de
+        real e centavos) pelo módulo dinheiro, com o modo de arredondamento
+        MODO_ARREDONDAMENTO. Exemplo: 30 L × R$ 5,79 com 10% de desconto
+        = R$ 173,70 - R$ 17,37 = R$ 156,33.
         
-        Returns:
-            float: Valor final que o cliente deve pagar
+        Args:
+            percentual_desconto (float): Desconto em fração (0.0 = sem desconto)
         """
-        # SUBTRAÇÃO SIMPLES: valor bruto menos desconto
-        return self.valor_bruto - self.valor_desconto
+        self.percentual_desconto = percentual_desconto  # Exibido no recibo
+        # VALIDAÇÃO: preço não encontrado
+        if self.valor_por_litro is None:
+            self.valor_bruto = self.valor_desconto = self.valor_final = 0.0
+            return
+        
+        bruto, desconto, final = dinheiro.precificar(
+            dinheiro.litros_para_mililitros(self.quantidade_litros, MODO_ARREDONDAMENTO),
+            _preco_em_milesimos(self.valor_por_litro, MODO_ARREDONDAMENTO),
+            _pontos_base(percentual_desconto),
+            MODO_ARREDONDAMENTO,
+            CASAS_PRECO,
+        )
+        self.valor_bruto = bruto / 100
+        self.valor_desconto = desconto / 100
+        self.valor_final = final / 100
+
+@lru_cache(maxsize=4096)
+def _preco_em_milesimos(preco, modo):
+    """Preço por litro em milésimos de real (poucos preços distintos: guardado em cache)"""
+    return dinheiro.reais_para_milesimos(preco, modo)
+
+@lru_cache(maxsize=256)
+def _pontos_base(percentual):
+    """Percentual em fração convertido para pontos-base (0.10 -> 1000)"""
+    return dinheiro.percentual_para_pontos_base(percentual)
 
 def calcular_valor_total(quantidade_litros, valor_por_litro):
     """
@@ -145,7 +281,95 @@ def calcular_valor_total(quantidade_litros, valor_por_litro):
         # TRATAMENTO DE ERRO: retorna 0 se conversão falhar
         return 0.0
 
-def processar_abastecimento(tipo_combustivel, quantidade_litros, forma_pagamento):
+def _litros_validos(litros):
+    """
+    Verifica se uma quantidade de litros (já convertida) é aceitável
+
+    Escrito como "maior que zero E finito" para que nan (que falha em
+    qualquer comparação) e infinito também sejam rejeitados.
+
+    Returns:
+        bool: True se a quantidade é positiva e finita
+    """
+    return litros > 0 and math.isfinite(litros)
+
+# OUVINTES DE VENDAS - funções chamadas com cada registro produzido por
+# processar_abastecimento() e processar_abastecimento_por_id() (ex: o
+# painel em tempo real). Sem ouvintes, o custo é uma verificação de lista.
+_ouvintes_registros = []
+
+# OUVINTES DE LOTES - o mesmo para cada ResultadoLote do processamento em
+# lote (um aviso por lote, não por venda)
+_ouvintes_lotes = []
+
+# ESTOQUE DOS TANQUES (opcional) - quando configurado, as vendas (únicas e em
+# lote) só acontecem se houver volume no tanque do combustível (ver módulo tanques)
+_estoque = None
+
+def _notificar_ouvintes(registro):
+    """Entrega um registro recém-produzido a todos os ouvintes"""
+    for ouvinte in _ouvintes_registros:
+        ouvinte(registro)
+
+def adicionar_ouvinte_registros(ouvinte):
+    """
+    Registra uma função chamada com cada RegistroAbastecimento produzido
+
+    Args:
+        ouvinte (callable): Recebe o RegistroAbastecimento
+    """
+    _ouvintes_registros.append(ouvinte)
+
+def configurar_estoque(estoque):
+    """
+    Liga o controle de estoque nas vendas
+
+    processar_abastecimento() e processar_abastecimento_por_id() passam a
+    reservar o volume no tanque antes da venda e a confirmá-lo depois (a
+    reserva é cancelada se a venda falhar). Combustível sem tanque ou sem
+    volume suficiente gera ValueError.
+
+    No processamento em lote cada linha válida reserva o seu volume, na
+    ordem do lote; as linhas sem tanque ou sem estoque são marcadas como
+    inválidas e as reservas são confirmadas ao fim do cálculo.
+
+    Args:
+        estoque (EstoqueTanques): Estoque a usar (None = desliga o controle)
+    """
+    global _estoque
+    _estoque = estoque
+
+def obter_estoque():
+    """
+    Returns:
+        EstoqueTanques: Estoque ligado às vendas (None = sem controle de estoque)
+    """
+    return _estoque
+
+def remover_ouvinte_registros(ouvinte):
+    """Remove uma função registrada com adicionar_ouvinte_registros()"""
+    if ouvinte in _ouvintes_registros:
+        _ouvintes_registros.remove(ouvinte)
+
+def adicionar_ouvinte_lotes(ouvinte):
+    """
+    Registra uma função chamada com cada ResultadoLote produzido
+
+    Como nas vendas únicas, o ouvinte roda antes da baixa do estoque: se
+    ele falhar, as reservas do lote são canceladas e a exceção é propagada.
+
+    Args:
+        ouvinte (callable): Recebe o ResultadoLote (use a máscara `validos`)
+    """
+    _ouvintes_lotes.append(ouvinte)
+
+def remover_ouvinte_lotes(ouvinte):
+    """Remove uma função registrada com adicionar_ouvinte_lotes()"""
+    if ouvinte in _ouvintes_lotes:
+        _ouvintes_lotes.remove(ouvinte)
+
+def processar_abastecimento(tipo_combustivel, quantidade_litros, forma_pagamento,
+                            chave_idempotencia=None):
     """
     Processa um abastecimento completo
     
@@ -153,54 +377,139 @@ def processar_abastecimento(tipo_combustivel, quantidade_litros, forma_pagamento
         tipo_combustivel (str): Tipo do combustível
         quantidade_litros (float): Quantidade de litros
         forma_pagamento (str): Forma de pagamento
+        chave_idempotencia (str): Chave única do pedido (opcional). Se o
+                                  pedido for repetido com a mesma chave, o
+                                  registro original é devolvido sem novo
+                                  cálculo (ver módulo idempotencia)
     
     Returns:
         RegistroAbastecimento: Objeto com todos os dados do abastecimento
     """
+    if chave_idempotencia is not None:
+        dados = (tipo_combustivel, quantidade_litros, forma_pagamento)
+        return idempotencia.obter_cache_padrao().executar(
+            chave_idempotencia, dados, processar_abastecimento, *dados)[0]
+
+    medir = instrumentacao.ATIVO
+    if medir:
+        inicio = instrumentacao.agora()
+    
     # Validações
-    if not combustivel.validar_combustivel(tipo_combustivel):
-        raise ValueError(f"Combustível '{tipo_combustivel}' não encontrado!")
+    try:
+        if not combustivel.validar_combustivel(tipo_combustivel):
+            raise ValueError(f"Combustível '{tipo_combustivel}' não encontrado!")
+        
+        if not pagamento.validar_forma_pagamento(forma_pagamento):
+            raise ValueError(f"Forma de pagamento '{forma_pagamento}' inválida!")
+        
+        try:
+            quantidade_litros = float(quantidade_litros)
+        except (ValueError, TypeError):
+            raise ValueError("Quantidade de litros inválida!")
+        if not _litros_validos(quantidade_litros):
+            raise ValueError("Quantidade de litros deve ser maior que zero!")
+        reserva = None if _estoque is None else _estoque.reservar(tipo_combustivel, quantidade_litros)
+    except ValueError:
+        if medir:
+            instrumentacao.contar("abastecimentos_rejeitados")
+        raise
     
-    if not pagamento.validar_forma_pagamento(forma_pagamento):
-        raise ValueError(f"Forma de pagamento '{forma_pagamento}' inválida!")
+    try:
+        if not medir:
+            # Criar o registro
+            registro = RegistroAbastecimento(tipo_combustivel, quantidade_litros, forma_pagamento)
+        else:
+            instrumentacao.registrar_etapa("validar", inicio)
+            inicio = instrumentacao.agora()
+            registro = RegistroAbastecimento(tipo_combustivel, quantidade_litros, forma_pagamento)
+            instrumentacao.registrar_etapa("montar_registro", inicio)
+            instrumentacao.contar("abastecimentos_processados")
+        if _ouvintes_registros:
+            _notificar_ouvintes(registro)
+    except BaseException:
+        if reserva is not None:
+            reserva.cancelar()   # a venda não aconteceu: o volume volta ao tanque
+        raise
+    if reserva is not None:
+        reserva.confirmar()
+    return registro
+
+def processar_abastecimento_por_id(id_combustivel, quantidade_litros, codigo_pagamento,
+                                   chave_idempotencia=None):
+    """
+    Processa um abastecimento completo a partir de ids numéricos
+    
+    Mesmas regras de processar_abastecimento(), mas sem nenhuma busca
+    por texto: combustível e pagamento são validados pelo id.
+    
+    Args:
+        id_combustivel (int): Id do combustível
+        quantidade_litros (float): Quantidade de litros
+        codigo_pagamento (int): Código da forma de pagamento
+        chave_idempotencia (str): Chave única do pedido (opcional)
+    
+    Returns:
+        RegistroAbastecimento: Objeto com todos os dados do abastecimento
+    """
+    if chave_idempotencia is not None:
+        dados = (id_combustivel, quantidade_litros, codigo_pagamento)
+        return idempotencia.obter_cache_padrao().executar(
+            chave_idempotencia, ("id",) + dados, processar_abastecimento_por_id, *dados)[0]
+
+    medir = instrumentacao.ATIVO
+    if medir:
+        inicio = instrumentacao.agora()
     
     try:
-        quantidade_litros = float(quantidade_litros)
-        if quantidade_litros <= 0:
+        if not combustivel.validar_id_combustivel(id_combustivel):
+            raise ValueError(f"Combustível de id {id_combustivel} não encontrado!")
+        
+        if not pagamento.validar_codigo_pagamento(codigo_pagamento):
+            raise ValueError(f"Forma de pagamento de código {codigo_pagamento} inválida!")
+        
+        try:
+            quantidade_litros = float(quantidade_litros)
+        except (ValueError, TypeError):
+            raise ValueError("Quantidade de litros inválida!")
+        if not _litros_validos(quantidade_litros):
             raise ValueError("Quantidade de litros deve ser maior que zero!")
-    except (ValueError, TypeError):
-        raise ValueError("Quantidade de litros inválida!")
+        reserva = None if _estoque is None else _estoque.reservar(
+            combustivel.obter_nome_combustivel(id_combustivel), quantidade_litros)
+    except ValueError:
+        if medir:
+            instrumentacao.contar("abastecimentos_rejeitados")
+        raise
     
-    # Criar e retornar o registro
-    return RegistroAbastecimento(tipo_combustivel, quantidade_litros, forma_pagamento)
+    try:
+        if not medir:
+            registro = RegistroAbastecimento.de_ids(id_combustivel, quantidade_litros, codigo_pagamento)
+        else:
+            instrumentacao.registrar_etapa("validar", inicio)
+            inicio = instrumentacao.agora()
+            registro = RegistroAbastecimento.de_ids(id_combustivel, quantidade_litros, codigo_pagamento)
+            instrumentacao.registrar_etapa("montar_registro", inicio)
+            instrumentacao.contar("abastecimentos_processados")
+        if _ouvintes_registros:
+            _notificar_ouvintes(registro)
+    except BaseException:
+        if reserva is not None:
+            reserva.cancelar()   # a venda não aconteceu: o volume volta ao tanque
+        raise
+    if reserva is not None:
+        reserva.confirmar()
+    return registro
 
 def exibir_resumo_abastecimento(registro):
     """
     Exibe o resumo detalhado do abastecimento
     
+    O texto é montado pelo módulo recibo (layout pré-compilado) e
+    escrito no terminal de uma só vez.
+    
     Args:
         registro (RegistroAbastecimento): Registro do abastecimento
     """
-    print("\n" + "="*50)
-    print("--- REGISTRO DE ABASTECIMENTO ---")
-    print("="*50)
-    
-    print(f"Data/Hora: {registro.data_abastecimento.strftime('%d/%m/%Y %H:%M:%S')}")
-    print(f"Tipo de Combustível: {registro.tipo_combustivel}")
-    print(f"Valor por litro: R$ {registro.valor_por_litro:.2f}")
-    print(f"Quantidade: {registro.quantidade_litros:.2f} litros")
-    print(f"Valor bruto: R$ {registro.valor_bruto:.2f}")
-    print(f"Forma de pagamento: {registro.forma_pagamento}")
-    
-    if registro.valor_desconto > 0:
-        percentual = pagamento.obter_percentual_desconto() * 100
-        print(f"Desconto aplicado ({percentual:.0f}%): R$ {registro.valor_desconto:.2f}")
-    else:
-        print("Desconto aplicado: R$ 0.00")
-    
-    print("-" * 50)
-    print(f"TOTAL A PAGAR: R$ {registro.valor_final:.2f}")
-    print("="*50)
+    recibo.escrever_recibo(registro)
 
 def obter_dados_abastecimento():
     """
@@ -219,7 +528,7 @@ def obter_dados_abastecimento():
     # Obter quantidade de litros
     try:
         quantidade_litros = float(input("\nDigite a quantidade de litros: "))
-        if quantidade_litros <= 0:
+        if not _litros_validos(quantidade_litros):
             print("A quantidade deve ser maior que zero!")
             return None, None, None
     except ValueError:
@@ -252,13 +561,347 @@ def validar_dados_abastecimento(tipo_combustivel, quantidade_litros, forma_pagam
     # Validar quantidade
     try:
         quantidade = float(quantidade_litros)
-        if quantidade <= 0:
-            return False, "A quantidade de litros deve ser maior que zero!"
     except (ValueError, TypeError):
         return False, "Quantidade de litros inválida!"
+    if not _litros_validos(quantidade):
+        return False, "A quantidade de litros deve ser maior que zero!"
     
     # Validar forma de pagamento
     if not pagamento.validar_forma_pagamento(forma_pagamento):
         return False, f"Forma de pagamento '{forma_pagamento}' não é válida!"
     
-    return True, "Dados válidos"
\ No newline at end of file
+    return True, "Dados válidos"
+
+class ResultadoLote:
+    """
+    CLASSE: Resultado de um processamento em lote
+    =============================================
+    Guarda os resultados de vários abastecimentos em formato de colunas
+    (uma lista/array por campo) em vez de um objeto por venda.
+
+    A posição i de cada coluna corresponde ao abastecimento i da entrada.
+    Linhas inválidas ficam com valores 0.0 e são marcadas com 0 em `validos`
+    (inclusive as recusadas por falta de estoque, com o estoque ligado).
+
+    Atributos:
+    - tipos_combustivel, formas_pagamento: listas com os nomes recebidos
+    - quantidade_litros, valor_por_litro: array('d') com os dados de entrada
+    - valor_bruto, valor_desconto, valor_final: array('d') com os cálculos
+    - percentual_desconto: array('d') com o percentual aplicado a cada linha
+    - validos: bytearray com 1 para linha válida e 0 para inválida
+    - versao_preco: versão da tabela de preços usada no lote inteiro
+    - data_processamento: datetime do cálculo do lote
+    """
+    def __init__(self, tipos_combustivel, formas_pagamento, quantidade_litros,
+                 valor_por_litro, valor_bruto, valor_desconto, valor_final, validos,
+                 versao_preco, data_processamento=None, percentual_desconto=None):
+        self.tipos_combustivel = tipos_combustivel
+        self.formas_pagamento = formas_pagamento
+        self.quantidade_litros = quantidade_litros
+        self.valor_por_litro = valor_por_litro
+        self.valor_bruto = valor_bruto
+        self.valor_desconto = valor_desconto
+        self.valor_final = valor_final
+        self.percentual_desconto = (array('d', [0.0]) * len(validos)
+                                    if percentual_desconto is None else percentual_desconto)
+        self.validos = validos
+        self.versao_preco = versao_preco
+        self.data_processamento = datetime.now() if data_processamento is None else data_processamento
+
+    def __len__(self):
+        return len(self.validos)
+
+    def quantidade_validos(self):
+        """
+        Conta quantas linhas do lote são válidas
+
+        Returns:
+            int: Número de abastecimentos válidos
+        """
+        return self.validos.count(1)
+
+    def indices_invalidos(self):
+        """
+        Lista as posições das linhas rejeitadas na validação
+
+        Returns:
+            list: Índices (base 0) das linhas inválidas
+        """
+        return [i for i, valido in enumerate(self.validos) if not valido]
+
+    def total_final(self):
+        """
+        Soma o valor final de todas as linhas válidas
+
+        Returns:
+            float: Total a receber do lote
+        """
+        return sum(self.valor_final)
+
+def _converter_litros(valor):
+    """
+    Converte uma quantidade de litros para float positivo
+
+    Returns:
+        float: Quantidade convertida ou 0.0 se inválida
+    """
+    try:
+        litros = float(valor)
+    except (ValueError, TypeError):
+        return 0.0
+    return litros if _litros_validos(litros) else 0.0
+
+def _milesimos_ou_none(preco, modo):
+    """Converte um preço para milésimos (None se não for um número positivo e finito)"""
+    if not 0 < preco < math.inf:   # também rejeita nan
+        return None
+    try:
+        return _preco_em_milesimos(preco, modo)
+    except ValueError:
+        return None
+
+def _mililitros_ou_none(litros, modo):
+    """Converte litros para mililitros (None se o volume não for representável)"""
+    try:
+        return dinheiro.litros_para_mililitros(litros, modo)
+    except ValueError:
+        return None
+
+def processar_abastecimentos_em_lote(tipos_combustivel, quantidades_litros, formas_pagamento,
+                                     tabela=None):
+    """
+    FUNÇÃO: Processar vários abastecimentos de uma só vez
+    =====================================================
+    Versão em lote de processar_abastecimento(), pensada para reprocessar
+    e conciliar grandes volumes de vendas (ex: fechamento do dia).
+
+    Em vez de criar um RegistroAbastecimento por venda, a função:
+    1. Monta uma única vez as tabelas de preço e de desconto
+    2. Calcula cada coluna inteira (bruto, desconto, final) de uma vez
+    3. Marca as linhas inválidas em uma máscara, sem lançar exceção
+
+    Todo o lote é precificado com uma única versão da tabela de preços.
+
+    Args:
+        tipos_combustivel (list): Nomes dos combustíveis
+        quantidades_litros (list): Quantidades de litros
+        formas_pagamento (list): Nomes das formas de pagamento
+        tabela (TabelaPrecos): Versão de preços a usar (padrão: a vigente)
+
+    Returns:
+        ResultadoLote: Resultado em colunas com a máscara `validos`
+
+    Raises:
+        ValueError: Se as três listas não tiverem o mesmo tamanho
+    """
+    tipos_combustivel = list(tipos_combustivel)
+    formas_pagamento = list(formas_pagamento)
+    quantidades_litros = list(quantidades_litros)
+
+    total = len(tipos_combustivel)
+    if len(formas_pagamento) != total or len(quantidades_litros) != total:
+        raise ValueError("As listas do lote devem ter o mesmo tamanho!")
+
+    if tabela is None:
+        tabela = combustivel.obter_tabela_precos()
+
+    # TABELAS DE CONSULTA - montadas uma vez para o lote inteiro
+    tabela_precos = tabela.precos
+    tabela_taxas = {
+        forma: (pagamento.obter_percentual_desconto() if pagamento.tem_desconto(forma) else 0.0)
+        for forma in pagamento.listar_formas_pagamento().values()
+    }
+
+    # COLUNAS DE ENTRADA - None marca combustível/pagamento desconhecido
+    precos = [tabela_precos.get(tipo) for tipo in tipos_combustivel]
+    taxas = [tabela_taxas.get(forma) for forma in formas_pagamento]
+    litros = [_converter_litros(q) for q in quantidades_litros]
+
+    motor = pagamento.obter_motor_descontos()
+    if motor is not None:
+        taxas = _taxas_do_motor(motor, [combustivel.obter_id_combustivel(t) for t in tipos_combustivel],
+                                [pagamento.obter_codigo_pagamento(f) for f in formas_pagamento],
+                                precos, taxas, litros)
+
+    return _calcular_lote(tipos_combustivel, formas_pagamento, precos, taxas, litros,
+                          tabela.versao)
+
+def processar_abastecimentos_em_lote_por_id(ids_combustivel, quantidades_litros, codigos_pagamento,
+                                           tabela=None):
+    """
+    Versão de processar_abastecimentos_em_lote() que recebe ids numéricos
+
+    Preços e descontos são obtidos por posição nas listas indexadas por id.
+    Os nomes do resultado só são preenchidos para as linhas válidas.
+
+    Args:
+        ids_combustivel (list): Ids dos combustíveis
+        quantidades_litros (list): Quantidades de litros
+        codigos_pagamento (list): Códigos das formas de pagamento
+        tabela (TabelaPrecos): Versão de preços a usar (padrão: a vigente)
+
+    Returns:
+        ResultadoLote: Resultado em colunas com a máscara `validos`
+
+    Raises:
+        ValueError: Se as três listas não tiverem o mesmo tamanho
+    """
+    ids_combustivel = list(ids_combustivel)
+    codigos_pagamento = list(codigos_pagamento)
+    quantidades_litros = list(quantidades_litros)
+
+    total = len(ids_combustivel)
+    if len(codigos_pagamento) != total or len(quantidades_litros) != total:
+        raise ValueError("As listas do lote devem ter o mesmo tamanho!")
+
+    if tabela is None:
+        tabela = combustivel.obter_tabela_precos()
+
+    # TABELAS INDEXADAS POR ID - None nas posições inexistentes
+    precos_por_id = tabela.precos_por_id
+    formas = pagamento.listar_formas_pagamento()
+    percentual = pagamento.obter_percentual_desconto()
+    taxas_por_codigo = [None] * (max(formas) + 1)
+    for codigo in formas:
+        taxas_por_codigo[codigo] = percentual if pagamento.tem_desconto_por_codigo(codigo) else 0.0
+
+    def _na_posicao(tabela, indice):
+        if type(indice) is int and 0 <= indice < len(tabela):
+            return tabela[indice]
+        return None
+
+    precos = [_na_posicao(precos_por_id, i) for i in ids_combustivel]
+    taxas = [_na_posicao(taxas_por_codigo, c) for c in codigos_pagamento]
+    litros = [_converter_litros(q) for q in quantidades_litros]
+
+    motor = pagamento.obter_motor_descontos()
+    if motor is not None:
+        taxas = _taxas_do_motor(motor, ids_combustivel, codigos_pagamento, precos, taxas, litros)
+
+    tipos_combustivel = [
+        combustivel.obter_nome_combustivel(i) if p is not None else None
+        for i, p in zip(ids_combustivel, precos)
+    ]
+    formas_pagamento = [formas[c] if t is not None else None for c, t in zip(codigos_pagamento, taxas)]
+
+    return _calcular_lote(tipos_combustivel, formas_pagamento, precos, taxas, litros,
+                          tabela.versao)
+
+def _taxas_do_motor(motor, ids_combustivel, codigos_pagamento, precos, taxas, litros):
+    """
+    Troca a taxa da regra fixa pela do motor de regras (ver pagamento.configurar_motor_descontos)
+
+    Só as linhas com combustível, pagamento e litros válidos são consultadas; todas
+    usam a hora atual. As demais continuam com None (inválidas).
+
+    Returns:
+        list: Taxa de desconto por linha
+    """
+    linhas = [i for i, (p, t, l) in enumerate(zip(precos, taxas, litros))
+              if p is not None and t is not None and l is not None]
+    if not linhas:
+        return taxas
+    hora = datetime.now().hour
+    percentuais = motor.percentuais_lote(
+        [ids_combustivel[i] for i in linhas],
+        [codigos_pagamento[i] for i in linhas],
+        [litros[i] for i in linhas],
+        [hora] * len(linhas),
+    )
+    taxas = list(taxas)
+    for i, percentual in zip(linhas, percentuais):
+        taxas[i] = percentual
+    return taxas
+
+def _reservar_lote(estoque, tipos_combustivel, litros, validos):
+    """
+    Reserva no estoque configurado o volume de cada linha válida do lote
+
+    As linhas são reservadas na ordem do lote; a que não tiver tanque ou
+    volume disponível é marcada como inválida em `validos` (as seguintes
+    ainda podem caber no que sobrou).
+
+    Returns:
+        list: Reservas feitas (a confirmar ou cancelar pelo chamador)
+    """
+    reservar = estoque.reservar
+    reservas = []
+    for i, valido in enumerate(validos):
+        if valido:
+            try:
+                reservas.append(reservar(tipos_combustivel[i], litros[i]))
+            except ValueError:
+                validos[i] = 0
+    return reservas
+
+def _calcular_lote(tipos_combustivel, formas_pagamento, precos, taxas, litros, versao_preco):
+    """
+    Núcleo comum do processamento em lote: validação e cálculo por coluna
+
+    Args:
+        tipos_combustivel, formas_pagamento (list): Nomes para o resultado
+        precos, taxas (list): Preço e taxa de desconto por linha (None = inválido)
+        litros (list): Litros por linha (0.0 = inválido)
+        versao_preco (int): Versão da tabela de preços usada
+
+    Returns:
+        ResultadoLote: Resultado em colunas com a máscara `validos`
+    """
+    modo = MODO_ARREDONDAMENTO
+
+    # CONVERSÃO PARA INTEIROS - mililitros e milésimos de real (None = valor
+    # fora do intervalo; um preço inválido no catálogo só recusa as suas linhas)
+    mililitros = [_mililitros_ou_none(l, modo) if l > 0 else None for l in litros]
+    precos_milesimos = [_milesimos_ou_none(p, modo) if p is not None else None for p in precos]
+
+    # MÁSCARA DE VALIDAÇÃO - 1 quando as três colunas são válidas
+    validos = bytearray(
+        1 if (p is not None and t is not None and m is not None) else 0
+        for p, t, m in zip(precos_milesimos, taxas, mililitros)
+    )
+
+    # ESTOQUE (opcional) - linhas sem volume no tanque também ficam inválidas
+    estoque = _estoque
+    reservas = _reservar_lote(estoque, tipos_combustivel, litros, validos) if estoque is not None else ()
+    try:
+        resultado = _precificar_lote(tipos_combustivel, formas_pagamento, precos, taxas, litros,
+                                     mililitros, precos_milesimos, validos, versao_preco, modo)
+        for ouvinte in _ouvintes_lotes:
+            ouvinte(resultado)
+    except BaseException:
+        for reserva in reservas:
+            reserva.cancelar()   # o lote não foi concluído: o volume volta aos tanques
+        raise
+    for reserva in reservas:
+        reserva.confirmar()
+    return resultado
+
+def _precificar_lote(tipos_combustivel, formas_pagamento, precos, taxas, litros, mililitros,
+                     precos_milesimos, validos, versao_preco, modo):
+    """Cálculo por coluna das linhas marcadas em `validos` (ver _calcular_lote)"""
+    # LINHAS INVÁLIDAS ZERADAS PARA NÃO CONTAMINAR OS CÁLCULOS
+    precos = [p if v else 0.0 for p, v in zip(precos, validos)]
+    litros = [l if v else 0.0 for l, v in zip(litros, validos)]
+    mililitros = [m if v else 0 for m, v in zip(mililitros, validos)]
+    precos_milesimos = [p if v else 0 for p, v in zip(precos_milesimos, validos)]
+    descontos = [_pontos_base(t) if v else 0 for t, v in zip(taxas, validos)]
+
+    # CÁLCULO POR COLUNA EM CENTAVOS: bruto = litros × preço; desconto = bruto × taxa
+    bruto, desconto, final = dinheiro.precificar_lote(
+        mililitros, precos_milesimos, descontos, modo, CASAS_PRECO)
+    valor_bruto = array('d', [c / 100 for c in bruto])
+    valor_desconto = array('d', [c / 100 for c in desconto])
+    valor_final = array('d', [c / 100 for c in final])
+
+    return ResultadoLote(
+        tipos_combustivel,
+        formas_pagamento,
+        array('d', litros),
+        array('d', precos),
+        valor_bruto,
+        valor_desconto,
+        valor_final,
+        validos,
+        versao_preco,
+        percentual_desconto=array('d', [t if v else 0.0 for t, v in zip(taxas, validos)]),
+    )
\ No newline at end of file
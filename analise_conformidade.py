@@ -7,114 +7,123 @@ Este documento analisa se o sistema desenvolvido atende todos os
 requisitos especificados no enunciado do projeto.
 """
 
-# VERIFICAÇÃO DOS REQUISITOS SOLICITADOS
-
-print("="*70)
-print(" ANÁLISE DE CONFORMIDADE COM OS REQUISITOS ".center(70))
-print("="*70)
-
-print("\n1. MÓDULOS SUGERIDOS:")
-print("   ✓ combustivel.py   - Cadastro e manipulação de tipos de combustível")
-print("   ✓ pagamento.py     - Formas de pagamento e verificação de desconto") 
-print("   ✓ abastecimento.py - Cálculo do total e aplicação de desconto")
-print("   ✓ menu.py          - Menu principal e fluxo do sistema")
-
-print("\n2. REQUISITOS FUNCIONAIS:")
-
-print("\n   ▪ Cadastro de tipos de combustível:")
-print("     ✓ Nome (Ex: Gasolina, Etanol, Diesel) - IMPLEMENTADO")
-print("     ✓ Valor por litro (float) - IMPLEMENTADO")
-print("     ✓ Sistema permite cadastro de novos combustíveis")
-print("     ✓ 4 tipos pré-cadastrados: Gasolina, Etanol, Diesel, Gasolina Aditivada")
-
-print("\n   ▪ Cadastro e seleção da forma de pagamento:")
-print("     ✓ Dinheiro - IMPLEMENTADO")
-print("     ✓ PIX - IMPLEMENTADO") 
-print("     ✓ Cartão de Crédito - IMPLEMENTADO")
-print("     ✓ Cartão de Débito - IMPLEMENTADO")
-
-print("\n   ▪ Entrada de dados para o abastecimento:")
-print("     ✓ Tipo de combustível - Menu interativo implementado")
-print("     ✓ Quantidade em litros - Input numérico com validação")
-print("     ✓ Forma de pagamento - Menu interativo implementado")
-
-print("\n   ▪ Função de cálculo do valor total do abastecimento:")
-print("     ✓ valor_total = litros * valor_por_litro - IMPLEMENTADO")
-print("     ✓ Função calcular_valor_total() no módulo abastecimento")
-print("     ✓ Classe RegistroAbastecimento com cálculos automáticos")
-
-print("\n   ▪ Função de desconto automático (10%) para pagamentos em:")
-print("     ✓ Dinheiro - IMPLEMENTADO")
-print("     ✓ PIX - IMPLEMENTADO") 
-print("     ✓ Cartão de Débito - IMPLEMENTADO")
-print("     ✓ Função calcular_desconto() no módulo pagamento")
-
-print("\n3. SAÍDA ESPERADA CONFORME EXEMPLO:")
-
-# Importar módulos para demonstrar
-import sys
 import os
-sys.path.append(os.path.dirname(__file__))
-
-import combustivel
-import pagamento
-import abastecimento
-
-# Criar exemplo exato do requisito
-registro = abastecimento.processar_abastecimento("Gasolina", 30, "PIX")
-
-print("\n   EXEMPLO DO REQUISITO:")
-print("   --- Registro de Abastecimento ---")
-print("   Tipo de Combustível: Gasolina")
-print("   Valor por litro: R$ 5.79")
-print("   Quantidade: 30 litros")
-print("   Forma de pagamento: PIX")
-print("   Desconto aplicado: R$ 17.37")
-print("   Total a pagar: R$ 156.93")
-
-print("\n   SAÍDA DO NOSSO SISTEMA:")
-print("   --- Registro de Abastecimento ---")
-print(f"   Tipo de Combustível: {registro.tipo_combustivel}")
-print(f"   Valor por litro: R$ {registro.valor_por_litro:.2f}")
-print(f"   Quantidade: {registro.quantidade_litros:.0f} litros")
-print(f"   Forma de pagamento: {registro.forma_pagamento}")
-print(f"   Desconto aplicado: R$ {registro.valor_desconto:.2f}")
-print(f"   Total a pagar: R$ {registro.valor_final:.2f}")
-
-print("\n4. FUNCIONALIDADES EXTRAS IMPLEMENTADAS:")
-print("   ✓ Sistema de validação de dados")
-print("   ✓ Tratamento de erros e exceções")
-print("   ✓ Menu administrativo para gerenciar combustíveis")
-print("   ✓ Interface limpa com limpeza de tela")
-print("   ✓ Informações detalhadas sobre pagamentos")
-print("   ✓ Cadastro dinâmico de novos combustíveis")
-print("   ✓ Atualização de preços")
-print("   ✓ Sistema de ajuda e informações")
-print("   ✓ Comentários extensivos para apresentação")
-print("   ✓ Arquivo de teste automatizado")
-
-print("\n5. CONCEITOS DE PROGRAMAÇÃO DEMONSTRADOS:")
-print("   ✓ Modularização e separação de responsabilidades")
-print("   ✓ Funções e parâmetros")
-print("   ✓ Classes e objetos (POO básica)")
-print("   ✓ Dicionários e estruturas de dados")
-print("   ✓ Loops e estruturas condicionais")
-print("   ✓ Tratamento de exceções")
-print("   ✓ Validação de entrada de dados")
-print("   ✓ Formatação de saída")
-print("   ✓ Importação de módulos")
-print("   ✓ Constantes e configurações")
-
-print("\n" + "="*70)
-print(" CONCLUSÃO: TODOS OS REQUISITOS FORAM ATENDIDOS ".center(70))
-print("="*70)
-
-print("\nO sistema está 100% conforme as especificações e pronto para")
-print("apresentação no curso de Lógica de Programação do SENAI 2025.")
-
-print("\nARQUIVOS PARA APRESENTAÇÃO:")
-print("• menu.py - Sistema principal interativo")
-print("• teste_sistema.py - Demonstração automatizada")
-print("• Todos os módulos estão comentados para facilitar explicação")
-
-print(f"\nData da análise: {__import__('datetime').datetime.now().strftime('%d/%m/%Y %H:%M')}")
\ No newline at end of file
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    """
+    Executa a análise e imprime o relatório de conformidade
+
+    Todo o trabalho fica dentro desta função: importar este arquivo não
+    imprime nada nem processa abastecimentos.
+    """
+    # VERIFICAÇÃO DOS REQUISITOS SOLICITADOS
+    print("="*70)
+    print(" ANÁLISE DE CONFORMIDADE COM OS REQUISITOS ".center(70))
+    print("="*70)
+
+    print("\n1. MÓDULOS SUGERIDOS:")
+    print("   ✓ combustivel.py   - Cadastro e manipulação de tipos de combustível")
+    print("   ✓ pagamento.py     - Formas de pagamento e verificação de desconto") 
+    print("   ✓ abastecimento.py - Cálculo do total e aplicação de desconto")
+    print("   ✓ menu.py          - Menu principal e fluxo do sistema")
+
+    print("\n2. REQUISITOS FUNCIONAIS:")
+
+    print("\n   ▪ Cadastro de tipos de combustível:")
+    print("     ✓ Nome (Ex: Gasolina, Etanol, Diesel) - IMPLEMENTADO")
+    print("     ✓ Valor por litro (float) - IMPLEMENTADO")
+    print("     ✓ Sistema permite cadastro de novos combustíveis")
+    print("     ✓ 4 tipos pré-cadastrados: Gasolina, Etanol, Diesel, Gasolina Aditivada")
+
+    print("\n   ▪ Cadastro e seleção da forma de pagamento:")
+    print("     ✓ Dinheiro - IMPLEMENTADO")
+    print("     ✓ PIX - IMPLEMENTADO") 
+    print("     ✓ Cartão de Crédito - IMPLEMENTADO")
+    print("     ✓ Cartão de Débito - IMPLEMENTADO")
+
+    print("\n   ▪ Entrada de dados para o abastecimento:")
+    print("     ✓ Tipo de combustível - Menu interativo implementado")
+    print("     ✓ Quantidade em litros - Input numérico com validação")
+    print("     ✓ Forma de pagamento - Menu interativo implementado")
+
+    print("\n   ▪ Função de cálculo do valor total do abastecimento:")
+    print("     ✓ valor_total = litros * valor_por_litro - IMPLEMENTADO")
+    print("     ✓ Função calcular_valor_total() no módulo abastecimento")
+    print("     ✓ Classe RegistroAbastecimento com cálculos automáticos")
+
+    print("\n   ▪ Função de desconto automático (10%) para pagamentos em:")
+    print("     ✓ Dinheiro - IMPLEMENTADO")
+    print("     ✓ PIX - IMPLEMENTADO") 
+    print("     ✓ Cartão de Débito - IMPLEMENTADO")
+    print("     ✓ Função calcular_desconto() no módulo pagamento")
+
+    print("\n3. SAÍDA ESPERADA CONFORME EXEMPLO:")
+
+    # Importar módulos para demonstrar (apenas quando a análise é executada)
+    import abastecimento
+
+    # Criar exemplo exato do requisito
+    registro = abastecimento.processar_abastecimento("Gasolina", 30, "PIX")
+
+    print("\n   EXEMPLO DO REQUISITO:")
+    print("   --- Registro de Abastecimento ---")
+    print("   Tipo de Combustível: Gasolina")
+    print("   Valor por litro: R$ 5.79")
+    print("   Quantidade: 30 litros")
+    print("   Forma de pagamento: PIX")
+    print("   Desconto aplicado: R$ 17.37")
+    print("   Total a pagar: R$ 156.93")
+
+    print("\n   SAÍDA DO NOSSO SISTEMA:")
+    print("   --- Registro de Abastecimento ---")
+    print(f"   Tipo de Combustível: {registro.tipo_combustivel}")
+    print(f"   Valor por litro: R$ {registro.valor_por_litro:.2f}")
+    print(f"   Quantidade: {registro.quantidade_litros:.0f} litros")
+    print(f"   Forma de pagamento: {registro.forma_pagamento}")
+    print(f"   Desconto aplicado: R$ {registro.valor_desconto:.2f}")
+    print(f"   Total a pagar: R$ {registro.valor_final:.2f}")
+
+    print("\n4. FUNCIONALIDADES EXTRAS IMPLEMENTADAS:")
+    print("   ✓ Sistema de validação de dados")
+    print("   ✓ Tratamento de erros e exceções")
+    print("   ✓ Menu administrativo para gerenciar combustíveis")
+    print("   ✓ Interface limpa com limpeza de tela")
+    print("   ✓ Informações detalhadas sobre pagamentos")
+    print("   ✓ Cadastro dinâmico de novos combustíveis")
+    print("   ✓ Atualização de preços")
+    print("   ✓ Sistema de ajuda e informações")
+    print("   ✓ Comentários extensivos para apresentação")
+    print("   ✓ Arquivo de teste automatizado")
+
+    print("\n5. CONCEITOS DE PROGRAMAÇÃO DEMONSTRADOS:")
+    print("   ✓ Modularização e separação de responsabilidades")
+    print("   ✓ Funções e parâmetros")
+    print("   ✓ Classes e objetos (POO básica)")
+    print("   ✓ Dicionários e estruturas de dados")
+    print("   ✓ Loops e estruturas condicionais")
+    print("   ✓ Tratamento de exceções")
+    print("   ✓ Validação de entrada de dados")
+    print("   ✓ Formatação de saída")
+    print("   ✓ Importação de módulos")
+    print("   ✓ Constantes e configurações")
+
+    print("\n" + "="*70)
+    print(" CONCLUSÃO: TODOS OS REQUISITOS FORAM ATENDIDOS ".center(70))
+    print("="*70)
+
+    print("\nO sistema está 100% conforme as especificações e pronto para")
+    print("apresentação no curso de Lógica de Programação do SENAI 2025.")
+
+    print("\nARQUIVOS PARA APRESENTAÇÃO:")
+    print("• menu.py - Sistema principal interativo")
+    print("• teste_sistema.py - Demonstração automatizada")
+    print("• Todos os módulos estão comentados para facilitar explicação")
+
+    print(f"\nData da análise: {__import__('datetime').datetime.now().strftime('%d/%m/%Y %H:%M')}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+API REST DO SISTEMA DE POSTO DE COMBUSTÍVEL
+===========================================
+Servidor Flask que expõe os módulos do sistema (combustivel, pagamento
+e abastecimento) para o frontend web e para os terminais das bombas (PDV).
+
+Endpoints:
+- GET  /api/combustiveis                 Lista de combustíveis e preços (com ETag)
+- POST /api/combustiveis                 Cadastra combustível {"nome", "preco"}
+- PUT  /api/combustiveis/<nome>/preco    Atualiza preço {"preco"}
+- GET  /api/pagamentos                   Formas de pagamento e descontos
+- POST /api/abastecimentos               Um abastecimento {"combustivel", "litros", "pagamento"}
+                                         (cabeçalho Idempotency-Key: repetições devolvem
+                                         a venda original com status 200)
+- POST /api/abastecimentos/lote          Milhares de abastecimentos em uma requisição
+- GET  /api/abastecimentos               Vendas gravadas no diário (resposta em fluxo)
+
+Desempenho:
+- ETag na lista de preços (resumo do conteúdo, válido entre reinícios):
+  o terminal envia If-None-Match e recebe 304 (sem corpo) enquanto a
+  tabela de preços não mudar
+- Lote: processado com processar_abastecimentos_em_lote() e gravado
+  no diário de uma só vez
+- Vendas só são confirmadas (201) depois do commit em grupo que as
+  grava em disco; requisições simultâneas compartilham o mesmo fsync
+- Listagens grandes são enviadas em fluxo (streaming), sem montar
+  a resposta inteira na memória
+- HTTP/1.1 com keep-alive: o terminal reaproveita a mesma conexão
+
+Execução:
+    cd api
+    python app.py
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+
+# PERMITIR IMPORTAR OS MÓDULOS DA PASTA PRINCIPAL DO SISTEMA
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, Response, jsonify, request
+from flask_cors import CORS
+from werkzeug.serving import WSGIRequestHandler
+
+import abastecimento
+import combustivel
+import diario
+import idempotencia
+import pagamento
+
+app = Flask(__name__)
+CORS(app)
+
+# Tamanho dos blocos de texto enviados nas respostas em fluxo
+REGISTROS_POR_BLOCO = 500
+
+
+def _registro_para_dict(registro):
+    """Converte um RegistroAbastecimento em dicionário para JSON"""
+    return {
+        "data": registro.data_abastecimento.isoformat(timespec="seconds"),
+        "combustivel": registro.tipo_combustivel,
+        "litros": registro.quantidade_litros,
+        "valor_por_litro": registro.valor_por_litro,
+        "versao_preco": registro.versao_preco,
+        "pagamento": registro.forma_pagamento,
+        "valor_bruto": round(registro.valor_bruto, 2),
+        "valor_desconto": round(registro.valor_desconto, 2),
+        "valor_final": round(registro.valor_final, 2),
+    }
+
+def _erro(mensagem, status=400):
+    """Resposta padrão de erro"""
+    return jsonify({"erro": mensagem}), status
+
+def _corpo_json():
+    """
+    Lê o corpo JSON da requisição
+
+    Returns:
+        dict: Objeto enviado ({} sem corpo) ou None se o corpo não for um objeto
+    """
+    dados = request.get_json(silent=True)
+    if dados is None:
+        return {}
+    return dados if isinstance(dados, dict) else None
+
+def _texto_ou_none(valor):
+    """Mantém apenas textos (números, listas e objetos viram None = inválido)"""
+    return valor if isinstance(valor, str) else None
+
+# ETAG DA TABELA DE PREÇOS - calculada uma vez por versão publicada
+_etag_da_tabela = (None, None)
+
+def _etag_precos(tabela):
+    """
+    ETag derivada do conteúdo da tabela (nomes e preços)
+
+    A versão da tabela é um contador do processo e recomeça a cada
+    reinício; o resumo do conteúdo não, então uma ETag antiga nunca
+    coincide com preços diferentes.
+    """
+    global _etag_da_tabela
+    tabela_em_cache, etag = _etag_da_tabela
+    if tabela_em_cache is not tabela:
+        conteudo = repr(tuple(tabela.precos.items())).encode("utf-8")
+        etag = "precos-" + hashlib.sha1(conteudo).hexdigest()[:20]
+        _etag_da_tabela = (tabela, etag)
+    return etag
+
+
+@app.get("/")
+def indice():
+    """Informações básicas da API"""
+    return jsonify({
+        "sistema": "Sistema de Controle de Abastecimento",
+        "endpoints": sorted({str(regra) for regra in app.url_map.iter_rules()
+                             if str(regra).startswith("/api")}),
+    })
+
+@app.get("/api/combustiveis")
+def listar_combustiveis():
+    """
+    Lista combustíveis e preços da versão vigente da tabela de preços
+
+    A ETag é um resumo dos nomes e preços: enquanto nenhum preço mudar, a
+    resposta a um GET com If-None-Match igual é 304 Not Modified, sem corpo.
+    """
+    tabela = combustivel.obter_tabela_precos()
+    resposta = jsonify({
+        "versao": tabela.versao,
+        "combustiveis": [
+            {"id": combustivel.obter_id_combustivel(nome), "nome": nome, "preco": preco}
+            for nome, preco in tabela.precos.items()
+        ],
+    })
+    resposta.set_etag(_etag_precos(tabela))
+    resposta.cache_control.no_cache = True   # sempre revalidar com a ETag
+    return resposta.make_conditional(request)
+
+@app.post("/api/combustiveis")
+def cadastrar_combustivel():
+    """Cadastra um novo combustível"""
+    dados = _corpo_json()
+    if dados is None:
+        return _erro("O corpo deve ser um objeto JSON!")
+    nome = dados.get("nome", "")
+    if not isinstance(nome, str):
+        return _erro("O nome deve ser um texto!")
+    nome = nome.strip()
+    if not nome:
+        return _erro("Nome não pode estar vazio!")
+    try:
+        preco = float(dados.get("preco"))
+    except (TypeError, ValueError):
+        return _erro("Preço inválido!")
+    if not (math.isfinite(preco) and preco > 0):   # NaN/Infinity não cabem em JSON
+        return _erro("O preço deve ser um número maior que zero!")
+
+    combustivel.cadastrar_combustivel(nome, preco)
+    return jsonify({"nome": nome, "preco": preco,
+                    "versao": combustivel.obter_tabela_precos().versao}), 201
+
+@app.put("/api/combustiveis/<nome>/preco")
+def atualizar_preco(nome):
+    """Atualiza o preço de um combustível existente"""
+    if not combustivel.validar_combustivel(nome):
+        return _erro("Combustível não encontrado!", 404)
+    dados = _corpo_json()
+    if dados is None:
+        return _erro("O corpo deve ser um objeto JSON!")
+    try:
+        preco = float(dados.get("preco"))
+    except (TypeError, ValueError):
+        return _erro("Preço inválido!")
+    if not (math.isfinite(preco) and preco > 0):   # NaN/Infinity não cabem em JSON
+        return _erro("O preço deve ser um número maior que zero!")
+
+    combustivel.atualizar_preco_combustivel(nome, preco)
+    return jsonify({"nome": nome, "preco": preco,
+                    "versao": combustivel.obter_tabela_precos().versao})
+
+@app.get("/api/pagamentos")
+def listar_pagamentos():
+    """Lista as formas de pagamento com a informação de desconto"""
+    return jsonify([
+        {"codigo": codigo, "nome": nome, **pagamento.obter_info_desconto(nome)}
+        for codigo, nome in pagamento.listar_formas_pagamento().items()
+    ])
+
+@app.post("/api/abastecimentos")
+def realizar_abastecimento():
+    """Processa um abastecimento e grava no diário"""
+    dados = _corpo_json()
+    if dados is None:
+        return _erro("O corpo deve ser um objeto JSON!")
+    tipo = dados.get("combustivel")
+    litros = dados.get("litros")
+    forma = dados.get("pagamento")
+    if not isinstance(tipo, str) or not isinstance(forma, str):
+        return _erro("Combustível e pagamento devem ser textos!")
+
+    valido, mensagem = abastecimento.validar_dados_abastecimento(tipo, litros, forma)
+    if not valido:
+        return _erro(mensagem)
+
+    chave = request.headers.get("Idempotency-Key") or dados.get("chave")
+    if chave is not None and not isinstance(chave, str):
+        return _erro("A chave de idempotência deve ser um texto!")
+    try:
+        if chave is None:
+            registro = _vender_e_gravar(tipo, litros, forma)
+            repetido = False
+        else:
+            # repetição da bomba: devolve a venda original, sem gravar de novo
+            registro, repetido = idempotencia.obter_cache_padrao().executar(
+                chave, (tipo, litros, forma), _vender_e_gravar, tipo, litros, forma)
+    except ValueError as erro:
+        return _erro(str(erro))
+
+    return jsonify(_registro_para_dict(registro)), 200 if repetido else 201
+
+def _vender_e_gravar(tipo, litros, forma):
+    """Processa um abastecimento e grava no diário"""
+    registro = abastecimento.processar_abastecimento(tipo, litros, forma)
+    diario.obter_diario_padrao().registrar(registro, duravel=True)
+    return registro
+
+@app.post("/api/abastecimentos/lote")
+def realizar_abastecimentos_em_lote():
+    """
+    Processa muitos abastecimentos em uma única requisição
+
+    Aceita o formato em colunas (mais compacto):
+        {"combustiveis": [...], "litros": [...], "pagamentos": [...]}
+    ou uma lista de objetos:
+        {"abastecimentos": [{"combustivel", "litros", "pagamento"}, ...]}
+
+    Linhas inválidas não interrompem o lote: seus índices são devolvidos
+    em "invalidos" e elas não são gravadas.
+    """
+    dados = _corpo_json()
+    if dados is None:
+        return _erro("O corpo deve ser um objeto JSON!")
+    if "abastecimentos" in dados:
+        itens = dados["abastecimentos"]
+        if not isinstance(itens, list):
+            return _erro("'abastecimentos' deve ser uma lista!")
+        itens = [item if isinstance(item, dict) else {} for item in itens]
+        tipos = [item.get("combustivel") for item in itens]
+        litros = [item.get("litros") for item in itens]
+        formas = [item.get("pagamento") for item in itens]
+    else:
+        tipos = dados.get("combustiveis", [])
+        litros = dados.get("litros", [])
+        formas = dados.get("pagamentos", [])
+        if not all(isinstance(coluna, list) for coluna in (tipos, litros, formas)):
+            return _erro("'combustiveis', 'litros' e 'pagamentos' devem ser listas!")
+    # nomes que não são texto marcam a linha como inválida
+    tipos = [_texto_ou_none(tipo) for tipo in tipos]
+    formas = [_texto_ou_none(forma) for forma in formas]
+
+    try:
+        resultado = abastecimento.processar_abastecimentos_em_lote(tipos, litros, formas)
+    except (ValueError, TypeError) as erro:
+        return _erro(str(erro))
+
+    gravados = diario.obter_diario_padrao().registrar_lote(resultado, duravel=True)
+    return jsonify({
+        "total": len(resultado),
+        "gravados": gravados,
+        "invalidos": resultado.indices_invalidos(),
+        "versao_preco": resultado.versao_preco,
+        "valor_total": round(resultado.total_final(), 2),
+        "valor_final": [round(valor, 2) for valor in resultado.valor_final],
+    }), 201
+
+@app.get("/api/abastecimentos")
+def listar_abastecimentos():
+    """
+    Lista as vendas do diário em fluxo (JSON array enviado em blocos)
+
+    Parâmetro opcional: ?limite=N envia apenas as N primeiras vendas do diário
+    """
+    limite = request.args.get("limite", type=int)
+    diario_padrao = diario.obter_diario_padrao()
+    diario_padrao.sincronizar()
+    leitor = diario.LeitorDiario(diario_padrao.pasta)
+
+    def gerar():
+        nome_combustivel = leitor.nome_combustivel
+        nome_pagamento = leitor.nome_pagamento
+        bloco = []
+        primeiro = True
+        yield "["
+        for quantidade, campos in enumerate(leitor.iterar()):
+            if limite is not None and quantidade >= limite:
+                break
+            instante, id_comb, id_pag, versao, litros, preco, bruto, desconto, final = campos
+            item = json.dumps({
+                "instante": instante,
+                "combustivel": nome_combustivel(id_comb),
+                "litros": litros,
+                "valor_por_litro": preco,
+                "versao_preco": versao,
+                "pagamento": nome_pagamento(id_pag),
+                "valor_bruto": round(bruto, 2),
+                "valor_desconto": round(desconto, 2),
+                "valor_final": round(final, 2),
+            }, ensure_ascii=False)
+            bloco.append(item if primeiro else "," + item)
+            primeiro = False
+            if len(bloco) >= REGISTROS_POR_BLOCO:
+                yield "".join(bloco)
+                bloco.clear()
+        bloco.append("]")
+        yield "".join(bloco)
+
+    return Response(gerar(), mimetype="application/json")
+
+
+if __name__ == "__main__":
+    # HTTP/1.1 mantém a conexão aberta entre requisições (keep-alive)
+    WSGIRequestHandler.protocol_version = "HTTP/1.1"
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)), threaded=True)
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO BANCO
+============
+Armazenamento em banco de dados SQLite (embutido, sem servidor) para:
+- combustíveis e preços vigentes
+- histórico de preços
+- vendas (abastecimentos)
+
+Desempenho:
+- Grupo (pool) de conexões reaproveitadas entre as threads
+- Modo WAL: leitores não bloqueiam o escritor e vice-versa
+- Comandos SQL fixos (constantes do módulo): o sqlite3 guarda em cada
+  conexão o comando já preparado e o reaproveita a cada execução
+- Vendas em lote gravadas com executemany() em uma única transação
+
+Integração com o módulo combustivel:
+conectar_catalogo(banco) carrega os preços do banco para a tabela de
+preços em memória do módulo combustivel (a cache) e passa a gravar no
+banco cada cadastro ou alteração de preço. As consultas de preço
+(obter_preco_combustivel etc.) continuam lendo apenas a memória: o banco
+nunca é consultado durante uma venda. Uma falha do banco nessa gravação
+chega a quem alterou o preço como OSError, e o preço não é publicado.
+
+Vendas: o livro oficial de vendas é o diário (módulo diario). As vendas
+só chegam ao banco se forem gravadas explicitamente (inserir_vendas,
+inserir_lote) ou se conectar_vendas(banco) for chamado; neste caso cada
+venda processada pelo módulo abastecimento é gravada em uma transação
+própria, dentro da própria venda.
+
+Uso típico:
+    banco = BancoDados()              # dados/sistema.db
+    conectar_catalogo(banco)
+    combustivel.atualizar_preco_combustivel("Gasolina", 5.99)   # grava no banco
+    banco.inserir_vendas(registros)
+
+Execução (medição de gravação em lote):
+    python banco.py --vendas 100000
+"""
+
+import argparse
+import os
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import abastecimento
+import combustivel
+
+# ARQUIVO PADRÃO - na mesma pasta de dados do diário
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "sistema.db")
+
+# ESQUEMA DO BANCO
+_SQL_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS combustiveis (
+    id     INTEGER PRIMARY KEY,
+    nome   TEXT NOT NULL UNIQUE,
+    preco  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS historico_precos (
+    id_combustivel  INTEGER NOT NULL REFERENCES combustiveis(id),
+    instante        REAL NOT NULL,
+    preco           REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_historico_combustivel
+    ON historico_precos (id_combustivel, instante);
+CREATE TABLE IF NOT EXISTS vendas (
+    id              INTEGER PRIMARY KEY,
+    instante        INTEGER NOT NULL,
+    combustivel     TEXT NOT NULL,
+    litros          REAL NOT NULL,
+    pagamento       TEXT NOT NULL,
+    valor_por_litro REAL NOT NULL,
+    versao_preco    INTEGER NOT NULL,
+    valor_bruto     REAL NOT NULL,
+    valor_desconto  REAL NOT NULL,
+    valor_final     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_vendas_instante ON vendas (instante);
+"""
+
+# COMANDOS SQL FIXOS - preparados uma vez por conexão e reaproveitados
+_SQL_SALVAR_PRECO = """
+INSERT INTO combustiveis (nome, preco) VALUES (?, ?)
+ON CONFLICT (nome) DO UPDATE SET preco = excluded.preco
+"""
+_SQL_GARANTIR_COMBUSTIVEL = "INSERT OR IGNORE INTO combustiveis (nome, preco) VALUES (?, ?)"
+_SQL_INSERIR_HISTORICO = """
+INSERT INTO historico_precos (id_combustivel, instante, preco)
+SELECT id, ?, ? FROM combustiveis WHERE nome = ?
+"""
+_SQL_LISTAR_COMBUSTIVEIS = "SELECT nome, preco FROM combustiveis ORDER BY id"
+_SQL_LISTAR_HISTORICO = """
+SELECT c.nome, h.instante, h.preco
+FROM historico_precos h JOIN combustiveis c ON c.id = h.id_combustivel
+ORDER BY h.id_combustivel, h.instante
+"""
+_SQL_INSERIR_VENDA = """
+INSERT INTO vendas (instante, combustivel, litros, pagamento, valor_por_litro,
+                    versao_preco, valor_bruto, valor_desconto, valor_final)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# id seguido da mesma ordem de campos de relatorios.Venda; um bloco por
+# consulta, continuando depois do último id lido
+_SQL_LISTAR_VENDAS = """
+SELECT id, instante, combustivel, litros, pagamento, valor_por_litro,
+       valor_bruto, valor_desconto, valor_final
+FROM vendas WHERE id > ? AND instante >= ? AND instante < ? ORDER BY id LIMIT ?
+"""
+_SQL_CONTAR_VENDAS = "SELECT COUNT(*) FROM vendas"
+
+
+def _linha_de_registro(registro):
+    """Converte um RegistroAbastecimento na tupla de parâmetros da tabela vendas"""
+    return (
+        int(registro.data_abastecimento.timestamp()),
+        registro.tipo_combustivel,
+        registro.quantidade_litros,
+        registro.forma_pagamento,
+        registro.valor_por_litro or 0.0,
+        registro.versao_preco,
+        registro.valor_bruto,
+        registro.valor_desconto,
+        registro.valor_final,
+    )
+
+
+class BancoDados:
+    """
+    CLASSE: Banco de dados SQLite do sistema
+    ========================================
+    Mantém um grupo fixo de conexões. Cada operação pega uma conexão
+    livre, executa em uma transação e devolve a conexão ao grupo.
+    """
+    def __init__(self, caminho=CAMINHO_PADRAO, tamanho_pool=4):
+        """
+        Args:
+            caminho (str): Arquivo do banco (":memory:" não é suportado pelo pool)
+            tamanho_pool (int): Quantidade de conexões abertas
+        """
+        if tamanho_pool < 1:
+            raise ValueError("O pool precisa de pelo menos uma conexão!")
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(pasta, exist_ok=True)
+        self.caminho = caminho
+
+        self._pool = queue.LifoQueue()
+        self._conexoes = [self._abrir_conexao() for _ in range(tamanho_pool)]
+        with self._conexoes[0] as conexao:
+            conexao.executescript(_SQL_ESQUEMA)
+        for conexao in self._conexoes:
+            self._pool.put(conexao)
+
+    def _abrir_conexao(self):
+        """Abre e configura uma conexão (WAL, espera em caso de bloqueio)"""
+        conexao = sqlite3.connect(self.caminho, timeout=30, check_same_thread=False,
+                                  cached_statements=64)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")   # seguro com WAL e bem mais rápido
+        conexao.execute("PRAGMA foreign_keys=ON")
+        return conexao
+
+    @contextmanager
+    def conexao(self):
+        """
+        Empresta uma conexão do pool (devolvida ao sair do bloco with)
+
+        Exemplo:
+            with banco.conexao() as conexao:
+                conexao.execute("SELECT ...")
+        """
+        conexao = self._pool.get()
+        try:
+            yield conexao
+        finally:
+            self._pool.put(conexao)
+
+    # ------------------------------------------------------------------
+    # COMBUSTÍVEIS E PREÇOS
+    # ------------------------------------------------------------------
+    def salvar_preco(self, nome, preco, instante=None, vigente=True):
+        """
+        Grava um preço de combustível (e o registra no histórico)
+
+        Tem a mesma assinatura dos ouvintes do módulo combustivel.
+
+        Args:
+            nome (str): Nome do combustível
+            preco (float): Preço por litro
+            instante (float): Início da vigência em segundos desde 1970 (padrão: agora)
+            vigente (bool): False para registrar apenas no histórico
+        """
+        if instante is None:
+            instante = time.time()
+        with self.conexao() as conexao, conexao:
+            if vigente:
+                conexao.execute(_SQL_SALVAR_PRECO, (nome, preco))
+            else:
+                conexao.execute(_SQL_GARANTIR_COMBUSTIVEL, (nome, preco))
+            conexao.execute(_SQL_INSERIR_HISTORICO, (instante, preco, nome))
+
+    def carregar_catalogo(self):
+        """
+        Lê combustíveis e históricos do banco
+
+        Returns:
+            tuple: ({nome: preço vigente}, {nome: [(instante, preço), ...]})
+        """
+        with self.conexao() as conexao:
+            precos = dict(conexao.execute(_SQL_LISTAR_COMBUSTIVEIS))
+            historico = {}
+            for nome, instante, preco in conexao.execute(_SQL_LISTAR_HISTORICO):
+                historico.setdefault(nome, []).append((instante, preco))
+        return precos, historico
+
+    # ------------------------------------------------------------------
+    # VENDAS
+    # ------------------------------------------------------------------
+    def inserir_venda(self, registro):
+        """
+        Grava uma venda
+
+        Args:
+            registro (RegistroAbastecimento): Registro já processado
+        """
+        with self.conexao() as conexao, conexao:
+            conexao.execute(_SQL_INSERIR_VENDA, _linha_de_registro(registro))
+
+    def inserir_vendas(self, registros):
+        """
+        FUNÇÃO: Gravação em lote com executemany()
+        ==========================================
+        Todas as vendas entram em uma única transação, com o comando
+        preparado uma vez e executado para cada linha.
+
+        Args:
+            registros (iterable): RegistroAbastecimento (ou objetos com os mesmos campos)
+
+        Returns:
+            int: Quantidade de vendas gravadas
+        """
+        with self.conexao() as conexao, conexao:
+            cursor = conexao.executemany(_SQL_INSERIR_VENDA, map(_linha_de_registro, registros))
+            return cursor.rowcount
+
+    def inserir_lote(self, resultado, instante=None):
+        """
+        Grava as linhas válidas de um processamento em lote
+
+        Args:
+            resultado (ResultadoLote): Retorno de processar_abastecimentos_em_lote()
+            instante (int): Data/hora em segundos desde 1970 (padrão: agora)
+
+        Returns:
+            int: Quantidade de vendas gravadas
+        """
+        if instante is None:
+            instante = int(datetime.now().timestamp())
+        linhas = (
+            (instante, resultado.tipos_combustivel[i], resultado.quantidade_litros[i],
+             resultado.formas_pagamento[i], resultado.valor_por_litro[i], resultado.versao_preco,
+             resultado.valor_bruto[i], resultado.valor_desconto[i], resultado.valor_final[i])
+            for i, valido in enumerate(resultado.validos) if valido
+        )
+        with self.conexao() as conexao, conexao:
+            return conexao.executemany(_SQL_INSERIR_VENDA, linhas).rowcount
+
+    def contar_vendas(self):
+        """
+        Returns:
+            int: Quantidade de vendas gravadas
+        """
+        with self.conexao() as conexao:
+            return conexao.execute(_SQL_CONTAR_VENDAS).fetchone()[0]
+
+    def iterar_vendas(self, inicio=0, fim=2 ** 62, tamanho_bloco=5000):
+        """
+        Percorre as vendas de um período, em blocos (sem carregar tudo na memória)
+
+        Cada linha tem a mesma ordem de campos de relatorios.Venda, então
+        pode ser convertida com relatorios.Venda._make(linha).
+
+        Cada bloco é lido com uma conexão emprestada e devolvida ao pool
+        antes de as linhas serem entregues: um iterador abandonado no meio
+        não segura conexão nenhuma.
+
+        Args:
+            inicio (int): Instante inicial (inclusive), em segundos desde 1970
+            fim (int): Instante final (exclusive)
+            tamanho_bloco (int): Linhas lidas do banco por vez
+
+        Yields:
+            tuple: (instante, combustivel, litros, pagamento, valor_por_litro,
+                    valor_bruto, valor_desconto, valor_final)
+        """
+        ultimo_id = 0
+        while True:
+            with self.conexao() as conexao:
+                bloco = conexao.execute(_SQL_LISTAR_VENDAS,
+                                        (ultimo_id, inicio, fim, tamanho_bloco)).fetchall()
+            if not bloco:
+                return
+            ultimo_id = bloco[-1][0]
+            for linha in bloco:
+                yield linha[1:]
+
+    # ------------------------------------------------------------------
+    # OUVINTES - erros do SQLite viram OSError para quem alterou o preço ou vendeu
+    # ------------------------------------------------------------------
+    def _ouvinte_precos(self, nome, preco, instante, vigente):
+        """salvar_preco() como ouvinte do módulo combustivel"""
+        try:
+            self.salvar_preco(nome, preco, instante, vigente)
+        except sqlite3.Error as e:
+            raise OSError(f"Falha ao gravar o preço no banco: {e}") from e
+
+    def _ouvinte_vendas(self, registro):
+        """inserir_venda() como ouvinte do módulo abastecimento"""
+        try:
+            self.inserir_venda(registro)
+        except sqlite3.Error as e:
+            raise OSError(f"Falha ao gravar a venda no banco: {e}") from e
+
+    def fechar(self):
+        """Fecha todas as conexões do pool (e para de receber preços e vendas)"""
+        desconectar_catalogo(self)
+        desconectar_vendas(self)
+        for conexao in self._conexoes:
+            conexao.close()
+        self._conexoes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+# ----------------------------------------------------------------------
+# INTEGRAÇÃO COM O MÓDULO COMBUSTIVEL
+# ----------------------------------------------------------------------
+def conectar_catalogo(banco):
+    """
+    Usa o banco como armazenamento do catálogo de combustíveis
+
+    1. Banco vazio: grava nele os combustíveis e históricos atuais da memória
+    2. Banco com dados: carrega os preços do banco para a memória (uma versão nova)
+    3. A partir daí, cada cadastro/alteração de preço é gravado no banco
+       antes de ser publicado na memória
+
+    Args:
+        banco (BancoDados): Banco a conectar
+    """
+    precos, historico = banco.carregar_catalogo()
+    if precos:
+        combustivel.carregar_precos(precos, historico)
+    else:
+        for nome, preco in combustivel.listar_combustiveis().items():
+            pares = combustivel.obter_historico_precos(nome) or [(time.time(), preco)]
+            for instante, preco_historico in pares[:-1]:
+                banco.salvar_preco(nome, preco_historico, instante, vigente=False)
+            banco.salvar_preco(nome, preco, pares[-1][0], vigente=True)
+    combustivel.adicionar_ouvinte_precos(banco._ouvinte_precos)
+
+def desconectar_catalogo(banco):
+    """Para de gravar as alterações de preço no banco"""
+    combustivel.remover_ouvinte_precos(banco._ouvinte_precos)
+
+def conectar_vendas(banco):
+    """
+    Grava no banco cada venda processada pelo módulo abastecimento
+
+    Uma transação por venda, feita dentro da própria venda: se o banco
+    falhar, a venda levanta OSError. Para muitas vendas de uma vez,
+    inserir_vendas() / inserir_lote() são bem mais rápidos.
+
+    Args:
+        banco (BancoDados): Banco a conectar
+    """
+    abastecimento.adicionar_ouvinte_registros(banco._ouvinte_vendas)
+
+def desconectar_vendas(banco):
+    """Para de gravar as vendas no banco"""
+    abastecimento.remover_ouvinte_registros(banco._ouvinte_vendas)
+
+def recarregar_catalogo(banco):
+    """
+    Relê os preços do banco (ex: alterados por outro processo) e publica uma nova versão
+    """
+    precos, historico = banco.carregar_catalogo()
+    combustivel.carregar_precos(precos, historico)
+
+
+def main():
+    """Mede a gravação de vendas: uma por transação x executemany em lote"""
+    parser = argparse.ArgumentParser(description="Medição de gravação no banco SQLite")
+    parser.add_argument("--vendas", type=int, default=100_000, help="vendas no lote")
+    parser.add_argument("--banco", default=CAMINHO_PADRAO, help="arquivo do banco")
+    argumentos = parser.parse_args()
+
+    registros = [abastecimento.processar_abastecimento("Gasolina", 10 + i % 40, "PIX")
+                 for i in range(argumentos.vendas)]
+    with BancoDados(argumentos.banco) as banco:
+        individuais = registros[:min(2000, len(registros))]
+        inicio = time.perf_counter()
+        for registro in individuais:
+            banco.inserir_venda(registro)
+        uma_a_uma = len(individuais) / (time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        banco.inserir_vendas(registros)
+        em_lote = len(registros) / (time.perf_counter() - inicio)
+
+        print(f"Uma venda por transação: {uma_a_uma:>12,.0f} vendas/s")
+        print(f"executemany em lote:     {em_lote:>12,.0f} vendas/s")
+        print(f"Vendas no banco:         {banco.contar_vendas():>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+BENCHMARK DO SISTEMA DE ABASTECIMENTO
+=====================================
+Mede o desempenho das operações principais do sistema:
+
+- processar_abastecimento       (venda completa)
+- validar_dados_abastecimento   (validação)
+- calcular_desconto             (regra de desconto)
+- obter_preco_combustivel       (consulta de preço)
+- atualizar_preco_disputa       (alterações de preço com vendas em paralelo)
+- renderizar_recibo             (montagem do comprovante)
+- processar_lote                (processamento em lote, por venda)
+
+Para cada caso são medidos: operações por segundo, latência p50 e p99
+(em microssegundos). A carga é sintética, com tamanho e mistura
+configuráveis e semente fixa para ser repetível.
+
+Os resultados podem ser gravados em JSON e comparados com uma execução
+anterior: se algum caso ficar mais lento que o limite, o programa
+termina com código de saída 1 (útil em integração contínua).
+
+Execução:
+    python benchmark.py --tamanho 20000 --saida atual.json
+    python benchmark.py --tamanho 20000 --comparar base.json --limite 0.10
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+import abastecimento
+import combustivel
+import pagamento
+import recibo
+
+
+def gerar_carga(tamanho, fracao_invalidos=0.0, fracao_desconto=None, semente=42):
+    """
+    Gera uma carga sintética de abastecimentos
+
+    Args:
+        tamanho (int): Quantidade de abastecimentos
+        fracao_invalidos (float): Fração de linhas com dados inválidos
+        fracao_desconto (float): Fração de pagamentos com desconto
+                                 (None = formas de pagamento sorteadas igualmente)
+        semente (int): Semente do gerador aleatório
+
+    Returns:
+        list: Tuplas (tipo_combustivel, quantidade_litros, forma_pagamento)
+    """
+    aleatorio = random.Random(semente)
+    tipos = list(combustivel.listar_combustiveis())
+    formas = list(pagamento.listar_formas_pagamento().values())
+    com_desconto = [f for f in formas if pagamento.tem_desconto(f)]
+    sem_desconto = [f for f in formas if not pagamento.tem_desconto(f)] or formas
+
+    carga = []
+    for _ in range(tamanho):
+        tipo = aleatorio.choice(tipos)
+        litros = round(aleatorio.uniform(5, 80), 2)
+        if fracao_desconto is None:
+            forma = aleatorio.choice(formas)
+        elif aleatorio.random() < fracao_desconto:
+            forma = aleatorio.choice(com_desconto)
+        else:
+            forma = aleatorio.choice(sem_desconto)
+        if aleatorio.random() < fracao_invalidos:
+            # Um dos três campos fica inválido
+            campo = aleatorio.randrange(3)
+            if campo == 0:
+                tipo = "Querosene"
+            elif campo == 1:
+                litros = -litros
+            else:
+                forma = "Cheque"
+        carga.append((tipo, litros, forma))
+    return carga
+
+
+def _percentil(ordenadas, fracao):
+    """Percentil de uma lista já ordenada"""
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(fracao * len(ordenadas)))]
+
+def medir(funcao, argumentos):
+    """
+    Executa a função uma vez para cada tupla de argumentos, cronometrando cada chamada
+
+    Exceções de validação (ValueError) contam como operação concluída.
+
+    Returns:
+        dict: operacoes, ops_por_segundo, p50_us, p99_us
+    """
+    cronometro = time.perf_counter_ns
+    latencias = []
+    anotar = latencias.append
+    inicio = cronometro()
+    for args in argumentos:
+        antes = cronometro()
+        try:
+            funcao(*args)
+        except ValueError:
+            pass
+        anotar(cronometro() - antes)
+    total_ns = cronometro() - inicio
+    return _resumo(latencias, total_ns)
+
+def _resumo(latencias_ns, total_ns):
+    """Monta o resultado de um caso a partir das latências em nanossegundos"""
+    latencias_ns.sort()
+    return {
+        "operacoes": len(latencias_ns),
+        "ops_por_segundo": round(len(latencias_ns) / (total_ns / 1e9), 1) if total_ns else 0.0,
+        "p50_us": round(_percentil(latencias_ns, 0.50) / 1000, 3),
+        "p99_us": round(_percentil(latencias_ns, 0.99) / 1000, 3),
+    }
+
+def medir_atualizacao_em_disputa(carga, threads_venda=4):
+    """
+    Mede atualizações de preço enquanto outras threads processam vendas
+
+    No final, preços e históricos voltam à cópia feita antes da medição,
+    sem avisar os ouvintes (nada das atualizações medidas fica no catálogo
+    nem chega ao banco ou ao registro de recuperação).
+
+    Returns:
+        dict: Resultado das atualizações de preço (mais vendas_em_paralelo)
+    """
+    precos_originais, historico_original = combustivel.exportar_catalogo()
+    tipos = list(precos_originais)
+    parar = threading.Event()
+    vendas = [0] * threads_venda
+
+    def _vender(indice):
+        posicao = indice
+        while not parar.is_set():
+            tipo, litros, forma = carga[posicao % len(carga)]
+            try:
+                abastecimento.processar_abastecimento(tipo, litros, forma)
+            except ValueError:
+                pass
+            vendas[indice] += 1
+            posicao += threads_venda
+
+    vendedores = [threading.Thread(target=_vender, args=(i,)) for i in range(threads_venda)]
+    for thread in vendedores:
+        thread.start()
+    try:
+        atualizacoes = [(tipos[i % len(tipos)], precos_originais[tipos[i % len(tipos)]] + (i % 7) / 100)
+                        for i in range(max(1, len(carga) // 10))]
+        resultado = medir(combustivel.atualizar_preco_combustivel, atualizacoes)
+    finally:
+        parar.set()
+        for thread in vendedores:
+            thread.join()
+        combustivel.carregar_precos(precos_originais, historico_original, avisar_ouvintes=False)
+    resultado["vendas_em_paralelo"] = sum(vendas)
+    return resultado
+
+def medir_lote(carga, tamanho_lote=1000):
+    """
+    Mede processar_abastecimentos_em_lote (latências e vazão por venda)
+
+    Returns:
+        dict: Resultado por venda processada
+    """
+    latencias = []
+    inicio = time.perf_counter_ns()
+    for posicao in range(0, len(carga), tamanho_lote):
+        fatia = carga[posicao:posicao + tamanho_lote]
+        tipos, litros, formas = zip(*fatia)
+        antes = time.perf_counter_ns()
+        abastecimento.processar_abastecimentos_em_lote(tipos, litros, formas)
+        custo = (time.perf_counter_ns() - antes) / len(fatia)
+        latencias.extend([custo] * len(fatia))
+    return _resumo(latencias, time.perf_counter_ns() - inicio)
+
+def executar(tamanho=20000, fracao_invalidos=0.0, fracao_desconto=None, semente=42):
+    """
+    FUNÇÃO PRINCIPAL: Executa todos os casos do benchmark
+    =====================================================
+    Returns:
+        dict: {"metadados": {...}, "casos": {nome: resultado}}
+    """
+    carga = gerar_carga(tamanho, fracao_invalidos, fracao_desconto, semente)
+    valores = [(round(litros * 5.0, 2), forma) for _, litros, forma in carga]
+    registros = [abastecimento.processar_abastecimento(t, abs(l) or 1, "PIX")
+                 for t, l, _ in carga if combustivel.validar_combustivel(t)][:tamanho]
+
+    casos = {
+        "processar_abastecimento": medir(abastecimento.processar_abastecimento, carga),
+        "validar_dados_abastecimento": medir(abastecimento.validar_dados_abastecimento, carga),
+        "calcular_desconto": medir(pagamento.calcular_desconto, valores),
+        "obter_preco_combustivel": medir(combustivel.obter_preco_combustivel,
+                                         [(tipo,) for tipo, _, _ in carga]),
+        "atualizar_preco_disputa": medir_atualizacao_em_disputa(carga),
+        "renderizar_recibo": medir(recibo.renderizar_recibo, [(r,) for r in registros]),
+        "processar_lote": medir_lote(carga),
+    }
+    return {
+        "metadados": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "tamanho": tamanho,
+            "fracao_invalidos": fracao_invalidos,
+            "fracao_desconto": fracao_desconto,
+            "semente": semente,
+        },
+        "casos": casos,
+    }
+
+def comparar(base, atual, limite=0.10):
+    """
+    Compara duas execuções pela vazão (ops/s) de cada caso
+
+    Args:
+        base (dict): Resultado de referência
+        atual (dict): Resultado novo
+        limite (float): Queda máxima aceita (0.10 = 10% mais lento)
+
+    Returns:
+        list: Linhas (caso, ops_base, ops_atual, variacao, regrediu)
+    """
+    linhas = []
+    for nome, resultado in atual["casos"].items():
+        referencia = base.get("casos", {}).get(nome)
+        if not referencia or not referencia["ops_por_segundo"]:
+            continue
+        variacao = resultado["ops_por_segundo"] / referencia["ops_por_segundo"] - 1
+        linhas.append((nome, referencia["ops_por_segundo"], resultado["ops_por_segundo"],
+                       variacao, variacao < -limite))
+    return linhas
+
+def exibir(resultado):
+    """Exibe a tabela de resultados no terminal"""
+    print(f"\n{'CASO':<30} {'OPS/S':>14} {'P50 (us)':>10} {'P99 (us)':>10}")
+    print("-" * 67)
+    for nome, caso in resultado["casos"].items():
+        print(f"{nome:<30} {caso['ops_por_segundo']:>14,.1f} {caso['p50_us']:>10.2f} {caso['p99_us']:>10.2f}")
+
+def main():
+    """Ponto de entrada em linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmark do sistema de abastecimento")
+    parser.add_argument("--tamanho", type=int, default=20000, help="vendas na carga sintética")
+    parser.add_argument("--invalidos", type=float, default=0.0, help="fração de vendas inválidas")
+    parser.add_argument("--desconto", type=float, default=None, help="fração de pagamentos com desconto")
+    parser.add_argument("--semente", type=int, default=42, help="semente aleatória")
+    parser.add_argument("--saida", help="grava o resultado em JSON neste arquivo")
+    parser.add_argument("--comparar", help="JSON de referência para detectar regressões")
+    parser.add_argument("--limite", type=float, default=0.10, help="queda de vazão tolerada (0.10 = 10%%)")
+    argumentos = parser.parse_args()
+
+    resultado = executar(argumentos.tamanho, argumentos.invalidos, argumentos.desconto,
+                         argumentos.semente)
+    exibir(resultado)
+
+    if argumentos.saida:
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultado gravado em {argumentos.saida}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, "r", encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        linhas = comparar(base, resultado, argumentos.limite)
+        print(f"\n{'CASO':<30} {'BASE':>12} {'ATUAL':>12} {'VARIAÇÃO':>10}")
+        print("-" * 67)
+        for nome, ops_base, ops_atual, variacao, regrediu in linhas:
+            marca = "  REGRESSÃO" if regrediu else ""
+            print(f"{nome:<30} {ops_base:>12,.0f} {ops_atual:>12,.0f} {variacao:>+10.1%}{marca}")
+        if any(linha[4] for linha in linhas):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
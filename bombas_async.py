@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO BOMBAS ASSÍNCRONAS
+=========================
+Camada de entrada assíncrona (asyncio) para eventos das bombas.
+
+Os eventos podem chegar de duas fontes:
+- Conexões locais (TCP ou socket Unix), uma linha JSON por evento:
+  {"bomba": 3, "combustivel": "Gasolina", "litros": 30, "pagamento": "PIX"}
+  A resposta também é uma linha JSON com o resultado da venda.
+- Simulador embutido: N bombas gerando eventos em uma taxa configurável.
+
+Fluxo de cada evento:
+1. Validação com abastecimento.validar_dados_abastecimento()
+2. Processamento com abastecimento.processar_abastecimento()
+3. Gravação opcional no diário, em lote, fora do laço de eventos
+   (run_in_executor), para não travar o asyncio com escrita em disco
+
+O simulador mede a latência de cada evento (da criação até a venda
+confirmada) e informa os percentis p50, p99 e p99.9 dos últimos
+AMOSTRAS_LATENCIA eventos (memória fixa num servidor que roda por dias).
+
+Execução do simulador:
+    python bombas_async.py --bombas 16 --taxa 50 --duracao 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+import abastecimento
+import combustivel
+import pagamento
+
+# LATÊNCIAS GUARDADAS - só as mais recentes entram nos percentis
+AMOSTRAS_LATENCIA = 100_000
+
+
+class ServidorBombasAsync:
+    """
+    CLASSE: Servidor assíncrono de eventos das bombas
+    =================================================
+    Recebe eventos em uma fila asyncio e os processa em lotes.
+    """
+    def __init__(self, diario=None, tamanho_fila=10_000, lote_maximo=256):
+        """
+        Args:
+            diario (DiarioAbastecimentos): Diário para gravar as vendas (opcional)
+            tamanho_fila (int): Eventos em espera antes de segurar os produtores
+            lote_maximo (int): Eventos processados/gravados por lote
+        """
+        self.diario = diario
+        self.lote_maximo = lote_maximo
+        self.fila = asyncio.Queue(maxsize=tamanho_fila)
+        self.latencias = deque(maxlen=AMOSTRAS_LATENCIA)   # segundos, eventos concluídos mais recentes
+        self.processados = 0
+        self.rejeitados = 0
+
+    async def enviar(self, bomba, tipo_combustivel, quantidade_litros, forma_pagamento):
+        """
+        Envia um evento de bomba e aguarda o resultado
+
+        Args:
+            bomba: Identificador da bomba
+            tipo_combustivel (str): Tipo do combustível
+            quantidade_litros (float): Quantidade de litros
+            forma_pagamento (str): Forma de pagamento
+
+        Returns:
+            tuple: (RegistroAbastecimento ou None, mensagem)
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        evento = (time.perf_counter(), bomba, tipo_combustivel,
+                  quantidade_litros, forma_pagamento, futuro)
+        await self.fila.put(evento)   # espera se a fila estiver cheia
+        return await futuro
+
+    async def consumir(self):
+        """
+        Laço consumidor: processa os eventos da fila em lotes
+
+        Um evento com erro não encerra o laço: dados inválidos (ValueError,
+        TypeError) viram uma resposta de rejeição e qualquer outra falha,
+        inclusive na gravação do diário, é entregue ao futuro de quem enviou.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            # AGUARDAR O PRIMEIRO EVENTO E JUNTAR O QUE MAIS ESTIVER NA FILA
+            lote = [await self.fila.get()]
+            while len(lote) < self.lote_maximo and not self.fila.empty():
+                lote.append(self.fila.get_nowait())
+
+            resultados = []
+            vendas = []
+            for criado_em, bomba, tipo, litros, forma, futuro in lote:
+                try:
+                    valido, mensagem = abastecimento.validar_dados_abastecimento(tipo, litros, forma)
+                    if not valido:
+                        raise ValueError(mensagem)
+                    registro = abastecimento.processar_abastecimento(tipo, litros, forma)
+                except (ValueError, TypeError) as erro:
+                    self.rejeitados += 1
+                    resultados.append((criado_em, futuro, None, str(erro) or "Evento inválido!"))
+                    continue
+                except Exception as erro:
+                    self.rejeitados += 1
+                    resultados.append((criado_em, futuro, None, erro))
+                    continue
+                vendas.append(registro)
+                resultados.append((criado_em, futuro, registro, "Abastecimento realizado"))
+
+            # GRAVAÇÃO EM DISCO FORA DO LAÇO DE EVENTOS
+            falha_diario = None
+            if self.diario is not None and vendas:
+                try:
+                    await loop.run_in_executor(None, _gravar_no_diario, self.diario, vendas)
+                except Exception as erro:
+                    falha_diario = erro
+
+            agora = time.perf_counter()
+            for criado_em, futuro, registro, mensagem in resultados:
+                if registro is not None and falha_diario is not None:
+                    # venda calculada mas não gravada: não confirmar à bomba
+                    registro, mensagem = None, falha_diario
+                if registro is not None:
+                    self.processados += 1
+                    self.latencias.append(agora - criado_em)
+                if not futuro.done():
+                    if isinstance(mensagem, BaseException):
+                        futuro.set_exception(mensagem)
+                    else:
+                        futuro.set_result((registro, mensagem))
+                self.fila.task_done()
+
+    async def atender_conexao(self, leitor, escritor):
+        """
+        Atende uma conexão local: uma linha JSON por evento, uma linha JSON por resposta
+        """
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    dados = json.loads(linha)
+                    registro, mensagem = await self.enviar(
+                        dados.get("bomba"), dados.get("combustivel"),
+                        dados.get("litros"), dados.get("pagamento"),
+                    )
+                except (ValueError, AttributeError):
+                    registro, mensagem = None, "Evento inválido!"
+                except Exception as erro:
+                    registro, mensagem = None, f"Falha ao processar o evento: {erro}"
+                escritor.write(json.dumps(_resposta(registro, mensagem), ensure_ascii=False)
+                               .encode("utf-8") + b"\n")
+                await escritor.drain()
+        finally:
+            escritor.close()
+
+    async def iniciar_tcp(self, host="127.0.0.1", porta=8765):
+        """Abre o servidor TCP local"""
+        return await asyncio.start_server(self.atender_conexao, host, porta)
+
+    async def iniciar_unix(self, caminho):
+        """Abre o servidor em um socket Unix (Linux/macOS)"""
+        return await asyncio.start_unix_server(self.atender_conexao, caminho)
+
+    def percentis(self):
+        """
+        Calcula os percentis de latência dos eventos concluídos mais recentes
+        (até AMOSTRAS_LATENCIA)
+
+        Returns:
+            dict: p50, p99, p999 e maximo em milissegundos
+        """
+        if not self.latencias:
+            return {"p50": 0.0, "p99": 0.0, "p999": 0.0, "maximo": 0.0}
+        ordenadas = sorted(self.latencias)
+        ultimo = len(ordenadas) - 1
+
+        def _p(fracao):
+            return ordenadas[min(ultimo, int(fracao * len(ordenadas)))] * 1000
+
+        return {"p50": _p(0.50), "p99": _p(0.99), "p999": _p(0.999),
+                "maximo": ordenadas[-1] * 1000}
+
+
+def _gravar_no_diario(diario, vendas):
+    """
+    Grava um lote de vendas no diário (executado em thread separada)
+
+    Termina com um único fsync para o lote inteiro, assim as vendas só
+    são confirmadas às bombas depois de estarem em disco.
+    """
+    for registro in vendas:
+        diario.registrar(registro)
+    diario.sincronizar()
+
+def _resposta(registro, mensagem):
+    """Monta a resposta JSON de um evento"""
+    if registro is None:
+        return {"ok": False, "mensagem": mensagem}
+    return {
+        "ok": True,
+        "mensagem": mensagem,
+        "combustivel": registro.tipo_combustivel,
+        "litros": registro.quantidade_litros,
+        "pagamento": registro.forma_pagamento,
+        "valor_bruto": round(registro.valor_bruto, 2),
+        "valor_desconto": round(registro.valor_desconto, 2),
+        "valor_final": round(registro.valor_final, 2),
+    }
+
+
+async def simular_bombas(servidor, bombas=16, taxa=50.0, duracao=5.0, semente=None):
+    """
+    FUNÇÃO: Simulador de bombas
+    ===========================
+    Cada bomba envia eventos aleatórios em intervalos médios de 1/taxa
+    segundos (chegadas de Poisson) durante `duracao` segundos.
+
+    Args:
+        servidor (ServidorBombasAsync): Servidor que recebe os eventos
+        bombas (int): Quantidade de bombas simuladas
+        taxa (float): Eventos por segundo de cada bomba
+        duracao (float): Tempo de simulação em segundos
+        semente (int): Semente do gerador aleatório (para repetir a simulação)
+
+    Returns:
+        int: Total de eventos enviados
+    """
+    aleatorio = random.Random(semente)
+    tipos = list(combustivel.listar_combustiveis())
+    formas = list(pagamento.listar_formas_pagamento().values())
+    fim = time.perf_counter() + duracao
+    enviados = 0
+
+    async def _bomba(numero):
+        nonlocal enviados
+        pendentes = []
+        while time.perf_counter() < fim:
+            await asyncio.sleep(aleatorio.expovariate(taxa))
+            pendentes.append(asyncio.create_task(servidor.enviar(
+                numero,
+                aleatorio.choice(tipos),
+                round(aleatorio.uniform(5, 60), 2),
+                aleatorio.choice(formas),
+            )))
+            enviados += 1
+        if pendentes:
+            await asyncio.gather(*pendentes)
+
+    await asyncio.gather(*(_bomba(numero) for numero in range(1, bombas + 1)))
+    return enviados
+
+
+async def _executar_simulacao(argumentos):
+    """Executa o simulador e imprime o resumo ao final"""
+    diario_aberto = None
+    if argumentos.diario:
+        import diario
+        diario_aberto = diario.DiarioAbastecimentos(argumentos.diario)
+
+    servidor = ServidorBombasAsync(diario=diario_aberto)
+    consumidor = asyncio.create_task(servidor.consumir())
+
+    inicio = time.perf_counter()
+    enviados = await simular_bombas(servidor, argumentos.bombas, argumentos.taxa,
+                                    argumentos.duracao, argumentos.semente)
+    decorrido = time.perf_counter() - inicio
+    consumidor.cancel()
+
+    if diario_aberto is not None:
+        diario_aberto.fechar()
+
+    latencia = servidor.percentis()
+    print(json.dumps({
+        "bombas": argumentos.bombas,
+        "eventos": enviados,
+        "processados": servidor.processados,
+        "rejeitados": servidor.rejeitados,
+        "vazao": round(servidor.processados / decorrido, 1),
+        "latencia_ms": {chave: round(valor, 3) for chave, valor in latencia.items()},
+    }, ensure_ascii=False, indent=2))
+
+def main():
+    """Ponto de entrada do simulador em linha de comando"""
+    parser = argparse.ArgumentParser(description="Simulador assíncrono de bombas")
+    parser.add_argument("--bombas", type=int, default=16, help="quantidade de bombas")
+    parser.add_argument("--taxa", type=float, default=50.0, help="eventos/s por bomba")
+    parser.add_argument("--duracao", type=float, default=5.0, help="duração em segundos")
+    parser.add_argument("--semente", type=int, default=None, help="semente aleatória")
+    parser.add_argument("--diario", default=None, help="pasta do diário (opcional)")
+    asyncio.run(_executar_simulacao(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO BUSCA
+============
+Busca de combustíveis pelo nome para catálogos grandes (milhares de
+produtos de várias marcas, aditivos e misturas).
+
+Regras da busca:
+- Sem diferença de acentos e maiúsculas: "Etanol", "etanol", "ETANOL"
+  e "étanol" são iguais
+- Por prefixo de palavra: "gas adit" encontra "Gasolina Aditivada"
+  (cada palavra digitada deve ser o início de uma palavra do nome,
+  em qualquer ordem)
+- Tolerante a erros de digitação: se uma palavra não é prefixo de
+  nenhuma palavra do catálogo, ela é trocada pelas palavras mais
+  parecidas ("etanl" -> "etanol")
+- Resultados em páginas, na ordem de cadastro
+
+Estruturas do índice:
+- Vocabulário: lista ORDENADA das palavras distintas do catálogo; os
+  prefixos são encontrados por busca binária (bisect), como em uma trie
+- Listas de ocorrência: palavra -> ids dos nomes que a contêm (em ordem)
+- Trigramas: pedaços de 3 letras -> palavras do vocabulário, usados
+  para achar as palavras parecidas com um termo digitado errado
+- Mapas de bits (para termos muito frequentes, como "gasolina" ou "1"):
+  um inteiro com o bit i ligado se o nome i contém o termo; a interseção
+  de termos é um E binário. Ficam em cache e servem às próximas páginas
+O vocabulário é muito menor que o catálogo (muitos produtos repetem
+as mesmas palavras), então a correção de erros trabalha sobre poucas
+palavras e a página de resultados é montada sem percorrer o catálogo.
+
+Execução:
+    python busca.py   # mede as consultas em um catálogo de 100.000 nomes
+"""
+
+import re
+import sys
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from collections import OrderedDict, namedtuple
+from heapq import merge
+from itertools import islice
+
+# TAMANHO PADRÃO DA PÁGINA NOS MENUS
+TAMANHO_PAGINA = 20
+
+# SEMELHANÇA MÍNIMA (coeficiente de Dice dos trigramas) para corrigir um termo
+SEMELHANCA_MINIMA = 0.45
+CORRECOES_POR_TERMO = 3
+
+# ACIMA DESTES LIMITES a busca usa mapas de bits em vez de percorrer ids:
+# - ocorrências do termo mais raro (ex: "gasolina querosene" - dois termos
+#   frequentes cuja interseção pode ser vazia)
+# - palavras de um mesmo termo (ex: "1" é prefixo de milhares de números)
+LIMITE_PERCORRER = 1024
+LIMITE_PALAVRAS_TERMO = 32
+MAPAS_EM_CACHE = 256
+
+_PALAVRA = re.compile(r"\w+")
+
+# RESULTADO DE UMA BUSCA
+# nomes: nomes da página | pagina: número da página (0 = primeira)
+# tem_mais: existe página seguinte | aproximada: houve correção de digitação
+ResultadoBusca = namedtuple("ResultadoBusca", ["nomes", "pagina", "tem_mais", "aproximada"])
+
+
+def normalizar(texto):
+    """
+    Remove acentos, ignora maiúsculas e espaços repetidos
+
+    Args:
+        texto (str): Texto digitado ou nome do catálogo
+
+    Returns:
+        str: Texto normalizado (ex: "Étanol  Aditivado" -> "etanol aditivado")
+    """
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+def _palavras(texto_normalizado):
+    """Divide um texto normalizado em palavras (letras e dígitos)"""
+    return _PALAVRA.findall(texto_normalizado)
+
+def _bits(mapa):
+    """Posições dos bits ligados de um mapa de bits (inteiro), em ordem crescente"""
+    while mapa:
+        menor = mapa & -mapa
+        yield menor.bit_length() - 1
+        mapa ^= menor
+
+def _trigramas(palavra):
+    """Trigramas de uma palavra com marcadores de início e fim ("  et", " eta", ...)"""
+    marcada = f"  {palavra} "
+    return {marcada[i:i + 3] for i in range(len(marcada) - 2)}
+
+
+class IndiceBusca:
+    """
+    CLASSE: Índice de busca de nomes
+    ================================
+    Cada nome recebe um id (posição de cadastro). Nomes só são
+    acrescentados, nunca removidos - como os ids do módulo combustivel.
+    """
+    def __init__(self, nomes=()):
+        """
+        Args:
+            nomes (iterable): Nomes iniciais do índice
+        """
+        self._trava = threading.Lock()
+        self._nomes = []                 # id -> nome original
+        self._palavras_por_id = []       # id -> tupla de palavras normalizadas
+        self._exatos = {}                # nome normalizado -> lista de ids
+        self._ocorrencias = {}           # palavra -> array de ids (crescente)
+        self._vocabulario = []           # palavras distintas, ordenadas
+        self._trigramas = {}             # trigrama -> conjunto de palavras
+        self._mapas = OrderedDict()      # termo -> (nomes no índice, mapa de bits); LRU
+        for nome in nomes:
+            self.adicionar(nome)
+
+    def __len__(self):
+        return len(self._nomes)
+
+    def adicionar(self, nome):
+        """
+        Acrescenta um nome ao índice
+
+        Returns:
+            int: Id do nome
+        """
+        normalizado = normalizar(nome)
+        palavras = tuple(dict.fromkeys(map(sys.intern, _palavras(normalizado))))   # sem repetições
+        with self._trava:
+            identificador = len(self._nomes)
+            self._nomes.append(nome)
+            self._palavras_por_id.append(palavras)
+            self._exatos.setdefault(normalizado, []).append(identificador)
+            for palavra in palavras:
+                ocorrencias = self._ocorrencias.get(palavra)
+                if ocorrencias is None:
+                    ocorrencias = self._ocorrencias[palavra] = array("I")
+                    insort(self._vocabulario, palavra)
+                    for trigrama in _trigramas(palavra):
+                        self._trigramas.setdefault(trigrama, set()).add(palavra)
+                ocorrencias.append(identificador)
+        return identificador
+
+    def nome(self, identificador):
+        """Nome original de um id"""
+        return self._nomes[identificador]
+
+    def resolver(self, texto):
+        """
+        Nomes iguais ao texto, ignorando acentos e maiúsculas
+
+        Returns:
+            list: Nomes encontrados (normalmente zero ou um)
+        """
+        return [self._nomes[i] for i in self._exatos.get(normalizar(texto), ())]
+
+    # ------------------------------------------------------------------
+    # TERMOS DA CONSULTA
+    # ------------------------------------------------------------------
+    def _palavras_com_prefixo(self, termo):
+        """Palavras do vocabulário que começam com o termo (busca binária)"""
+        vocabulario = self._vocabulario
+        inicio = bisect_left(vocabulario, termo)
+        fim = bisect_left(vocabulario, termo + "\U0010ffff", inicio)
+        return vocabulario[inicio:fim]
+
+    def corrigir(self, termo, maximo=CORRECOES_POR_TERMO):
+        """
+        Palavras do vocabulário mais parecidas com um termo digitado errado
+
+        A semelhança é o coeficiente de Dice dos trigramas:
+            2 x trigramas em comum / (trigramas do termo + trigramas da palavra)
+
+        Args:
+            termo (str): Termo normalizado
+            maximo (int): Quantidade máxima de sugestões
+
+        Returns:
+            list: Palavras, da mais parecida para a menos parecida
+        """
+        trigramas = _trigramas(termo)
+        comuns = {}
+        for trigrama in trigramas:
+            for palavra in self._trigramas.get(trigrama, ()):
+                comuns[palavra] = comuns.get(palavra, 0) + 1
+        candidatas = []
+        for palavra, quantidade in comuns.items():
+            semelhanca = 2 * quantidade / (len(trigramas) + len(palavra) + 1)
+            if semelhanca >= SEMELHANCA_MINIMA:
+                candidatas.append((-semelhanca, palavra))
+        candidatas.sort()
+        return [palavra for _, palavra in candidatas[:maximo]]
+
+    def _palavras_do_termo(self, termo):
+        """
+        Palavras aceitas para um termo: por prefixo ou, sem nenhuma, por semelhança
+
+        Returns:
+            tuple: (lista de palavras, True se veio da correção de digitação)
+        """
+        palavras = self._palavras_com_prefixo(termo)
+        if palavras:
+            return palavras, False
+        return self.corrigir(termo), True
+
+    # ------------------------------------------------------------------
+    # CONSULTA
+    # ------------------------------------------------------------------
+    def _ids_encontrados(self, consulta):
+        """
+        Gera os ids que atendem todos os termos, em ordem crescente
+
+        Returns:
+            tuple: (gerador de ids, houve correção de digitação)
+        """
+        termos = list(dict.fromkeys(map(sys.intern, _palavras(normalizar(consulta)))))
+        if not termos:
+            return iter(range(len(self._nomes))), False
+
+        aproximada = False
+        grupos = []
+        for termo in termos:
+            palavras, corrigido = self._palavras_do_termo(termo)
+            if not palavras:
+                return iter(()), corrigido
+            aproximada = aproximada or corrigido
+            tamanho = sum(len(self._ocorrencias[p]) for p in palavras)
+            grupos.append((tamanho, palavras))
+
+        # O termo mais raro conduz a busca; os demais apenas filtram
+        grupos.sort(key=lambda grupo: grupo[0])
+        if grupos[0][0] > LIMITE_PERCORRER and len(grupos) > 1 or \
+                len(grupos[0][1]) > LIMITE_PALAVRAS_TERMO:
+            # termos frequentes: interseção de mapas de bits (um E binário por termo)
+            mapa = -1
+            for _, palavras in grupos:
+                mapa &= self._mapa_do_termo(palavras)
+            return _bits(mapa), aproximada
+
+        condutor = grupos[0][1]
+        # filtros de uma palavra só (o caso comum) são testados direto na tupla
+        simples = [palavras[0] for _, palavras in grupos[1:] if len(palavras) == 1]
+        compostos = [frozenset(palavras) for _, palavras in grupos[1:] if len(palavras) > 1]
+        palavras_por_id = self._palavras_por_id
+
+        if len(condutor) == 1:
+            candidatos = iter(self._ocorrencias[condutor[0]])
+        else:
+            candidatos = merge(*(self._ocorrencias[p] for p in condutor))
+
+        def _gerar():
+            anterior = -1
+            for identificador in candidatos:
+                if identificador == anterior:
+                    continue   # mesmo nome com duas palavras do termo condutor
+                anterior = identificador
+                palavras = palavras_por_id[identificador]
+                for palavra in simples:
+                    if palavra not in palavras:
+                        break
+                else:
+                    for filtro in compostos:
+                        if filtro.isdisjoint(palavras):
+                            break
+                    else:
+                        yield identificador
+
+        return _gerar(), aproximada
+
+    def _mapa_do_termo(self, palavras):
+        """
+        Mapa de bits dos nomes que contêm alguma das palavras (bit i = id i)
+
+        Os mapas ficam em um cache LRU e são refeitos quando o índice cresce.
+        """
+        chave = tuple(palavras)
+        guardado = self._mapas.get(chave)
+        if guardado is not None and guardado[0] == len(self._nomes):
+            self._mapas.move_to_end(chave)
+            return guardado[1]
+        bytes_mapa = bytearray(len(self._nomes) // 8 + 1)
+        for palavra in palavras:
+            for identificador in self._ocorrencias[palavra]:
+                bytes_mapa[identificador >> 3] |= 1 << (identificador & 7)
+        mapa = int.from_bytes(bytes_mapa, "little")
+        self._mapas[chave] = (len(self._nomes), mapa)
+        if len(self._mapas) > MAPAS_EM_CACHE:
+            self._mapas.popitem(last=False)
+        return mapa
+
+    def buscar(self, consulta, pagina=0, tamanho_pagina=TAMANHO_PAGINA):
+        """
+        FUNÇÃO PRINCIPAL: Busca paginada
+        ================================
+        Args:
+            consulta (str): Texto digitado (vazio = todos os nomes)
+            pagina (int): Página desejada (0 = primeira)
+            tamanho_pagina (int): Nomes por página
+
+        Returns:
+            ResultadoBusca: Nomes da página, se há próxima página e se a
+                            busca usou correção de digitação
+        """
+        if pagina < 0 or tamanho_pagina < 1:
+            raise ValueError("Página ou tamanho de página inválido!")
+        with self._trava:
+            ids, aproximada = self._ids_encontrados(consulta)
+            inicio = pagina * tamanho_pagina
+            # um id além da página indica se existe a próxima
+            selecionados = list(islice(ids, inicio, inicio + tamanho_pagina + 1))
+            tem_mais = len(selecionados) > tamanho_pagina
+            nomes = [self._nomes[i] for i in selecionados[:tamanho_pagina]]
+            return ResultadoBusca(nomes, pagina, tem_mais, aproximada)
+
+
+# ÍNDICE DOS COMBUSTÍVEIS CADASTRADOS
+# Os ids do índice são os mesmos do módulo combustivel; a cada consulta
+# só os combustíveis cadastrados depois da última são acrescentados.
+_indice_combustiveis = IndiceBusca()
+_trava_sincronia = threading.Lock()
+
+def obter_indice_combustiveis():
+    """
+    Índice de busca sobre os combustíveis cadastrados (sempre atualizado)
+
+    Returns:
+        IndiceBusca: Índice compartilhado
+    """
+    import combustivel   # importado aqui: combustivel usa este módulo nos menus
+
+    quantidade = len(combustivel.obter_tabela_precos().precos_por_id)
+    if len(_indice_combustiveis) < quantidade:
+        with _trava_sincronia:
+            for identificador in range(len(_indice_combustiveis), quantidade):
+                _indice_combustiveis.adicionar(combustivel.obter_nome_combustivel(identificador))
+    return _indice_combustiveis
+
+def buscar_combustiveis(consulta, pagina=0, tamanho_pagina=TAMANHO_PAGINA):
+    """Busca paginada nos combustíveis cadastrados (ver IndiceBusca.buscar)"""
+    return obter_indice_combustiveis().buscar(consulta, pagina, tamanho_pagina)
+
+def resolver_combustivel(texto):
+    """
+    Encontra o combustível digitado sem exigir o nome exato
+
+    Returns:
+        str: Nome cadastrado, se o texto indica um único combustível
+             (nome igual sem acentos/maiúsculas, ou única sugestão da busca);
+             None caso contrário
+    """
+    indice = obter_indice_combustiveis()
+    exatos = indice.resolver(texto)
+    if len(exatos) == 1:
+        return exatos[0]
+    resultado = indice.buscar(texto, tamanho_pagina=2)
+    if len(resultado.nomes) == 1 and not exatos:
+        return resultado.nomes[0]
+    return None
+
+
+def main():
+    """Mede o índice com um catálogo sintético de 100.000 nomes"""
+    import random
+    import time
+
+    random.seed(11)
+    marcas = ["Shell", "Ipiranga", "Petrobras", "Raízen", "Ale", "Texaco", "Total", "Esso",
+              "Repsol", "BR Mania", "Sabbá", "Rodoil", "Charrua", "Megapetro", "Atem"]
+    produtos = ["Gasolina Comum", "Gasolina Aditivada", "Gasolina Premium", "Etanol Hidratado",
+                "Etanol Aditivado", "Diesel S10", "Diesel S500", "Diesel Aditivado", "GNV",
+                "Biodiesel B15", "Querosene", "Arla 32"]
+    extras = ["V-Power", "Grid", "Podium", "Octapro", "Evolution", "Supra", "Max", "Plus",
+              "Turbo", "Eco", "Ultra", "Força", "Limpeza", "Alta Octanagem", "Verão", "Inverno"]
+    nomes = list(dict.fromkeys(
+        f"{random.choice(marcas)} {random.choice(produtos)} {random.choice(extras)} "
+        f"Lote {random.randint(1, 9999)}" for _ in range(120_000)))[:100_000]
+
+    inicio = time.perf_counter()
+    indice = IndiceBusca(nomes)
+    print(f"Índice com {len(indice):,} nomes montado em {time.perf_counter() - inicio:.2f} s "
+          f"({len(indice._vocabulario):,} palavras distintas)")
+
+    consultas = ["gasolina", "GAS ADIT", "etanol shell", "ETANOL", "étanol hidratado raizen",
+                 "etanl", "gasolna aditivda ipiranga", "diesel s10 lote 42", "querosene supra",
+                 "xyzw", ""]
+    print(f"\n{'consulta':<28} {'µs/consulta':>12}  primeira página")
+    for consulta in consultas:
+        repeticoes = 200
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            resultado = indice.buscar(consulta)
+        custo = (time.perf_counter() - inicio) / repeticoes * 1e6
+        exemplo = resultado.nomes[0] if resultado.nomes else "-"
+        marca = " (aproximada)" if resultado.aproximada else ""
+        print(f"{consulta!r:<28} {custo:>12.1f}  {len(resultado.nomes)} nomes, ex: {exemplo}{marca}")
+
+
+if __name__ == "__main__":
+    main()
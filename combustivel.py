@@ -9,8 +9,18 @@ Funcionalidades principais:
 - Listagem de combustíveis disponíveis 
 - Atualização de preços
 - Validação de combustíveis
+- Tabela de preços versionada (leitura consistente com várias bombas)
+- Histórico de preços com consulta do "preço vigente em uma data"
 """
 
+import math
+import threading
+import time
+from bisect import bisect_right
+from types import MappingProxyType
+
+import instrumentacao
+
 # BANCO DE DADOS SIMPLES - Dicionário que simula uma base de dados
 # Estrutura: {"nome_combustivel": preço_por_litro}
 # Em um sistema real, isso seria substituído por um banco de dados
@@ -21,6 +31,216 @@ combustiveis_cadastrados = {
     "Gasolina Aditivada": 6.15     # Gasolina premium - mais cara
 }
 
+# MENUS - acima desta quantidade, os combustíveis são mostrados em páginas
+# com busca pelo nome (catálogos com muitas marcas e produtos)
+COMBUSTIVEIS_POR_PAGINA = 20
+
+# ÍNDICE DE IDS - cada combustível recebe um número inteiro fixo (0, 1, 2...)
+# O nome é convertido em id uma única vez (na entrada dos dados); depois
+# disso, nome e preço são obtidos por posição em lista, sem comparar textos.
+# Mantido em sincronia por cadastrar_combustivel() e atualizar_preco_combustivel().
+_ids_combustivel = {}       # nome -> id
+_nomes_combustivel = []     # id -> nome
+_precos_por_id = []         # id -> preço por litro (cópia de trabalho dos escritores;
+                            # a leitura é feita pela TabelaPrecos publicada)
+
+def _preco_valido(preco):
+    """
+    Verifica se um preço por litro (já convertido) é aceitável
+
+    Returns:
+        bool: True se o preço é positivo e finito (nan também é recusado)
+    """
+    return 0 < preco < math.inf
+
+def _indexar_combustivel(nome, preco):
+    """
+    Registra (ou atualiza) um combustível no índice de ids
+
+    Returns:
+        int: Id do combustível
+    """
+    identificador = _ids_combustivel.get(nome)
+    if identificador is None:
+        identificador = len(_nomes_combustivel)
+        _ids_combustivel[nome] = identificador
+        _nomes_combustivel.append(nome)
+        _precos_por_id.append(preco)
+    else:
+        _precos_por_id[identificador] = preco
+    return identificador
+
+for _nome, _preco in combustiveis_cadastrados.items():
+    _indexar_combustivel(_nome, _preco)
+
+
+class TabelaPrecos:
+    """
+    CLASSE: Fotografia (snapshot) imutável da tabela de preços
+    ==========================================================
+    Cada alteração de preço publica uma NOVA tabela com a versão seguinte;
+    uma tabela já publicada nunca muda (cópia na escrita / copy-on-write).
+
+    Assim, quem pega a tabela atual enxerga sempre um conjunto de preços
+    completo e consistente, mesmo que outra bomba altere um preço no meio
+    do cálculo. Ler a tabela atual não precisa de trava.
+
+    Atributos:
+    - versao (int): Número da versão (começa em 1 e cresce a cada alteração)
+    - precos (mapping): Somente leitura, nome -> preço por litro
+    - precos_por_id (tuple): Preço por litro na posição de cada id
+    """
+    __slots__ = ("versao", "precos", "precos_por_id")
+
+    def __init__(self, versao, precos, precos_por_id):
+        self.versao = versao
+        self.precos = MappingProxyType(dict(precos))
+        self.precos_por_id = tuple(precos_por_id)
+
+    def __repr__(self):
+        return f"TabelaPrecos(versao={self.versao}, combustiveis={len(self.precos_por_id)})"
+
+# TABELA PUBLICADA - substituída inteira (atribuição atômica) a cada escrita
+_tabela_atual = TabelaPrecos(1, combustiveis_cadastrados, _precos_por_id)
+
+# TRAVA DE ESCRITA - apenas um escritor por vez monta a próxima versão
+_trava_escrita = threading.Lock()
+
+def _publicar_tabela():
+    """Publica uma nova versão da tabela (chamado com _trava_escrita adquirida)"""
+    global _tabela_atual
+    _tabela_atual = TabelaPrecos(_tabela_atual.versao + 1, combustiveis_cadastrados, _precos_por_id)
+
+# HISTÓRICO DE PREÇOS - por combustível, dois tuples paralelos e ordenados:
+# {"Gasolina": ((instante1, instante2, ...), (preço1, preço2, ...))}
+# Instantes em segundos desde 1970. Cada alteração substitui o par inteiro
+# (cópia na escrita), assim a leitura nunca vê as listas pela metade.
+# Os preços iniciais valem desde o instante 0.
+_historico_precos = {nome: ((0.0,), (preco,)) for nome, preco in combustiveis_cadastrados.items()}
+
+def _para_segundos(instante):
+    """Converte datetime (ou número) para segundos desde 1970"""
+    if hasattr(instante, "timestamp"):
+        return instante.timestamp()
+    return float(instante)
+
+def _registrar_no_historico(nome, preco, instante):
+    """Insere um preço no histórico na posição correta (chamado com _trava_escrita adquirida)"""
+    instantes, precos = _historico_precos.get(nome, ((), ()))
+    posicao = bisect_right(instantes, instante)
+    _historico_precos[nome] = (
+        instantes[:posicao] + (instante,) + instantes[posicao:],
+        precos[:posicao] + (preco,) + precos[posicao:],
+    )
+
+# OUVINTES DE ALTERAÇÃO - funções avisadas a cada preço gravado (ex: o módulo
+# banco grava a alteração no SQLite). São chamadas com a trava de escrita
+# adquirida e ANTES da alteração em memória: se um ouvinte falhar, a
+# alteração é cancelada e a tabela em memória continua como estava.
+_ouvintes_precos = []
+
+def _notificar_ouvintes(nome, preco, instante, vigente):
+    """Avisa os ouvintes sobre um preço gravado (chamado com _trava_escrita adquirida)"""
+    for ouvinte in _ouvintes_precos:
+        ouvinte(nome, preco, instante, vigente)
+
+def adicionar_ouvinte_precos(ouvinte):
+    """
+    Registra uma função chamada a cada preço gravado
+
+    Args:
+        ouvinte (callable): Recebe (nome, preco, instante, vigente); vigente é
+                            False para preços registrados só no histórico
+    """
+    with _trava_escrita:
+        _ouvintes_precos.append(ouvinte)
+
+def remover_ouvinte_precos(ouvinte):
+    """Remove uma função registrada com adicionar_ouvinte_precos()"""
+    with _trava_escrita:
+        if ouvinte in _ouvintes_precos:
+            _ouvintes_precos.remove(ouvinte)
+
+def carregar_precos(precos, historico=None, avisar_ouvintes=False):
+    """
+    Carrega preços (e históricos) de uma fonte externa, publicando UMA nova versão
+
+    Usada para iniciar o sistema a partir de um armazenamento (ex: banco).
+    Por padrão os ouvintes não são avisados, pois os dados vieram da
+    própria fonte.
+
+    Args:
+        precos (dict): {nome: preço por litro vigente}
+        historico (dict): {nome: [(instante, preço), ...]} substitui o
+                          histórico desses combustíveis (opcional)
+        avisar_ouvintes (bool): Se True (ex: importação de arquivo), os ouvintes
+                                recebem os preços novos antes de qualquer
+                                alteração, e os preços vigentes que mudaram
+                                entram no histórico a partir de agora
+
+    Raises:
+        ValueError: Se algum preço não for um número positivo e finito
+    """
+    precos = {nome: float(preco) for nome, preco in precos.items()}
+    historico = {nome: sorted((float(instante), float(preco)) for instante, preco in pares)
+                 for nome, pares in (historico or {}).items()}
+    invalidos = [nome for nome, preco in precos.items() if not _preco_valido(preco)]
+    invalidos += [nome for nome, pares in historico.items()
+                  if not all(_preco_valido(preco) for _, preco in pares)]
+    if invalidos:
+        raise ValueError(f"Preços inválidos para: {', '.join(map(str, invalidos))}")
+    with _trava_escrita:
+        alterados = [nome for nome, preco in precos.items()
+                     if combustiveis_cadastrados.get(nome) != preco]
+        if avisar_ouvintes:
+            instante = time.time()
+            for nome in alterados:
+                _notificar_ouvintes(nome, precos[nome], instante, True)
+            for nome, pares in historico.items():
+                anteriores = set(zip(*_historico_precos.get(nome, ((), ()))))
+                for par in pares:
+                    if par not in anteriores:
+                        _notificar_ouvintes(nome, par[1], par[0], False)
+
+        for nome, preco in precos.items():
+            combustiveis_cadastrados[nome] = preco
+            _indexar_combustivel(nome, preco)
+        for nome, pares in historico.items():
+            if pares:
+                _historico_precos[nome] = (tuple(i for i, _ in pares), tuple(p for _, p in pares))
+        if avisar_ouvintes:
+            for nome in alterados:
+                _registrar_no_historico(nome, precos[nome], instante)
+        _publicar_tabela()
+
+def exportar_catalogo():
+    """
+    Cópia consistente de preços e históricos (ex: para gravar um instantâneo)
+
+    Aguarda qualquer alteração em andamento terminar, portanto uma
+    alteração já avisada aos ouvintes sempre aparece na cópia.
+
+    Returns:
+        tuple: ({nome: preço vigente}, {nome: [(instante, preço), ...]})
+    """
+    with _trava_escrita:
+        precos = dict(combustiveis_cadastrados)
+        historico = {nome: list(zip(instantes, precos_historico))
+                     for nome, (instantes, precos_historico) in _historico_precos.items()}
+    return precos, historico
+
+def obter_tabela_precos():
+    """
+    Obtém a tabela de preços vigente (fotografia imutável com versão)
+
+    Use a mesma tabela do início ao fim de um cálculo para que todos os
+    preços venham da mesma versão.
+
+    Returns:
+        TabelaPrecos: Tabela atual
+    """
+    return _tabela_atual
+
 def listar_combustiveis():
     """
     FUNÇÃO: Listar todos os combustíveis disponíveis
@@ -49,7 +269,7 @@ def obter_preco_combustivel(nome_combustivel):
     Returns:
         float: Preço por litro ou None se não encontrado
     """
-    return combustiveis_cadastrados.get(nome_combustivel)
+    return _tabela_atual.precos.get(nome_combustivel)
 
 def cadastrar_combustivel(nome, preco_por_litro):
     """
@@ -60,13 +280,23 @@ def cadastrar_combustivel(nome, preco_por_litro):
         preco_por_litro (float): Preço por litro
     
     Returns:
-        bool: True se cadastrado com sucesso
+        bool: True se cadastrado com sucesso (False se o preço não for
+              um número positivo e finito)
     """
     try:
-        combustiveis_cadastrados[nome] = float(preco_por_litro)
-        return True
+        preco = float(preco_por_litro)
     except (ValueError, TypeError):
         return False
+    if not _preco_valido(preco):
+        return False
+    with _trava_escrita:
+        instante = time.time()
+        _notificar_ouvintes(nome, preco, instante, True)
+        combustiveis_cadastrados[nome] = preco
+        _indexar_combustivel(nome, preco)
+        _registrar_no_historico(nome, preco, instante)
+        _publicar_tabela()
+    return True
 
 def atualizar_preco_combustivel(nome, novo_preco):
     """
@@ -77,14 +307,26 @@ def atualizar_preco_combustivel(nome, novo_preco):
         novo_preco (float): Novo preço por litro
     
     Returns:
-        bool: True se atualizado com sucesso
+        bool: True se atualizado com sucesso (False se o combustível não
+              existir ou o preço não for um número positivo e finito)
     """
     if nome in combustiveis_cadastrados:
         try:
-            combustiveis_cadastrados[nome] = float(novo_preco)
-            return True
+            preco = float(novo_preco)
         except (ValueError, TypeError):
             return False
+        if not _preco_valido(preco):
+            return False
+        with _trava_escrita:
+            instante = time.time()
+            _notificar_ouvintes(nome, preco, instante, True)
+            combustiveis_cadastrados[nome] = preco
+            _indexar_combustivel(nome, preco)
+            _registrar_no_historico(nome, preco, instante)
+            _publicar_tabela()
+        if instrumentacao.ATIVO:
+            instrumentacao.contar("precos_atualizados")
+        return True
     return False
 
 def exibir_menu_combustiveis():
@@ -107,6 +349,10 @@ def exibir_menu_combustiveis():
     # PASSO 1: Buscar combustíveis cadastrados
     combustiveis = listar_combustiveis()
     
+    # Catálogo grande: menu em páginas, com busca pelo nome
+    if len(combustiveis) > COMBUSTIVEIS_POR_PAGINA:
+        return escolher_combustivel_paginado()
+    
     # PASSO 2: Exibir cabeçalho do menu
     print("\n=== TIPOS DE COMBUSTÍVEL ===")
     
@@ -134,6 +380,64 @@ def exibir_menu_combustiveis():
         print("Por favor, digite um número válido!")
         return None
 
+def escolher_combustivel_paginado(consulta=""):
+    """
+    FUNÇÃO: Escolher combustível em catálogos grandes
+    =================================================
+    Mostra os combustíveis em páginas numeradas. O usuário pode:
+    - digitar o número de um combustível da página para escolhê-lo
+    - digitar "+" ou "-" para ir à página seguinte ou anterior
+    - digitar parte do nome para buscar (sem diferença de acentos e
+      maiúsculas, tolerante a erros de digitação - ver módulo busca)
+    - deixar em branco para desistir
+    
+    Args:
+        consulta (str): Busca inicial (vazio = todos os combustíveis)
+    
+    Returns:
+        str: Nome do combustível selecionado ou None se o usuário desistir
+    """
+    import busca   # importado aqui: só os catálogos grandes precisam do índice
+    
+    pagina = 0
+    while True:
+        resultado = busca.buscar_combustiveis(consulta, pagina, COMBUSTIVEIS_POR_PAGINA)
+        precos = _tabela_atual.precos
+        
+        titulo = f"BUSCA: {consulta}" if consulta else "TIPOS DE COMBUSTÍVEL"
+        print(f"\n=== {titulo} (página {pagina + 1}) ===")
+        if resultado.aproximada:
+            print("Nenhum nome com esse texto; mostrando os mais parecidos.")
+        if not resultado.nomes:
+            print("Nenhum combustível encontrado.")
+        for i, nome in enumerate(resultado.nomes, 1):
+            print(f"{i}. {nome} - R$ {precos[nome]:.2f}/L")
+        
+        navegacao = []
+        if resultado.tem_mais:
+            navegacao.append("'+' próxima")
+        if pagina > 0:
+            navegacao.append("'-' anterior")
+        print(f"\nNúmero para escolher, {', '.join(navegacao + ['texto para buscar'])}, "
+              f"ENTER para sair")
+        entrada = input("Opção: ").strip()
+        
+        if not entrada:
+            return None
+        if entrada == "+" and resultado.tem_mais:
+            pagina += 1
+        elif entrada == "-" and pagina > 0:
+            pagina -= 1
+        elif entrada.isdigit():
+            escolha = int(entrada)
+            if 1 <= escolha <= len(resultado.nomes):
+                return resultado.nomes[escolha - 1]
+            print("Opção inválida!")
+        elif entrada in ("+", "-"):
+            print("Não há outra página nessa direção!")
+        else:
+            consulta, pagina = entrada, 0
+
 def validar_combustivel(nome_combustivel):
     """
     Valida se o combustível existe no sistema
@@ -144,4 +448,163 @@ def validar_combustivel(nome_combustivel):
     Returns:
         bool: True se o combustível existe
     """
-    return nome_combustivel in combustiveis_cadastrados
\ No newline at end of file
+    return nome_combustivel in combustiveis_cadastrados
+
+def obter_id_combustivel(nome_combustivel):
+    """
+    Converte o nome de um combustível em seu id numérico
+
+    Deve ser chamada uma única vez, na entrada dos dados. A partir daí
+    o processamento usa apenas o id.
+
+    Args:
+        nome_combustivel (str): Nome do combustível
+
+    Returns:
+        int: Id do combustível ou None se não encontrado
+    """
+    return _ids_combustivel.get(nome_combustivel)
+
+def validar_id_combustivel(id_combustivel):
+    """
+    Valida se o id corresponde a um combustível cadastrado
+
+    Args:
+        id_combustivel (int): Id do combustível
+
+    Returns:
+        bool: True se o id existe
+    """
+    return type(id_combustivel) is int and 0 <= id_combustivel < len(_tabela_atual.precos_por_id)
+
+def obter_nome_combustivel(id_combustivel):
+    """
+    Obtém o nome de um combustível a partir do id
+
+    Args:
+        id_combustivel (int): Id do combustível
+
+    Returns:
+        str: Nome do combustível
+    """
+    return _nomes_combustivel[id_combustivel]
+
+def obter_preco_por_id(id_combustivel):
+    """
+    Obtém o preço por litro a partir do id (consulta direta na lista)
+
+    Args:
+        id_combustivel (int): Id do combustível
+
+    Returns:
+        float: Preço por litro
+    """
+    return _tabela_atual.precos_por_id[id_combustivel]
+
+def listar_precos_por_id():
+    """
+    Retorna a lista de preços indexada pelo id do combustível
+
+    Utilizada no processamento em lote por ids.
+
+    Returns:
+        tuple: Preço por litro na posição de cada id (versão vigente)
+    """
+    return _tabela_atual.precos_por_id
+
+def obter_historico_precos(nome_combustivel):
+    """
+    Lista o histórico de preços de um combustível
+
+    Args:
+        nome_combustivel (str): Nome do combustível
+
+    Returns:
+        list: Pares (instante, preço) em ordem cronológica
+    """
+    instantes, precos = _historico_precos.get(nome_combustivel, ((), ()))
+    return list(zip(instantes, precos))
+
+def registrar_preco_historico(nome_combustivel, preco, instante):
+    """
+    Registra no histórico um preço que passou a valer em um instante passado
+
+    Utilizada para carregar históricos antigos (auditorias e disputas).
+    Não altera o preço vigente da tabela de preços.
+
+    Args:
+        nome_combustivel (str): Nome do combustível
+        preco (float): Preço por litro
+        instante (float ou datetime): Início da vigência do preço
+
+    Returns:
+        bool: True se registrado com sucesso
+    """
+    try:
+        preco = float(preco)
+        instante = _para_segundos(instante)
+    except (ValueError, TypeError):
+        return False
+    if not _preco_valido(preco):
+        return False
+    with _trava_escrita:
+        _notificar_ouvintes(nome_combustivel, preco, instante, False)
+        _registrar_no_historico(nome_combustivel, preco, instante)
+    return True
+
+def preco_em(nome_combustivel, instante):
+    """
+    FUNÇÃO: Preço vigente em um instante
+    ====================================
+    Busca binária (bisect) no histórico: encontra o último preço cuja
+    vigência começou até o instante informado. Custo O(log n).
+
+    Exemplo: preço alterado de 5.79 para 6.00 às 10h; preco_em(..., 9h) = 5.79
+
+    Args:
+        nome_combustivel (str): Nome do combustível
+        instante (float ou datetime): Momento da consulta
+
+    Returns:
+        float: Preço vigente ou None se não havia preço naquele instante
+    """
+    instantes, precos = _historico_precos.get(nome_combustivel, ((), ()))
+    posicao = bisect_right(instantes, _para_segundos(instante)) - 1
+    if posicao < 0:
+        return None
+    return precos[posicao]
+
+def precos_em_instantes(nome_combustivel, instantes_consulta):
+    """
+    FUNÇÃO: Junção "as-of" de instantes com o histórico de preços
+    =============================================================
+    Para uma sequência de instantes JÁ ORDENADA, devolve o preço vigente
+    em cada um. Histórico e instantes são percorridos juntos em uma única
+    passada (merge), sem uma busca binária por instante.
+
+    Args:
+        nome_combustivel (str): Nome do combustível
+        instantes_consulta (iterable): Instantes em ordem crescente
+
+    Returns:
+        list: Preço vigente em cada instante (None antes do primeiro preço)
+
+    Raises:
+        ValueError: Se os instantes não estiverem em ordem crescente
+    """
+    instantes, precos = _historico_precos.get(nome_combustivel, ((), ()))
+    total = len(instantes)
+    proximo = 0          # próxima mudança de preço ainda não alcançada
+    preco_atual = None
+    anterior = None
+    resultado = []
+    for instante in instantes_consulta:
+        instante = _para_segundos(instante)
+        if anterior is not None and instante < anterior:
+            raise ValueError("Os instantes devem estar em ordem crescente!")
+        anterior = instante
+        while proximo < total and instantes[proximo] <= instante:
+            preco_atual = precos[proximo]
+            proximo += 1
+        resultado.append(preco_atual)
+    return resultado
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+MÓDULO DESPACHO
+===============
+Este módulo permite atender várias bombas ao mesmo tempo.
+
+O menu (menu.py) atende uma bomba por vez. O DespachanteBombas recebe
+pedidos de abastecimento de muitas bombas e os processa com
+abastecimento.processar_abastecimento() em um grupo fixo de threads
+trabalhadoras (pool).
+
+Regras de funcionamento:
+- Ordem por bomba: todos os pedidos de uma mesma bomba vão sempre para
+  a mesma trabalhadora, portanto são processados na ordem de chegada
+- Contrapressão (backpressure): cada trabalhadora tem uma fila com
+  tamanho máximo; com a fila cheia, quem envia espera (ou recebe
+  queue.Full, se não quiser esperar)
+- Contadores: pedidos enviados, processados, com erro, rejeitados,
+  profundidade das filas e vazão (abastecimentos por segundo)
+
+Uso típico:
+    with DespachanteBombas(trabalhadores=4) as despachante:
+        futuro = despachante.enviar(7, "Gasolina", 30, "PIX")
+        registro = futuro.result()
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import abastecimento
+
+# Marcador que avisa a trabalhadora para encerrar
+_ENCERRAR = object()
+
+
+class DespachanteBombas:
+    """
+    CLASSE: Despachante de pedidos das bombas
+    =========================================
+    Distribui os pedidos das bombas entre as trabalhadoras e mantém
+    os contadores de desempenho.
+    """
+    def __init__(self, trabalhadores=4, capacidade_fila=1024, ao_concluir=None):
+        """
+        Args:
+            trabalhadores (int): Quantidade de threads trabalhadoras
+            capacidade_fila (int): Pedidos em espera por trabalhadora
+            ao_concluir (callable): Função chamada com (bomba, registro) após
+                                    cada abastecimento processado com sucesso
+                                    (ex: gravar no diário)
+        """
+        if trabalhadores < 1:
+            raise ValueError("É necessário pelo menos uma trabalhadora!")
+
+        self.ao_concluir = ao_concluir
+        self._filas = [queue.Queue(maxsize=capacidade_fila) for _ in range(trabalhadores)]
+
+        # CONTADORES POR TRABALHADORA - cada thread só altera a própria posição
+        self._processados = [0] * trabalhadores
+        self._erros = [0] * trabalhadores
+
+        # CONTADORES DE ENVIO - alterados por quem envia, protegidos por trava
+        self._trava = threading.Lock()
+        self._envios_concluidos = threading.Condition(self._trava)
+        self._em_envio = 0        # envios entre a checagem de _fechado e o put
+        self._enviados = 0
+        self._rejeitados = 0
+        self._profundidade_maxima = 0
+
+        self._fechado = False
+        self._inicio = time.monotonic()
+        self._threads = [
+            threading.Thread(target=self._trabalhar, args=(indice,), daemon=True,
+                             name=f"despacho-{indice}")
+            for indice in range(trabalhadores)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _fila_da_bomba(self, bomba):
+        """Escolhe a fila fixa de uma bomba (garante a ordem por bomba)"""
+        return self._filas[hash(bomba) % len(self._filas)]
+
+    def enviar(self, bomba, tipo_combustivel, quantidade_litros, forma_pagamento,
+               bloquear=True, timeout=None):
+        """
+        Envia um pedido de abastecimento de uma bomba
+
+        Args:
+            bomba: Identificador da bomba (ex: 1 a 16)
+            tipo_combustivel (str): Tipo do combustível
+            quantidade_litros (float): Quantidade de litros
+            forma_pagamento (str): Forma de pagamento
+            bloquear (bool): Esperar por espaço se a fila estiver cheia
+            timeout (float): Tempo máximo de espera em segundos
+
+        Returns:
+            Future: Resultado futuro com o RegistroAbastecimento
+                    (ou com o ValueError da validação)
+
+        Raises:
+            queue.Full: Se a fila estiver cheia e não houver espera
+            RuntimeError: Se o despachante já foi fechado
+            TypeError: Se o identificador da bomba não for hashable (ex: lista)
+        """
+        # a fila é escolhida antes de contar o envio: um erro aqui não deixa
+        # _em_envio preso (o que travaria fechar() para sempre)
+        fila = self._fila_da_bomba(bomba)
+        with self._trava:
+            if self._fechado:
+                raise RuntimeError("O despachante já foi fechado!")
+            self._em_envio += 1
+        futuro = Future()
+        try:
+            fila.put((bomba, tipo_combustivel, quantidade_litros, forma_pagamento, futuro),
+                     block=bloquear, timeout=timeout)
+        except queue.Full:
+            with self._trava:
+                self._rejeitados += 1
+            raise
+        finally:
+            # fechar() só encerra as trabalhadoras quando nenhum envio está em andamento
+            with self._trava:
+                self._em_envio -= 1
+                if not self._em_envio:
+                    self._envios_concluidos.notify_all()
+
+        with self._trava:
+            self._enviados += 1
+            profundidade = fila.qsize()
+            if profundidade > self._profundidade_maxima:
+                self._profundidade_maxima = profundidade
+        return futuro
+
+    def _trabalhar(self, indice):
+        """Laço de uma trabalhadora: processa os pedidos da sua fila em ordem"""
+        fila = self._filas[indice]
+        while True:
+            pedido = fila.get()
+            if pedido is _ENCERRAR:
+                fila.task_done()
+                return
+
+            bomba, tipo_combustivel, quantidade_litros, forma_pagamento, futuro = pedido
+            try:
+                registro = abastecimento.processar_abastecimento(
+                    tipo_combustivel, quantidade_litros, forma_pagamento
+                )
+                if self.ao_concluir is not None:
+                    self.ao_concluir(bomba, registro)
+            except Exception as erro:
+                self._erros[indice] += 1
+                futuro.set_exception(erro)
+            else:
+                self._processados[indice] += 1
+                futuro.set_result(registro)
+            finally:
+                fila.task_done()
+
+    def profundidade_fila(self):
+        """
+        Soma os pedidos aguardando em todas as filas
+
+        Returns:
+            int: Pedidos em espera
+        """
+        return sum(fila.qsize() for fila in self._filas)
+
+    def estatisticas(self):
+        """
+        Retorna os contadores de desempenho do despachante
+
+        Returns:
+            dict: enviados, processados, erros, rejeitados, profundidade_fila,
+                  profundidade_maxima e vazao (abastecimentos por segundo)
+        """
+        processados = sum(self._processados)
+        decorrido = time.monotonic() - self._inicio
+        return {
+            "enviados": self._enviados,
+            "processados": processados,
+            "erros": sum(self._erros),
+            "rejeitados": self._rejeitados,
+            "profundidade_fila": self.profundidade_fila(),
+            "profundidade_maxima": self._profundidade_maxima,
+            "vazao": processados / decorrido if decorrido > 0 else 0.0,
+        }
+
+    def aguardar(self):
+        """Espera até que todos os pedidos enviados sejam processados"""
+        for fila in self._filas:
+            fila.join()
+
+    def fechar(self):
+        """
+        Processa os pedidos pendentes e encerra as trabalhadoras
+
+        Depois de fechado, enviar() lança RuntimeError. Envios que já
+        passaram da verificação terminam antes do encerramento, então
+        nenhum pedido fica em uma fila sem trabalhadora.
+        """
+        with self._trava:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._envios_concluidos.wait_for(lambda: not self._em_envio)
+        for fila in self._filas:
+            fila.put(_ENCERRAR)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
@@ -0,0 +1,505 @@
+"""
+MÓDULO DIÁRIO
+=============
+Este módulo grava de forma permanente (em disco) cada abastecimento processado.
+
+O diário é um "log" somente de acréscimo (append-only):
+- Cada venda vira um registro binário de tamanho fixo (60 bytes)
+- Os registros são gravados em arquivos de segmento numerados
+  (segmento-000001.bin, segmento-000002.bin, ...)
+- Quando um segmento enche, um novo é aberto automaticamente
+- Os nomes de combustíveis e pagamentos ficam em nomes.json e cada
+  registro guarda apenas os ids correspondentes
+
+Commit em grupo (group commit):
+O comando os.fsync() garante que os dados chegaram ao disco, mas é lento.
+Em vez de chamá-lo a cada venda, as vendas são acumuladas em memória e
+gravadas juntas quando o grupo atinge `lote_commit` registros ou quando
+`intervalo_commit` segundos se passaram desde o último commit.
+
+Confirmação da venda:
+Por padrão registrar() devolve o controle assim que a venda entra no
+grupo, ANTES do fsync: uma queda nesse intervalo pode perder as vendas
+ainda não gravadas. Quem confirma a venda ao cliente (menu, API) chama
+registrar(registro, duravel=True), que só retorna depois do commit que
+inclui aquela venda. O atributo `gravados` informa quantos registros já
+estão garantidos em disco.
+
+Leitura:
+O LeitorDiario abre os segmentos com mmap e decodifica os registros
+direto da memória mapeada, sem copiar o arquivo para a memória do Python.
+"""
+
+import atexit
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+
+import instrumentacao
+
+# FORMATO DO REGISTRO BINÁRIO (little-endian, 60 bytes)
+# q  instante (segundos desde 1970)
+# I  id do combustível
+# I  id da forma de pagamento
+# I  versão da tabela de preços usada (0 = desconhecida)
+# d  quantidade de litros, valor por litro, bruto, desconto, final
+FORMATO_REGISTRO = struct.Struct("<qIIIddddd")
+TAMANHO_REGISTRO = FORMATO_REGISTRO.size
+
+# VERSÃO DO FORMATO - gravada em nomes.json; diários de outra versão não
+# são abertos (os registros seriam decodificados com o tamanho errado).
+# Versão 1: ids de 2 bytes (combustível) e 1 byte (pagamento), 56 bytes.
+VERSAO_FORMATO = 2
+
+ARQUIVO_NOMES = "nomes.json"
+PREFIXO_SEGMENTO = "segmento-"
+SUFIXO_SEGMENTO = ".bin"
+
+# PASTA PADRÃO - usada pelo menu do sistema
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "diario")
+
+
+def _nome_segmento(numero):
+    """Monta o nome do arquivo de um segmento (ex: segmento-000001.bin)"""
+    return f"{PREFIXO_SEGMENTO}{numero:06d}{SUFIXO_SEGMENTO}"
+
+def listar_segmentos(pasta):
+    """
+    Lista os números dos segmentos existentes em ordem crescente
+
+    Args:
+        pasta (str): Pasta do diário
+
+    Returns:
+        list: Números dos segmentos (ex: [1, 2, 3])
+    """
+    if not os.path.isdir(pasta):
+        return []
+    numeros = []
+    for arquivo in os.listdir(pasta):
+        if arquivo.startswith(PREFIXO_SEGMENTO) and arquivo.endswith(SUFIXO_SEGMENTO):
+            try:
+                numeros.append(int(arquivo[len(PREFIXO_SEGMENTO):-len(SUFIXO_SEGMENTO)]))
+            except ValueError:
+                continue
+    return sorted(numeros)
+
+def _carregar_nomes(pasta):
+    """
+    Lê a tabela de nomes do diário
+
+    Returns:
+        tuple: (lista de combustíveis, lista de pagamentos)
+    """
+    caminho = os.path.join(pasta, ARQUIVO_NOMES)
+    if not os.path.exists(caminho):
+        return [], []
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    versao = dados.get("formato", 1)
+    if versao != VERSAO_FORMATO:
+        raise ValueError(f"Diário em {pasta} usa o formato {versao}; "
+                         f"esta versão do sistema lê apenas o formato {VERSAO_FORMATO}")
+    return list(dados.get("combustiveis", [])), list(dados.get("pagamentos", []))
+
+
+class DiarioAbastecimentos:
+    """
+    CLASSE: Diário de abastecimentos (escrita)
+    ==========================================
+    Acrescenta registros ao final do diário com commit em grupo.
+    Pode ser usada por várias threads ao mesmo tempo.
+
+    Uso típico:
+        with DiarioAbastecimentos("dados/diario") as diario:
+            diario.registrar(registro)
+    """
+    def __init__(self, pasta, registros_por_segmento=100_000, lote_commit=256,
+                 intervalo_commit=0.05):
+        """
+        Args:
+            pasta (str): Pasta onde os segmentos são gravados
+            registros_por_segmento (int): Registros por arquivo de segmento
+            lote_commit (int): Registros acumulados que disparam um commit
+            intervalo_commit (float): Tempo máximo (s) entre commits
+        """
+        self.pasta = pasta
+        self.registros_por_segmento = registros_por_segmento
+        self.lote_commit = lote_commit
+        self.intervalo_commit = intervalo_commit
+
+        os.makedirs(pasta, exist_ok=True)
+
+        # TABELAS DE NOMES PERSISTIDAS
+        self._nomes_combustivel, self._nomes_pagamento = _carregar_nomes(pasta)
+        self._ids_combustivel = {nome: i for i, nome in enumerate(self._nomes_combustivel)}
+        self._ids_pagamento = {nome: i for i, nome in enumerate(self._nomes_pagamento)}
+
+        # ESTADO DO COMMIT EM GRUPO
+        self._trava = threading.Lock()
+        self._commit_feito = threading.Condition(self._trava)
+        self._buffer = bytearray()
+        self._pendentes = 0
+        self._acrescentados = 0   # registros entregues desde a abertura
+        self.gravados = 0         # desses, quantos já passaram pelo fsync
+        self._ultimo_commit = time.monotonic()
+        self.total_commits = 0
+
+        # ABRIR O ÚLTIMO SEGMENTO (ou criar o primeiro)
+        segmentos = listar_segmentos(pasta)
+        self._numero_segmento = segmentos[-1] if segmentos else 1
+        self._abrir_segmento()
+
+        # THREAD DE COMMIT PERIÓDICO - garante que nenhuma venda fique
+        # mais do que `intervalo_commit` segundos apenas na memória
+        self._parar = threading.Event()
+        self._thread_commit = threading.Thread(target=self._laco_commit, daemon=True)
+        self._thread_commit.start()
+
+    def _abrir_segmento(self):
+        """Abre o segmento atual para acréscimo, descartando um registro incompleto no final"""
+        caminho = os.path.join(self.pasta, _nome_segmento(self._numero_segmento))
+        self._arquivo = open(caminho, "ab")
+        tamanho = self._arquivo.tell()
+        if tamanho % TAMANHO_REGISTRO:
+            # Registro parcial de uma queda anterior
+            tamanho -= tamanho % TAMANHO_REGISTRO
+            self._arquivo.truncate(tamanho)
+            self._arquivo.seek(tamanho)
+        self._registros_no_segmento = tamanho // TAMANHO_REGISTRO
+
+    def _salvar_nomes(self):
+        """Grava nomes.json de forma atômica (arquivo temporário + os.replace)"""
+        caminho = os.path.join(self.pasta, ARQUIVO_NOMES)
+        temporario = caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({"formato": VERSAO_FORMATO,
+                       "combustiveis": self._nomes_combustivel,
+                       "pagamentos": self._nomes_pagamento}, arquivo, ensure_ascii=False)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+
+    def _id_de(self, nome, nomes, ids):
+        """Obtém o id persistente de um nome (chamado com a trava adquirida)"""
+        identificador = ids.get(nome)
+        if identificador is None:
+            identificador = len(nomes)
+            nomes.append(nome)
+            ids[nome] = identificador
+            self._salvar_nomes()
+        return identificador
+
+    def _acrescentar(self, tipo_combustivel, quantidade_litros, valor_por_litro, versao_preco,
+                     forma_pagamento, instante, valor_bruto, valor_desconto, valor_final):
+        """Empacota um registro no buffer (chamado com a trava adquirida)"""
+        self._buffer += FORMATO_REGISTRO.pack(
+            instante,
+            self._id_de(tipo_combustivel, self._nomes_combustivel, self._ids_combustivel),
+            self._id_de(forma_pagamento, self._nomes_pagamento, self._ids_pagamento),
+            versao_preco,
+            quantidade_litros, valor_por_litro, valor_bruto, valor_desconto, valor_final,
+        )
+        self._pendentes += 1
+        self._acrescentados += 1
+        if self._registros_no_segmento + self._pendentes >= self.registros_por_segmento:
+            self._commit()
+            self._arquivo.close()
+            self._numero_segmento += 1
+            self._abrir_segmento()
+
+    def registrar(self, registro, duravel=False):
+        """
+        Acrescenta um abastecimento ao diário
+
+        Args:
+            registro (RegistroAbastecimento): Registro já processado
+            duravel (bool): Se True, só retorna depois que o commit em grupo
+                            que inclui este registro chegou ao disco (espera
+                            no máximo `intervalo_commit` e então grava por conta
+                            própria). Use antes de confirmar a venda ao cliente.
+        """
+        if instrumentacao.ATIVO:
+            inicio = instrumentacao.agora()
+        with self._trava:
+            self._acrescentar(
+                registro.tipo_combustivel,
+                registro.quantidade_litros,
+                registro.valor_por_litro or 0.0,
+                registro.versao_preco,
+                registro.forma_pagamento,
+                int(registro.data_abastecimento.timestamp()),
+                registro.valor_bruto,
+                registro.valor_desconto,
+                registro.valor_final,
+            )
+            self._commit_se_necessario()
+            if duravel:
+                self._aguardar_gravacao(self._acrescentados)
+        if instrumentacao.ATIVO:
+            instrumentacao.registrar_etapa("persistir", inicio)
+            instrumentacao.contar("registros_gravados")
+
+    def registrar_lote(self, resultado, instante=None, duravel=False):
+        """
+        Acrescenta as linhas válidas de um processamento em lote
+
+        Args:
+            resultado (ResultadoLote): Retorno de processar_abastecimentos_em_lote()
+            instante (int): Data/hora em segundos desde 1970 (padrão: agora)
+            duravel (bool): Se True, só retorna com todas as linhas em disco
+
+        Returns:
+            int: Quantidade de registros acrescentados
+        """
+        if instante is None:
+            instante = int(datetime.now().timestamp())
+
+        adicionados = 0
+        with self._trava:
+            for i, valido in enumerate(resultado.validos):
+                if not valido:
+                    continue
+                self._acrescentar(
+                    resultado.tipos_combustivel[i],
+                    resultado.quantidade_litros[i],
+                    resultado.valor_por_litro[i],
+                    resultado.versao_preco,
+                    resultado.formas_pagamento[i],
+                    instante,
+                    resultado.valor_bruto[i],
+                    resultado.valor_desconto[i],
+                    resultado.valor_final[i],
+                )
+                adicionados += 1
+            self._commit_se_necessario()
+            if duravel:
+                self._aguardar_gravacao(self._acrescentados)
+        if instrumentacao.ATIVO:
+            instrumentacao.contar("registros_gravados", adicionados)
+        return adicionados
+
+    def _aguardar_gravacao(self, numero):
+        """Espera até `numero` registros estarem em disco (chamado com a trava adquirida)"""
+        if not self._commit_feito.wait_for(lambda: self.gravados >= numero,
+                                           self.intervalo_commit):
+            # Nenhum commit no intervalo (ex: thread periódica atrasada):
+            # grava o grupo agora; um erro de disco chega a quem registrou
+            self._commit()
+
+    def _commit_se_necessario(self):
+        """Dispara o commit quando o grupo está cheio ou o intervalo venceu"""
+        if (self._pendentes >= self.lote_commit
+                or time.monotonic() - self._ultimo_commit >= self.intervalo_commit):
+            self._commit()
+
+    def _commit(self):
+        """Grava o buffer no segmento e chama fsync (chamado com a trava adquirida)"""
+        self._ultimo_commit = time.monotonic()
+        if not self._pendentes:
+            return
+        if instrumentacao.ATIVO:
+            inicio = instrumentacao.agora()
+        try:
+            self._arquivo.write(self._buffer)
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+        except BaseException:
+            # o buffer continua pendente; a próxima tentativa grava tudo de novo
+            # a partir do último registro completo, sem duplicar um pedaço
+            self._descartar_escrita_parcial()
+            raise
+        if instrumentacao.ATIVO:
+            instrumentacao.registrar_etapa("commit_disco", inicio)
+        self._registros_no_segmento += self._pendentes
+        self.gravados += self._pendentes
+        self._buffer.clear()
+        self._pendentes = 0
+        self.total_commits += 1
+        self._commit_feito.notify_all()
+
+    def _descartar_escrita_parcial(self):
+        """
+        Volta o segmento ao fim do último commit (chamado com a trava adquirida)
+
+        Um write() que falhou pode ter gravado parte do grupo. O arquivo é
+        fechado (o que ficou no buffer do Python é descartado junto) e
+        truncado no último registro confirmado antes de ser reaberto.
+        """
+        caminho = os.path.join(self.pasta, _nome_segmento(self._numero_segmento))
+        try:
+            self._arquivo.close()
+        except OSError:
+            pass
+        try:
+            os.truncate(caminho, self._registros_no_segmento * TAMANHO_REGISTRO)
+        except OSError:
+            pass   # o erro original é propagado; a reabertura ainda descarta um registro parcial
+        self._abrir_segmento()
+
+    def _laco_commit(self):
+        """Laço da thread de commit periódico"""
+        while not self._parar.wait(self.intervalo_commit):
+            with self._trava:
+                if self._pendentes and not self._arquivo.closed:
+                    self._commit()
+
+    def sincronizar(self):
+        """Força a gravação imediata de todos os registros pendentes"""
+        with self._trava:
+            self._commit()
+
+    def fechar(self):
+        """Grava os pendentes e fecha o diário"""
+        self._parar.set()
+        with self._trava:
+            if self._arquivo.closed:
+                return
+            self._commit()
+            self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+class LeitorDiario:
+    """
+    CLASSE: Leitor do diário
+    ========================
+    Percorre os segmentos do diário usando mmap (arquivo mapeado na memória).
+    Cada registro é decodificado direto da memória mapeada.
+
+    Os nomes são lidos na criação; um id mais novo que eles (combustível
+    cadastrado com o leitor aberto) faz nome_combustivel()/nome_pagamento()
+    lerem nomes.json de novo.
+    """
+    def __init__(self, pasta):
+        self.pasta = pasta
+        self.recarregar_nomes()
+
+    def recarregar_nomes(self):
+        """Lê de novo as tabelas de nomes (nomes.json) do diário"""
+        self.nomes_combustivel, self.nomes_pagamento = _carregar_nomes(self.pasta)
+
+    def nome_combustivel(self, id_combustivel):
+        """
+        Nome de um id de combustível do diário
+
+        Raises:
+            IndexError: Se o id não existir nem depois de recarregar os nomes
+        """
+        try:
+            return self.nomes_combustivel[id_combustivel]
+        except IndexError:
+            self.recarregar_nomes()
+            return self.nomes_combustivel[id_combustivel]
+
+    def nome_pagamento(self, id_pagamento):
+        """
+        Nome de um id de forma de pagamento do diário
+
+        Raises:
+            IndexError: Se o id não existir nem depois de recarregar os nomes
+        """
+        try:
+            return self.nomes_pagamento[id_pagamento]
+        except IndexError:
+            self.recarregar_nomes()
+            return self.nomes_pagamento[id_pagamento]
+
+    def iterar_segmento(self, numero, inicio=0):
+        """
+        Percorre os registros de um segmento
+
+        Args:
+            numero (int): Número do segmento
+            inicio (int): Posição do primeiro registro a ler (ex: para
+                          continuar de onde uma leitura anterior parou)
+
+        Yields:
+            tuple: (instante, id_combustivel, id_pagamento, versao_preco, quantidade_litros,
+                    valor_por_litro, valor_bruto, valor_desconto, valor_final)
+        """
+        caminho = os.path.join(self.pasta, _nome_segmento(numero))
+        with open(caminho, "rb") as arquivo:
+            tamanho = os.fstat(arquivo.fileno()).st_size
+            util = tamanho - tamanho % TAMANHO_REGISTRO  # ignora registro parcial
+            if util <= inicio * TAMANHO_REGISTRO:
+                return
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            visao = memoryview(mapa)[inicio * TAMANHO_REGISTRO:util]
+            iterador = FORMATO_REGISTRO.iter_unpack(visao)
+            try:
+                yield from iterador
+            finally:
+                # Liberar as referências ao buffer antes de fechar o mmap
+                del iterador
+                visao.release()
+                mapa.close()
+
+    def iterar(self):
+        """
+        Percorre todos os registros de todos os segmentos, em ordem
+
+        Yields:
+            tuple: Campos brutos do registro (ver iterar_segmento)
+        """
+        for numero in listar_segmentos(self.pasta):
+            yield from self.iterar_segmento(numero)
+
+    def __len__(self):
+        total = 0
+        for numero in listar_segmentos(self.pasta):
+            tamanho = os.path.getsize(os.path.join(self.pasta, _nome_segmento(numero)))
+            total += tamanho // TAMANHO_REGISTRO
+        return total
+
+    def carregar_livro(self, livro=None):
+        """
+        Carrega os registros do diário em um LivroRegistros
+
+        Args:
+            livro (LivroRegistros): Livro de destino (padrão: um novo livro)
+
+        Returns:
+            LivroRegistros: Livro com todos os registros do diário
+        """
+        import registros
+
+        if livro is None:
+            livro = registros.LivroRegistros()
+        nome_combustivel = self.nome_combustivel
+        nome_pagamento = self.nome_pagamento
+        for (instante, id_comb, id_pag, versao, litros, preco,
+             bruto, desconto, final) in self.iterar():
+            livro._anexar(nome_combustivel(id_comb), litros, preco, versao, nome_pagamento(id_pag),
+                          instante, bruto, desconto, final)
+        return livro
+
+
+# DIÁRIO PADRÃO DO SISTEMA - aberto na primeira venda e fechado ao sair
+_diario_padrao = None
+_trava_padrao = threading.Lock()
+
+def obter_diario_padrao():
+    """
+    Obtém o diário padrão do sistema (pasta dados/diario)
+
+    Returns:
+        DiarioAbastecimentos: Diário compartilhado pelo processo
+    """
+    global _diario_padrao
+    if _diario_padrao is None:
+        with _trava_padrao:
+            if _diario_padrao is None:
+                diario_aberto = DiarioAbastecimentos(PASTA_PADRAO)
+                atexit.register(diario_aberto.fechar)
+                _diario_padrao = diario_aberto
+    return _diario_padrao
@@ -0,0 +1,265 @@
+"""
+MÓDULO DINHEIRO
+===============
+Cálculos financeiros exatos usando apenas números inteiros.
+
+Por que não usar float?
+O float é binário e não representa exatamente valores como 5.79 ou 0.10.
+Uma venda isolada parece correta quando impressa com :.2f, mas somando
+milhões de vendas o total em float se afasta do que os cupons mostram.
+
+Solução deste módulo:
+- Dinheiro em CENTAVOS (int):       R$ 5,79  -> 579
+- Preço por litro pode ter 3 casas:  R$ 5,799 -> 5799 milésimos (casas_preco=3)
+- Volume em MILILITROS (int):       30 litros -> 30000
+- Percentuais em PONTOS-BASE (int): 10%       -> 1000   (1 ponto-base = 0,01%)
+- Cada divisão tem um modo de arredondamento explícito
+
+Exemplo (30 L de Gasolina a R$ 5,79, PIX com 10%):
+    bruto    = 30000 × 579 / 1000  = 17370 centavos (R$ 173,70)
+    desconto = 17370 × 1000 / 10000 = 1737 centavos (R$ 17,37)
+    final    = 17370 - 1737         = 15633 centavos (R$ 156,33)
+
+As funções *_lote calculam colunas inteiras de uma vez, com o
+arredondamento escrito como uma única expressão inteira por elemento.
+
+O módulo abastecimento usa estas funções em toda venda (única ou em
+lote): os valores do registro são centavos exatos, iguais aos do cupom.
+"""
+
+from array import array
+from decimal import Decimal, InvalidOperation, ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP
+from itertools import repeat
+
+# MODOS DE ARREDONDAMENTO
+MEIO_CIMA = "meio_cima"   # 0,5 arredonda para longe do zero (padrão comercial)
+MEIO_PAR = "meio_par"     # 0,5 arredonda para o par mais próximo ("do banqueiro")
+TRUNCAR = "truncar"       # descarta a fração (em direção ao zero)
+PARA_CIMA = "para_cima"   # qualquer fração arredonda para longe do zero
+
+_MODOS_DECIMAL = {
+    MEIO_CIMA: ROUND_HALF_UP,
+    MEIO_PAR: ROUND_HALF_EVEN,
+    TRUNCAR: ROUND_DOWN,
+    PARA_CIMA: ROUND_UP,
+}
+
+# ESCALAS
+MILILITROS_POR_LITRO = 1000
+PONTOS_BASE_TOTAL = 10000   # 100% = 10000 pontos-base
+
+
+def _validar_modo(modo):
+    """Garante que o modo de arredondamento é conhecido"""
+    if modo not in _MODOS_DECIMAL:
+        raise ValueError(f"Modo de arredondamento '{modo}' inválido!")
+
+def dividir_arredondando(numerador, denominador, modo=MEIO_CIMA):
+    """
+    FUNÇÃO PRINCIPAL: Divisão inteira com arredondamento explícito
+    ==============================================================
+    Exemplo: dividir_arredondando(17375, 10, MEIO_CIMA) = 1738
+
+    Args:
+        numerador (int): Valor a dividir
+        denominador (int): Divisor (maior que zero)
+        modo (str): MEIO_CIMA, MEIO_PAR, TRUNCAR ou PARA_CIMA
+
+    Returns:
+        int: Quociente arredondado
+    """
+    if denominador <= 0:
+        raise ValueError("O denominador deve ser maior que zero!")
+    negativo = numerador < 0
+    quociente, resto = divmod(-numerador if negativo else numerador, denominador)
+
+    if modo == MEIO_CIMA:
+        if 2 * resto >= denominador:
+            quociente += 1
+    elif modo == MEIO_PAR:
+        if 2 * resto > denominador or (2 * resto == denominador and quociente % 2):
+            quociente += 1
+    elif modo == PARA_CIMA:
+        if resto:
+            quociente += 1
+    elif modo != TRUNCAR:
+        _validar_modo(modo)
+
+    return -quociente if negativo else quociente
+
+def _para_inteiro(valor, casas, modo):
+    """
+    Converte um valor decimal para inteiro na escala de 10^casas
+
+    Raises:
+        ValueError: Se o valor não é um número finito representável
+    """
+    _validar_modo(modo)
+    try:
+        decimal = Decimal(str(valor)).quantize(Decimal(1).scaleb(-casas),
+                                               rounding=_MODOS_DECIMAL[modo])
+        return int(decimal.scaleb(casas))
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"Valor '{valor}' fora do intervalo suportado!")
+
+def reais_para_centavos(valor, modo=MEIO_CIMA):
+    """
+    Converte um valor em reais (float, str ou Decimal) para centavos
+
+    Exemplo: reais_para_centavos(5.79) = 579
+
+    Returns:
+        int: Valor em centavos
+    """
+    return _para_inteiro(valor, 2, modo)
+
+def reais_para_milesimos(valor, modo=MEIO_CIMA):
+    """
+    Converte um preço em reais para milésimos de real (preços com 3 casas)
+
+    Exemplo: reais_para_milesimos(5.799) = 5799
+
+    Returns:
+        int: Valor em milésimos de real
+    """
+    return _para_inteiro(valor, 3, modo)
+
+def litros_para_mililitros(valor, modo=MEIO_CIMA):
+    """
+    Converte litros (float, str ou Decimal) para mililitros
+
+    Exemplo: litros_para_mililitros(30.5) = 30500
+
+    Returns:
+        int: Volume em mililitros
+    """
+    return _para_inteiro(valor, 3, modo)
+
+def percentual_para_pontos_base(percentual):
+    """
+    Converte um percentual em fração (0.10) para pontos-base (1000)
+
+    Returns:
+        int: Percentual em pontos-base
+    """
+    return int(Decimal(str(percentual)) * PONTOS_BASE_TOTAL)
+
+def centavos_para_reais(centavos):
+    """
+    Converte centavos para Decimal exato em reais (ex: 15633 -> Decimal('156.33'))
+
+    Returns:
+        Decimal: Valor em reais
+    """
+    return Decimal(centavos).scaleb(-2)
+
+def formatar_centavos(centavos):
+    """
+    Formata centavos como texto em reais (ex: 15633 -> 'R$ 156.33')
+
+    Returns:
+        str: Valor formatado, no mesmo padrão dos cupons do sistema
+    """
+    sinal = "-" if centavos < 0 else ""
+    inteiro, fracao = divmod(abs(centavos), 100)
+    return f"R$ {sinal}{inteiro}.{fracao:02d}"
+
+def _divisor_bruto(casas_preco):
+    """Divisor que leva mililitros × preço (na escala de casas_preco) para centavos"""
+    if casas_preco < 2:
+        raise ValueError("O preço deve ter pelo menos 2 casas decimais!")
+    return MILILITROS_POR_LITRO * 10 ** (casas_preco - 2)
+
+def precificar(mililitros, preco_centavos, desconto_pontos_base=0, modo=MEIO_CIMA,
+               casas_preco=2):
+    """
+    Calcula bruto, desconto e final de uma venda em centavos
+
+    Args:
+        mililitros (int): Volume abastecido
+        preco_centavos (int): Preço por litro em centavos (ou em milésimos
+                              de real com casas_preco=3)
+        desconto_pontos_base (int): Desconto em pontos-base (1000 = 10%)
+        modo (str): Modo de arredondamento
+        casas_preco (int): Casas decimais do preço informado
+
+    Returns:
+        tuple: (bruto, desconto, final) em centavos
+    """
+    bruto = dividir_arredondando(mililitros * preco_centavos, _divisor_bruto(casas_preco), modo)
+    desconto = dividir_arredondando(bruto * desconto_pontos_base, PONTOS_BASE_TOTAL, modo)
+    return bruto, desconto, bruto - desconto
+
+
+def _dividir_lote(valores, denominador, modo):
+    """
+    Divide uma coluna inteira por um denominador com arredondamento
+
+    Para valores não negativos (o caso normal: volumes, preços, descontos)
+    cada modo é uma única expressão inteira por elemento. Com algum valor
+    negativo, usa dividir_arredondando() elemento a elemento.
+    """
+    _validar_modo(modo)
+    if valores and min(valores) < 0:
+        return [dividir_arredondando(v, denominador, modo) for v in valores]
+
+    if modo == MEIO_CIMA:
+        dobro = 2 * denominador
+        return [(2 * v + denominador) // dobro for v in valores]
+    if modo == TRUNCAR:
+        return [v // denominador for v in valores]
+    if modo == PARA_CIMA:
+        return [-(-v // denominador) for v in valores]
+    # MEIO_PAR
+    return [q + (2 * r > denominador or (2 * r == denominador and q & 1))
+            for q, r in map(divmod, valores, repeat(denominador))]
+
+def reais_para_centavos_lote(valores, modo=MEIO_CIMA):
+    """
+    Converte uma coluna de valores em reais para centavos
+
+    Returns:
+        array: array('q') com os valores em centavos
+    """
+    return array('q', (reais_para_centavos(v, modo) for v in valores))
+
+def litros_para_mililitros_lote(valores, modo=MEIO_CIMA):
+    """
+    Converte uma coluna de litros para mililitros
+
+    Returns:
+        array: array('q') com os volumes em mililitros
+    """
+    return array('q', (litros_para_mililitros(v, modo) for v in valores))
+
+def precificar_lote(mililitros, precos_centavos, descontos_pontos_base=0, modo=MEIO_CIMA,
+                    casas_preco=2):
+    """
+    FUNÇÃO: Precificação em lote com matemática inteira
+    ===================================================
+    Calcula as colunas bruto, desconto e final de muitas vendas de uma vez.
+
+    Args:
+        mililitros (sequence): Volumes em mililitros
+        precos_centavos (sequence): Preços por litro em centavos
+        descontos_pontos_base (sequence ou int): Desconto de cada venda em
+                                                pontos-base, ou um único valor para todas
+        modo (str): Modo de arredondamento
+        casas_preco (int): Casas decimais dos preços informados
+
+    Returns:
+        tuple: (bruto, desconto, final) como array('q') em centavos
+    """
+    if len(mililitros) != len(precos_centavos):
+        raise ValueError("As colunas do lote devem ter o mesmo tamanho!")
+    if isinstance(descontos_pontos_base, int):
+        descontos_pontos_base = repeat(descontos_pontos_base, len(mililitros))
+    elif len(descontos_pontos_base) != len(mililitros):
+        raise ValueError("As colunas do lote devem ter o mesmo tamanho!")
+
+    bruto = _dividir_lote([m * p for m, p in zip(mililitros, precos_centavos)],
+                          _divisor_bruto(casas_preco), modo)
+    desconto = _dividir_lote([b * d for b, d in zip(bruto, descontos_pontos_base)],
+                             PONTOS_BASE_TOTAL, modo)
+    final = [b - d for b, d in zip(bruto, desconto)]
+    return array('q', bruto), array('q', desconto), array('q', final)
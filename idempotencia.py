@@ -0,0 +1,342 @@
+"""
+MÓDULO IDEMPOTÊNCIA
+===================
+Evita vendas duplicadas quando uma bomba repete o pedido (ex: após um
+tempo de espera esgotado, sem saber se a venda foi feita).
+
+Como funciona:
+- Cada pedido traz uma chave de idempotência (ex: "bomba7-000123"),
+  única por venda
+- Primeira vez: a venda é processada e o registro fica guardado com a chave
+- Repetição: o registro ORIGINAL é devolvido (mesma data/hora e valores),
+  sem recalcular preço nem desconto
+- Mesma chave com dados diferentes: erro (provável falha do controlador)
+- Pedidos simultâneos com a mesma chave: o segundo espera o primeiro
+  terminar e recebe o mesmo registro
+
+Limites de memória:
+- `capacidade`: máximo de chaves guardadas; acima dela as mais antigas
+  são descartadas
+- `validade`: segundos que uma chave é lembrada (as bombas só repetem
+  pedidos recentes)
+As chaves ficam em ordem de inserção (OrderedDict); como todas têm a
+mesma validade, as primeiras são sempre as que vencem antes. A consulta
+e o descarte custam O(1).
+
+Índice em disco (opcional):
+Com `caminho_indice`, cada chave nova é acrescentada a um arquivo JSONL.
+Ao reiniciar, as chaves ainda válidas são recarregadas; assim uma
+repetição que chega logo após uma queda do sistema também é reconhecida.
+Quando o arquivo passa do dobro da capacidade ele é reescrito só com as
+chaves em memória, fora da trava do cache: as outras vendas continuam
+sendo atendidas e as chaves gravadas durante a reescrita entram no
+arquivo novo antes da troca.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# PADRÕES DO CACHE
+CAPACIDADE_PADRAO = 100_000
+VALIDADE_PADRAO = 24 * 3600   # um dia
+
+# Campos do RegistroAbastecimento guardados no índice em disco
+_CAMPOS_REGISTRO = (
+    "tipo_combustivel", "quantidade_litros", "forma_pagamento",
+    "id_combustivel", "codigo_pagamento", "valor_por_litro", "versao_preco",
+    "valor_bruto", "valor_desconto", "valor_final",
+    "percentual_desconto",   # por último: índices antigos, sem ele, continuam legíveis
+)
+
+
+def _registro_para_lista(registro):
+    """Converte um RegistroAbastecimento em lista para o índice em disco"""
+    return [registro.data_abastecimento.isoformat()] + [getattr(registro, campo)
+                                                        for campo in _CAMPOS_REGISTRO]
+
+def _linha_indice(chave, vencimento, dados, registro):
+    """Linha JSONL de uma chave no índice em disco"""
+    return json.dumps([chave, vencimento, list(dados), _registro_para_lista(registro)],
+                      ensure_ascii=False) + "\n"
+
+def _registro_de_lista(valores):
+    """Reconstrói o RegistroAbastecimento guardado no índice, sem recalcular nada"""
+    import abastecimento   # importado aqui: abastecimento importa este módulo
+    from datetime import datetime
+
+    registro = abastecimento.RegistroAbastecimento.__new__(abastecimento.RegistroAbastecimento)
+    registro.data_abastecimento = datetime.fromisoformat(valores[0])
+    for campo, valor in zip(_CAMPOS_REGISTRO, valores[1:]):
+        setattr(registro, campo, valor)
+    return registro
+
+
+class CacheIdempotencia:
+    """
+    CLASSE: Cache de vendas por chave de idempotência
+    =================================================
+    Guarda {chave: (vencimento, dados do pedido, registro)} com
+    capacidade e validade limitadas.
+    """
+    def __init__(self, capacidade=CAPACIDADE_PADRAO, validade=VALIDADE_PADRAO,
+                 caminho_indice=None, relogio=time.time):
+        """
+        Args:
+            capacidade (int): Máximo de chaves em memória
+            validade (float): Segundos que cada chave é lembrada
+            caminho_indice (str): Arquivo JSONL para sobreviver a reinícios (opcional)
+            relogio (callable): Fonte do instante atual em segundos
+        """
+        if capacidade < 1 or validade <= 0:
+            raise ValueError("Capacidade e validade do cache devem ser positivas!")
+        self.capacidade = capacidade
+        self.validade = validade
+        self.caminho_indice = caminho_indice
+        self.relogio = relogio
+        self._entradas = OrderedDict()
+        self._em_andamento = {}   # chave: threading.Event do pedido em processamento
+        self._trava = threading.Lock()
+        self._arquivo = None
+        self._linhas_indice = 0
+        self._linhas_em_compactacao = None   # linhas gravadas durante uma compactação
+        self._contadores = dict.fromkeys(
+            ("consultas", "acertos", "perdas", "expirados", "descartados", "conflitos", "esperas"), 0)
+        if caminho_indice:
+            self._carregar_indice()
+
+    # ------------------------------------------------------------------
+    # MEMÓRIA
+    # ------------------------------------------------------------------
+    def _descartar(self, agora):
+        """Remove as chaves vencidas e as que passam da capacidade (com a trava adquirida)"""
+        entradas = self._entradas
+        while entradas:
+            if next(iter(entradas.values()))[0] > agora:
+                break
+            entradas.popitem(last=False)
+            self._contadores["expirados"] += 1
+        while len(entradas) > self.capacidade:
+            entradas.popitem(last=False)
+            self._contadores["descartados"] += 1
+
+    def consultar(self, chave):
+        """
+        Busca o registro de uma chave já processada
+
+        Returns:
+            RegistroAbastecimento: Registro original ou None
+        """
+        with self._trava:
+            self._descartar(self.relogio())
+            entrada = self._entradas.get(chave)
+            return entrada[2] if entrada is not None else None
+
+    def executar(self, chave, dados, funcao, *argumentos):
+        """
+        FUNÇÃO PRINCIPAL: Executa uma venda uma única vez por chave
+        ===========================================================
+        Args:
+            chave (str): Chave de idempotência do pedido
+            dados (tuple): Dados do pedido, comparados nas repetições
+            funcao (callable): Processa a venda; recebe *argumentos e
+                               devolve o RegistroAbastecimento
+            *argumentos: Argumentos de `funcao`
+
+        Returns:
+            tuple: (registro, repetido) - repetido é True quando o registro
+                   veio do cache
+
+        Raises:
+            ValueError: Se a chave já foi usada com outros dados, ou o
+                        erro de `funcao` (a chave fica livre para nova tentativa)
+        """
+        dados = tuple(dados)
+        while True:
+            with self._trava:
+                self._contadores["consultas"] += 1
+                self._descartar(self.relogio())
+                entrada = self._entradas.get(chave)
+                if entrada is not None:
+                    if entrada[1] != dados:
+                        self._contadores["conflitos"] += 1
+                        raise ValueError(f"Chave de idempotência '{chave}' já usada com outros dados!")
+                    self._contadores["acertos"] += 1
+                    return entrada[2], True
+                evento = self._em_andamento.get(chave)
+                if evento is None:
+                    self._contadores["perdas"] += 1
+                    evento = self._em_andamento[chave] = threading.Event()
+                    break
+                self._contadores["esperas"] += 1
+                self._contadores["consultas"] -= 1   # a nova volta do laço conta a consulta
+            evento.wait()
+
+        try:
+            registro = funcao(*argumentos)
+        except BaseException:
+            with self._trava:
+                del self._em_andamento[chave]
+            evento.set()
+            raise
+
+        retrato = None
+        with self._trava:
+            vencimento = self.relogio() + self.validade
+            self._entradas[chave] = (vencimento, dados, registro)
+            self._descartar(self.relogio())
+            del self._em_andamento[chave]
+            if self._arquivo is not None:
+                retrato = self._gravar_no_indice(chave, vencimento, dados, registro)
+        evento.set()
+        if retrato is not None:
+            self._compactar_indice(retrato)
+        return registro, False
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: consultas, acertos, perdas, expirados, descartados, conflitos,
+                  esperas, tamanho, capacidade e taxa de acerto
+        """
+        with self._trava:
+            estatisticas = dict(self._contadores)
+            estatisticas["tamanho"] = len(self._entradas)
+        estatisticas["capacidade"] = self.capacidade
+        consultas = estatisticas["consultas"]
+        estatisticas["taxa_acerto"] = round(estatisticas["acertos"] / consultas, 4) if consultas else 0.0
+        return estatisticas
+
+    def __len__(self):
+        return len(self._entradas)
+
+    # ------------------------------------------------------------------
+    # ÍNDICE EM DISCO
+    # ------------------------------------------------------------------
+    def _carregar_indice(self):
+        """Recarrega as chaves válidas do arquivo e o reescreve só com elas"""
+        agora = self.relogio()
+        if os.path.exists(self.caminho_indice):
+            with open(self.caminho_indice, "r", encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    try:
+                        chave, vencimento, dados, registro = json.loads(linha)
+                    except ValueError:
+                        continue   # última linha incompleta (queda durante a gravação)
+                    if vencimento > agora:
+                        self._entradas.pop(chave, None)
+                        self._entradas[chave] = (vencimento, tuple(dados), _registro_de_lista(registro))
+            self._descartar(agora)
+        else:
+            pasta = os.path.dirname(self.caminho_indice)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+        self._trocar_indice(self._reescrever_indice(self._entradas.items()), len(self._entradas))
+
+    def _reescrever_indice(self, entradas):
+        """
+        Grava as entradas em um arquivo temporário (sem a trava do cache)
+
+        Returns:
+            str: Caminho do arquivo temporário
+        """
+        temporario = self.caminho_indice + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            for chave, (vencimento, dados, registro) in entradas:
+                arquivo.write(_linha_indice(chave, vencimento, dados, registro))
+        return temporario
+
+    def _trocar_indice(self, temporario, linhas):
+        """Põe o arquivo reescrito no lugar do índice (troca atômica)"""
+        if self._arquivo is not None:
+            self._arquivo.close()
+        os.replace(temporario, self.caminho_indice)
+        self._linhas_indice = linhas
+        self._arquivo = open(self.caminho_indice, "a", encoding="utf-8")
+
+    def _compactar_indice(self, retrato):
+        """
+        Reescreve o índice apenas com as chaves de `retrato`, fora da trava
+
+        As chaves gravadas enquanto o arquivo é reescrito (guardadas em
+        _linhas_em_compactacao) são acrescentadas a ele antes da troca.
+        """
+        try:
+            temporario = self._reescrever_indice(retrato)
+        except BaseException:
+            with self._trava:
+                self._linhas_em_compactacao = None
+            raise
+        with self._trava:
+            linhas = self._linhas_em_compactacao
+            self._linhas_em_compactacao = None
+            if self._arquivo is None:   # fechado durante a reescrita
+                os.remove(temporario)
+                return
+            with open(temporario, "a", encoding="utf-8") as arquivo:
+                arquivo.writelines(linhas)
+            self._trocar_indice(temporario, len(retrato) + len(linhas))
+
+    def _gravar_no_indice(self, chave, vencimento, dados, registro):
+        """
+        Acrescenta uma chave ao índice (com a trava adquirida)
+
+        Returns:
+            list: Retrato das entradas a compactar (fora da trava) ou None
+        """
+        linha = _linha_indice(chave, vencimento, dados, registro)
+        self._arquivo.write(linha)
+        self._arquivo.flush()
+        self._linhas_indice += 1
+        if self._linhas_em_compactacao is not None:
+            self._linhas_em_compactacao.append(linha)
+        # o arquivo só cresce; ao passar do dobro da capacidade, é reescrito
+        elif self._linhas_indice > 2 * self.capacidade:
+            self._linhas_em_compactacao = []
+            return list(self._entradas.items())
+        return None
+
+    def fechar(self):
+        """Fecha o índice em disco"""
+        with self._trava:
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+# CACHE PADRÃO - usado por abastecimento.processar_abastecimento(..., chave_idempotencia=...)
+_cache_padrao = None
+_trava_padrao = threading.Lock()
+
+def obter_cache_padrao():
+    """
+    Obtém o cache usado pelo processamento de vendas (criado no primeiro uso)
+
+    Returns:
+        CacheIdempotencia: Cache padrão (somente em memória)
+    """
+    global _cache_padrao
+    if _cache_padrao is None:
+        with _trava_padrao:
+            if _cache_padrao is None:
+                _cache_padrao = CacheIdempotencia()
+    return _cache_padrao
+
+def configurar_cache_padrao(cache):
+    """
+    Troca o cache padrão (ex: por um com índice em disco)
+
+    Args:
+        cache (CacheIdempotencia): Novo cache padrão
+    """
+    global _cache_padrao
+    with _trava_padrao:
+        _cache_padrao = cache
@@ -0,0 +1,279 @@
+"""
+MÓDULO INSTRUMENTAÇÃO
+=====================
+Contadores e histogramas de latência para acompanhar onde o tempo é
+gasto no caminho de uma venda.
+
+Etapas medidas (ETAPAS):
+- validar:           validação dos dados da venda
+- consultar_preco:   busca do preço na tabela vigente
+- calcular_desconto: cálculo do desconto da forma de pagamento
+- montar_registro:   criação completa do RegistroAbastecimento
+- persistir:         gravação no diário em disco
+
+Custo quando desligado:
+Os módulos do sistema verificam a variável ATIVO antes de medir:
+
+    if instrumentacao.ATIVO:
+        inicio = instrumentacao.agora()
+
+Com ATIVO = False (padrão) resta apenas essa verificação; nenhum
+relógio é lido e nada é alocado. Por isso os pontos de medição podem
+ficar permanentemente no código.
+
+Leitura dos dados:
+- fotografia(): dicionário com contadores e histogramas
+- adicionar_destino(): registra uma função que recebe cada fotografia publicada
+- iniciar_despejo_periodico(): grava a fotografia em um arquivo JSON a cada N segundos
+- iniciar_servidor(): endpoint HTTP local (GET /metricas)
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# CHAVE GERAL - verificada em cada ponto de medição
+ATIVO = False
+
+ETAPAS = ("validar", "consultar_preco", "calcular_desconto", "montar_registro", "persistir")
+
+# LIMITES DOS BALDES DO HISTOGRAMA (em nanossegundos): 1-2-5 de 100 ns a 10 s
+LIMITES_NS = tuple(
+    base * fator
+    for fator in (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000)
+    for base in (1, 2, 5)
+) + (10_000_000_000,)
+
+agora = time.perf_counter_ns
+
+
+class Histograma:
+    """
+    CLASSE: Histograma de latências
+    ===============================
+    Conta as medições em baldes de limites fixos (LIMITES_NS), com custo
+    constante por medição e memória fixa, qualquer que seja o volume.
+    """
+    __slots__ = ("baldes", "quantidade", "soma_ns", "maximo_ns")
+
+    def __init__(self):
+        self.baldes = [0] * (len(LIMITES_NS) + 1)   # último balde: acima de 10 s
+        self.quantidade = 0
+        self.soma_ns = 0
+        self.maximo_ns = 0
+
+    def registrar(self, duracao_ns):
+        """Acrescenta uma medição (em nanossegundos)"""
+        self.baldes[bisect_left(LIMITES_NS, duracao_ns)] += 1
+        self.quantidade += 1
+        self.soma_ns += duracao_ns
+        if duracao_ns > self.maximo_ns:
+            self.maximo_ns = duracao_ns
+
+    def percentil(self, fracao):
+        """
+        Estima um percentil pelo limite superior do balde que o contém
+
+        Args:
+            fracao (float): Ex: 0.99 para o p99
+
+        Returns:
+            int: Latência estimada em nanossegundos
+        """
+        if not self.quantidade:
+            return 0
+        alvo = fracao * self.quantidade
+        acumulado = 0
+        for indice, contagem in enumerate(self.baldes):
+            acumulado += contagem
+            if acumulado >= alvo and contagem:
+                if indice < len(LIMITES_NS):
+                    return min(LIMITES_NS[indice], self.maximo_ns)
+                return self.maximo_ns
+        return self.maximo_ns
+
+    def resumo(self):
+        """
+        Returns:
+            dict: quantidade, média, p50, p99 e máximo em microssegundos
+        """
+        return {
+            "quantidade": self.quantidade,
+            "media_us": round(self.soma_ns / self.quantidade / 1000, 3) if self.quantidade else 0.0,
+            "p50_us": self.percentil(0.50) / 1000,
+            "p99_us": self.percentil(0.99) / 1000,
+            "maximo_us": self.maximo_ns / 1000,
+        }
+
+
+# ESTADO DAS MEDIÇÕES
+_trava = threading.Lock()
+_contadores = {}
+_histogramas = {etapa: Histograma() for etapa in ETAPAS}
+_destinos = []
+
+
+def ativar():
+    """Liga a coleta de métricas"""
+    global ATIVO
+    ATIVO = True
+
+def desativar():
+    """Desliga a coleta de métricas (os valores já coletados são mantidos)"""
+    global ATIVO
+    ATIVO = False
+
+def zerar():
+    """Apaga todos os contadores e histogramas"""
+    with _trava:
+        _contadores.clear()
+        for etapa in list(_histogramas):
+            _histogramas[etapa] = Histograma()
+
+def contar(nome, quantidade=1):
+    """
+    Incrementa um contador
+
+    Args:
+        nome (str): Nome do contador (ex: "abastecimentos_processados")
+        quantidade (int): Valor a somar
+    """
+    with _trava:
+        _contadores[nome] = _contadores.get(nome, 0) + quantidade
+
+def registrar_etapa(etapa, inicio_ns):
+    """
+    Registra a duração de uma etapa iniciada em inicio_ns (valor de agora())
+
+    Args:
+        etapa (str): Nome da etapa (ver ETAPAS; outros nomes criam novos histogramas)
+        inicio_ns (int): Instante de início obtido com agora()
+    """
+    duracao = agora() - inicio_ns
+    with _trava:
+        histograma = _histogramas.get(etapa)
+        if histograma is None:
+            histograma = _histogramas[etapa] = Histograma()
+        histograma.registrar(duracao)
+
+def fotografia():
+    """
+    Retrato atual das métricas
+
+    Returns:
+        dict: {"instante", "ativo", "contadores", "etapas": {etapa: resumo}}
+    """
+    with _trava:
+        return {
+            "instante": time.time(),
+            "ativo": ATIVO,
+            "contadores": dict(_contadores),
+            "etapas": {etapa: h.resumo() for etapa, h in _histogramas.items()},
+        }
+
+
+# ----------------------------------------------------------------------
+# DESTINOS (SINKS)
+# ----------------------------------------------------------------------
+def adicionar_destino(destino):
+    """
+    Registra um destino para as fotografias publicadas
+
+    Args:
+        destino (callable): Função que recebe o dicionário de fotografia()
+    """
+    _destinos.append(destino)
+
+def remover_destino(destino):
+    """Remove um destino registrado"""
+    if destino in _destinos:
+        _destinos.remove(destino)
+
+def publicar():
+    """
+    Envia a fotografia atual para todos os destinos registrados
+
+    Returns:
+        dict: Fotografia publicada
+    """
+    dados = fotografia()
+    for destino in list(_destinos):
+        destino(dados)
+    return dados
+
+def gravar_arquivo(caminho, dados=None):
+    """
+    Grava uma fotografia em JSON (troca atômica do arquivo)
+
+    Args:
+        caminho (str): Arquivo de destino
+        dados (dict): Fotografia (padrão: a atual)
+    """
+    import json   # importado sob demanda: só quem grava métricas paga a importação
+
+    if dados is None:
+        dados = fotografia()
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+def iniciar_despejo_periodico(caminho, intervalo=10.0):
+    """
+    Publica e grava a fotografia em arquivo a cada `intervalo` segundos
+
+    Args:
+        caminho (str): Arquivo JSON de destino
+        intervalo (float): Segundos entre gravações
+
+    Returns:
+        threading.Event: Evento que encerra o despejo quando acionado
+    """
+    parar = threading.Event()
+
+    def _laco():
+        while not parar.wait(intervalo):
+            gravar_arquivo(caminho, publicar())
+        gravar_arquivo(caminho, publicar())
+
+    threading.Thread(target=_laco, name="despejo-metricas", daemon=True).start()
+    return parar
+
+
+# ----------------------------------------------------------------------
+# ENDPOINT HTTP LOCAL
+# ----------------------------------------------------------------------
+def iniciar_servidor(host="127.0.0.1", porta=9109):
+    """
+    Inicia o endpoint local de métricas em uma thread de fundo
+
+    Responde GET /metricas com a fotografia em JSON.
+    Exemplo: curl http://127.0.0.1:9109/metricas
+
+    Returns:
+        ThreadingHTTPServer: Servidor em execução (use shutdown() para parar)
+    """
+    # http.server só é importado aqui: é pesado e não deve atrasar a
+    # inicialização dos módulos que apenas verificam ATIVO
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class ManipuladorMetricas(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metricas":
+                self.send_error(404)
+                return
+            corpo = json.dumps(fotografia(), ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, formato, *args):
+            pass   # sem log de cada leitura no terminal
+
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorMetricas)
+    threading.Thread(target=servidor.serve_forever, name="servidor-metricas", daemon=True).start()
+    return servidor
@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO INTERCÂMBIO
+==================
+Importação e exportação em massa de combustíveis, histórico de preços e
+vendas, em CSV, JSONL e em um formato binário colunar próprio.
+
+Memória limitada:
+Os arquivos são lidos e escritos em blocos de linhas; nunca há mais do
+que alguns blocos na memória, então arquivos de vários GB podem ser
+processados com memória constante.
+
+Leitura paralela de vendas:
+Os blocos de linhas de vendas são interpretados em paralelo por um grupo
+de processos (ProcessPoolExecutor). Os blocos voltam na ordem original
+e apenas alguns ficam "em voo" ao mesmo tempo. Cada processo recebe uma
+cópia dos preços, do histórico e das regras de desconto para calcular
+os valores ausentes.
+Observação: cada linha do arquivo deve ser um registro completo (campos
+CSV com quebra de linha dentro de aspas não são suportados).
+
+Formato colunar de vendas (arquivos .col), inspirado no Parquet:
+    "VNDC" + versão
+    grupo de linhas 1: coluna instante | coluna combustivel | ... (arrays binários)
+    grupo de linhas 2: ...
+    rodapé JSON: linhas, posição de cada coluna em cada grupo e os
+                 dicionários de nomes (combustível e pagamento viram ids)
+    tamanho do rodapé (8 bytes) + "VNDC"
+Uma coluna pode ser lida sozinha (ex: só valor_final para somar a
+receita), pulando direto para os seus bytes em cada grupo.
+
+Execução:
+    python intercambio.py combustiveis importar precos.csv
+    python intercambio.py historico exportar historico.jsonl
+    python intercambio.py vendas vendas.csv vendas.col
+    python intercambio.py vendas dados/diario vendas.jsonl
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import combustivel
+import pagamento
+import regras_desconto
+import relatorios
+
+LINHAS_POR_BLOCO = 20_000
+LINHAS_POR_GRUPO = 65_536
+
+CAMPOS_VENDA = relatorios.Venda._fields
+CABECALHO_VENDAS_CSV = ("instante", "combustivel", "litros", "pagamento",
+                        "valor_por_litro", "valor_bruto", "valor_desconto", "valor_final")
+
+# COLUNAS DO FORMATO COLUNAR - (nome, código do array)
+COLUNAS = (
+    ("instante", "d"),
+    ("combustivel", "I"),      # id no dicionário de combustíveis
+    ("litros", "d"),
+    ("pagamento", "I"),        # id no dicionário de formas de pagamento
+    ("valor_por_litro", "d"),
+    ("valor_bruto", "d"),
+    ("valor_desconto", "d"),
+    ("valor_final", "d"),
+)
+_MAGICO = b"VNDC"
+_VERSAO_FORMATO = 2   # 2: ids de combustível e pagamento em "I" (a versão 1 usava "H"/"B")
+_RODAPE = struct.Struct("<Q4s")
+_INVERTER_BYTES = sys.byteorder == "big"   # o arquivo é sempre little-endian
+
+
+def detectar_formato(caminho):
+    """
+    Identifica o formato pela extensão do arquivo
+
+    Returns:
+        str: "csv", "jsonl" ou "colunar"
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".csv":
+        return "csv"
+    if extensao in (".jsonl", ".json", ".ndjson"):
+        return "jsonl"
+    if extensao == ".col":
+        return "colunar"
+    raise ValueError(f"Formato do arquivo '{caminho}' não reconhecido (use .csv, .jsonl ou .col)!")
+
+def _blocos(iteravel, tamanho):
+    """Divide um iterável em listas de até `tamanho` itens"""
+    iterador = iter(iteravel)
+    while True:
+        bloco = list(islice(iterador, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+def _objeto_json(linha):
+    """
+    Interpreta uma linha JSONL
+
+    Raises:
+        ValueError: Se a linha não for um objeto JSON válido
+    """
+    try:
+        campos = json.loads(linha)
+    except json.JSONDecodeError:
+        raise ValueError("JSON inválido!")
+    if not isinstance(campos, dict):
+        raise ValueError("a linha deve ser um objeto JSON!")
+    return campos
+
+def _ler_registros(caminho, formato):
+    """
+    Lê um arquivo CSV ou JSONL como dicionários, um por vez
+
+    Yields:
+        tuple: (número da linha, dicionário de campos)
+
+    Raises:
+        ValueError: Se uma linha JSONL não for um objeto JSON válido
+    """
+    with open(caminho, "r", encoding="utf-8", newline="") as arquivo:
+        if formato == "csv":
+            for numero, campos in enumerate(csv.DictReader(arquivo), 2):
+                yield numero, campos
+        else:
+            for numero, linha in enumerate(arquivo, 1):
+                if linha.strip():
+                    try:
+                        campos = _objeto_json(linha)
+                    except ValueError as erro:
+                        raise ValueError(f"Linha {numero}: {erro}")
+                    yield numero, campos
+
+def _escrever_registros(caminho, formato, campos, linhas):
+    """Escreve tuplas em CSV (com cabeçalho) ou JSONL, em blocos"""
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        if formato == "csv":
+            escritor = csv.writer(arquivo)
+            escritor.writerow(campos)
+            for bloco in _blocos(linhas, LINHAS_POR_BLOCO):
+                escritor.writerows(bloco)
+        else:
+            for bloco in _blocos(linhas, LINHAS_POR_BLOCO):
+                arquivo.write("".join(json.dumps(dict(zip(campos, linha)), ensure_ascii=False) + "\n"
+                                      for linha in bloco))
+
+
+# ----------------------------------------------------------------------
+# COMBUSTÍVEIS E HISTÓRICO DE PREÇOS
+# ----------------------------------------------------------------------
+def importar_combustiveis(caminho):
+    """
+    Importa combustíveis (colunas: nome, preco), publicando UMA nova versão de preços
+
+    Os ouvintes de preços (ex: banco) recebem os preços que mudaram.
+
+    Returns:
+        int: Quantidade de combustíveis importados
+
+    Raises:
+        ValueError: Se alguma linha tiver preço inválido (nada é importado)
+    """
+    precos = {}
+    for numero, campos in _ler_registros(caminho, detectar_formato(caminho)):
+        nome = campos.get("nome")
+        nome = nome.strip() if isinstance(nome, str) else ""   # null/número no JSON = inválido
+        try:
+            preco = float(campos["preco"])
+        except (KeyError, ValueError, TypeError):
+            raise ValueError(f"Linha {numero}: preço inválido!")
+        if not nome or not 0 < preco < math.inf:   # também rejeita nan
+            raise ValueError(f"Linha {numero}: nome vazio/inválido ou preço não positivo!")
+        precos[nome] = preco
+    combustivel.carregar_precos(precos, avisar_ouvintes=True)
+    return len(precos)
+
+def exportar_combustiveis(caminho):
+    """
+    Exporta os combustíveis e preços vigentes
+
+    Returns:
+        int: Quantidade de combustíveis exportados
+    """
+    precos = combustivel.obter_tabela_precos().precos
+    _escrever_registros(caminho, detectar_formato(caminho), ("nome", "preco"), precos.items())
+    return len(precos)
+
+def _precos_do_historico(caminho):
+    """
+    Lê um arquivo de histórico, um preço por vez
+
+    Yields:
+        tuple: (nome, instante, preço)
+
+    Raises:
+        ValueError: Na primeira linha inválida
+    """
+    for numero, campos in _ler_registros(caminho, detectar_formato(caminho)):
+        try:
+            instante = relatorios._converter_instante(campos["instante"])
+            preco = float(campos["preco"])
+            nome = campos["combustivel"]
+            if not isinstance(nome, str) or not 0 < preco < math.inf:
+                raise ValueError
+        except (KeyError, ValueError, TypeError):
+            raise ValueError(f"Linha {numero}: registro de histórico inválido!")
+        yield nome, instante, preco
+
+def importar_historico(caminho, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Importa histórico de preços (colunas: combustivel, instante, preco)
+
+    Os preços lidos são juntados ao histórico atual de cada combustível;
+    a tabela de preços vigente não muda.
+
+    O arquivo é lido uma vez, em blocos de `linhas_por_bloco`; os pares
+    lidos são acumulados por combustível (sem repetições) e juntados ao
+    histórico uma única vez no final, em uma só versão do catálogo. Assim
+    nada é importado se alguma linha for inválida, e o histórico atual é
+    copiado e ordenado uma vez, e não uma vez por bloco.
+
+    Returns:
+        int: Quantidade de preços importados
+
+    Raises:
+        ValueError: Se alguma linha for inválida (nada é importado)
+    """
+    total = 0
+    novos = {}
+    for bloco in _blocos(_precos_do_historico(caminho), linhas_por_bloco):
+        for nome, instante, preco in bloco:
+            novos.setdefault(nome, set()).add((instante, preco))
+        total += len(bloco)
+
+    if novos:
+        historico = {nome: pares.union(combustivel.obter_historico_precos(nome))
+                     for nome, pares in novos.items()}
+        combustivel.carregar_precos({}, historico, avisar_ouvintes=True)
+    return total
+
+def exportar_historico(caminho):
+    """
+    Exporta o histórico de preços de todos os combustíveis
+
+    Returns:
+        int: Quantidade de preços exportados
+    """
+    linhas = [(nome, instante, preco)
+              for nome in combustivel.obter_tabela_precos().precos
+              for instante, preco in combustivel.obter_historico_precos(nome)]
+    _escrever_registros(caminho, detectar_formato(caminho), ("combustivel", "instante", "preco"), linhas)
+    return len(linhas)
+
+
+# ----------------------------------------------------------------------
+# VENDAS EM CSV/JSONL - LEITURA PARALELA POR BLOCOS
+# ----------------------------------------------------------------------
+def _iniciar_processo(precos, historico, percentual_desconto, motor_descontos):
+    """
+    Copia preços, histórico, desconto e motor de regras (estado() ou None)
+    do processo principal para um processo do grupo
+    """
+    # ouvintes herdados no fork gravariam no armazenamento do processo principal
+    pagamento._ouvintes_descontos.clear()
+    combustivel.carregar_precos(precos, historico)
+    pagamento.definir_percentual_desconto(percentual_desconto)
+    if motor_descontos is not None:
+        motor_descontos = regras_desconto.MotorDescontos.de_estado(motor_descontos)
+    pagamento.configurar_motor_descontos(motor_descontos)
+
+def _interpretar_bloco(formato, cabecalho, primeira_linha, linhas, ignorar_erros):
+    """
+    Interpreta um bloco de linhas de vendas (executado nos processos do grupo)
+
+    Returns:
+        tuple: (lista de Venda, lista de (número da linha, mensagem de erro))
+    """
+    vendas = []
+    erros = []
+    if formato == "csv":
+        registros = (dict(zip(cabecalho, campos)) for campos in csv.reader(linhas))
+    else:
+        registros = linhas   # cada linha JSONL é interpretada dentro do try abaixo
+    for numero, campos in enumerate(registros, primeira_linha):
+        try:
+            if formato != "csv":
+                if not campos.strip():
+                    continue
+                campos = _objeto_json(campos)
+            vendas.append(relatorios._venda_de_campos(campos))
+        except (KeyError, ValueError, TypeError) as erro:
+            if not ignorar_erros:
+                raise ValueError(f"Linha {numero}: {erro}")
+            erros.append((numero, str(erro)))
+    return vendas, erros
+
+def _interpretar_bloco_em_colunas(formato, cabecalho, primeira_linha, linhas, ignorar_erros):
+    """
+    Como _interpretar_bloco(), mas devolve as vendas em colunas (arrays e
+    dicionários de nomes), que custam bem menos para voltar ao processo
+    principal do que milhares de tuplas
+    """
+    vendas, erros = _interpretar_bloco(formato, cabecalho, primeira_linha, linhas, ignorar_erros)
+    nomes = {"combustivel": {}, "pagamento": {}}
+    colunas = {nome: array(codigo) for nome, codigo in COLUNAS}
+    for venda in vendas:
+        colunas["instante"].append(venda.instante)
+        colunas["combustivel"].append(nomes["combustivel"].setdefault(venda.tipo_combustivel,
+                                                                      len(nomes["combustivel"])))
+        colunas["litros"].append(venda.quantidade_litros)
+        colunas["pagamento"].append(nomes["pagamento"].setdefault(venda.forma_pagamento,
+                                                                  len(nomes["pagamento"])))
+        colunas["valor_por_litro"].append(venda.valor_por_litro)
+        colunas["valor_bruto"].append(venda.valor_bruto)
+        colunas["valor_desconto"].append(venda.valor_desconto)
+        colunas["valor_final"].append(venda.valor_final)
+    dicionarios = {coluna: list(ids) for coluna, ids in nomes.items()}
+    return ([colunas[nome] for nome, _ in COLUNAS], dicionarios), erros
+
+def _vendas_de_colunas(colunas, dicionarios):
+    """Reconstrói as vendas de um bloco em colunas (formato do arquivo .col ou dos processos)"""
+    combustiveis = dicionarios["combustivel"]
+    pagamentos = dicionarios["pagamento"]
+    Venda = relatorios.Venda
+    instante, comb, litros, pag, preco, bruto, desconto, final = colunas
+    for i in range(len(instante)):
+        yield Venda(instante[i], combustiveis[comb[i]], litros[i], pagamentos[pag[i]],
+                    preco[i], bruto[i], desconto[i], final[i])
+
+def ler_vendas(caminho, processos=None, linhas_por_bloco=LINHAS_POR_BLOCO, erros=None):
+    """
+    FUNÇÃO PRINCIPAL: Leitura de vendas em blocos
+    =============================================
+    Aceita CSV, JSONL ou o formato colunar (.col).
+
+    Args:
+        caminho (str): Arquivo de vendas
+        processos (int): Processos para interpretar os blocos (padrão: núcleos;
+                         1 = sem paralelismo)
+        linhas_por_bloco (int): Linhas por bloco
+        erros (list): Se informada, linhas inválidas são puladas e anotadas nela
+                      como (número da linha, mensagem); senão, geram ValueError
+
+    Yields:
+        Venda: Uma venda por linha, na ordem do arquivo
+    """
+    formato = detectar_formato(caminho)
+    if formato == "colunar":
+        with LeitorColunar(caminho) as leitor:
+            yield from leitor.iterar_vendas()
+        return
+
+    ignorar = erros is not None
+    with open(caminho, "r", encoding="utf-8", newline="") as arquivo:
+        cabecalho = None
+        primeira = 1
+        if formato == "csv":
+            cabecalho = next(csv.reader([arquivo.readline()]), None)
+            primeira = 2
+        blocos = _blocos(arquivo, linhas_por_bloco)
+
+        processos = processos or os.cpu_count() or 1
+        if processos == 1:
+            for bloco in blocos:
+                vendas, falhas = _interpretar_bloco(formato, cabecalho, primeira, bloco, ignorar)
+                primeira += len(bloco)
+                if ignorar:
+                    erros.extend(falhas)
+                yield from vendas
+            return
+
+        tabela = combustivel.obter_tabela_precos()
+        historico = {nome: combustivel.obter_historico_precos(nome) for nome in tabela.precos}
+        motor = pagamento.obter_motor_descontos()
+        with ProcessPoolExecutor(processos, initializer=_iniciar_processo,
+                                 initargs=(dict(tabela.precos), historico,
+                                           pagamento.PERCENTUAL_DESCONTO,
+                                           None if motor is None else motor.estado())) as grupo:
+            limite = 2 * processos   # blocos em voo: memória limitada
+            em_voo = []
+            for bloco in blocos:
+                em_voo.append(grupo.submit(_interpretar_bloco_em_colunas, formato, cabecalho,
+                                           primeira, bloco, ignorar))
+                primeira += len(bloco)
+                if len(em_voo) >= limite:
+                    (colunas, dicionarios), falhas = em_voo.pop(0).result()
+                    if ignorar:
+                        erros.extend(falhas)
+                    yield from _vendas_de_colunas(colunas, dicionarios)
+            for futuro in em_voo:
+                (colunas, dicionarios), falhas = futuro.result()
+                if ignorar:
+                    erros.extend(falhas)
+                yield from _vendas_de_colunas(colunas, dicionarios)
+
+def escrever_vendas(vendas, caminho):
+    """
+    Exporta vendas para CSV, JSONL ou formato colunar (pela extensão)
+
+    Args:
+        vendas (iterable): Vendas (relatorios.Venda), ex: relatorios.de_diario(pasta)
+        caminho (str): Arquivo de destino
+
+    Returns:
+        int: Quantidade de vendas escritas
+    """
+    formato = detectar_formato(caminho)
+    if formato == "colunar":
+        with EscritorColunar(caminho) as escritor:
+            escritor.escrever_muitas(vendas)
+            return escritor.linhas
+
+    contador = [0]
+
+    def _contar(fonte):
+        for venda in fonte:
+            contador[0] += 1
+            yield venda
+
+    _escrever_registros(caminho, formato, CABECALHO_VENDAS_CSV, _contar(vendas))
+    return contador[0]
+
+
+# ----------------------------------------------------------------------
+# FORMATO COLUNAR
+# ----------------------------------------------------------------------
+class EscritorColunar:
+    """
+    CLASSE: Escrita de vendas no formato colunar
+    ============================================
+    Acumula até `linhas_por_grupo` vendas em colunas (arrays) e grava o
+    grupo inteiro, coluna após coluna. O rodapé é escrito ao fechar.
+    """
+    def __init__(self, caminho, linhas_por_grupo=LINHAS_POR_GRUPO):
+        self.caminho = caminho
+        self.linhas_por_grupo = linhas_por_grupo
+        self.linhas = 0
+        self._arquivo = open(caminho, "wb")
+        self._arquivo.write(_MAGICO + bytes([_VERSAO_FORMATO]))
+        self._grupos = []
+        self._ids = {"combustivel": {}, "pagamento": {}}
+        self._nomes = {"combustivel": [], "pagamento": []}
+        self._colunas = {nome: array(codigo) for nome, codigo in COLUNAS}
+
+    def _id_de(self, coluna, nome):
+        """Id de um nome no dicionário da coluna (criado na primeira vez)"""
+        identificador = self._ids[coluna].get(nome)
+        if identificador is None:
+            identificador = self._ids[coluna][nome] = len(self._nomes[coluna])
+            self._nomes[coluna].append(nome)
+        return identificador
+
+    def escrever(self, venda):
+        """Acrescenta uma venda (relatorios.Venda)"""
+        colunas = self._colunas
+        colunas["instante"].append(venda.instante)
+        colunas["combustivel"].append(self._id_de("combustivel", venda.tipo_combustivel))
+        colunas["litros"].append(venda.quantidade_litros)
+        colunas["pagamento"].append(self._id_de("pagamento", venda.forma_pagamento))
+        colunas["valor_por_litro"].append(venda.valor_por_litro)
+        colunas["valor_bruto"].append(venda.valor_bruto)
+        colunas["valor_desconto"].append(venda.valor_desconto)
+        colunas["valor_final"].append(venda.valor_final)
+        self.linhas += 1
+        if len(colunas["instante"]) >= self.linhas_por_grupo:
+            self._gravar_grupo()
+
+    def escrever_muitas(self, vendas):
+        """Acrescenta todas as vendas de uma fonte"""
+        escrever = self.escrever
+        for venda in vendas:
+            escrever(venda)
+
+    def _gravar_grupo(self):
+        """Grava as colunas acumuladas como um grupo de linhas"""
+        quantidade = len(self._colunas["instante"])
+        if not quantidade:
+            return
+        posicoes = {}
+        for nome, codigo in COLUNAS:
+            coluna = self._colunas[nome]
+            if _INVERTER_BYTES:
+                coluna.byteswap()
+            posicoes[nome] = [self._arquivo.tell(), len(coluna) * coluna.itemsize]
+            coluna.tofile(self._arquivo)
+            self._colunas[nome] = array(codigo)
+        self._grupos.append({"linhas": quantidade, "colunas": posicoes})
+
+    def fechar(self):
+        """Grava o último grupo e o rodapé"""
+        if self._arquivo.closed:
+            return
+        self._gravar_grupo()
+        rodape = json.dumps({
+            "versao": _VERSAO_FORMATO,
+            "linhas": self.linhas,
+            "colunas": dict(COLUNAS),
+            "dicionarios": self._nomes,
+            "grupos": self._grupos,
+        }, ensure_ascii=False).encode("utf-8")
+        self._arquivo.write(rodape)
+        self._arquivo.write(_RODAPE.pack(len(rodape), _MAGICO))
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+class LeitorColunar:
+    """
+    CLASSE: Leitura do formato colunar
+    ==================================
+    Lê o rodapé na abertura; cada coluna é lida grupo a grupo, somente
+    com os bytes daquela coluna.
+    """
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        if self._arquivo.read(4) != _MAGICO:
+            self._arquivo.close()
+            raise ValueError(f"'{caminho}' não é um arquivo colunar de vendas!")
+        # Versões anteriores continuam legíveis: o tipo de cada coluna está no rodapé
+        versao = self._arquivo.read(1)[0]
+        if versao > _VERSAO_FORMATO:
+            self._arquivo.close()
+            raise ValueError(f"Arquivo colunar '{caminho}' na versão {versao}, "
+                             f"mais nova que a suportada ({_VERSAO_FORMATO})!")
+        self._arquivo.seek(-_RODAPE.size, io.SEEK_END)
+        tamanho, magico = _RODAPE.unpack(self._arquivo.read(_RODAPE.size))
+        if magico != _MAGICO:
+            self._arquivo.close()
+            raise ValueError(f"Arquivo colunar '{caminho}' incompleto (sem rodapé)!")
+        self._arquivo.seek(-_RODAPE.size - tamanho, io.SEEK_END)
+        rodape = json.loads(self._arquivo.read(tamanho))
+        self.linhas = rodape["linhas"]
+        self.tipos = rodape["colunas"]
+        self.dicionarios = rodape["dicionarios"]
+        self._grupos = rodape["grupos"]
+
+    @property
+    def colunas(self):
+        """Nomes das colunas do arquivo"""
+        return list(self.tipos)
+
+    def iterar_coluna(self, nome):
+        """
+        Lê uma coluna grupo a grupo (memória limitada ao tamanho de um grupo)
+
+        Yields:
+            array: Valores da coluna em um grupo de linhas
+        """
+        codigo = self.tipos.get(nome)
+        if codigo is None:
+            raise ValueError(f"Coluna '{nome}' não existe!")
+        for grupo in self._grupos:
+            posicao, tamanho = grupo["colunas"][nome]
+            self._arquivo.seek(posicao)
+            valores = array(codigo)
+            valores.frombytes(self._arquivo.read(tamanho))
+            if _INVERTER_BYTES:
+                valores.byteswap()
+            yield valores
+
+    def ler_coluna(self, nome):
+        """
+        Lê uma coluna inteira
+
+        Returns:
+            array: Todos os valores da coluna (ids para combustivel e pagamento;
+                   os nomes estão em self.dicionarios)
+        """
+        resultado = array(self.tipos[nome])
+        for valores in self.iterar_coluna(nome):
+            resultado.extend(valores)
+        return resultado
+
+    def somar_coluna(self, nome):
+        """
+        Soma uma coluna numérica lendo apenas os seus bytes
+
+        Returns:
+            float: Soma da coluna (ex: "valor_final" = receita total)
+        """
+        return sum(sum(valores) for valores in self.iterar_coluna(nome))
+
+    def iterar_vendas(self):
+        """
+        Reconstrói as vendas linha a linha
+
+        Yields:
+            Venda: Uma venda por linha
+        """
+        iteradores = [self.iterar_coluna(nome) for nome, _ in COLUNAS]
+        for colunas in zip(*iteradores):
+            yield from _vendas_de_colunas(colunas, self.dicionarios)
+
+    def fechar(self):
+        """Fecha o arquivo"""
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+def main():
+    """Ponto de entrada em linha de comando"""
+    parser = argparse.ArgumentParser(description="Importação e exportação em massa")
+    sub = parser.add_subparsers(dest="dados", required=True)
+
+    for dados in ("combustiveis", "historico"):
+        opcao = sub.add_parser(dados, help=f"importa ou exporta {dados}")
+        opcao.add_argument("acao", choices=("importar", "exportar"))
+        opcao.add_argument("arquivo", help="arquivo .csv ou .jsonl")
+        opcao.add_argument("--banco", default=None,
+                           help="banco SQLite do catálogo (a importação fica gravada nele)")
+
+    opcao = sub.add_parser("vendas", help="converte vendas entre formatos")
+    opcao.add_argument("entrada", help="arquivo .csv/.jsonl/.col ou pasta do diário")
+    opcao.add_argument("saida", help="arquivo .csv/.jsonl/.col")
+    opcao.add_argument("--processos", type=int, default=None, help="processos para a leitura")
+    opcao.add_argument("--ignorar-erros", action="store_true", help="pula linhas inválidas")
+    argumentos = parser.parse_args()
+
+    try:
+        if argumentos.dados == "vendas":
+            erros = [] if argumentos.ignorar_erros else None
+            if os.path.isdir(argumentos.entrada):
+                vendas = relatorios.de_diario(argumentos.entrada)
+            else:
+                vendas = ler_vendas(argumentos.entrada, argumentos.processos, erros=erros)
+            total = escrever_vendas(vendas, argumentos.saida)
+            print(f"{total} vendas escritas em {argumentos.saida}")
+            if erros:
+                print(f"{len(erros)} linhas inválidas ignoradas "
+                      f"(primeira: linha {erros[0][0]}: {erros[0][1]})")
+            return
+
+        funcoes = {
+            ("combustiveis", "importar"): importar_combustiveis,
+            ("combustiveis", "exportar"): exportar_combustiveis,
+            ("historico", "importar"): importar_historico,
+            ("historico", "exportar"): exportar_historico,
+        }
+        banco_dados = None
+        if argumentos.banco:
+            import banco   # só carrega o sqlite3 quando o catálogo está em um banco
+            banco_dados = banco.BancoDados(argumentos.banco)
+            banco.conectar_catalogo(banco_dados)
+        try:
+            total = funcoes[(argumentos.dados, argumentos.acao)](argumentos.arquivo)
+        finally:
+            if banco_dados is not None:
+                banco_dados.fechar()
+        print(f"{total} registros ({argumentos.dados}) - {argumentos.acao} concluído")
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,59 +20,114 @@ FUNCIONALIDADES PRINCIPAIS:
 - Gestão completa de abastecimentos
 - Administração de combustíveis e preços
 - Informações sobre descontos e pagamentos
+
+DESEMPENHO DA INTERFACE:
+- A tela é limpa com sequências ANSI, sem abrir um shell a cada redesenho
+- As telas fixas (cabeçalho, menus, "Sobre") são montadas uma única vez
+  e escritas com uma única chamada de write()
+- Os módulos do sistema só são importados quando o menu que os usa é
+  aberto pela primeira vez (o import fica dentro de cada função)
+
+Para medir o tempo de inicialização e o custo de cada tela:
+    python menu.py --medir
+
+MODO SEM INTERFACE (lote de comandos, saída em JSON por linha):
+    python menu.py --lote comandos.txt
+    cat comandos.txt | python menu.py --lote -
 """
 
-# IMPORTAÇÕES DO SISTEMA OPERACIONAL
-import os   # Para limpar tela (cls no Windows, clear no Linux)
+# IMPORTAÇÕES DA BIBLIOTECA PADRÃO (leves - os módulos do sistema são importados sob demanda)
+import sys
+
+# SEQUÊNCIA ANSI: cursor para o início + apaga a tela
+LIMPAR_TELA = "\033[H\033[2J"
+
+# TELAS FIXAS - montadas uma única vez na carga do módulo
+TELA_CABECALHO = (
+    "=" * 60 + "\n"
+    + " " * 15 + "POSTO DE COMBUSTÍVEL\n"
+    + " " * 10 + "Sistema de Controle de Abastecimento\n"
+    + "=" * 60 + "\n"
+)
+
+TELA_MENU_PRINCIPAL = (
+    "\n" + "=" * 40 + "\n"
+    "           MENU PRINCIPAL\n"
+    + "=" * 40 + "\n"
+    "1. Realizar Abastecimento\n"
+    "2. Gerenciar Combustíveis\n"
+    "3. Informações de Pagamento\n"
+    "4. Sobre o Sistema\n"
+    "0. Sair\n"
+    + "=" * 40 + "\n"
+)
+
+TELA_MENU_COMBUSTIVEIS = (
+    "\n" + "=" * 40 + "\n"
+    "      GERENCIAR COMBUSTÍVEIS\n"
+    + "=" * 40 + "\n"
+    "1. Listar Combustíveis\n"
+    "2. Cadastrar Novo Combustível\n"
+    "3. Atualizar Preço\n"
+    "0. Voltar ao Menu Principal\n"
+    + "=" * 40 + "\n"
+)
 
-# IMPORTAÇÕES DOS MÓDULOS CUSTOMIZADOS
-import combustivel   # Módulo para gerenciar combustíveis
-import pagamento     # Módulo para formas de pagamento
-import abastecimento  # Módulo principal de processamento
+TELA_SOBRE = (
+    "\n" + "=" * 60 + "\n"
+    "              SOBRE O SISTEMA\n"
+    + "=" * 60 + "\n"
+    "Sistema de Controle de Abastecimento\n"
+    "Desenvolvido para o curso de Lógica de Programação\n"
+    "SENAI 2025\n"
+    "\n"
+    "Funcionalidades:\n"
+    "• Cadastro e gerenciamento de combustíveis\n"
+    "• Múltiplas formas de pagamento\n"
+    "• Aplicação automática de descontos\n"
+    "• Cálculo detalhado do abastecimento\n"
+    "\n"
+    "Módulos:\n"
+    "• combustivel.py - Gerenciamento de combustíveis\n"
+    "• pagamento.py - Formas de pagamento e descontos\n"
+    "• abastecimento.py - Cálculos e processamento\n"
+    "• main.py - Interface principal\n"
+    + "=" * 60 + "\n"
+)
+
+# TELA INICIAL COMPLETA - limpeza + cabeçalho + menu em um único write()
+TELA_INICIAL = LIMPAR_TELA + TELA_CABECALHO + TELA_MENU_PRINCIPAL
 
 
 def limpar_tela():
     """
-    Limpa a tela do terminal
+    Limpa a tela do terminal com uma sequência ANSI
+
+    Não cria processos: apenas escreve alguns bytes no terminal
+    (antes era chamado o comando cls/clear do sistema a cada tela).
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.write(LIMPAR_TELA)
 
 def exibir_cabecalho():
     """
     Exibe o cabeçalho do sistema
     """
-    print("="*60)
-    print(" " * 15 + "POSTO DE COMBUSTÍVEL")
-    print(" " * 10 + "Sistema de Controle de Abastecimento")
-    print("="*60)
+    sys.stdout.write(TELA_CABECALHO)
 
 def exibir_menu_principal():
     """
     Exibe o menu principal do sistema
     """
-    print("\n" + "="*40)
-    print("           MENU PRINCIPAL")
-    print("="*40)
-    print("1. Realizar Abastecimento")
-    print("2. Gerenciar Combustíveis")
-    print("3. Informações de Pagamento")
-    print("4. Sobre o Sistema")
-    print("0. Sair")
-    print("="*40)
+    sys.stdout.write(TELA_MENU_PRINCIPAL)
 
 def menu_gerenciar_combustiveis():
     """
     Menu para gerenciar combustíveis
     """
+    garantir_estado()
+    
     while True:
-        print("\n" + "="*40)
-        print("      GERENCIAR COMBUSTÍVEIS")
-        print("="*40)
-        print("1. Listar Combustíveis")
-        print("2. Cadastrar Novo Combustível")
-        print("3. Atualizar Preço")
-        print("0. Voltar ao Menu Principal")
-        print("="*40)
+        sys.stdout.write(TELA_MENU_COMBUSTIVEIS)
         
         try:
             opcao = int(input("Escolha uma opção: "))
@@ -97,8 +152,14 @@ def listar_combustiveis():
     """
     Lista todos os combustíveis cadastrados
     """
+    import combustivel
+    
     combustiveis_list = combustivel.listar_combustiveis()
     
+    if len(combustiveis_list) > combustivel.COMBUSTIVEIS_POR_PAGINA:
+        listar_combustiveis_paginado()
+        return
+    
     print("\n" + "="*50)
     print("        COMBUSTÍVEIS CADASTRADOS")
     print("="*50)
@@ -111,10 +172,53 @@ def listar_combustiveis():
     
     print("="*50)
 
+def listar_combustiveis_paginado():
+    """
+    Lista os combustíveis em páginas, com busca pelo nome (catálogos grandes)
+    """
+    import busca
+    import combustivel
+    
+    consulta, pagina = "", 0
+    while True:
+        resultado = busca.buscar_combustiveis(consulta, pagina, combustivel.COMBUSTIVEIS_POR_PAGINA)
+        precos = combustivel.obter_tabela_precos().precos
+        
+        print("\n" + "="*50)
+        print(f"        COMBUSTÍVEIS CADASTRADOS - página {pagina + 1}")
+        if consulta:
+            print(f"        Busca: {consulta}")
+        print("="*50)
+        if resultado.aproximada:
+            print("Nenhum nome com esse texto; mostrando os mais parecidos.")
+        for nome in resultado.nomes:
+            print(f"{nome:<25} R$ {precos[nome]:>8.2f}/L")
+        if not resultado.nomes:
+            print("Nenhum combustível encontrado.")
+        print("="*50)
+        
+        entrada = input("'+' próxima, '-' anterior, texto para buscar, ENTER para sair: ").strip()
+        if not entrada:
+            return
+        if entrada == "+":
+            if resultado.tem_mais:
+                pagina += 1
+            else:
+                print("Esta é a última página!")
+        elif entrada == "-":
+            if pagina > 0:
+                pagina -= 1
+            else:
+                print("Esta é a primeira página!")
+        else:
+            consulta, pagina = entrada, 0
+
 def cadastrar_novo_combustivel():
     """
     Cadastra um novo tipo de combustível
     """
+    import combustivel
+    
     print("\n=== CADASTRAR NOVO COMBUSTÍVEL ===")
     
     nome = input("Nome do combustível: ").strip()
@@ -140,15 +244,28 @@ def atualizar_preco_combustivel():
     """
     Atualiza o preço de um combustível existente
     """
+    import combustivel
+    
     print("\n=== ATUALIZAR PREÇO DE COMBUSTÍVEL ===")
     
-    # Listar combustíveis primeiro
-    listar_combustiveis()
+    catalogo_grande = len(combustivel.listar_combustiveis()) > combustivel.COMBUSTIVEIS_POR_PAGINA
+    
+    # Listar combustíveis primeiro (em catálogos grandes, o nome é buscado)
+    if not catalogo_grande:
+        listar_combustiveis()
     
     nome = input("\nNome do combustível para atualizar: ").strip()
     if not combustivel.validar_combustivel(nome):
-        print("Combustível não encontrado!")
-        return
+        import busca
+        
+        # sem diferença de acentos/maiúsculas; parte do nome abre a busca em páginas
+        encontrado = busca.resolver_combustivel(nome) if nome else None
+        if encontrado is None and catalogo_grande:
+            encontrado = combustivel.escolher_combustivel_paginado(nome)
+        if encontrado is None:
+            print("Combustível não encontrado!")
+            return
+        nome = encontrado
     
     preco_atual = combustivel.obter_preco_combustivel(nome)
     print(f"Preço atual: R$ {preco_atual:.2f}/L")
@@ -171,6 +288,10 @@ def menu_informacoes_pagamento():
     """
     Exibe informações sobre formas de pagamento
     """
+    import pagamento
+    
+    garantir_estado()
+    
     print("\n" + "="*50)
     print("        INFORMAÇÕES DE PAGAMENTO")
     print("="*50)
@@ -203,6 +324,7 @@ def realizar_abastecimento():
     2. Valida as informações inseridas  
     3. Processa os cálculos (valor bruto, desconto, final)
     4. Exibe o resumo formatado como comprovante
+    5. Grava a venda no diário permanente em disco
     
     Integração entre módulos:
     - abastecimento: coleta dados e processa
@@ -211,6 +333,12 @@ def realizar_abastecimento():
     
     Fluxo de trabalho completo demonstrando modularização.
     """
+    # IMPORTAÇÃO SOB DEMANDA - feita só no primeiro abastecimento
+    import abastecimento
+    import diario
+    
+    garantir_estado()
+    
     try:
         # ETAPA 1: COLETA DE DADOS
         # Chama função do módulo abastecimento para coletar:
@@ -245,6 +373,11 @@ def realizar_abastecimento():
         # Mostra resumo detalhado formatado para o cliente
         abastecimento.exibir_resumo_abastecimento(registro)
         
+        # ETAPA 5: GRAVAÇÃO NO DIÁRIO
+        # Acrescenta a venda ao diário em disco para relatórios e conciliação;
+        # só confirma depois que a venda chegou de fato ao disco
+        diario.obter_diario_padrao().registrar(registro, duravel=True)
+        
         # CONFIRMAÇÃO FINAL
         print("\nAbastecimento realizado com sucesso!")
         
@@ -259,28 +392,44 @@ def exibir_sobre():
     """
     Exibe informações sobre o sistema
     """
-    print("\n" + "="*60)
-    print("              SOBRE O SISTEMA")
-    print("="*60)
-    print("Sistema de Controle de Abastecimento")
-    print("Desenvolvido para o curso de Lógica de Programação")
-    print("SENAI 2025")
-    print()
-    print("Funcionalidades:")
-    print("• Cadastro e gerenciamento de combustíveis")
-    print("• Múltiplas formas de pagamento")
-    print("• Aplicação automática de descontos")
-    print("• Cálculo detalhado do abastecimento")
-    print()
-    print("Módulos:")
-    print("• combustivel.py - Gerenciamento de combustíveis")
-    print("• pagamento.py - Formas de pagamento e descontos")
-    print("• abastecimento.py - Cálculos e processamento")
-    print("• main.py - Interface principal")
-    print("="*60)
+    sys.stdout.write(TELA_SOBRE)
     
     input("\nPressione ENTER para voltar...")
 
+# ESTADO JÁ RESTAURADO? (a restauração é feita na primeira tela que precisa dele)
+_estado_verificado = False
+
+def restaurar_estado():
+    """
+    Restaura combustíveis, preços e livro de vendas salvos antes do último
+    encerramento (ou queda) e passa a gravar instantâneos periódicos
+
+    Returns:
+        bool: True se o estado foi restaurado
+    """
+    import recuperacao
+    
+    global _estado_verificado
+    _estado_verificado = True
+    try:
+        recuperacao.iniciar_padrao()
+        return True
+    except (OSError, ValueError, KeyError) as e:
+        # Instantâneo ilegível ou incompleto: o sistema continua com o catálogo padrão
+        # (aviso em stderr: no modo lote, stdout só tem as linhas JSON)
+        print(f"Aviso: estado anterior não restaurado ({e!r})", file=sys.stderr)
+        return False
+
+def garantir_estado():
+    """
+    Restaura o estado salvo na primeira vez em que uma tela precisa dele
+
+    Assim a tela inicial aparece sem esperar a leitura do instantâneo e do
+    diário, e "Sobre" ou "Sair" nunca pagam esse custo.
+    """
+    if not _estado_verificado:
+        restaurar_estado()
+
 def main():
     """
     FUNÇÃO PRINCIPAL DO SISTEMA (LOOP PRINCIPAL)
@@ -296,13 +445,15 @@ def main():
     
     Padrão de design: Menu principal com sub-menus
     """
+    # O estado anterior (instantâneo + cauda do diário) só é restaurado
+    # quando uma tela que usa combustíveis, pagamentos ou vendas é aberta
+    
     # LOOP PRINCIPAL DO SISTEMA
     while True:  # Loop infinito - só para quando usuário escolher sair
         try:
             # PREPARAR INTERFACE
-            limpar_tela()          # Limpa terminal para melhor visual
-            exibir_cabecalho()     # Mostra título do sistema
-            exibir_menu_principal() # Exibe opções disponíveis
+            # Limpa o terminal e mostra cabeçalho + menu com um único write()
+            sys.stdout.write(TELA_INICIAL)
             
             # CAPTURAR ESCOLHA DO USUÁRIO
             opcao = int(input("Escolha uma opção: "))
@@ -354,8 +505,318 @@ def main():
             print(f"\nErro inesperado: {e}")
             input("\nPressione ENTER para continuar...")
 
+# ----------------------------------------------------------------------
+# MODO SEM INTERFACE (LOTE DE COMANDOS)
+# ----------------------------------------------------------------------
+# Operações aceitas em cada linha do arquivo de comandos:
+#   venda;Gasolina;30;PIX            (ou: abastecer;...)
+#   cadastrar;Gasolina Premium;6.49
+#   preco;Gasolina;5.99
+# Ou em JSON, uma linha por comando:
+#   {"op": "venda", "combustivel": "Gasolina", "litros": 30, "pagamento": "PIX"}
+#   {"op": "cadastrar", "nome": "Gasolina Premium", "preco": 6.49}
+#   {"op": "preco", "nome": "Gasolina", "preco": 5.99}
+# Linhas vazias e iniciadas por # são ignoradas.
+_CAMPOS_COMANDO = {
+    "venda": ("combustivel", "litros", "pagamento"),
+    "abastecer": ("combustivel", "litros", "pagamento"),
+    "cadastrar": ("nome", "preco"),
+    "preco": ("nome", "preco"),
+}
+
+def interpretar_comando(linha):
+    """
+    Converte uma linha do arquivo de comandos em um dicionário
+
+    Args:
+        linha (str): Linha em texto (campos separados por ;) ou JSON
+
+    Returns:
+        dict: Comando com a chave "op" e os campos da operação
+
+    Raises:
+        ValueError: Se a operação for desconhecida ou faltarem campos
+    """
+    if linha.startswith("{"):
+        import json
+        try:
+            comando = json.loads(linha)
+        except json.JSONDecodeError:
+            raise ValueError("JSON inválido!")
+        if not isinstance(comando, dict):
+            raise ValueError("O comando JSON deve ser um objeto!")
+        operacao = str(comando.get("op", "")).lower()
+    else:
+        partes = [parte.strip() for parte in linha.split(";")]
+        operacao = partes[0].lower()
+        campos = _CAMPOS_COMANDO.get(operacao)
+        if campos is None:
+            raise ValueError(f"Operação '{partes[0]}' desconhecida!")
+        if len(partes) != len(campos) + 1:
+            raise ValueError(f"A operação '{operacao}' espera {len(campos)} campos!")
+        comando = dict(zip(campos, partes[1:]))
+
+    campos = _CAMPOS_COMANDO.get(operacao)
+    if campos is None:
+        raise ValueError(f"Operação '{operacao}' desconhecida!")
+    faltando = [campo for campo in campos if campo not in comando]
+    if faltando:
+        raise ValueError(f"Campos ausentes: {', '.join(faltando)}")
+    comando["op"] = operacao
+    return comando
+
+def executar_comando(comando, diario_vendas=None):
+    """
+    Executa um comando já interpretado (sem nenhuma interação com o usuário)
+
+    Args:
+        comando (dict): Retorno de interpretar_comando()
+        diario_vendas (DiarioAbastecimentos): Diário onde gravar as vendas (None = não grava)
+
+    Returns:
+        dict: Resultado da operação
+
+    Raises:
+        ValueError: Se os dados forem inválidos
+        TypeError: Se um campo JSON tiver um tipo inesperado (ex: lista no lugar de texto)
+    """
+    import combustivel
+    
+    operacao = comando["op"]
+    if operacao in ("venda", "abastecer"):
+        import abastecimento
+        registro = abastecimento.processar_abastecimento(
+            comando["combustivel"], comando["litros"], comando["pagamento"]
+        )
+        if diario_vendas is not None:
+            diario_vendas.registrar(registro)
+        return {
+            "combustivel": registro.tipo_combustivel,
+            "litros": registro.quantidade_litros,
+            "pagamento": registro.forma_pagamento,
+            "valor_por_litro": registro.valor_por_litro,
+            "versao_preco": registro.versao_preco,
+            "valor_bruto": round(registro.valor_bruto, 2),
+            "valor_desconto": round(registro.valor_desconto, 2),
+            "valor_final": round(registro.valor_final, 2),
+        }
+
+    # CADASTRO E ATUALIZAÇÃO DE PREÇO - mesmas regras das telas interativas
+    if not isinstance(comando["nome"], str):
+        raise ValueError("Nome inválido!")
+    nome = comando["nome"].strip()
+    try:
+        preco = float(comando["preco"])
+    except (ValueError, TypeError):
+        raise ValueError("Preço inválido!")
+    if not nome:
+        raise ValueError("Nome não pode estar vazio!")
+    if not 0 < preco < float("inf"):   # também rejeita nan
+        raise ValueError("O preço deve ser maior que zero!")
+    if operacao == "cadastrar":
+        combustivel.cadastrar_combustivel(nome, preco)
+    elif not combustivel.atualizar_preco_combustivel(nome, preco):
+        raise ValueError("Combustível não encontrado!")
+    return {"nome": nome, "preco": preco}
+
+def executar_lote(entrada, saida, diario_vendas=None):
+    """
+    FUNÇÃO: Executar comandos sem interface (modo lote)
+    ===================================================
+    Lê os comandos de um arquivo ou pipe e escreve um resultado JSON por
+    linha, sem limpar a tela, sem mensagens de entrada e sem pausas.
+
+    As vendas entram no diário em commit em grupo: uma linha com "ok": true
+    só está garantida em disco quando o lote termina (o diário é
+    sincronizado antes de retornar). Uma falha do diário (OSError) é
+    informada na linha do comando em que aconteceu; a da sincronização
+    final vai para o resumo, em "erro_diario".
+
+    Exemplo de saída:
+        {"linha": 1, "op": "venda", "ok": true, "valor_final": 156.33, ...}
+        {"linha": 2, "op": "preco", "ok": false, "erro": "Combustível não encontrado!"}
+
+    Args:
+        entrada: Arquivo ou fluxo de texto com os comandos
+        saida: Arquivo ou fluxo de texto para os resultados
+        diario_vendas (DiarioAbastecimentos): Diário onde gravar as vendas (None = não grava)
+
+    Returns:
+        dict: Resumo (comandos, sucessos, erros, por operação, segundos, comandos_por_segundo
+              e erro_diario, se a sincronização final falhou)
+    """
+    import json
+    import time
+    
+    sucessos = 0
+    erros = 0
+    por_operacao = {}
+    inicio = time.perf_counter()
+    
+    for numero, linha in enumerate(entrada, 1):
+        linha = linha.strip()
+        if not linha or linha.startswith("#"):
+            continue
+        resultado = {"linha": numero}
+        try:
+            comando = interpretar_comando(linha)
+            resultado["op"] = comando["op"]
+            resultado["ok"] = True
+            resultado.update(executar_comando(comando, diario_vendas))
+            sucessos += 1
+            por_operacao[comando["op"]] = por_operacao.get(comando["op"], 0) + 1
+        except (ValueError, TypeError) as e:
+            resultado["ok"] = False
+            resultado["erro"] = str(e)
+            erros += 1
+        except OSError as e:
+            # Diário (ou outro armazenamento) indisponível: falha só deste comando
+            resultado["ok"] = False
+            resultado["erro"] = f"Falha ao gravar: {e}"
+            erros += 1
+        saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    
+    erro_diario = None
+    if diario_vendas is not None:
+        try:
+            diario_vendas.sincronizar()
+        except OSError as e:
+            erro_diario = str(e)
+    segundos = time.perf_counter() - inicio
+    total = sucessos + erros
+    resumo = {
+        "comandos": total,
+        "sucessos": sucessos,
+        "erros": erros,
+        "por_operacao": por_operacao,
+        "segundos": round(segundos, 6),
+        "comandos_por_segundo": round(total / segundos, 1) if segundos else 0.0,
+    }
+    if erro_diario is not None:
+        resumo["erro_diario"] = erro_diario
+    return resumo
+
+def main_lote(argumentos):
+    """
+    Ponto de entrada do modo lote em linha de comando
+
+    Exemplos:
+        python menu.py --lote comandos.txt > resultados.jsonl
+        cat comandos.txt | python menu.py --lote - --sem-diario
+
+    O estado salvo é restaurado antes dos comandos, com ou sem diário.
+    O resumo com a vazão é escrito em stderr ao final, em JSON.
+    
+    Returns:
+        int: Código de saída (1 se algum comando falhou)
+    """
+    import json
+    
+    diario_vendas = None
+    if not argumentos.sem_diario:
+        import diario
+        diario_vendas = diario.obter_diario_padrao()
+    restaurar_estado()
+    
+    entrada = sys.stdin if argumentos.lote == "-" else open(argumentos.lote, "r", encoding="utf-8")
+    saida = sys.stdout if argumentos.saida is None else open(argumentos.saida, "w", encoding="utf-8")
+    try:
+        resumo = executar_lote(entrada, saida, diario_vendas)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if saida is not sys.stdout:
+            saida.close()
+    sys.stderr.write(json.dumps({"resumo": resumo}, ensure_ascii=False) + "\n")
+    return 1 if resumo["erros"] or "erro_diario" in resumo else 0
+
+def medir_desempenho(repeticoes=10):
+    """
+    FUNÇÃO: Medir inicialização e custo das telas
+    =============================================
+    Mede, em processos novos do Python, o tempo para iniciar o menu e o
+    tempo de importação dos módulos de cada submenu (pago só na primeira
+    entrada). Depois mede o custo de desenhar cada tela fixa.
+
+    Args:
+        repeticoes (int): Execuções de cada medição de processo (usa a mediana)
+    """
+    import io
+    import os
+    import statistics
+    import subprocess
+    import time
+
+    pasta = os.path.dirname(os.path.abspath(__file__))
+
+    def _processo_ms(codigo):
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            subprocess.run([sys.executable, "-c", codigo], cwd=pasta, check=True)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tempos)
+
+    def _importacao_ms(modulos):
+        codigo = (f"import time; t = time.perf_counter(); import {modulos}; "
+                  "print((time.perf_counter() - t) * 1000)")
+        saidas = [float(subprocess.run([sys.executable, "-c", codigo], cwd=pasta, check=True,
+                                       capture_output=True, text=True).stdout)
+                  for _ in range(repeticoes)]
+        return statistics.median(saidas)
+
+    print("INICIALIZAÇÃO (processo novo, mediana)")
+    interpretador = _processo_ms("pass")
+    com_menu = _processo_ms("import menu")
+    print(f"  Python vazio:                 {interpretador:8.2f} ms")
+    print(f"  Python + import menu:         {com_menu:8.2f} ms  (menu: {com_menu - interpretador:+.2f} ms)")
+
+    print("\nPRIMEIRA ENTRADA EM CADA MENU (importação dos módulos)")
+    for rotulo, modulos in (("Realizar Abastecimento", "abastecimento, diario"),
+                            ("Gerenciar Combustíveis", "combustivel"),
+                            ("Informações de Pagamento", "pagamento")):
+        print(f"  {rotulo:<28} {_importacao_ms(modulos):8.2f} ms")
+
+    print("\nCUSTO POR TELA (média de 10.000 desenhos)")
+    telas = (("Limpar + cabeçalho + menu", TELA_INICIAL),
+             ("Menu de combustíveis", TELA_MENU_COMBUSTIVEIS),
+             ("Sobre o sistema", TELA_SOBRE))
+    for rotulo, tela in telas:
+        destino = io.StringIO()
+        inicio = time.perf_counter()
+        for _ in range(10_000):
+            destino.write(tela)
+        print(f"  {rotulo:<28} {(time.perf_counter() - inicio) / 10_000 * 1e6:8.3f} us")
+
+    if os.name != "nt":
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            os.system("clear > /dev/null")
+        custo = (time.perf_counter() - inicio) / repeticoes * 1000
+        print(f"\n  Referência - os.system('clear'): {custo:.2f} ms por tela")
+
 # PONTO DE ENTRADA DO PROGRAMA
 # Esta condição garante que main() só executa se o arquivo for rodado diretamente
 # (não quando importado como módulo)
 if __name__ == "__main__":
-    main()  # Chama a função principal para iniciar o sistema
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # OPÇÕES DE LINHA DE COMANDO (argparse só é importado quando usado)
+        import argparse
+        parser = argparse.ArgumentParser(description="Sistema de Controle de Abastecimento")
+        parser.add_argument("--medir", action="store_true",
+                            help="mede inicialização e custo das telas")
+        parser.add_argument("--lote", metavar="ARQUIVO",
+                            help="executa comandos de um arquivo ('-' = entrada padrão) sem interface")
+        parser.add_argument("--saida", metavar="ARQUIVO",
+                            help="no modo lote, grava os resultados neste arquivo")
+        parser.add_argument("--sem-diario", action="store_true",
+                            help="no modo lote, não grava as vendas no diário")
+        argumentos = parser.parse_args()
+        if argumentos.medir:
+            medir_desempenho()
+        elif argumentos.lote:
+            sys.exit(main_lote(argumentos))
+        else:
+            main()
+    else:
+        main()  # Chama a função principal para iniciar o sistema
\ No newline at end of file
@@ -10,6 +10,10 @@ Regras de negócio implementadas:
 - Cartão de Crédito não recebe desconto (taxas da operadora)
 """
 
+import threading
+
+import instrumentacao  # Contador de descontos concedidos (desligado por padrão)
+
 # CONSTANTES DO SISTEMA - Configurações das formas de pagamento
 # Dicionário que mapeia códigos numéricos para nomes das formas de pagamento
 # Facilita a criação de menus numerados para o usuário
@@ -28,6 +32,28 @@ PAGAMENTO_COM_DESCONTO = ["Dinheiro", "PIX", "Cartão de Débito"]
 # CONFIGURAÇÃO DE DESCONTO - Percentual aplicado
 PERCENTUAL_DESCONTO = 0.10  # 10% de desconto (0.10 = 10/100)
 
+# MOTOR DE REGRAS DE DESCONTO (opcional) - ver módulo regras_desconto
+# Sem motor, vale a regra fixa acima; com motor, o desconto de cada venda
+# depende também do combustível, do volume e da hora.
+_motor_descontos = None
+
+# OUVINTES DE DESCONTO - funções avisadas a cada alteração da configuração de
+# desconto (percentual ou motor de regras), ex: o módulo recuperacao grava a
+# alteração em disco. A troca do percentual e do motor avisa ANTES de valer
+# (se um ouvinte falhar, nada muda); a alteração de regras do motor instalado
+# avisa logo depois de publicada (ver MotorDescontos.definir_regra).
+_ouvintes_descontos = []
+_trava_descontos = threading.Lock()
+
+# ÍNDICES DE CONSULTA RÁPIDA - montados uma vez a partir das constantes acima
+# O código numérico de FORMAS_PAGAMENTO é o id da forma de pagamento.
+_CODIGO_POR_FORMA = {nome: codigo for codigo, nome in FORMAS_PAGAMENTO.items()}
+_FORMAS_COM_DESCONTO = frozenset(PAGAMENTO_COM_DESCONTO)
+# Lista indexada pelo código: True se a forma de pagamento tem desconto
+_DESCONTO_POR_CODIGO = [False] * (max(FORMAS_PAGAMENTO) + 1)
+for _codigo, _nome in FORMAS_PAGAMENTO.items():
+    _DESCONTO_POR_CODIGO[_codigo] = _nome in _FORMAS_COM_DESCONTO
+
 def listar_formas_pagamento():
     """
     Lista todas as formas de pagamento disponíveis
@@ -47,7 +73,7 @@ def tem_desconto(forma_pagamento):
     Returns:
         bool: True se tem desconto, False caso contrário
     """
-    return forma_pagamento in PAGAMENTO_COM_DESCONTO
+    return forma_pagamento in _FORMAS_COM_DESCONTO
 
 def calcular_desconto(valor_total, forma_pagamento):
     """
@@ -88,6 +114,54 @@ def obter_percentual_desconto():
     """
     return PERCENTUAL_DESCONTO
 
+def definir_percentual_desconto(percentual):
+    """
+    Altera o percentual de desconto das formas de pagamento com desconto
+    
+    Usada ao restaurar um estado salvo (módulo recuperacao) e ao copiar a
+    configuração para outros processos (módulo intercambio).
+    
+    Args:
+        percentual (float): Novo percentual em fração (0.10 para 10%)
+    
+    Raises:
+        ValueError: Se o percentual não for um número entre 0 e 1
+    """
+    global PERCENTUAL_DESCONTO
+    if isinstance(percentual, bool):
+        raise ValueError(f"Percentual de desconto {percentual!r} inválido!")
+    try:
+        percentual = float(percentual)
+    except (ValueError, TypeError):
+        raise ValueError(f"Percentual de desconto {percentual!r} inválido!")
+    if not 0.0 <= percentual <= 1.0:   # também rejeita nan
+        raise ValueError("O percentual de desconto deve estar entre 0 e 1!")
+    with _trava_descontos:
+        _notificar_ouvintes_descontos(percentual, _motor_descontos)
+        PERCENTUAL_DESCONTO = percentual
+
+def _notificar_ouvintes_descontos(percentual, motor):
+    """Avisa os ouvintes sobre a configuração de desconto (chamado com _trava_descontos adquirida)"""
+    for ouvinte in _ouvintes_descontos:
+        ouvinte(percentual, motor)
+
+def adicionar_ouvinte_descontos(ouvinte):
+    """
+    Registra uma função chamada a cada alteração da configuração de desconto
+
+    Args:
+        ouvinte (callable): Recebe (percentual, motor) - a configuração que
+                            passa a valer (motor None = regra fixa)
+    """
+    with _trava_descontos:
+        _ouvintes_descontos.append(ouvinte)
+
+def remover_ouvinte_descontos(ouvinte):
+    """Remove uma função registrada com adicionar_ouvinte_descontos()"""
+    with _trava_descontos:
+        if ouvinte in _ouvintes_descontos:
+            _ouvintes_descontos.remove(ouvinte)
+
 def exibir_menu_pagamento():
     """
     Exibe o menu de formas de pagamento e retorna a escolha do usuário
@@ -125,7 +199,7 @@ def validar_forma_pagamento(forma_pagamento):
     Returns:
         bool: True se é válida, False caso contrário
     """
-    return forma_pagamento in FORMAS_PAGAMENTO.values()
+    return forma_pagamento in _CODIGO_POR_FORMA
 
 def obter_info_desconto(forma_pagamento):
     """
@@ -141,4 +215,132 @@ def obter_info_desconto(forma_pagamento):
         "tem_desconto": tem_desconto(forma_pagamento),
         "percentual": PERCENTUAL_DESCONTO if tem_desconto(forma_pagamento) else 0.0,
         "percentual_exibicao": f"{int(PERCENTUAL_DESCONTO * 100)}%" if tem_desconto(forma_pagamento) else "0%"
-    }
\ No newline at end of file
+    }
+
+def obter_codigo_pagamento(forma_pagamento):
+    """
+    Converte o nome da forma de pagamento em seu código numérico
+
+    Args:
+        forma_pagamento (str): Nome da forma de pagamento
+
+    Returns:
+        int: Código da forma de pagamento ou None se inválida
+    """
+    return _CODIGO_POR_FORMA.get(forma_pagamento)
+
+def obter_forma_por_codigo(codigo):
+    """
+    Obtém o nome da forma de pagamento a partir do código
+
+    Args:
+        codigo (int): Código da forma de pagamento
+
+    Returns:
+        str: Nome da forma de pagamento
+    """
+    return FORMAS_PAGAMENTO[codigo]
+
+def validar_codigo_pagamento(codigo):
+    """
+    Valida se o código corresponde a uma forma de pagamento
+
+    Apenas int de verdade: 1.0 e True são iguais a 1 no dicionário, mas
+    não servem de índice nas listas consultadas pelo código.
+
+    Args:
+        codigo (int): Código da forma de pagamento
+
+    Returns:
+        bool: True se o código é válido
+    """
+    return type(codigo) is int and codigo in FORMAS_PAGAMENTO
+
+def tem_desconto_por_codigo(codigo):
+    """
+    Verifica pelo código se a forma de pagamento tem desconto
+
+    Args:
+        codigo (int): Código da forma de pagamento
+
+    Returns:
+        bool: True se tem desconto
+    """
+    return _DESCONTO_POR_CODIGO[codigo]
+
+def configurar_motor_descontos(motor):
+    """
+    Instala um motor de regras de desconto para as vendas
+
+    Args:
+        motor (MotorDescontos): Motor compilado (None volta à regra fixa)
+    """
+    global _motor_descontos
+    with _trava_descontos:
+        _notificar_ouvintes_descontos(PERCENTUAL_DESCONTO, motor)
+        _motor_descontos = motor
+
+def avisar_alteracao_motor(motor):
+    """
+    Avisa os ouvintes que as regras de um motor mudaram (chamado pelo motor)
+
+    Só tem efeito se o motor for o instalado nas vendas.
+
+    Args:
+        motor (MotorDescontos): Motor alterado
+    """
+    with _trava_descontos:
+        if motor is _motor_descontos:
+            _notificar_ouvintes_descontos(PERCENTUAL_DESCONTO, motor)
+
+def obter_motor_descontos():
+    """
+    Obtém o motor de regras instalado
+
+    Returns:
+        MotorDescontos: Motor em uso ou None (regra fixa)
+    """
+    return _motor_descontos
+
+def percentual_desconto_por_codigo(codigo, id_combustivel=None, quantidade_litros=0.0, hora=0):
+    """
+    Percentual de desconto de uma venda, pelo código da forma de pagamento
+
+    Usado pelo cálculo da venda (abastecimento), que aplica o percentual
+    com matemática inteira em centavos (módulo dinheiro). Com um motor de
+    regras instalado, o percentual vem da tabela compilada do motor.
+
+    Args:
+        codigo (int): Código da forma de pagamento
+        id_combustivel (int): Id do combustível (necessário para o motor)
+        quantidade_litros (float): Volume da venda (faixa de volume do motor)
+        hora (int): Hora do dia da venda (0 a 23)
+
+    Returns:
+        float: Percentual em fração (0.10 = 10%) ou 0.0 se sem desconto
+    """
+    motor = _motor_descontos
+    if motor is not None and id_combustivel is not None:
+        percentual = motor.percentual(id_combustivel, codigo, quantidade_litros, hora)
+    else:
+        percentual = PERCENTUAL_DESCONTO if _DESCONTO_POR_CODIGO[codigo] else 0.0
+    if percentual and instrumentacao.ATIVO:
+        instrumentacao.contar("descontos_concedidos")
+    return percentual
+
+def calcular_desconto_por_codigo(valor_total, codigo):
+    """
+    Versão de calcular_desconto() que recebe o código da forma de pagamento
+
+    Args:
+        valor_total (float): Valor total antes do desconto
+        codigo (int): Código da forma de pagamento (ex: 2 para PIX)
+
+    Returns:
+        float: Valor em reais do desconto ou 0.0 se sem desconto
+    """
+    if _DESCONTO_POR_CODIGO[codigo]:
+        if instrumentacao.ATIVO:
+            instrumentacao.contar("descontos_concedidos")
+        return valor_total * PERCENTUAL_DESCONTO
+    return 0.0
\ No newline at end of file
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO PAINEL
+=============
+Indicadores em tempo real para a gerência: receita, litros por minuto
+e proporção de desconto, no total, por combustível e por forma de
+pagamento.
+
+Janelas mantidas:
+- "1min" e "15min": janelas DESLIZANTES (sempre os últimos N minutos)
+- "turno" e "dia":  janelas FIXAS (do início do turno/dia atual até agora;
+                    ao virar o turno/dia, recomeçam do zero)
+
+Cálculo incremental:
+Nenhuma venda é guardada. Cada venda soma seus valores nos acumuladores
+das janelas (custo constante por venda) e as consultas apenas leem
+esses acumuladores - o custo não cresce com o número de vendas.
+
+Janela deslizante em baldes:
+A janela de 1 minuto é um anel de 60 baldes de 1 segundo (15 minutos:
+90 baldes de 10 segundos). Além dos baldes existe o total da janela.
+Quando o tempo avança, os baldes que saíram da janela são subtraídos
+do total e zerados. Por isso a janela "1min" cobre de 59 a 60 segundos
+(precisão de um balde).
+
+Uso típico:
+    painel = Painel()
+    conectar(painel)          # recebe cada venda única e cada lote processado
+    painel.consultar("15min", combustivel="Gasolina")
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+import abastecimento
+import relatorios
+
+# JANELAS DESLIZANTES - nome: (duração em segundos, quantidade de baldes)
+JANELAS_DESLIZANTES = {
+    "1min": (60, 60),
+    "15min": (900, 90),
+}
+JANELAS_FIXAS = ("turno", "dia")
+JANELAS = tuple(JANELAS_DESLIZANTES) + JANELAS_FIXAS
+
+# POSIÇÕES DOS VALORES NOS ACUMULADORES
+# [vendas, litros, valor bruto, desconto, valor final]
+_VENDAS, _LITROS, _BRUTO, _DESCONTO, _FINAL = range(5)
+
+
+def _somar(destino, valores):
+    """Soma os valores de uma venda (ou de um balde) em um acumulador"""
+    destino[0] += valores[0]
+    destino[1] += valores[1]
+    destino[2] += valores[2]
+    destino[3] += valores[3]
+    destino[4] += valores[4]
+
+
+class JanelaDeslizante:
+    """
+    CLASSE: Janela deslizante (últimos N segundos)
+    ==============================================
+    Anel de baldes com o total da janela sempre atualizado.
+    """
+    __slots__ = ("duracao", "largura", "baldes", "total", "ultimo")
+
+    def __init__(self, duracao, quantidade_baldes):
+        """
+        Args:
+            duracao (float): Tamanho da janela em segundos
+            quantidade_baldes (int): Baldes do anel (precisão = duracao / quantidade)
+        """
+        self.duracao = duracao
+        self.largura = duracao / quantidade_baldes
+        self.baldes = [[0, 0.0, 0.0, 0.0, 0.0] for _ in range(quantidade_baldes)]
+        self.total = [0, 0.0, 0.0, 0.0, 0.0]
+        self.ultimo = None   # número do balde mais recente
+
+    def _avancar(self, numero):
+        """Move a janela até o balde `numero`, descartando os baldes que saíram"""
+        if self.ultimo is None:
+            self.ultimo = numero
+            return
+        if numero <= self.ultimo:
+            return
+        baldes = self.baldes
+        quantidade = len(baldes)
+        total = self.total
+        for passo in range(1, min(numero - self.ultimo, quantidade) + 1):
+            balde = baldes[(self.ultimo + passo) % quantidade]
+            if balde[0]:
+                total[0] -= balde[0]
+                total[1] -= balde[1]
+                total[2] -= balde[2]
+                total[3] -= balde[3]
+                total[4] -= balde[4]
+                balde[:] = (0, 0.0, 0.0, 0.0, 0.0)
+        if not total[0]:
+            total[:] = (0, 0.0, 0.0, 0.0, 0.0)   # evita resíduos de arredondamento
+        self.ultimo = numero
+
+    def adicionar(self, instante, valores):
+        """
+        Soma uma venda
+
+        Returns:
+            bool: False se a venda é antiga demais para a janela (ignorada)
+        """
+        numero = int(instante // self.largura)
+        self._avancar(numero)
+        if numero <= self.ultimo - len(self.baldes):
+            return False
+        _somar(self.baldes[numero % len(self.baldes)], valores)
+        _somar(self.total, valores)
+        return True
+
+    def totais(self, agora):
+        """
+        Returns:
+            tuple: (acumulador da janela, minutos cobertos)
+        """
+        self._avancar(int(agora // self.largura))
+        return self.total, self.duracao / 60
+
+
+def _periodo_dia(instante, turnos):
+    """Dia civil do instante: (rótulo, início, fim) em segundos"""
+    inicio = datetime.fromtimestamp(instante).replace(hour=0, minute=0, second=0, microsecond=0)
+    return inicio.date().isoformat(), inicio.timestamp(), (inicio + timedelta(days=1)).timestamp()
+
+def _periodo_turno(instante, turnos):
+    """Turno do instante: (rótulo, início, fim) em segundos; o turno da noite começa na véspera"""
+    data = datetime.fromtimestamp(instante)
+    hora_cheia = data.replace(minute=0, second=0, microsecond=0)
+    for nome, inicio, fim in turnos:
+        if inicio <= fim:
+            dentro = inicio <= data.hour < fim
+        else:
+            dentro = data.hour >= inicio or data.hour < fim
+        if dentro:
+            comeco = hora_cheia.replace(hour=inicio)
+            if comeco > data:
+                comeco -= timedelta(days=1)
+            duracao = timedelta(hours=(fim - inicio) % 24 or 24)
+            return (f"{comeco.date().isoformat()} {nome}", comeco.timestamp(),
+                    (comeco + duracao).timestamp())
+    # hora sem turno: período de uma hora
+    return (f"{hora_cheia.isoformat()} sem turno", hora_cheia.timestamp(),
+            (hora_cheia + timedelta(hours=1)).timestamp())
+
+
+class JanelaFixa:
+    """
+    CLASSE: Janela fixa (turno ou dia)
+    ==================================
+    Acumula do início do período atual; ao virar o período, guarda o
+    fechamento do anterior e recomeça. Os limites do período ficam
+    guardados, então o calendário só é consultado na virada.
+    """
+    __slots__ = ("calcular_periodo", "turnos", "rotulo", "inicio", "fim", "total", "anterior")
+
+    def __init__(self, calcular_periodo, turnos=relatorios.TURNOS_PADRAO):
+        self.calcular_periodo = calcular_periodo
+        self.turnos = turnos
+        self.rotulo = None
+        self.inicio = self.fim = 0.0
+        self.total = [0, 0.0, 0.0, 0.0, 0.0]
+        self.anterior = None   # (rótulo, acumulador) do último período fechado
+
+    def _avancar(self, instante):
+        """Vira o período se o instante já passou do fim do atual"""
+        if instante >= self.fim:
+            if self.total[0]:
+                self.anterior = (self.rotulo, self.total)
+            self.rotulo, self.inicio, self.fim = self.calcular_periodo(instante, self.turnos)
+            self.total = [0, 0.0, 0.0, 0.0, 0.0]
+
+    def adicionar(self, instante, valores):
+        """
+        Soma uma venda
+
+        Returns:
+            bool: False se a venda é de um período já fechado (ignorada)
+        """
+        self._avancar(instante)
+        if instante < self.inicio:
+            return False
+        _somar(self.total, valores)
+        return True
+
+    def totais(self, agora):
+        """
+        Returns:
+            tuple: (acumulador do período, minutos decorridos no período)
+        """
+        self._avancar(agora)
+        return self.total, max(min(agora, self.fim) - self.inicio, 1.0) / 60
+
+
+def _indicadores(total, minutos):
+    """Transforma um acumulador nos indicadores exibidos"""
+    vendas, litros, bruto, desconto, final = total
+    return {
+        "vendas": vendas,
+        "litros": round(litros, 3),
+        "receita": round(final, 2),
+        "desconto": round(desconto, 2),
+        "razao_desconto": round(desconto / bruto, 4) if bruto else 0.0,
+        "litros_por_minuto": round(litros / minutos, 3),
+        "ticket_medio": round(final / vendas, 2) if vendas else 0.0,
+    }
+
+
+class Painel:
+    """
+    CLASSE: Painel de indicadores em tempo real
+    ===========================================
+    Cada venda atualiza 4 janelas x 3 visões (total, combustível e
+    pagamento) - 12 acumuladores, custo constante por venda.
+    """
+    def __init__(self, turnos=relatorios.TURNOS_PADRAO, relogio=time.time):
+        """
+        Args:
+            turnos (tuple): Turnos para a janela "turno" (padrão: relatorios.TURNOS_PADRAO)
+            relogio (callable): Fonte do instante atual das consultas
+        """
+        self.turnos = turnos
+        self.relogio = relogio
+        self.ignoradas = 0   # vendas antigas demais para alguma janela
+        self._trava = threading.Lock()
+        # {janela: {chave: acumulador da janela}}; chave None = total
+        self._janelas = {nome: {} for nome in JANELAS}
+
+    def _nova_janela(self, nome):
+        """Cria a janela de um nome para uma nova chave (combustível/pagamento)"""
+        if nome in JANELAS_DESLIZANTES:
+            return JanelaDeslizante(*JANELAS_DESLIZANTES[nome])
+        return JanelaFixa(_periodo_turno if nome == "turno" else _periodo_dia, self.turnos)
+
+    def adicionar(self, instante, tipo_combustivel, forma_pagamento, litros, bruto, desconto, final):
+        """
+        Soma uma venda em todas as janelas
+
+        Args:
+            instante (float): Segundos desde 1970
+            tipo_combustivel (str): Combustível vendido
+            forma_pagamento (str): Forma de pagamento
+            litros, bruto, desconto, final (float): Valores da venda
+        """
+        with self._trava:
+            self._adicionar(instante, tipo_combustivel, forma_pagamento,
+                            (1, litros, bruto, desconto, final))
+
+    def _adicionar(self, instante, tipo_combustivel, forma_pagamento, valores):
+        """Soma uma venda em todas as janelas (chamado com a trava adquirida)"""
+        chaves = (None, ("combustivel", tipo_combustivel), ("pagamento", forma_pagamento))
+        for nome, janelas in self._janelas.items():
+            for chave in chaves:
+                janela = janelas.get(chave)
+                if janela is None:
+                    janela = janelas[chave] = self._nova_janela(nome)
+                if not janela.adicionar(instante, valores):
+                    self.ignoradas += 1
+
+    def registrar(self, registro):
+        """
+        Soma um RegistroAbastecimento (assinatura de ouvinte de abastecimento)
+
+        Args:
+            registro (RegistroAbastecimento): Venda recém-processada
+        """
+        self.adicionar(registro.data_abastecimento.timestamp(), registro.tipo_combustivel,
+                       registro.forma_pagamento, registro.quantidade_litros,
+                       registro.valor_bruto, registro.valor_desconto, registro.valor_final)
+
+    def registrar_lote(self, resultado):
+        """
+        Soma as linhas válidas de um ResultadoLote (assinatura de ouvinte de lotes)
+
+        Args:
+            resultado (ResultadoLote): Lote recém-processado
+        """
+        instante = resultado.data_processamento.timestamp()
+        with self._trava:
+            for i, valido in enumerate(resultado.validos):
+                if valido:
+                    self._adicionar(instante, resultado.tipos_combustivel[i],
+                                    resultado.formas_pagamento[i],
+                                    (1, resultado.quantidade_litros[i], resultado.valor_bruto[i],
+                                     resultado.valor_desconto[i], resultado.valor_final[i]))
+
+    def registrar_venda(self, venda):
+        """Soma uma relatorios.Venda (ex: para preencher o painel a partir do diário)"""
+        self.adicionar(venda.instante, venda.tipo_combustivel, venda.forma_pagamento,
+                       venda.quantidade_litros, venda.valor_bruto, venda.valor_desconto,
+                       venda.valor_final)
+
+    def consultar(self, janela="1min", combustivel=None, pagamento=None, agora=None):
+        """
+        FUNÇÃO PRINCIPAL: Indicadores de uma janela
+        ===========================================
+        Args:
+            janela (str): "1min", "15min", "turno" ou "dia"
+            combustivel (str): Filtra um combustível (opcional)
+            pagamento (str): Filtra uma forma de pagamento (opcional)
+            agora (float): Instante da consulta (padrão: relógio do painel)
+
+        Returns:
+            dict: vendas, litros, receita, desconto, razao_desconto,
+                  litros_por_minuto e ticket_medio
+
+        Raises:
+            ValueError: Se a janela não existir ou os dois filtros forem usados
+        """
+        if janela not in self._janelas:
+            raise ValueError(f"Janela '{janela}' inválida (use {', '.join(JANELAS)})!")
+        if combustivel is not None and pagamento is not None:
+            raise ValueError("Filtre por combustível OU por forma de pagamento!")
+        if combustivel is not None:
+            chave = ("combustivel", combustivel)
+        elif pagamento is not None:
+            chave = ("pagamento", pagamento)
+        else:
+            chave = None
+        agora = self.relogio() if agora is None else agora
+        with self._trava:
+            acumulador = self._janelas[janela].get(chave)
+            if acumulador is None:
+                acumulador = self._nova_janela(janela)
+            return _indicadores(*acumulador.totais(agora))
+
+    def fotografia(self, agora=None):
+        """
+        Todos os indicadores de uma vez
+
+        Returns:
+            dict: {janela: {"total": ..., "combustivel": {nome: ...},
+                            "pagamento": {forma: ...}}}
+        """
+        agora = self.relogio() if agora is None else agora
+        resultado = {}
+        with self._trava:
+            for nome, janelas in self._janelas.items():
+                visao = {"total": _indicadores(*(janelas.get(None) or self._nova_janela(nome)).totais(agora)),
+                         "combustivel": {}, "pagamento": {}}
+                for chave, janela in janelas.items():
+                    if chave is not None:
+                        visao[chave[0]][chave[1]] = _indicadores(*janela.totais(agora))
+                resultado[nome] = visao
+        return resultado
+
+
+def conectar(painel):
+    """Passa a alimentar o painel com cada venda única e cada lote processado"""
+    abastecimento.adicionar_ouvinte_registros(painel.registrar)
+    abastecimento.adicionar_ouvinte_lotes(painel.registrar_lote)
+
+def desconectar(painel):
+    """Deixa de alimentar o painel"""
+    abastecimento.remover_ouvinte_registros(painel.registrar)
+    abastecimento.remover_ouvinte_lotes(painel.registrar_lote)
+
+
+def main():
+    """Demonstração: alimenta o painel com vendas simuladas e mede o custo"""
+    import random
+
+    random.seed(7)
+    painel = Painel()
+    conectar(painel)
+    combustiveis = ["Gasolina", "Etanol", "Diesel", "Gasolina Aditivada"]
+    formas = ["Dinheiro", "PIX", "Cartão de Crédito", "Cartão de Débito"]
+    quantidade = 50_000
+
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        abastecimento.processar_abastecimento(random.choice(combustiveis),
+                                              round(random.uniform(5, 60), 2),
+                                              random.choice(formas))
+    com_painel = time.perf_counter() - inicio
+    desconectar(painel)
+
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        abastecimento.processar_abastecimento(random.choice(combustiveis),
+                                              round(random.uniform(5, 60), 2),
+                                              random.choice(formas))
+    sem_painel = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for _ in range(1000):
+        painel.consultar("15min", combustivel="Gasolina")
+    consulta = (time.perf_counter() - inicio) / 1000
+
+    print("=== PAINEL EM TEMPO REAL ===")
+    for nome in JANELAS:
+        indicadores = painel.consultar(nome)
+        print(f"{nome:>6}: {indicadores['vendas']} vendas | R$ {indicadores['receita']:,.2f} | "
+              f"{indicadores['litros_por_minuto']:,.1f} L/min | "
+              f"desconto {indicadores['razao_desconto']:.1%}")
+    print("\nPor pagamento (dia):")
+    for forma, indicadores in painel.fotografia()["dia"]["pagamento"].items():
+        print(f"  {forma:<18} R$ {indicadores['receita']:>12,.2f}  desconto {indicadores['razao_desconto']:.1%}")
+    print(f"\nCusto do painel por venda: {(com_painel - sem_painel) / quantidade * 1e6:.2f} µs")
+    print(f"Consulta: {consulta * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
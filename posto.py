@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO POSTO
+============
+Vários postos da rede em um único computador.
+
+Os módulos combustivel e pagamento representam UM posto: o catálogo de
+preços e as regras de desconto são globais do processo. Este módulo
+oferece as mesmas regras em classes que podem ter uma instância por posto:
+
+- CatalogoCombustiveis: preços de um posto (tabela versionada, cópia na escrita)
+- RegrasPagamento: formas de pagamento e desconto de um posto
+- Posto: processa as vendas de um posto e acumula o seu RelatorioVendas
+
+E um supervisor que distribui os postos entre processos:
+
+- SupervisorPostos: cada posto pertence a um único processo (shard),
+  escolhido por um hash estável do código do posto. As vendas são
+  encaminhadas em lotes para o processo do posto; de volta vêm apenas
+  os relatórios acumulados (somas), nunca as vendas individuais.
+
+Uso típico:
+    configuracoes = [{"codigo": "P001"}, {"codigo": "P002", "percentual_desconto": 0.05}]
+    with SupervisorPostos(configuracoes, processos=2) as supervisor:
+        supervisor.registrar_venda("P001", "Gasolina", 30, "PIX")
+        supervisor.atualizar_preco("P002", "Etanol", 3.99)
+        geral = supervisor.resumo_geral()
+
+Execução (demonstração com carga sintética):
+    python posto.py --postos 16 --processos 4 --vendas 200000
+"""
+
+import argparse
+import math
+import multiprocessing
+import queue
+import random
+import threading
+import time
+import zlib
+
+import abastecimento
+import combustivel
+import pagamento
+import relatorios
+
+# SEGUNDOS ENTRE VERIFICAÇÕES de que o processo de um shard continua vivo
+# enquanto o supervisor espera por ele (fila cheia ou relatório pendente)
+INTERVALO_VERIFICACAO = 0.5
+
+
+class CatalogoCombustiveis:
+    """
+    CLASSE: Catálogo de combustíveis de um posto
+    ============================================
+    Mesmas regras do módulo combustivel (ids fixos, tabela de preços
+    versionada e imutável), mas com uma instância por posto.
+    """
+    def __init__(self, precos=None):
+        """
+        Args:
+            precos (dict): {nome: preço por litro} (padrão: os preços iniciais
+                           do módulo combustivel)
+        """
+        if precos is None:
+            precos = combustivel.listar_combustiveis()
+        self._trava = threading.Lock()
+        self._ids = {}
+        self._nomes = []
+        self._precos_por_id = []
+        for nome, preco in precos.items():
+            self._indexar(nome, float(preco))
+        self._tabela = combustivel.TabelaPrecos(1, dict(zip(self._nomes, self._precos_por_id)),
+                                                self._precos_por_id)
+
+    def _indexar(self, nome, preco):
+        """Registra (ou atualiza) um combustível no índice de ids"""
+        identificador = self._ids.get(nome)
+        if identificador is None:
+            self._ids[nome] = len(self._nomes)
+            self._nomes.append(nome)
+            self._precos_por_id.append(preco)
+        else:
+            self._precos_por_id[identificador] = preco
+
+    def _publicar(self):
+        """Publica uma nova versão da tabela (chamado com a trava adquirida)"""
+        self._tabela = combustivel.TabelaPrecos(
+            self._tabela.versao + 1, dict(zip(self._nomes, self._precos_por_id)),
+            self._precos_por_id)
+
+    def obter_tabela(self):
+        """
+        Returns:
+            TabelaPrecos: Tabela de preços vigente do posto
+        """
+        return self._tabela
+
+    def listar(self):
+        """
+        Returns:
+            dict: Cópia de {nome: preço por litro}
+        """
+        return dict(self._tabela.precos)
+
+    def validar(self, nome):
+        """Verifica se o combustível existe no posto"""
+        return nome in self._tabela.precos
+
+    def obter_preco(self, nome):
+        """
+        Returns:
+            float: Preço por litro ou None se o combustível não existir
+        """
+        return self._tabela.precos.get(nome)
+
+    def obter_id(self, nome):
+        """
+        Returns:
+            int: Id do combustível no posto ou None se não existir
+        """
+        return self._ids.get(nome)
+
+    def cadastrar(self, nome, preco_por_litro):
+        """
+        Cadastra um combustível (ou substitui o preço, se já existir)
+
+        Returns:
+            bool: True se cadastrado com sucesso
+        """
+        try:
+            preco = float(preco_por_litro)
+        except (ValueError, TypeError):
+            return False
+        if not 0 < preco < math.inf:   # também rejeita nan
+            return False
+        with self._trava:
+            self._indexar(nome, preco)
+            self._publicar()
+        return True
+
+    def atualizar_preco(self, nome, novo_preco):
+        """
+        Atualiza o preço de um combustível existente
+
+        Returns:
+            bool: True se atualizado com sucesso
+        """
+        if nome not in self._ids:
+            return False
+        return self.cadastrar(nome, novo_preco)
+
+
+class RegrasPagamento:
+    """
+    CLASSE: Formas de pagamento e desconto de um posto
+    ==================================================
+    Mesmas regras do módulo pagamento, mas configuráveis por posto.
+    """
+    def __init__(self, formas=None, com_desconto=None, percentual_desconto=None):
+        """
+        Args:
+            formas (dict): {código: nome} (padrão: pagamento.FORMAS_PAGAMENTO)
+            com_desconto (list): Nomes com desconto (padrão: pagamento.PAGAMENTO_COM_DESCONTO)
+            percentual_desconto (float): Desconto em fração (padrão: pagamento.PERCENTUAL_DESCONTO)
+        """
+        if formas is None:
+            formas = pagamento.FORMAS_PAGAMENTO
+        if com_desconto is None:
+            com_desconto = pagamento.PAGAMENTO_COM_DESCONTO
+        if percentual_desconto is None:
+            percentual_desconto = pagamento.PERCENTUAL_DESCONTO
+        if not 0.0 <= percentual_desconto <= 1.0:
+            raise ValueError("O percentual de desconto deve estar entre 0 e 1!")
+
+        self.formas = {int(codigo): nome for codigo, nome in formas.items()}
+        self.com_desconto = frozenset(com_desconto)
+        self.percentual_desconto = percentual_desconto
+        self._codigo_por_forma = {nome: codigo for codigo, nome in self.formas.items()}
+
+    def listar_formas(self):
+        """
+        Returns:
+            dict: {código: nome}
+        """
+        return dict(self.formas)
+
+    def validar_forma(self, forma_pagamento):
+        """Verifica se a forma de pagamento é aceita no posto"""
+        return forma_pagamento in self._codigo_por_forma
+
+    def obter_codigo(self, forma_pagamento):
+        """
+        Returns:
+            int: Código da forma de pagamento ou None se inválida
+        """
+        return self._codigo_por_forma.get(forma_pagamento)
+
+    def tem_desconto(self, forma_pagamento):
+        """Verifica se a forma de pagamento tem desconto no posto"""
+        return forma_pagamento in self.com_desconto
+
+    def percentual_da_forma(self, forma_pagamento):
+        """
+        Returns:
+            float: Percentual de desconto da forma (0.0 se sem desconto)
+        """
+        return self.percentual_desconto if forma_pagamento in self.com_desconto else 0.0
+
+    def calcular_desconto(self, valor_total, forma_pagamento):
+        """
+        Returns:
+            float: Valor em reais do desconto
+        """
+        return valor_total * self.percentual_da_forma(forma_pagamento)
+
+
+class Posto:
+    """
+    CLASSE: Um posto da rede
+    ========================
+    Tem catálogo e regras de pagamento próprios, processa as vendas com
+    as mesmas validações de abastecimento.processar_abastecimento() e
+    acumula um RelatorioVendas (somas) em vez de guardar as vendas.
+    """
+    def __init__(self, codigo, catalogo=None, regras=None):
+        """
+        Args:
+            codigo (str): Código único do posto (ex: "P001")
+            catalogo (CatalogoCombustiveis): Catálogo do posto (padrão: preços iniciais)
+            regras (RegrasPagamento): Regras de pagamento (padrão: as do módulo pagamento)
+        """
+        self.codigo = codigo
+        self.catalogo = catalogo if catalogo is not None else CatalogoCombustiveis()
+        self.regras = regras if regras is not None else RegrasPagamento()
+        self.relatorio = relatorios.RelatorioVendas()
+        self.rejeitadas = 0
+
+    @classmethod
+    def de_configuracao(cls, configuracao):
+        """
+        Cria um posto a partir de um dicionário de configuração
+
+        Chaves: codigo (obrigatória), precos, formas_pagamento,
+                com_desconto, percentual_desconto
+
+        Returns:
+            Posto: Novo posto
+        """
+        return cls(
+            configuracao["codigo"],
+            CatalogoCombustiveis(configuracao.get("precos")),
+            RegrasPagamento(configuracao.get("formas_pagamento"),
+                            configuracao.get("com_desconto"),
+                            configuracao.get("percentual_desconto")),
+        )
+
+    def processar_abastecimento(self, tipo_combustivel, quantidade_litros, forma_pagamento):
+        """
+        Processa uma venda com o catálogo e as regras do posto
+
+        Returns:
+            RegistroAbastecimento: Registro com todos os cálculos
+
+        Raises:
+            ValueError: Se os dados forem inválidos para este posto
+        """
+        tabela = self.catalogo.obter_tabela()
+        preco = tabela.precos.get(tipo_combustivel)
+        if preco is None:
+            raise ValueError(f"Combustível '{tipo_combustivel}' não encontrado!")
+        codigo = self.regras.obter_codigo(forma_pagamento)
+        if codigo is None:
+            raise ValueError(f"Forma de pagamento '{forma_pagamento}' inválida!")
+        try:
+            quantidade_litros = float(quantidade_litros)
+        except (ValueError, TypeError):
+            raise ValueError("Quantidade de litros inválida!")
+        if not 0 < quantidade_litros < math.inf:   # também rejeita nan
+            raise ValueError("Quantidade de litros deve ser maior que zero!")
+
+        return abastecimento.RegistroAbastecimento.de_valores(
+            tipo_combustivel, quantidade_litros, forma_pagamento,
+            self.catalogo.obter_id(tipo_combustivel), codigo, preco, tabela.versao,
+            self.regras.percentual_da_forma(forma_pagamento),
+        )
+
+    def registrar_venda(self, tipo_combustivel, quantidade_litros, forma_pagamento):
+        """
+        Processa uma venda e a acumula no relatório do posto
+
+        Vendas inválidas (inclusive com campos de tipo errado, que geram
+        TypeError) são contadas em `rejeitadas` e o erro é repassado.
+
+        Returns:
+            RegistroAbastecimento: Registro da venda
+        """
+        try:
+            registro = self.processar_abastecimento(tipo_combustivel, quantidade_litros,
+                                                    forma_pagamento)
+        except (ValueError, TypeError):
+            self.rejeitadas += 1
+            raise
+        self.relatorio.adicionar(relatorios.Venda(
+            registro.data_abastecimento.timestamp(),
+            registro.tipo_combustivel,
+            registro.quantidade_litros,
+            registro.forma_pagamento,
+            registro.valor_por_litro,
+            registro.valor_bruto,
+            registro.valor_desconto,
+            registro.valor_final,
+        ))
+        return registro
+
+    def resumo(self):
+        """
+        Returns:
+            dict: Relatório do posto com as vendas rejeitadas e a versão de preços
+        """
+        resultado = self.relatorio.resultado()
+        resultado["rejeitadas"] = self.rejeitadas
+        resultado["versao_precos"] = self.catalogo.obter_tabela().versao
+        return resultado
+
+
+# ----------------------------------------------------------------------
+# SUPERVISOR - POSTOS DISTRIBUÍDOS ENTRE PROCESSOS
+# ----------------------------------------------------------------------
+# Comandos enviados aos processos (sempre em listas, um lote por envio):
+#   ("venda", codigo_posto, combustivel, litros, pagamento)
+#   ("preco", codigo_posto, combustivel, preco)
+#   ("cadastrar", codigo_posto, combustivel, preco)
+#   ("relatorios",)   -> o processo responde
+#                        {codigo: (RelatorioVendas, rejeitadas, versao, falhas)}
+# None encerra o processo.
+
+def _executar_shard(configuracoes, entrada, saida):
+    """
+    Laço de um processo (shard): atende os postos que pertencem a ele
+
+    Um comando com erro é contado nas falhas do seu posto e o laço segue
+    para o próximo: um dado ruim não derruba o processo nem os demais
+    postos do shard.
+
+    Args:
+        configuracoes (list): Configurações dos postos deste shard
+        entrada (Queue): Lotes de comandos
+        saida (Queue): Respostas aos pedidos de relatório
+    """
+    postos = {c["codigo"]: Posto.de_configuracao(c) for c in configuracoes}
+    falhas = dict.fromkeys(postos, 0)   # preços/cadastros recusados e erros inesperados
+    while True:
+        lote = entrada.get()
+        if lote is None:
+            return
+        for comando in lote:
+            operacao = comando[0]
+            if operacao == "relatorios":
+                saida.put({
+                    codigo: (posto.relatorio, posto.rejeitadas,
+                             posto.catalogo.obter_tabela().versao, falhas[codigo])
+                    for codigo, posto in postos.items()
+                })
+                continue
+            posto = postos[comando[1]]
+            try:
+                if operacao == "venda":
+                    try:
+                        posto.registrar_venda(comando[2], comando[3], comando[4])
+                    except (ValueError, TypeError):
+                        pass   # já contada em Posto.rejeitadas
+                elif operacao == "preco":
+                    if not posto.catalogo.atualizar_preco(comando[2], comando[3]):
+                        falhas[comando[1]] += 1
+                elif operacao == "cadastrar":
+                    if not posto.catalogo.cadastrar(comando[2], comando[3]):
+                        falhas[comando[1]] += 1
+            except Exception:
+                falhas[comando[1]] += 1
+
+
+class SupervisorPostos:
+    """
+    CLASSE: Supervisor da rede de postos
+    ====================================
+    Distribui os postos entre processos, encaminha as vendas de cada
+    posto para o seu processo e junta os relatórios.
+
+    Regras de funcionamento:
+    - Cada posto pertence sempre ao mesmo processo (hash estável do código),
+      então as operações de um posto são aplicadas na ordem de envio
+    - Os comandos são acumulados e enviados em lotes (menos trocas entre processos)
+    - Filas com tamanho máximo: se um processo atrasar, quem envia espera
+    - Se um processo morrer, quem espera por ele recebe RuntimeError
+      (nunca fica bloqueado para sempre)
+    - Entre os processos trafegam apenas comandos e relatórios somados
+    """
+    def __init__(self, configuracoes, processos=None, tamanho_lote=512, capacidade_fila=64):
+        """
+        Args:
+            configuracoes (list): Configurações dos postos (ver Posto.de_configuracao)
+            processos (int): Quantidade de processos (padrão: núcleos do computador,
+                             limitado ao número de postos)
+            tamanho_lote (int): Comandos acumulados antes de enviar a um processo
+            capacidade_fila (int): Lotes em espera por processo
+        """
+        configuracoes = list(configuracoes)
+        codigos = [c["codigo"] for c in configuracoes]
+        if not configuracoes:
+            raise ValueError("É necessário pelo menos um posto!")
+        if len(set(codigos)) != len(codigos):
+            raise ValueError("Os códigos dos postos devem ser únicos!")
+        if processos is None:
+            processos = multiprocessing.cpu_count()
+        processos = max(1, min(processos, len(configuracoes)))
+
+        self.tamanho_lote = tamanho_lote
+        self.quantidade_processos = processos
+        self._shard_do_posto = {codigo: self.calcular_shard(codigo, processos) for codigo in codigos}
+        por_shard = [[] for _ in range(processos)]
+        for configuracao in configuracoes:
+            por_shard[self._shard_do_posto[configuracao["codigo"]]].append(configuracao)
+
+        self._entradas = [multiprocessing.Queue(maxsize=capacidade_fila) for _ in range(processos)]
+        self._saidas = [multiprocessing.Queue() for _ in range(processos)]
+        self._pendentes = [[] for _ in range(processos)]
+        self._processos = [
+            multiprocessing.Process(target=_executar_shard,
+                                    args=(por_shard[i], self._entradas[i], self._saidas[i]),
+                                    name=f"postos-{i}", daemon=True)
+            for i in range(processos)
+        ]
+        for processo in self._processos:
+            processo.start()
+        self._fechado = False
+        self.vendas_enviadas = 0
+
+    @staticmethod
+    def calcular_shard(codigo_posto, processos):
+        """
+        Escolhe o processo de um posto (crc32 do código: igual em qualquer execução)
+
+        Returns:
+            int: Índice do processo
+        """
+        return zlib.crc32(str(codigo_posto).encode("utf-8")) % processos
+
+    def _verificar_processo(self, shard):
+        """
+        Raises:
+            RuntimeError: Se o processo do shard terminou
+        """
+        processo = self._processos[shard]
+        if not processo.is_alive():
+            raise RuntimeError(f"O processo {processo.name} terminou inesperadamente "
+                               f"(código de saída {processo.exitcode})!")
+
+    def _enviar(self, shard, lote):
+        """Coloca um lote na fila do shard, conferindo se o processo segue vivo enquanto espera"""
+        while True:
+            try:
+                self._entradas[shard].put(lote, timeout=INTERVALO_VERIFICACAO)
+                return
+            except queue.Full:
+                self._verificar_processo(shard)
+
+    def _receber(self, shard):
+        """Aguarda a resposta de um shard, conferindo se o processo segue vivo enquanto espera"""
+        while True:
+            try:
+                return self._saidas[shard].get(timeout=INTERVALO_VERIFICACAO)
+            except queue.Empty:
+                self._verificar_processo(shard)
+
+    def _encaminhar(self, codigo_posto, comando):
+        """Acumula um comando no lote do processo do posto"""
+        if self._fechado:
+            raise RuntimeError("O supervisor de postos já foi encerrado!")
+        shard = self._shard_do_posto.get(codigo_posto)
+        if shard is None:
+            raise ValueError(f"Posto '{codigo_posto}' não encontrado!")
+        pendentes = self._pendentes[shard]
+        pendentes.append(comando)
+        if len(pendentes) >= self.tamanho_lote:
+            self._pendentes[shard] = []
+            self._enviar(shard, pendentes)
+
+    def registrar_venda(self, codigo_posto, tipo_combustivel, quantidade_litros, forma_pagamento):
+        """
+        Encaminha uma venda ao processo do posto
+
+        A venda é validada no processo do posto; as inválidas aparecem em
+        "rejeitadas" no resumo do posto.
+        """
+        self._encaminhar(codigo_posto, ("venda", codigo_posto, tipo_combustivel,
+                                        quantidade_litros, forma_pagamento))
+        self.vendas_enviadas += 1
+
+    def atualizar_preco(self, codigo_posto, nome, novo_preco):
+        """Encaminha uma alteração de preço (aplicada na ordem, entre as vendas do posto)"""
+        self._encaminhar(codigo_posto, ("preco", codigo_posto, nome, novo_preco))
+
+    def cadastrar_combustivel(self, codigo_posto, nome, preco_por_litro):
+        """Encaminha o cadastro de um combustível em um posto"""
+        self._encaminhar(codigo_posto, ("cadastrar", codigo_posto, nome, preco_por_litro))
+
+    def descarregar(self):
+        """Envia imediatamente todos os comandos acumulados"""
+        for shard, pendentes in enumerate(self._pendentes):
+            if pendentes:
+                self._pendentes[shard] = []
+                self._enviar(shard, pendentes)
+
+    def _coletar_relatorios(self):
+        """
+        Pede os relatórios a todos os processos (após os comandos já enviados)
+
+        Raises:
+            RuntimeError: Se algum processo terminou (os relatórios dele se perderam)
+        """
+        self.descarregar()
+        for shard in range(self.quantidade_processos):
+            self._enviar(shard, [("relatorios",)])
+        coletados = {}
+        for shard in range(self.quantidade_processos):
+            coletados.update(self._receber(shard))
+        return coletados
+
+    def resumos(self):
+        """
+        Resumo de cada posto
+
+        Returns:
+            dict: {código do posto: resumo} (mesmo formato de Posto.resumo())
+        """
+        resultado = {}
+        for codigo, (relatorio, rejeitadas, versao, falhas) in sorted(self._coletar_relatorios().items()):
+            resultado[codigo] = relatorio.resultado()
+            resultado[codigo]["rejeitadas"] = rejeitadas
+            resultado[codigo]["versao_precos"] = versao
+            resultado[codigo]["falhas"] = falhas
+        return resultado
+
+    def resumo_geral(self):
+        """
+        Junta os relatórios de todos os postos em um único resumo da rede
+
+        Returns:
+            dict: Resumo somado (mesmo formato de RelatorioVendas.resultado())
+                  com as chaves extras "postos", "rejeitadas" e "falhas"
+        """
+        coletados = self._coletar_relatorios()
+        geral = relatorios.RelatorioVendas()
+        rejeitadas = falhas = 0
+        for relatorio, rejeitadas_posto, _, falhas_posto in coletados.values():
+            geral.mesclar(relatorio)
+            rejeitadas += rejeitadas_posto
+            falhas += falhas_posto
+        resultado = geral.resultado()
+        resultado["postos"] = len(coletados)
+        resultado["rejeitadas"] = rejeitadas
+        resultado["falhas"] = falhas
+        return resultado
+
+    def fechar(self):
+        """
+        Processa os comandos pendentes e encerra os processos
+
+        Os processos vivos são sempre encerrados, mesmo que algum outro tenha
+        morrido antes; nesse caso o erro é informado no final.
+
+        Raises:
+            RuntimeError: Se algum processo terminou antes do encerramento
+        """
+        if self._fechado:
+            return
+        self._fechado = True
+        erro = None
+        for shard in range(self.quantidade_processos):
+            try:
+                pendentes, self._pendentes[shard] = self._pendentes[shard], []
+                if pendentes:
+                    self._enviar(shard, pendentes)
+                self._enviar(shard, None)
+            except RuntimeError as e:
+                erro = erro or e
+        for shard, processo in enumerate(self._processos):
+            processo.join()
+            if processo.exitcode != 0:
+                # Ninguém mais lê esta fila: não esperar o envio dos lotes restantes
+                self._entradas[shard].cancel_join_thread()
+                erro = erro or RuntimeError(f"O processo {processo.name} terminou "
+                                            f"inesperadamente (código de saída {processo.exitcode})!")
+        if erro is not None:
+            raise erro
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+def main():
+    """Demonstração: rede sintética de postos com carga aleatória"""
+    parser = argparse.ArgumentParser(description="Rede de postos distribuída entre processos")
+    parser.add_argument("--postos", type=int, default=16, help="quantidade de postos")
+    parser.add_argument("--processos", type=int, default=None, help="quantidade de processos")
+    parser.add_argument("--vendas", type=int, default=200_000, help="vendas a simular")
+    parser.add_argument("--semente", type=int, default=None, help="semente aleatória")
+    argumentos = parser.parse_args()
+
+    aleatorio = random.Random(argumentos.semente)
+    configuracoes = [{"codigo": f"P{numero:03d}"} for numero in range(1, argumentos.postos + 1)]
+    codigos = [c["codigo"] for c in configuracoes]
+    tipos = list(combustivel.listar_combustiveis())
+    formas = list(pagamento.listar_formas_pagamento().values())
+
+    inicio = time.perf_counter()
+    with SupervisorPostos(configuracoes, argumentos.processos) as supervisor:
+        for _ in range(argumentos.vendas):
+            supervisor.registrar_venda(aleatorio.choice(codigos), aleatorio.choice(tipos),
+                                       round(aleatorio.uniform(5, 60), 2), aleatorio.choice(formas))
+        geral = supervisor.resumo_geral()
+        decorrido = time.perf_counter() - inicio
+        processos = supervisor.quantidade_processos
+
+    print(f"Postos: {geral['postos']}   Processos: {processos}")
+    print(f"Vendas: {geral['vendas']}   Rejeitadas: {geral['rejeitadas']}   Falhas: {geral['falhas']}")
+    print(f"Total da rede: R$ {geral['valor_final']:.2f}")
+    print(f"Tempo: {decorrido:.2f} s   Vazão: {argumentos.vendas / decorrido:,.0f} vendas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+MÓDULO RECIBO
+=============
+Montagem dos comprovantes (recibos) de abastecimento.
+
+O layout do recibo é "pré-compilado" uma única vez: as linhas fixas
+(faixas de "=", títulos, rótulos) e o texto do percentual de desconto
+já ficam prontos dentro de um modelo de formatação. Para cada venda
+resta apenas preencher os valores, gerando o recibo inteiro como um
+único texto, escrito com uma única chamada de write().
+
+Também permite gravar muitos recibos de uma vez em um arquivo ou fluxo
+(ex: fila de impressão), em blocos, com poucas chamadas de escrita.
+"""
+
+import sys
+
+import pagamento
+
+LARGURA = 50
+RECIBOS_POR_BLOCO = 256
+
+
+class ModeloRecibo:
+    """
+    CLASSE: Modelo de recibo pré-compilado
+    ======================================
+    Guarda duas versões do layout (com e sem desconto) prontas para
+    receber os valores de uma venda.
+    """
+    def __init__(self, percentual_desconto):
+        """
+        Args:
+            percentual_desconto (float): Percentual exibido na linha de desconto
+        """
+        self.percentual_desconto = percentual_desconto
+
+        linha_dupla = "=" * LARGURA
+        cabecalho = (
+            "\n" + linha_dupla + "\n"
+            "--- REGISTRO DE ABASTECIMENTO ---\n"
+            + linha_dupla + "\n"
+            "Data/Hora: {dia:02d}/{mes:02d}/{ano:04d} {hora:02d}:{minuto:02d}:{segundo:02d}\n"
+            "Tipo de Combustível: {tipo}\n"
+            "Valor por litro: R$ {preco:.2f}\n"
+            "Quantidade: {litros:.2f} litros\n"
+            "Valor bruto: R$ {bruto:.2f}\n"
+            "Forma de pagamento: {forma}\n"
+        )
+        rodape = (
+            "-" * LARGURA + "\n"
+            "TOTAL A PAGAR: R$ {final:.2f}\n"
+            + linha_dupla + "\n"
+        )
+        linha_desconto = f"Desconto aplicado ({percentual_desconto * 100:.0f}%): R$ {{desconto:.2f}}\n"
+
+        # MÉTODOS format JÁ PRONTOS - evitam remontar o texto fixo a cada venda
+        self._com_desconto = (cabecalho + linha_desconto + rodape).format
+        self._sem_desconto = (cabecalho + "Desconto aplicado: R$ 0.00\n" + rodape).format
+
+    def renderizar(self, registro):
+        """
+        Monta o texto completo do recibo de uma venda
+
+        Args:
+            registro (RegistroAbastecimento): Registro do abastecimento
+
+        Returns:
+            str: Recibo pronto para exibir ou imprimir
+        """
+        data = registro.data_abastecimento
+        formatar = self._com_desconto if registro.valor_desconto > 0 else self._sem_desconto
+        return formatar(
+            dia=data.day, mes=data.month, ano=data.year,
+            hora=data.hour, minuto=data.minute, segundo=data.second,
+            tipo=registro.tipo_combustivel,
+            preco=registro.valor_por_litro,
+            litros=registro.quantidade_litros,
+            bruto=registro.valor_bruto,
+            forma=registro.forma_pagamento,
+            desconto=registro.valor_desconto,
+            final=registro.valor_final,
+        )
+
+
+# MODELOS EM USO - um por percentual de desconto, compilado na primeira venda
+# com esse percentual (o motor de regras pode dar percentuais diferentes por venda)
+_modelos = {}
+
+def obter_modelo(percentual=None):
+    """
+    Obtém o modelo de recibo para um percentual de desconto
+
+    Args:
+        percentual (float): Percentual da venda (None = o percentual vigente do pagamento)
+
+    Returns:
+        ModeloRecibo: Modelo pré-compilado
+    """
+    if percentual is None:
+        percentual = pagamento.PERCENTUAL_DESCONTO
+    modelo = _modelos.get(percentual)
+    if modelo is None:
+        modelo = _modelos[percentual] = ModeloRecibo(percentual)
+    return modelo
+
+def renderizar_recibo(registro):
+    """
+    Monta o texto do recibo de uma venda, com o percentual aplicado a ela
+
+    Returns:
+        str: Recibo completo
+    """
+    return obter_modelo(getattr(registro, "percentual_desconto", None)).renderizar(registro)
+
+def escrever_recibo(registro, destino=None):
+    """
+    Escreve o recibo de uma venda com uma única chamada de write()
+
+    Args:
+        registro (RegistroAbastecimento): Registro do abastecimento
+        destino: Arquivo ou fluxo de texto (padrão: o terminal)
+    """
+    (destino or sys.stdout).write(renderizar_recibo(registro))
+
+def escrever_recibos(registros, destino):
+    """
+    Escreve muitos recibos em um arquivo ou fluxo, em blocos
+
+    Args:
+        registros (iterable): Registros (RegistroAbastecimento ou VisaoRegistro)
+        destino: Arquivo ou fluxo de texto aberto para escrita
+
+    Returns:
+        int: Quantidade de recibos escritos
+    """
+    renderizar = renderizar_recibo
+    bloco = []
+    total = 0
+    for registro in registros:
+        bloco.append(renderizar(registro))
+        if len(bloco) >= RECIBOS_POR_BLOCO:
+            destino.write("".join(bloco))
+            total += len(bloco)
+            bloco.clear()
+    if bloco:
+        destino.write("".join(bloco))
+        total += len(bloco)
+    return total
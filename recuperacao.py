@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO RECUPERAÇÃO
+==================
+Restaura o estado do sistema após um reinício (ou queda): combustíveis
+cadastrados, preços alterados, histórico de preços, configuração de
+desconto (percentual e motor de regras) e o livro de vendas (somas do
+RelatorioVendas).
+
+Como funciona:
+1. Instantâneo (snapshot): de tempos em tempos, o estado completo é
+   gravado em um arquivo JSON compacto (instantaneo-000042.json)
+2. Registro de alterações: cada preço alterado e cada alteração da
+   configuração de desconto depois do instantâneo são acrescentados a um
+   arquivo próprio (precos-000042.jsonl)
+3. Diário de vendas: as vendas já ficam no diário (módulo diario); o
+   instantâneo guarda até onde o diário já foi somado no livro
+
+No reinício:
+    estado = instantâneo mais recente
+           + alterações registradas depois dele
+           + vendas do diário depois da posição guardada (a "cauda")
+
+Tempo de reinício limitado:
+O instantâneo tem tamanho fixo em relação às vendas (apenas somas) e a
+cauda tem no máximo as vendas de um intervalo entre instantâneos. Por
+isso o reinício NÃO cresce com o total de vendas já feitas. O histórico
+de preços guardado no instantâneo também é limitado: só os
+HISTORICO_NO_INSTANTANEO preços mais recentes de cada combustível (o
+histórico completo fica no banco, módulo banco, quando ligado).
+
+Consistência:
+O registro de um preço é gravado antes da alteração em memória (ouvinte
+de combustivel). A cópia do catálogo para o instantâneo espera qualquer
+alteração em andamento terminar. Uma alteração que apareça tanto no
+instantâneo quanto no registro é aplicada de novo sem efeito (repetir
+um preço é idempotente).
+
+Execução:
+    python recuperacao.py   # mede o reinício com e sem instantâneo
+"""
+
+import json
+import os
+import threading
+import time
+
+import combustivel
+import diario
+import pagamento
+import regras_desconto
+import relatorios
+
+# PASTA PADRÃO - junto com o diário, em dados/
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados", "recuperacao")
+
+PREFIXO_INSTANTANEO = "instantaneo-"
+PREFIXO_PRECOS = "precos-"
+VERSAO_FORMATO = 1
+
+# PREÇOS DO HISTÓRICO GUARDADOS POR COMBUSTÍVEL (os mais recentes)
+HISTORICO_NO_INSTANTANEO = 1000
+
+
+def _nome_instantaneo(numero):
+    """Nome do arquivo de um instantâneo (ex: instantaneo-000042.json)"""
+    return f"{PREFIXO_INSTANTANEO}{numero:06d}.json"
+
+def _nome_precos(numero):
+    """Nome do registro de preços que acompanha um instantâneo"""
+    return f"{PREFIXO_PRECOS}{numero:06d}.jsonl"
+
+def _listar_numeros(pasta, prefixo, sufixo):
+    """Números dos arquivos de um tipo, em ordem crescente"""
+    numeros = []
+    for arquivo in os.listdir(pasta):
+        if arquivo.startswith(prefixo) and arquivo.endswith(sufixo):
+            try:
+                numeros.append(int(arquivo[len(prefixo):-len(sufixo)]))
+            except ValueError:
+                continue
+    return sorted(numeros)
+
+def _gravar_atomico(caminho, texto):
+    """Grava um arquivo inteiro de forma atômica e durável (temporário + fsync + os.replace)"""
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(texto)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+
+class Recuperacao:
+    """
+    CLASSE: Instantâneos e reinício rápido
+    ======================================
+    Uso típico (início do sistema):
+        recuperacao = Recuperacao(diario_vendas=diario.obter_diario_padrao())
+        recuperacao.restaurar()            # estado de antes do reinício
+        recuperacao.conectar()             # passa a registrar os preços
+        recuperacao.iniciar_periodico(60)  # um instantâneo por minuto
+    """
+    def __init__(self, pasta=PASTA_PADRAO, pasta_diario=None, diario_vendas=None, manter=2):
+        """
+        Args:
+            pasta (str): Pasta dos instantâneos e registros de preços
+            pasta_diario (str): Pasta do diário de vendas (padrão: a de diario_vendas
+                                ou diario.PASTA_PADRAO)
+            diario_vendas (DiarioAbastecimentos): Diário aberto, sincronizado antes
+                                                  de cada instantâneo (opcional)
+            manter (int): Instantâneos antigos mantidos (o mais novo pode estar
+                          corrompido por uma queda durante a gravação)
+        """
+        os.makedirs(pasta, exist_ok=True)
+        self.pasta = pasta
+        if pasta_diario is None:
+            pasta_diario = diario_vendas.pasta if diario_vendas is not None else diario.PASTA_PADRAO
+        self.pasta_diario = pasta_diario
+        self.diario_vendas = diario_vendas
+        self.manter = max(1, manter)
+
+        self.livro = relatorios.RelatorioVendas()
+        self.posicao_diario = (0, 0)   # (segmento, registros já somados nele)
+        numeros = _listar_numeros(pasta, PREFIXO_INSTANTANEO, ".json")
+        self.numero = numeros[-1] if numeros else 0
+        self._trava = threading.Lock()
+        self._trava_instantaneo = threading.Lock()   # um instantâneo por vez
+        self._arquivo_precos = None
+        self._conectado = False
+
+    # ------------------------------------------------------------------
+    # REGISTRO DE PREÇOS
+    # ------------------------------------------------------------------
+    def _registrar_linha(self, registro):
+        """Acrescenta uma alteração ao registro e força a gravação em disco"""
+        with self._trava:
+            self._arquivo_precos.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            self._arquivo_precos.flush()
+            os.fsync(self._arquivo_precos.fileno())
+
+    def _registrar_preco(self, nome, preco, instante, vigente):
+        """Ouvinte de combustivel: grava a alteração antes de ela valer em memória"""
+        self._registrar_linha([nome, preco, instante, vigente])
+
+    def _registrar_desconto(self, percentual, motor):
+        """Ouvinte de pagamento: grava a configuração de desconto completa (a última vale)"""
+        self._registrar_linha({"percentual_desconto": percentual,
+                               "motor": None if motor is None else motor.estado()})
+
+    def _abrir_registro_precos(self, numero):
+        """Troca o registro de preços pelo do instantâneo `numero` (com a trava adquirida)"""
+        if self._arquivo_precos is not None:
+            self._arquivo_precos.close()
+        self._arquivo_precos = open(os.path.join(self.pasta, _nome_precos(numero)),
+                                    "a", encoding="utf-8")
+
+    def conectar(self):
+        """Passa a registrar cada alteração de preço (chame depois de restaurar())"""
+        with self._trava:
+            self._abrir_registro_precos(self.numero)
+        if not self._conectado:
+            combustivel.adicionar_ouvinte_precos(self._registrar_preco)
+            pagamento.adicionar_ouvinte_descontos(self._registrar_desconto)
+            self._conectado = True
+
+    # ------------------------------------------------------------------
+    # LIVRO DE VENDAS
+    # ------------------------------------------------------------------
+    def atualizar_livro(self):
+        """
+        Soma no livro as vendas do diário depois da posição guardada
+
+        Returns:
+            int: Quantidade de vendas somadas
+        """
+        leitor = diario.LeitorDiario(self.pasta_diario)
+        nome_combustivel = leitor.nome_combustivel
+        nome_pagamento = leitor.nome_pagamento
+        Venda = relatorios.Venda
+        adicionar = self.livro.adicionar
+        segmento_atual, lidos_no_segmento = self.posicao_diario
+        somadas = 0
+        for numero in diario.listar_segmentos(self.pasta_diario):
+            if numero < segmento_atual:
+                continue
+            inicio = lidos_no_segmento if numero == segmento_atual else 0
+            lidos = 0
+            for (instante, id_comb, id_pag, _versao, litros, preco,
+                 bruto, desconto, final) in leitor.iterar_segmento(numero, inicio):
+                adicionar(Venda(instante, nome_combustivel(id_comb), litros, nome_pagamento(id_pag),
+                                preco, bruto, desconto, final))
+                lidos += 1
+            self.posicao_diario = (numero, inicio + lidos)
+            somadas += lidos
+        return somadas
+
+    # ------------------------------------------------------------------
+    # INSTANTÂNEOS
+    # ------------------------------------------------------------------
+    def gravar_instantaneo(self):
+        """
+        FUNÇÃO PRINCIPAL: Grava um instantâneo do estado atual
+        ======================================================
+        1. Abre um novo registro de preços (as próximas alterações vão para ele)
+        2. Copia o catálogo (espera alterações em andamento terminarem)
+        3. Sincroniza o diário e soma a sua cauda no livro
+        4. Grava o instantâneo (atômico) e apaga os arquivos antigos
+
+        Returns:
+            dict: numero, vendas (total no livro), bytes e milissegundos
+        """
+        with self._trava_instantaneo:
+            return self._gravar_instantaneo()
+
+    def _gravar_instantaneo(self):
+        """Etapas de gravar_instantaneo() (com _trava_instantaneo adquirida)"""
+        inicio = time.perf_counter()
+        numero = self.numero + 1
+        with self._trava:
+            if self._conectado:
+                self._abrir_registro_precos(numero)
+        precos, historico = combustivel.exportar_catalogo()
+        historico = {nome: pares[-HISTORICO_NO_INSTANTANEO:] for nome, pares in historico.items()}
+        percentual, motor = pagamento.obter_percentual_desconto(), pagamento.obter_motor_descontos()
+        if self.diario_vendas is not None:
+            self.diario_vendas.sincronizar()
+        self.atualizar_livro()
+
+        texto = json.dumps({
+            "versao_formato": VERSAO_FORMATO,
+            "numero": numero,
+            "criado_em": time.time(),
+            "catalogo": {
+                "precos": precos,
+                "historico": historico,
+                "percentual_desconto": percentual,
+                "motor": None if motor is None else motor.estado(),
+            },
+            "diario": {"segmento": self.posicao_diario[0], "registros": self.posicao_diario[1]},
+            "livro": self.livro.estado(),
+        }, ensure_ascii=False, separators=(",", ":"))
+        _gravar_atomico(os.path.join(self.pasta, _nome_instantaneo(numero)), texto)
+        self.numero = numero
+        self._apagar_antigos()
+        return {"numero": numero, "vendas": self.livro.quantidade_vendas, "bytes": len(texto),
+                "ms": round((time.perf_counter() - inicio) * 1000, 3)}
+
+    def _apagar_antigos(self):
+        """Mantém apenas os `manter` instantâneos mais novos e seus registros de preços"""
+        for numero in _listar_numeros(self.pasta, PREFIXO_INSTANTANEO, ".json")[:-self.manter]:
+            os.remove(os.path.join(self.pasta, _nome_instantaneo(numero)))
+        mais_antigo = self.numero - self.manter + 1
+        for numero in _listar_numeros(self.pasta, PREFIXO_PRECOS, ".jsonl"):
+            if numero < mais_antigo:
+                os.remove(os.path.join(self.pasta, _nome_precos(numero)))
+
+    def _ler_instantaneo(self):
+        """
+        Lê o instantâneo válido mais recente
+
+        Returns:
+            dict: Conteúdo do instantâneo, ou None se não houver nenhum válido
+        """
+        for numero in reversed(_listar_numeros(self.pasta, PREFIXO_INSTANTANEO, ".json")):
+            try:
+                with open(os.path.join(self.pasta, _nome_instantaneo(numero)), "r",
+                          encoding="utf-8") as arquivo:
+                    dados = json.load(arquivo)
+            except (OSError, ValueError):
+                continue
+            if isinstance(dados, dict) and dados.get("versao_formato") == VERSAO_FORMATO:
+                return dados
+        return None
+
+    def _repetir_precos(self, numero_inicial, precos, historico):
+        """
+        Aplica sobre o catálogo lido as alterações registradas a partir do instantâneo
+
+        Returns:
+            tuple: (quantidade de preços repetidos, última configuração de
+                    desconto registrada - dict - ou None se não houver)
+        """
+        repetidas = 0
+        desconto = None
+        for numero in _listar_numeros(self.pasta, PREFIXO_PRECOS, ".jsonl"):
+            if numero < numero_inicial:
+                continue
+            with open(os.path.join(self.pasta, _nome_precos(numero)), "r", encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    try:
+                        registro = json.loads(linha)
+                        if isinstance(registro, dict):
+                            desconto = registro   # configuração completa: a última vale
+                            continue
+                        nome, preco, instante, vigente = registro
+                    except ValueError:
+                        break   # última linha incompleta (queda durante a gravação)
+                    if vigente:
+                        precos[nome] = preco
+                    historico.setdefault(nome, set()).add((instante, preco))
+                    repetidas += 1
+        return repetidas, desconto
+
+    def restaurar(self):
+        """
+        FUNÇÃO PRINCIPAL: Restaura o estado de antes do reinício
+        ========================================================
+        Instantâneo mais recente + registro de preços + cauda do diário.
+        Sem instantâneo, o catálogo padrão é mantido e o diário inteiro é
+        somado no livro.
+
+        Returns:
+            dict: Tempos (ms) de cada etapa, alterações de preço e vendas
+                  repetidas, e o instantâneo usado
+
+        Raises:
+            KeyError: Se o instantâneo (ou um registro de desconto) não tiver
+                      algum campo obrigatório
+            ValueError: Se houver um valor inválido (ex: desconto fora de 0 a 1)
+        """
+        inicio = time.perf_counter()
+        dados = self._ler_instantaneo()
+        desconto = None
+        if dados is not None:
+            catalogo = dados["catalogo"]
+            precos = catalogo["precos"]
+            historico = {nome: set(map(tuple, pares)) for nome, pares in catalogo["historico"].items()}
+            # "motor" ausente: instantâneo anterior ao motor de regras (sem motor)
+            desconto = {"percentual_desconto": catalogo["percentual_desconto"],
+                        "motor": catalogo.get("motor")}
+            self.livro = relatorios.RelatorioVendas.de_estado(dados["livro"])
+            self.posicao_diario = (dados["diario"]["segmento"], dados["diario"]["registros"])
+            self.numero = dados["numero"]
+        else:
+            precos, historico = combustivel.exportar_catalogo()
+            historico = {nome: set(pares) for nome, pares in historico.items()}
+            self.livro = relatorios.RelatorioVendas()
+            self.posicao_diario = (0, 0)
+        lido = time.perf_counter()
+
+        repetidas, desconto_registrado = self._repetir_precos(self.numero, precos, historico)
+        combustivel.carregar_precos(precos, historico)
+        # o motor é compilado depois do catálogo (as regras citam combustíveis pelo nome)
+        desconto = desconto_registrado or desconto
+        if desconto is not None:
+            motor = desconto["motor"]
+            pagamento.definir_percentual_desconto(desconto["percentual_desconto"])
+            pagamento.configurar_motor_descontos(
+                None if motor is None else regras_desconto.MotorDescontos.de_estado(motor))
+        catalogo_pronto = time.perf_counter()
+
+        vendas = self.atualizar_livro()
+        fim = time.perf_counter()
+        return {
+            "instantaneo": self.numero if dados is not None else None,
+            "precos_repetidos": repetidas,
+            "vendas_repetidas": vendas,
+            "ler_instantaneo_ms": round((lido - inicio) * 1000, 3),
+            "repetir_precos_ms": round((catalogo_pronto - lido) * 1000, 3),
+            "repetir_diario_ms": round((fim - catalogo_pronto) * 1000, 3),
+            "total_ms": round((fim - inicio) * 1000, 3),
+        }
+
+    def iniciar_periodico(self, intervalo=60.0):
+        """
+        Grava um instantâneo a cada `intervalo` segundos (thread de fundo)
+
+        Returns:
+            threading.Event: Evento que encerra a gravação periódica quando acionado
+        """
+        parar = threading.Event()
+
+        def _laco():
+            while not parar.wait(intervalo):
+                self.gravar_instantaneo()
+
+        threading.Thread(target=_laco, name="instantaneos", daemon=True).start()
+        return parar
+
+    def fechar(self):
+        """Deixa de registrar preços e fecha o registro"""
+        if self._conectado:
+            combustivel.remover_ouvinte_precos(self._registrar_preco)
+            pagamento.remover_ouvinte_descontos(self._registrar_desconto)
+            self._conectado = False
+        with self._trava:
+            if self._arquivo_precos is not None:
+                self._arquivo_precos.close()
+                self._arquivo_precos = None
+
+
+# RECUPERAÇÃO PADRÃO DO SISTEMA - iniciada pelo menu
+_recuperacao_padrao = None
+
+def iniciar_padrao(intervalo=60.0):
+    """
+    Restaura o estado salvo e mantém os instantâneos em dados/recuperacao
+
+    Args:
+        intervalo (float): Segundos entre instantâneos
+
+    Returns:
+        tuple: (Recuperacao, estatísticas de restaurar())
+    """
+    import atexit
+
+    global _recuperacao_padrao
+    if _recuperacao_padrao is not None:
+        return _recuperacao_padrao, None
+    recuperacao = Recuperacao(diario_vendas=diario.obter_diario_padrao())
+    estatisticas = recuperacao.restaurar()
+    recuperacao.conectar()
+    recuperacao.iniciar_periodico(intervalo)
+    atexit.register(recuperacao.gravar_instantaneo)   # executado antes de fechar o diário
+    _recuperacao_padrao = recuperacao
+    return recuperacao, estatisticas
+
+
+def main():
+    """Mede o reinício com e sem instantâneo para diários de tamanhos crescentes"""
+    import random
+    import shutil
+    import tempfile
+
+    import abastecimento
+
+    random.seed(3)
+    combustiveis = list(combustivel.listar_combustiveis())
+    formas = list(pagamento.listar_formas_pagamento().values())
+    cauda = 5_000
+    print("=== TEMPO DE REINÍCIO ===")
+    print(f"{'vendas no diário':>16} | {'sem instantâneo':>16} | {'com instantâneo':>16} | cauda")
+    for total in (20_000, 100_000, 400_000):
+        pasta = tempfile.mkdtemp(prefix="recuperacao-")
+        try:
+            pasta_diario = os.path.join(pasta, "diario")
+            with diario.DiarioAbastecimentos(pasta_diario, lote_commit=10_000) as diario_vendas:
+                def _vender(quantidade):
+                    for inicio in range(0, quantidade, 10_000):
+                        n = min(10_000, quantidade - inicio)
+                        resultado = abastecimento.processar_abastecimentos_em_lote(
+                            [random.choice(combustiveis) for _ in range(n)],
+                            [round(random.uniform(5, 60), 2) for _ in range(n)],
+                            [random.choice(formas) for _ in range(n)])
+                        diario_vendas.registrar_lote(resultado)
+                    diario_vendas.sincronizar()
+
+                recuperacao = Recuperacao(os.path.join(pasta, "estado"), diario_vendas=diario_vendas)
+                recuperacao.conectar()
+                _vender(total - cauda)
+                recuperacao.gravar_instantaneo()
+                combustivel.atualizar_preco_combustivel(combustiveis[0],
+                                                        combustivel.obter_preco_combustivel(combustiveis[0]))
+                _vender(cauda)
+                recuperacao.fechar()
+                esperado = relatorios.RelatorioVendas()
+                esperado.consumir(relatorios.de_diario(pasta_diario))
+
+            completo = Recuperacao(os.path.join(pasta, "vazia"), pasta_diario).restaurar()
+            rapido_recuperacao = Recuperacao(os.path.join(pasta, "estado"), pasta_diario)
+            rapido = rapido_recuperacao.restaurar()
+            assert rapido_recuperacao.livro.quantidade_vendas == esperado.quantidade_vendas
+            assert abs(rapido_recuperacao.livro.total_final - esperado.total_final) < 1e-6
+            print(f"{total:>16,} | {completo['total_ms']:>13.1f} ms | {rapido['total_ms']:>13.1f} ms | "
+                  f"{rapido['vendas_repetidas']:,} vendas, {rapido['precos_repetidos']} preço(s)")
+        finally:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
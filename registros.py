@@ -0,0 +1,252 @@
+"""
+MÓDULO REGISTROS
+================
+Este módulo guarda os abastecimentos do dia de forma compacta na memória.
+
+Em vez de manter um objeto RegistroAbastecimento por venda (cada um com
+oito atributos e um objeto datetime completo), o LivroRegistros guarda
+cada campo em um array tipado (módulo `array`), como uma tabela em colunas:
+
+    id_combustivel     -> array('I')  (inteiro sem sinal, 4 bytes)
+    quantidade_litros  -> array('d')  (float, 8 bytes)
+    valor_por_litro    -> array('d')
+    versao_preco       -> array('I')  (versão da tabela de preços usada)
+    id_pagamento       -> array('I')  (inteiro sem sinal, 4 bytes)
+    instante           -> array('q')  (data/hora em segundos desde 1970)
+    valor_bruto, valor_desconto, valor_final -> array('d')
+    percentual_desconto -> array('d')  (fração aplicada; nan = desconhecido)
+
+Os nomes de combustível e de pagamento são guardados uma única vez e
+cada venda guarda apenas o número (id) correspondente. Os ids usam 4 bytes
+para comportar catálogos com mais de 65.536 combustíveis (várias marcas).
+
+Para quem já usa RegistroAbastecimento (ex: exibir_resumo_abastecimento),
+o livro entrega "visões" (VisaoRegistro) com os mesmos atributos.
+"""
+
+import math
+from array import array
+from datetime import datetime
+
+
+def _internar(nome, nomes, ids):
+    """
+    Obtém o id de um nome, cadastrando-o na primeira vez que aparece
+
+    Args:
+        nome (str): Nome a ser convertido em id
+        nomes (list): Lista id -> nome
+        ids (dict): Dicionário nome -> id
+
+    Returns:
+        int: Id do nome
+    """
+    identificador = ids.get(nome)
+    if identificador is None:
+        identificador = len(nomes)
+        nomes.append(nome)
+        ids[nome] = identificador
+    return identificador
+
+
+class LivroRegistros:
+    """
+    CLASSE: Livro de registros compacto
+    ===================================
+    Armazena muitos abastecimentos em colunas de arrays tipados.
+
+    Uso típico:
+        livro = LivroRegistros()
+        livro.adicionar(registro)           # a partir de um RegistroAbastecimento
+        abastecimento.exibir_resumo_abastecimento(livro[0])
+    """
+    def __init__(self):
+        # TABELAS DE NOMES (id -> nome e nome -> id)
+        self._nomes_combustivel = []
+        self._ids_combustivel = {}
+        self._nomes_pagamento = []
+        self._ids_pagamento = {}
+
+        # COLUNAS DE DADOS
+        self.id_combustivel = array('I')
+        self.quantidade_litros = array('d')
+        self.valor_por_litro = array('d')
+        self.versao_preco = array('I')
+        self.id_pagamento = array('I')
+        self.instante = array('q')
+        self.valor_bruto = array('d')
+        self.valor_desconto = array('d')
+        self.valor_final = array('d')
+        # nan nas linhas vindas do diário, que não guarda o percentual
+        self.percentual_desconto = array('d')
+
+    def __len__(self):
+        return len(self.instante)
+
+    def __getitem__(self, indice):
+        total = len(self)
+        if indice < 0:
+            indice += total
+        if not 0 <= indice < total:
+            raise IndexError("Índice fora do livro de registros!")
+        return VisaoRegistro(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield VisaoRegistro(self, indice)
+
+    def nome_combustivel(self, id_combustivel):
+        """Retorna o nome do combustível correspondente ao id"""
+        return self._nomes_combustivel[id_combustivel]
+
+    def nome_pagamento(self, id_pagamento):
+        """Retorna o nome da forma de pagamento correspondente ao id"""
+        return self._nomes_pagamento[id_pagamento]
+
+    def _anexar(self, tipo_combustivel, quantidade_litros, valor_por_litro, versao_preco,
+                forma_pagamento, instante, valor_bruto, valor_desconto, valor_final,
+                percentual_desconto=None):
+        """
+        Anexa uma linha em todas as colunas
+
+        percentual_desconto None (ex: linha do diário) fica guardado como nan.
+
+        Returns:
+            int: Índice da linha anexada
+        """
+        self.id_combustivel.append(
+            _internar(tipo_combustivel, self._nomes_combustivel, self._ids_combustivel))
+        self.quantidade_litros.append(quantidade_litros)
+        self.valor_por_litro.append(valor_por_litro)
+        self.versao_preco.append(versao_preco)
+        self.id_pagamento.append(
+            _internar(forma_pagamento, self._nomes_pagamento, self._ids_pagamento))
+        self.instante.append(instante)
+        self.valor_bruto.append(valor_bruto)
+        self.valor_desconto.append(valor_desconto)
+        self.valor_final.append(valor_final)
+        self.percentual_desconto.append(math.nan if percentual_desconto is None
+                                        else percentual_desconto)
+        return len(self.instante) - 1
+
+    def adicionar(self, registro):
+        """
+        Adiciona um abastecimento ao livro
+
+        Args:
+            registro (RegistroAbastecimento): Registro já processado
+
+        Returns:
+            int: Índice do registro dentro do livro
+        """
+        return self._anexar(
+            registro.tipo_combustivel,
+            registro.quantidade_litros,
+            registro.valor_por_litro or 0.0,
+            registro.versao_preco,
+            registro.forma_pagamento,
+            int(registro.data_abastecimento.timestamp()),
+            registro.valor_bruto,
+            registro.valor_desconto,
+            registro.valor_final,
+            getattr(registro, "percentual_desconto", None),   # ausente em índices antigos
+        )
+
+    def adicionar_lote(self, resultado, instante=None):
+        """
+        Adiciona as linhas válidas de um processamento em lote
+
+        Args:
+            resultado (ResultadoLote): Retorno de processar_abastecimentos_em_lote()
+            instante (int): Data/hora em segundos desde 1970 (padrão: agora)
+
+        Returns:
+            int: Quantidade de linhas adicionadas
+        """
+        if instante is None:
+            instante = int(datetime.now().timestamp())
+
+        adicionados = 0
+        for i, valido in enumerate(resultado.validos):
+            if not valido:
+                continue
+            self._anexar(
+                resultado.tipos_combustivel[i],
+                resultado.quantidade_litros[i],
+                resultado.valor_por_litro[i],
+                resultado.versao_preco,
+                resultado.formas_pagamento[i],
+                instante,
+                resultado.valor_bruto[i],
+                resultado.valor_desconto[i],
+                resultado.valor_final[i],
+                resultado.percentual_desconto[i],
+            )
+            adicionados += 1
+        return adicionados
+
+    def total_final(self):
+        """
+        Soma o valor final de todos os abastecimentos do livro
+
+        Returns:
+            float: Total arrecadado
+        """
+        return sum(self.valor_final)
+
+
+class VisaoRegistro:
+    """
+    CLASSE: Visão de uma linha do livro
+    ===================================
+    Objeto leve (apenas referência ao livro + índice) que se comporta como
+    um RegistroAbastecimento para leitura. Os valores são buscados nas
+    colunas do livro somente quando o atributo é acessado.
+    """
+    __slots__ = ("_livro", "_indice")
+
+    def __init__(self, livro, indice):
+        self._livro = livro
+        self._indice = indice
+
+    @property
+    def tipo_combustivel(self):
+        return self._livro.nome_combustivel(self._livro.id_combustivel[self._indice])
+
+    @property
+    def quantidade_litros(self):
+        return self._livro.quantidade_litros[self._indice]
+
+    @property
+    def forma_pagamento(self):
+        return self._livro.nome_pagamento(self._livro.id_pagamento[self._indice])
+
+    @property
+    def valor_por_litro(self):
+        return self._livro.valor_por_litro[self._indice]
+
+    @property
+    def versao_preco(self):
+        return self._livro.versao_preco[self._indice]
+
+    @property
+    def data_abastecimento(self):
+        return datetime.fromtimestamp(self._livro.instante[self._indice])
+
+    @property
+    def valor_bruto(self):
+        return self._livro.valor_bruto[self._indice]
+
+    @property
+    def valor_desconto(self):
+        return self._livro.valor_desconto[self._indice]
+
+    @property
+    def valor_final(self):
+        return self._livro.valor_final[self._indice]
+
+    @property
+    def percentual_desconto(self):
+        """Percentual aplicado à venda (None se desconhecido, ex: linha do diário)"""
+        percentual = self._livro.percentual_desconto[self._indice]
+        return None if math.isnan(percentual) else percentual
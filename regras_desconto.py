@@ -0,0 +1,479 @@
+"""
+MÓDULO REGRAS DE DESCONTO
+=========================
+Motor de regras de desconto declarativas, compiladas em uma tabela.
+
+O módulo pagamento tem uma única regra fixa (10% para Dinheiro, PIX e
+Débito). Este motor permite descontos por:
+- combustível
+- forma de pagamento
+- faixa de volume (ex: acima de 50 litros)
+- hora do dia (ex: happy hour das 14h às 16h)
+- clientes fidelidade (regras que só valem para eles)
+
+Como funciona:
+1. As regras são declaradas como objetos RegraDesconto
+2. O motor "compila" as regras em uma tabela densa, com uma posição para
+   cada combinação (combustível, pagamento, faixa, hora)
+3. Na venda, o desconto é uma consulta direta na tabela: custo constante,
+   sem testar regra por regra
+
+Quando várias regras cobrem a mesma combinação, vence a de maior
+prioridade (empate: a de maior percentual).
+
+Alterar, adicionar ou remover UMA regra recalcula apenas as posições da
+tabela cobertas por ela (recompilação incremental): as posições de cada
+regra ficam guardadas, então as demais regras são apenas cruzadas com as
+posições alteradas, sem recalcular a cobertura delas nem a tabela inteira.
+O recálculo é feito em uma cópia das tabelas, publicada com uma única
+atribuição (como combustivel.TabelaPrecos): as vendas consultam sem trava.
+
+Para valer nas vendas, o motor é instalado no módulo pagamento:
+    pagamento.configurar_motor_descontos(MotorDescontos(regras_padrao()))
+A partir daí abastecimento (venda única e em lote) consulta o motor em
+vez da regra fixa de 10%.
+"""
+
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import product
+
+import combustivel
+import pagamento
+
+HORAS_DO_DIA = 24
+
+
+class RegraDesconto:
+    """
+    CLASSE: Regra de desconto declarativa
+    =====================================
+    Campos com None valem para todos os valores.
+
+    Exemplo - 15% no Diesel na faixa de volume 2, das 22h às 6h:
+        RegraDesconto("Diesel noturno", 0.15, combustiveis=["Diesel"],
+                      faixas=[2], horas=list(range(22, 24)) + list(range(0, 6)))
+    """
+    __slots__ = ("nome", "percentual", "combustiveis", "pagamentos",
+                 "faixas", "horas", "prioridade", "somente_fidelidade")
+
+    def __init__(self, nome, percentual, combustiveis=None, pagamentos=None,
+                 faixas=None, horas=None, prioridade=0, somente_fidelidade=False):
+        """
+        Args:
+            nome (str): Nome único da regra
+            percentual (float): Desconto em fração (0.10 = 10%)
+            combustiveis (list): Nomes dos combustíveis cobertos
+            pagamentos (list): Nomes das formas de pagamento cobertas
+            faixas (list): Índices das faixas de volume cobertas
+            horas (list): Horas do dia cobertas (0 a 23)
+            prioridade (int): Maior prioridade vence em caso de conflito
+            somente_fidelidade (bool): Vale apenas para clientes fidelidade
+        """
+        if not 0.0 <= percentual <= 1.0:
+            raise ValueError("O percentual deve estar entre 0 e 1!")
+        self.nome = nome
+        self.percentual = percentual
+        self.combustiveis = None if combustiveis is None else tuple(combustiveis)
+        self.pagamentos = None if pagamentos is None else tuple(pagamentos)
+        self.faixas = None if faixas is None else tuple(faixas)
+        self.horas = None if horas is None else tuple(horas)
+        self.prioridade = prioridade
+        self.somente_fidelidade = somente_fidelidade
+
+    def __repr__(self):
+        return f"RegraDesconto({self.nome!r}, {self.percentual})"
+
+    def estado(self):
+        """
+        Regra em tipos simples (para gravar em JSON)
+
+        Returns:
+            dict: Campos da regra; de_estado() reconstrói a regra
+        """
+        estado = {}
+        for campo in self.__slots__:
+            valor = getattr(self, campo)
+            estado[campo] = list(valor) if isinstance(valor, tuple) else valor
+        return estado
+
+    @classmethod
+    def de_estado(cls, estado):
+        """
+        Reconstrói uma regra a partir de estado()
+
+        Raises:
+            KeyError: Se faltar o nome ou o percentual
+            ValueError: Se algum campo for inválido
+        """
+        try:
+            return cls(**estado)
+        except TypeError as erro:
+            raise ValueError(f"Regra de desconto inválida: {erro}")
+
+
+class TabelasDesconto:
+    """
+    CLASSE: Fotografia (snapshot) das tabelas compiladas
+    ====================================================
+    Como combustivel.TabelaPrecos: depois de publicada pelo motor, uma
+    fotografia nunca muda. Cada alteração de regra monta uma cópia, altera
+    só a cópia e a publica com uma única atribuição, então as vendas
+    (que leem sem trava) nunca veem dimensões e tabelas de versões
+    diferentes nem posições zeradas no meio de um recálculo.
+
+    Atributos:
+    - total_combustiveis, total_pagamentos, total_faixas (int): Dimensões
+    - comum, fidelidade (array): Percentual por posição
+    - prioridade_comum, prioridade_fidelidade (list): Prioridade da regra
+      vencedora em cada posição (None = nenhuma regra)
+    """
+    __slots__ = ("total_combustiveis", "total_pagamentos", "total_faixas",
+                 "comum", "fidelidade", "prioridade_comum", "prioridade_fidelidade")
+
+    def __init__(self, total_combustiveis, total_pagamentos, total_faixas):
+        self.total_combustiveis = total_combustiveis
+        self.total_pagamentos = total_pagamentos
+        self.total_faixas = total_faixas
+        tamanho = total_combustiveis * total_pagamentos * total_faixas * HORAS_DO_DIA
+        self.comum = array('d', bytes(8 * tamanho))
+        self.fidelidade = array('d', bytes(8 * tamanho))
+        self.prioridade_comum = [None] * tamanho
+        self.prioridade_fidelidade = [None] * tamanho
+
+    def copiar(self):
+        """Cópia com as mesmas dimensões, para ser alterada antes de publicada"""
+        copia = TabelasDesconto.__new__(TabelasDesconto)
+        copia.total_combustiveis = self.total_combustiveis
+        copia.total_pagamentos = self.total_pagamentos
+        copia.total_faixas = self.total_faixas
+        copia.comum = array('d', self.comum)
+        copia.fidelidade = array('d', self.fidelidade)
+        copia.prioridade_comum = list(self.prioridade_comum)
+        copia.prioridade_fidelidade = list(self.prioridade_fidelidade)
+        return copia
+
+    def posicao(self, id_combustivel, codigo_pagamento, faixa, hora):
+        """Posição de uma combinação nas tabelas"""
+        return (((id_combustivel * self.total_pagamentos + codigo_pagamento)
+                 * self.total_faixas + faixa) * HORAS_DO_DIA + hora)
+
+
+class MotorDescontos:
+    """
+    CLASSE: Motor de descontos compilado
+    ====================================
+    Mantém duas tabelas densas (clientes comuns e clientes fidelidade),
+    indexadas por (id do combustível, código do pagamento, faixa, hora).
+
+    Alterações de regras são serializadas por uma trava e publicadas como
+    uma nova TabelasDesconto; as consultas não usam trava.
+    """
+    def __init__(self, regras=(), faixas_litros=(0,)):
+        """
+        Args:
+            regras (iterable): Regras iniciais
+            faixas_litros (tuple): Início (em litros) de cada faixa de volume,
+                                   em ordem crescente. Ex: (0, 20, 50)
+                                   -> faixa 0: até 20 L, 1: 20 a 50 L, 2: acima de 50 L
+        """
+        self.faixas_litros = tuple(faixas_litros)
+        if not self.faixas_litros or list(self.faixas_litros) != sorted(self.faixas_litros):
+            raise ValueError("As faixas de litros devem estar em ordem crescente!")
+        self._regras = {regra.nome: regra for regra in regras}
+        # COBERTURA DE CADA REGRA - {nome: (regra, conjunto de posições)}; só usada por escritores
+        self._cobertura = {}
+        self._trava = threading.Lock()   # um escritor por vez
+        self._tabelas = None             # TabelasDesconto publicada (leitura sem trava)
+        self.compilar()
+
+    @property
+    def tabelas(self):
+        """TabelasDesconto publicada (não deve ser alterada)"""
+        return self._tabelas
+
+    # ------------------------------------------------------------------
+    # COMPILAÇÃO
+    # ------------------------------------------------------------------
+    def compilar(self):
+        """Recompila as tabelas inteiras (usado na criação e quando surgem novos combustíveis)"""
+        with self._trava:
+            self._compilar()
+
+    def _compilar(self):
+        """Monta e publica tabelas novas com todas as regras (com a trava adquirida)"""
+        tabelas = TabelasDesconto(len(combustivel.obter_tabela_precos().precos_por_id),
+                                  max(pagamento.listar_formas_pagamento()) + 1,
+                                  len(self.faixas_litros))
+        self._cobertura = {}   # as posições dependem das dimensões
+        for regra in self._regras.values():
+            self._aplicar(tabelas, regra)
+        self._tabelas = tabelas
+
+    def _posicoes(self, tabelas, regra):
+        """Lista as posições da tabela cobertas por uma regra"""
+        if regra.combustiveis is None:
+            combustiveis = range(tabelas.total_combustiveis)
+        else:
+            combustiveis = [i for i in map(combustivel.obter_id_combustivel, regra.combustiveis)
+                            if i is not None and i < tabelas.total_combustiveis]
+        if regra.pagamentos is None:
+            pagamentos = list(pagamento.listar_formas_pagamento())
+        else:
+            pagamentos = [c for c in map(pagamento.obter_codigo_pagamento, regra.pagamentos)
+                          if c is not None]
+        faixas = range(tabelas.total_faixas) if regra.faixas is None else [
+            f for f in regra.faixas if 0 <= f < tabelas.total_faixas]
+        horas = range(HORAS_DO_DIA) if regra.horas is None else [
+            h for h in regra.horas if 0 <= h < HORAS_DO_DIA]
+
+        P, T, H = tabelas.total_pagamentos, tabelas.total_faixas, HORAS_DO_DIA
+        return [((c * P + p) * T + f) * H + h
+                for c, p, f, h in product(combustiveis, pagamentos, faixas, horas)]
+
+    def _cobertura_da_regra(self, tabelas, regra):
+        """Conjunto de posições de uma regra (calculado uma vez por regra e dimensões)"""
+        guardada = self._cobertura.get(regra.nome)
+        if guardada is None or guardada[0] is not regra:
+            guardada = self._cobertura[regra.nome] = (regra, frozenset(self._posicoes(tabelas, regra)))
+        return guardada[1]
+
+    @staticmethod
+    def _tabelas_da_regra(tabelas, regra):
+        """Tabelas afetadas: regras de fidelidade só entram na tabela fidelidade"""
+        afetadas = [(tabelas.fidelidade, tabelas.prioridade_fidelidade)]
+        if not regra.somente_fidelidade:
+            afetadas.append((tabelas.comum, tabelas.prioridade_comum))
+        return afetadas
+
+    @staticmethod
+    def _vence(regra, percentual_atual, prioridade_atual):
+        """Verifica se a regra vence a que ocupa a posição"""
+        if prioridade_atual is None:
+            return True
+        return (regra.prioridade, regra.percentual) > (prioridade_atual, percentual_atual)
+
+    def _aplicar(self, tabelas, regra, posicoes=None):
+        """Escreve uma regra nas posições que ela cobre (onde ela vence)"""
+        if posicoes is None:
+            posicoes = self._cobertura_da_regra(tabelas, regra)
+        for tabela, prioridades in self._tabelas_da_regra(tabelas, regra):
+            for posicao in posicoes:
+                if self._vence(regra, tabela[posicao], prioridades[posicao]):
+                    tabela[posicao] = regra.percentual
+                    prioridades[posicao] = regra.prioridade
+
+    def _recalcular(self, tabelas, posicoes):
+        """
+        Recalcula do zero as posições indicadas (em tabelas ainda não publicadas)
+
+        Cada regra é cruzada com as posições pela sua cobertura guardada
+        (interseção de conjuntos, proporcional às posições alteradas).
+        """
+        for tabela, prioridades in ((tabelas.comum, tabelas.prioridade_comum),
+                                    (tabelas.fidelidade, tabelas.prioridade_fidelidade)):
+            for posicao in posicoes:
+                tabela[posicao] = 0.0
+                prioridades[posicao] = None
+        for regra in self._regras.values():
+            cobertas = posicoes & self._cobertura_da_regra(tabelas, regra)
+            if cobertas:
+                self._aplicar(tabelas, regra, cobertas)
+
+    # ------------------------------------------------------------------
+    # ALTERAÇÃO DE REGRAS (RECOMPILAÇÃO INCREMENTAL)
+    # ------------------------------------------------------------------
+    def definir_regra(self, regra):
+        """
+        Adiciona uma regra ou substitui a regra de mesmo nome
+
+        Apenas as posições cobertas pela regra antiga e pela nova são
+        recalculadas, em uma cópia publicada ao final.
+        """
+        with self._trava:
+            self._garantir_dimensoes()
+            tabelas = self._tabelas.copiar()
+            regras = dict(self._regras)
+            antiga = regras.get(regra.nome)
+            regras[regra.nome] = regra
+            if antiga is None:
+                self._regras = regras
+                self._aplicar(tabelas, regra)
+            else:
+                alteradas = self._cobertura_da_regra(tabelas, antiga)
+                self._regras = regras
+                self._recalcular(tabelas, alteradas | self._cobertura_da_regra(tabelas, regra))
+            self._tabelas = tabelas
+        pagamento.avisar_alteracao_motor(self)
+
+    def remover_regra(self, nome):
+        """
+        Remove uma regra pelo nome
+
+        Returns:
+            bool: True se a regra existia
+        """
+        with self._trava:
+            self._garantir_dimensoes()
+            antiga = self._regras.get(nome)
+            if antiga is None:
+                return False
+            tabelas = self._tabelas.copiar()
+            alteradas = self._cobertura_da_regra(tabelas, antiga)
+            regras = dict(self._regras)
+            del regras[nome]
+            self._regras = regras
+            del self._cobertura[nome]
+            self._recalcular(tabelas, alteradas)
+            self._tabelas = tabelas
+        pagamento.avisar_alteracao_motor(self)
+        return True
+
+    def listar_regras(self):
+        """Retorna as regras cadastradas"""
+        return list(self._regras.values())
+
+    def estado(self):
+        """
+        Faixas e regras em tipos simples (para gravar em JSON)
+
+        Returns:
+            dict: de_estado() reconstrói um motor com as mesmas regras
+        """
+        return {"faixas_litros": list(self.faixas_litros),
+                "regras": [regra.estado() for regra in self.listar_regras()]}
+
+    @classmethod
+    def de_estado(cls, estado):
+        """
+        Reconstrói (e compila) um motor a partir de estado()
+
+        Raises:
+            KeyError: Se faltar algum campo
+            ValueError: Se alguma regra ou faixa for inválida
+        """
+        try:
+            regras = [RegraDesconto.de_estado(regra) for regra in estado["regras"]]
+            return cls(regras, faixas_litros=estado["faixas_litros"])
+        except TypeError as erro:
+            raise ValueError(f"Motor de descontos inválido: {erro}")
+
+    def _garantir_dimensoes(self):
+        """Recompila se novos combustíveis foram cadastrados (com a trava adquirida)"""
+        if len(combustivel.obter_tabela_precos().precos_por_id) != self._tabelas.total_combustiveis:
+            self._compilar()
+
+    # ------------------------------------------------------------------
+    # CONSULTA
+    # ------------------------------------------------------------------
+    def _tabelas_para(self, id_combustivel, codigo_pagamento, hora):
+        """
+        Confere id, código e hora e devolve as tabelas publicadas que os contêm
+
+        Um id além da tabela (combustível cadastrado depois da compilação)
+        provoca uma recompilação.
+
+        Returns:
+            TabelasDesconto: Fotografia a usar em toda a consulta
+
+        Raises:
+            ValueError: Se algum índice estiver fora da tabela
+        """
+        if type(id_combustivel) is not int or id_combustivel < 0:
+            raise ValueError(f"Id de combustível {id_combustivel!r} inválido!")
+        tabelas = self._tabelas
+        if id_combustivel >= tabelas.total_combustiveis:
+            with self._trava:
+                self._garantir_dimensoes()
+            tabelas = self._tabelas
+            if id_combustivel >= tabelas.total_combustiveis:
+                raise ValueError(f"Combustível de id {id_combustivel} não encontrado!")
+        if type(codigo_pagamento) is not int or not 0 <= codigo_pagamento < tabelas.total_pagamentos:
+            raise ValueError(f"Código de pagamento {codigo_pagamento!r} inválido!")
+        if type(hora) is not int or not 0 <= hora < HORAS_DO_DIA:
+            raise ValueError(f"Hora {hora!r} inválida (use 0 a 23)!")
+        return tabelas
+
+    def faixa_de(self, quantidade_litros):
+        """Índice da faixa de volume de uma quantidade de litros"""
+        return max(0, bisect_right(self.faixas_litros, quantidade_litros) - 1)
+
+    def percentual(self, id_combustivel, codigo_pagamento, quantidade_litros, hora,
+                   fidelidade=False):
+        """
+        FUNÇÃO: Percentual de desconto de uma venda (consulta direta na tabela)
+        =======================================================================
+        Args:
+            id_combustivel (int): Id do combustível
+            codigo_pagamento (int): Código da forma de pagamento
+            quantidade_litros (float): Volume da venda
+            hora (int): Hora do dia (0 a 23)
+            fidelidade (bool): Cliente fidelidade
+
+        Returns:
+            float: Percentual de desconto em fração (0.10 = 10%)
+
+        Raises:
+            ValueError: Se id, código ou hora estiverem fora da tabela
+        """
+        tabelas = self._tabelas_para(id_combustivel, codigo_pagamento, hora)
+        tabela = tabelas.fidelidade if fidelidade else tabelas.comum
+        return tabela[tabelas.posicao(id_combustivel, codigo_pagamento,
+                                      self.faixa_de(quantidade_litros), hora)]
+
+    def calcular_desconto(self, valor_bruto, id_combustivel, codigo_pagamento,
+                          quantidade_litros, hora, fidelidade=False):
+        """
+        Calcula o valor do desconto em reais de uma venda
+
+        Returns:
+            float: Valor do desconto
+        """
+        return valor_bruto * self.percentual(id_combustivel, codigo_pagamento,
+                                              quantidade_litros, hora, fidelidade)
+
+    def percentuais_lote(self, ids_combustivel, codigos_pagamento, quantidades_litros,
+                         horas, fidelidade=None):
+        """
+        Percentuais de desconto de muitas vendas de uma vez
+
+        Args:
+            ids_combustivel, codigos_pagamento, quantidades_litros, horas (list): Colunas do lote
+            fidelidade (list): Coluna de bool (None = nenhum cliente fidelidade)
+
+        Returns:
+            array: array('d') com o percentual de cada venda
+
+        Raises:
+            ValueError: Se algum id, código ou hora estiver fora da tabela
+        """
+        tabelas = self._tabelas
+        if ids_combustivel:
+            tabelas = self._tabelas_para(max(ids_combustivel), max(codigos_pagamento), max(horas))
+            self._tabelas_para(min(ids_combustivel), min(codigos_pagamento), min(horas))
+        P, T, H = tabelas.total_pagamentos, tabelas.total_faixas, HORAS_DO_DIA
+        faixas_litros = self.faixas_litros
+        faixas = [max(0, bisect_right(faixas_litros, l) - 1) for l in quantidades_litros]
+        posicoes = [((c * P + p) * T + f) * H + h
+                    for c, p, f, h in zip(ids_combustivel, codigos_pagamento, faixas, horas)]
+        comum = tabelas.comum
+        if fidelidade is None:
+            return array('d', [comum[i] for i in posicoes])
+        especial = tabelas.fidelidade
+        return array('d', [especial[i] if fiel else comum[i]
+                           for i, fiel in zip(posicoes, fidelidade)])
+
+
+def regras_padrao():
+    """
+    Regras equivalentes às do módulo pagamento (desconto para pagamentos à vista)
+
+    Returns:
+        list: Regras iniciais do motor
+    """
+    return [RegraDesconto(
+        "Pagamento sem taxa",
+        pagamento.obter_percentual_desconto(),
+        pagamentos=list(pagamento.PAGAMENTO_COM_DESCONTO),
+    )]
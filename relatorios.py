@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO RELATÓRIOS
+=================
+Relatórios de vendas calculados em fluxo (streaming), em uma única passada.
+
+As vendas nunca são carregadas todas na memória: cada fonte é um gerador
+que entrega uma venda por vez, e o RelatorioVendas apenas acumula somas
+por grupo. A memória usada depende do número de grupos (combustíveis,
+formas de pagamento, horas), e não do número de vendas.
+
+Fontes de vendas (todas geradores):
+- ler_csv(caminho)          Arquivo CSV com cabeçalho
+- ler_jsonl(caminho)        Arquivo com um objeto JSON por linha
+- de_registros(registros)   Vendas ao vivo (RegistroAbastecimento, LivroRegistros)
+- de_diario(pasta)          Diário gravado em disco (módulo diario)
+
+Colunas dos arquivos CSV/JSONL:
+- Obrigatórias: instante, combustivel, litros, pagamento
+- Opcionais: valor_por_litro, valor_bruto, valor_desconto, valor_final
+  (quando ausentes, são calculadas com o preço vigente no instante da venda)
+
+Relatórios:
+- RelatorioVendas: receita e litros por combustível, descontos por forma
+  de pagamento e histograma por hora do dia
+- agregar_por_dia() e agregar_por_turno(): um RelatorioVendas por grupo
+
+Execução:
+    python relatorios.py vendas.csv --por turno
+"""
+
+import argparse
+import csv
+import json
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import abastecimento
+import combustivel
+import dinheiro
+import pagamento
+
+# VENDA - forma comum entregue por todas as fontes
+# instante em segundos desde 1970
+Venda = namedtuple("Venda", [
+    "instante", "tipo_combustivel", "quantidade_litros", "forma_pagamento",
+    "valor_por_litro", "valor_bruto", "valor_desconto", "valor_final",
+])
+
+# TURNOS PADRÃO - (nome, hora inicial, hora final); o turno da noite atravessa a meia-noite
+TURNOS_PADRAO = (
+    ("Manhã", 6, 14),
+    ("Tarde", 14, 22),
+    ("Noite", 22, 6),
+)
+
+
+def _converter_instante(valor):
+    """Converte datetime, segundos desde 1970 ou data ISO (2025-01-31T10:00:00) em segundos"""
+    if isinstance(valor, datetime):
+        return valor.timestamp()
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(valor)).timestamp()
+
+def _venda_de_campos(campos):
+    """
+    Monta uma Venda a partir de um dicionário lido de CSV/JSONL
+
+    Valores ausentes são calculados como numa venda ao vivo: preço vigente
+    no instante (combustivel.preco_em), percentual do módulo pagamento (regra
+    fixa ou motor de regras, pela hora da venda) e contas em centavos exatos
+    do módulo dinheiro, com o arredondamento do módulo abastecimento.
+    """
+    instante = _converter_instante(campos["instante"])
+    tipo = campos["combustivel"]
+    litros = float(campos["litros"])
+    forma = campos["pagamento"]
+
+    preco = campos.get("valor_por_litro")
+    preco = float(preco) if preco not in (None, "") else combustivel.preco_em(tipo, instante)
+    if preco is None:
+        raise ValueError(f"Sem preço para '{tipo}' no instante {instante}!")
+
+    bruto = campos.get("valor_bruto")
+    desconto = campos.get("valor_desconto")
+    final = campos.get("valor_final")
+    if any(valor in (None, "") for valor in (bruto, desconto, final)):
+        bruto, desconto, final = _completar_valores(tipo, litros, forma, preco, instante,
+                                                    bruto, desconto, final)
+    else:
+        bruto, desconto, final = float(bruto), float(desconto), float(final)
+
+    return Venda(instante, tipo, litros, forma, preco, bruto, desconto, final)
+
+def _completar_valores(tipo, litros, forma, preco, instante, bruto, desconto, final):
+    """
+    Calcula em centavos (módulo dinheiro) os valores ausentes de uma venda
+
+    Os valores informados são mantidos; os ausentes partem deles (o desconto
+    é aplicado sobre o bruto informado, o final é bruto - desconto).
+
+    Returns:
+        tuple: (bruto, desconto, final) em reais
+    """
+    modo = abastecimento.MODO_ARREDONDAMENTO
+    codigo = pagamento.obter_codigo_pagamento(forma)
+    percentual = (0.0 if codigo is None else pagamento.percentual_desconto_por_codigo(
+        codigo, combustivel.obter_id_combustivel(tipo), litros,
+        datetime.fromtimestamp(instante).hour))
+
+    if bruto in (None, ""):
+        bruto_centavos, _, _ = dinheiro.precificar(
+            dinheiro.litros_para_mililitros(litros, modo),
+            dinheiro.reais_para_milesimos(preco, modo), 0, modo, abastecimento.CASAS_PRECO)
+    else:
+        bruto_centavos = dinheiro.reais_para_centavos(bruto, modo)
+    if desconto in (None, ""):
+        desconto_centavos = dinheiro.dividir_arredondando(
+            bruto_centavos * dinheiro.percentual_para_pontos_base(percentual),
+            dinheiro.PONTOS_BASE_TOTAL, modo)
+    else:
+        desconto_centavos = dinheiro.reais_para_centavos(desconto, modo)
+    if final in (None, ""):
+        final_centavos = bruto_centavos - desconto_centavos
+    else:
+        final_centavos = dinheiro.reais_para_centavos(final, modo)
+
+    return bruto_centavos / 100, desconto_centavos / 100, final_centavos / 100
+
+def ler_csv(caminho, delimitador=","):
+    """
+    Lê vendas de um arquivo CSV, uma linha por vez
+
+    Yields:
+        Venda: Uma venda por linha do arquivo
+    """
+    with open(caminho, "r", encoding="utf-8", newline="") as arquivo:
+        for campos in csv.DictReader(arquivo, delimiter=delimitador):
+            yield _venda_de_campos(campos)
+
+def ler_jsonl(caminho):
+    """
+    Lê vendas de um arquivo JSONL (um objeto JSON por linha)
+
+    Yields:
+        Venda: Uma venda por linha não vazia do arquivo
+    """
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield _venda_de_campos(json.loads(linha))
+
+def de_registros(registros):
+    """
+    Converte registros ao vivo (RegistroAbastecimento ou VisaoRegistro) em vendas
+
+    Yields:
+        Venda: Uma venda por registro
+    """
+    for registro in registros:
+        yield Venda(
+            registro.data_abastecimento.timestamp(),
+            registro.tipo_combustivel,
+            registro.quantidade_litros,
+            registro.forma_pagamento,
+            registro.valor_por_litro,
+            registro.valor_bruto,
+            registro.valor_desconto,
+            registro.valor_final,
+        )
+
+def de_diario(pasta):
+    """
+    Lê as vendas gravadas no diário em disco
+
+    Yields:
+        Venda: Uma venda por registro do diário
+    """
+    import diario
+
+    leitor = diario.LeitorDiario(pasta)
+    nome_combustivel = leitor.nome_combustivel
+    nome_pagamento = leitor.nome_pagamento
+    for instante, id_comb, id_pag, _versao, litros, preco, bruto, desconto, final in leitor.iterar():
+        yield Venda(instante, nome_combustivel(id_comb), litros, nome_pagamento(id_pag),
+                    preco, bruto, desconto, final)
+
+def filtrar_periodo(vendas, inicio=None, fim=None):
+    """
+    Mantém apenas as vendas com inicio <= instante < fim
+
+    Args:
+        vendas (iterable): Fonte de vendas
+        inicio, fim (float ou datetime): Limites do período (None = sem limite)
+
+    Yields:
+        Venda: Vendas dentro do período
+    """
+    inicio = None if inicio is None else _converter_instante(inicio)
+    fim = None if fim is None else _converter_instante(fim)
+    for venda in vendas:
+        if inicio is not None and venda.instante < inicio:
+            continue
+        if fim is not None and venda.instante >= fim:
+            continue
+        yield venda
+
+
+class RelatorioVendas:
+    """
+    CLASSE: Relatório de vendas acumulado em uma passada
+    ====================================================
+    Cada venda atualiza apenas somas e contadores; nenhuma venda é guardada.
+    """
+    def __init__(self):
+        self.quantidade_vendas = 0
+        self.total_litros = 0.0
+        self.total_bruto = 0.0
+        self.total_desconto = 0.0
+        self.total_final = 0.0
+        # {combustível: [vendas, litros, receita]}
+        self.por_combustivel = {}
+        # {forma de pagamento: [vendas, receita, desconto concedido]}
+        self.por_pagamento = {}
+        # posição = hora do dia (0 a 23): vendas e receita
+        self.vendas_por_hora = [0] * 24
+        self.receita_por_hora = [0.0] * 24
+
+    def adicionar(self, venda):
+        """Acumula uma venda no relatório"""
+        self.quantidade_vendas += 1
+        self.total_litros += venda.quantidade_litros
+        self.total_bruto += venda.valor_bruto
+        self.total_desconto += venda.valor_desconto
+        self.total_final += venda.valor_final
+
+        grupo = self.por_combustivel.get(venda.tipo_combustivel)
+        if grupo is None:
+            grupo = self.por_combustivel[venda.tipo_combustivel] = [0, 0.0, 0.0]
+        grupo[0] += 1
+        grupo[1] += venda.quantidade_litros
+        grupo[2] += venda.valor_final
+
+        grupo = self.por_pagamento.get(venda.forma_pagamento)
+        if grupo is None:
+            grupo = self.por_pagamento[venda.forma_pagamento] = [0, 0.0, 0.0]
+        grupo[0] += 1
+        grupo[1] += venda.valor_final
+        grupo[2] += venda.valor_desconto
+
+        hora = datetime.fromtimestamp(venda.instante).hour
+        self.vendas_por_hora[hora] += 1
+        self.receita_por_hora[hora] += venda.valor_final
+
+    def consumir(self, vendas):
+        """
+        Acumula todas as vendas de uma fonte (uma única passada)
+
+        Returns:
+            RelatorioVendas: O próprio relatório (permite encadear)
+        """
+        adicionar = self.adicionar
+        for venda in vendas:
+            adicionar(venda)
+        return self
+
+    def mesclar(self, outro):
+        """
+        Soma ao relatório os totais de outro relatório
+
+        Permite juntar relatórios parciais (ex: de cada posto ou de cada
+        processo) sem reprocessar as vendas.
+
+        Returns:
+            RelatorioVendas: O próprio relatório (permite encadear)
+        """
+        self.quantidade_vendas += outro.quantidade_vendas
+        self.total_litros += outro.total_litros
+        self.total_bruto += outro.total_bruto
+        self.total_desconto += outro.total_desconto
+        self.total_final += outro.total_final
+        for destino, origem in ((self.por_combustivel, outro.por_combustivel),
+                                (self.por_pagamento, outro.por_pagamento)):
+            for nome, valores in origem.items():
+                grupo = destino.get(nome)
+                if grupo is None:
+                    destino[nome] = list(valores)
+                else:
+                    for i, valor in enumerate(valores):
+                        grupo[i] += valor
+        for hora in range(24):
+            self.vendas_por_hora[hora] += outro.vendas_por_hora[hora]
+            self.receita_por_hora[hora] += outro.receita_por_hora[hora]
+        return self
+
+    def estado(self):
+        """
+        Estado completo do relatório em tipos simples (para gravar em JSON)
+
+        Returns:
+            dict: Somas e contadores; de_estado() reconstrói o relatório
+        """
+        return {
+            "quantidade_vendas": self.quantidade_vendas,
+            "total_litros": self.total_litros,
+            "total_bruto": self.total_bruto,
+            "total_desconto": self.total_desconto,
+            "total_final": self.total_final,
+            "por_combustivel": self.por_combustivel,
+            "por_pagamento": self.por_pagamento,
+            "vendas_por_hora": self.vendas_por_hora,
+            "receita_por_hora": self.receita_por_hora,
+        }
+
+    @classmethod
+    def de_estado(cls, estado):
+        """
+        Reconstrói um relatório a partir de estado()
+
+        Returns:
+            RelatorioVendas: Relatório com as mesmas somas
+        """
+        relatorio = cls()
+        for campo, valor in estado.items():
+            if campo in ("por_combustivel", "por_pagamento"):
+                valor = {chave: list(valores) for chave, valores in valor.items()}
+            setattr(relatorio, campo, list(valor) if isinstance(valor, list) else valor)
+        return relatorio
+
+    def resultado(self):
+        """
+        Retorna o relatório como dicionário (valores arredondados em centavos)
+
+        Returns:
+            dict: Totais, grupos por combustível/pagamento e histograma horário
+        """
+        return {
+            "vendas": self.quantidade_vendas,
+            "litros": round(self.total_litros, 3),
+            "valor_bruto": round(self.total_bruto, 2),
+            "valor_desconto": round(self.total_desconto, 2),
+            "valor_final": round(self.total_final, 2),
+            "por_combustivel": {
+                nome: {"vendas": v, "litros": round(l, 3), "receita": round(r, 2)}
+                for nome, (v, l, r) in sorted(self.por_combustivel.items())
+            },
+            "por_pagamento": {
+                nome: {"vendas": v, "receita": round(r, 2), "desconto": round(d, 2)}
+                for nome, (v, r, d) in sorted(self.por_pagamento.items())
+            },
+            "por_hora": [
+                {"hora": hora, "vendas": v, "receita": round(r, 2)}
+                for hora, (v, r) in enumerate(zip(self.vendas_por_hora, self.receita_por_hora))
+                if v
+            ],
+        }
+
+    def exibir(self, titulo="RELATÓRIO DE VENDAS"):
+        """Exibe o relatório formatado no terminal"""
+        print("\n" + "=" * 60)
+        print(titulo.center(60))
+        print("=" * 60)
+        print(f"Vendas: {self.quantidade_vendas}   Litros: {self.total_litros:.2f}")
+        print(f"Valor bruto: R$ {self.total_bruto:.2f}   Descontos: R$ {self.total_desconto:.2f}")
+        print(f"TOTAL RECEBIDO: R$ {self.total_final:.2f}")
+
+        print("\nPor combustível:")
+        for nome, (vendas, litros, receita) in sorted(self.por_combustivel.items()):
+            print(f"  {nome:<22} {vendas:>8} vendas {litros:>12.2f} L  R$ {receita:>12.2f}")
+
+        print("\nDescontos por forma de pagamento:")
+        for nome, (vendas, receita, desconto) in sorted(self.por_pagamento.items()):
+            print(f"  {nome:<22} {vendas:>8} vendas  desconto R$ {desconto:>10.2f}")
+
+        print("\nVendas por hora:")
+        maior = max(self.vendas_por_hora) or 1
+        for hora, vendas in enumerate(self.vendas_por_hora):
+            if vendas:
+                barra = "#" * max(1, round(40 * vendas / maior))
+                print(f"  {hora:02d}h {vendas:>8} {barra}")
+        print("=" * 60)
+
+
+def turno_da_hora(hora, turnos=TURNOS_PADRAO):
+    """
+    Identifica o turno de uma hora do dia
+
+    Returns:
+        str: Nome do turno (ou None se nenhum turno cobre a hora)
+    """
+    for nome, inicio, fim in turnos:
+        if inicio <= fim:
+            if inicio <= hora < fim:
+                return nome
+        elif hora >= inicio or hora < fim:   # turno que atravessa a meia-noite
+            return nome
+    return None
+
+def agregar_por(vendas, chave):
+    """
+    Agrupa as vendas com uma função de chave, um relatório por grupo
+
+    Args:
+        vendas (iterable): Fonte de vendas
+        chave (callable): Função venda -> grupo
+
+    Returns:
+        dict: {grupo: RelatorioVendas}
+    """
+    relatorios = {}
+    for venda in vendas:
+        grupo = chave(venda)
+        relatorio = relatorios.get(grupo)
+        if relatorio is None:
+            relatorio = relatorios[grupo] = RelatorioVendas()
+        relatorio.adicionar(venda)
+    return relatorios
+
+def agregar_por_dia(vendas):
+    """
+    Relatório diário
+
+    Returns:
+        dict: {data (date): RelatorioVendas}
+    """
+    return agregar_por(vendas, lambda venda: datetime.fromtimestamp(venda.instante).date())
+
+def agregar_por_turno(vendas, turnos=TURNOS_PADRAO):
+    """
+    Relatório por turno. Vendas do turno da noite feitas depois da
+    meia-noite contam no dia em que o turno começou.
+
+    Returns:
+        dict: {(data, turno): RelatorioVendas}
+    """
+    # Inícios dos turnos que atravessam a meia-noite (para ajustar a data)
+    noturnos = {nome: fim for nome, inicio, fim in turnos if inicio > fim}
+
+    def _chave(venda):
+        momento = datetime.fromtimestamp(venda.instante)
+        turno = turno_da_hora(momento.hour, turnos)
+        data = momento.date()
+        if turno in noturnos and momento.hour < noturnos[turno]:
+            data -= timedelta(days=1)
+        return data, turno
+
+    return agregar_por(vendas, _chave)
+
+
+def _rotulo(chave):
+    """Texto de um grupo: data ISO, turno ou (data, turno)"""
+    if isinstance(chave, tuple):
+        return " ".join(_rotulo(parte) for parte in chave)
+    if hasattr(chave, "isoformat"):
+        return chave.isoformat()
+    return str(chave)
+
+def main():
+    """Gera relatórios a partir de um arquivo CSV/JSONL ou de um diário"""
+    parser = argparse.ArgumentParser(description="Relatórios de vendas em fluxo")
+    parser.add_argument("origem", help="arquivo .csv/.jsonl ou pasta do diário")
+    parser.add_argument("--por", choices=["total", "dia", "turno"], default="total")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    argumentos = parser.parse_args()
+
+    if os.path.isdir(argumentos.origem):
+        vendas = de_diario(argumentos.origem)
+    elif argumentos.origem.endswith(".jsonl"):
+        vendas = ler_jsonl(argumentos.origem)
+    else:
+        vendas = ler_csv(argumentos.origem)
+
+    if argumentos.por == "dia":
+        grupos = agregar_por_dia(vendas)
+    elif argumentos.por == "turno":
+        grupos = agregar_por_turno(vendas)
+    else:
+        grupos = {"total": RelatorioVendas().consumir(vendas)}
+
+    if argumentos.json:
+        print(json.dumps({_rotulo(chave): relatorio.resultado() for chave, relatorio in grupos.items()},
+                         ensure_ascii=False, indent=2))
+    else:
+        for chave, relatorio in sorted(grupos.items(), key=lambda item: _rotulo(item[0])):
+            relatorio.exibir(f"RELATÓRIO - {_rotulo(chave)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MÓDULO TANQUES
+==============
+Estoque físico de combustível: cada combustível tem um tanque com
+capacidade, volume atual, entregas (descargas de caminhão) e as saídas
+de cada venda.
+
+Regras de negócio implementadas:
+- Uma venda só acontece se houver combustível disponível no tanque
+- Uma entrega não pode passar da capacidade do tanque
+- Volumes guardados em mililitros inteiros (sem erro de arredondamento
+  acumulado em milhares de vendas)
+
+Reserva e confirmação (várias bombas ao mesmo tempo):
+1. reservar(): separa o volume da venda; disponível = volume - reservado.
+   Duas bombas nunca conseguem reservar o mesmo litro.
+2. confirmar(): a venda foi concluída; o volume sai do tanque.
+   cancelar(): a venda falhou; a reserva é devolvida.
+
+Desempenho:
+- Cada tanque tem a SUA trava; bombas de combustíveis diferentes nunca
+  disputam a mesma trava (não existe trava global no caminho da venda)
+- Confirmações e cancelamentos não usam trava: entram em uma fila do
+  tanque (deque.append é atômico) e são aplicados em lote na próxima
+  operação que já precisa da trava (reserva, entrega ou leitura do
+  nível). Enquanto isso o volume continua reservado, então o lote
+  atrasado nunca permite vender além do estoque.
+
+Ligação com as vendas:
+    abastecimento.configurar_estoque(EstoqueTanques({"Gasolina": 30_000}, {"Gasolina": 12_000}))
+A partir daí processar_abastecimento() e processar_abastecimento_por_id()
+reservam e confirmam o volume sozinhos. No processamento em lote cada
+linha reserva o seu volume; as linhas sem estoque são recusadas (marcadas
+como inválidas no ResultadoLote) e as demais são confirmadas juntas.
+
+Execução:
+    python tanques.py   # mede a disputa com 1, 2, 4 e 8 bombas (threads)
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+import abastecimento
+
+# CAPACIDADE PADRÃO DE UM TANQUE - em litros (tanque subterrâneo típico)
+CAPACIDADE_PADRAO = 30_000
+
+
+def _para_mililitros(litros, aceitar_zero=False):
+    """
+    Converte litros em mililitros inteiros
+
+    Args:
+        litros (float): Volume em litros
+        aceitar_zero (bool): True para aceitar 0 (ex: tanque inicialmente vazio)
+
+    Raises:
+        ValueError: Se o valor não for um número positivo e finito (nan e
+                    infinito também são recusados, antes do round())
+    """
+    try:
+        litros = float(litros)
+    except (ValueError, TypeError):
+        raise ValueError("Quantidade de litros inválida!")
+    if not math.isfinite(litros):
+        raise ValueError("Quantidade de litros inválida!")
+    mililitros = round(litros * 1000)
+    if mililitros < 0 or (mililitros == 0 and not aceitar_zero):
+        raise ValueError("Quantidade de litros deve ser maior que zero!")
+    return mililitros
+
+
+class Reserva:
+    """
+    CLASSE: Reserva de volume em um tanque
+    ======================================
+    Devolvida por Tanque.reservar(); deve terminar com confirmar() ou cancelar().
+    """
+    __slots__ = ("tanque", "mililitros", "ativa")
+
+    def __init__(self, tanque, mililitros):
+        self.tanque = tanque
+        self.mililitros = mililitros
+        self.ativa = True
+
+    @property
+    def litros(self):
+        """Volume reservado em litros"""
+        return self.mililitros / 1000
+
+    def confirmar(self, litros=None):
+        """Atalho para tanque.confirmar(reserva, litros)"""
+        self.tanque.confirmar(self, litros)
+
+    def cancelar(self):
+        """Atalho para tanque.cancelar(reserva)"""
+        self.tanque.cancelar(self)
+
+
+class Tanque:
+    """
+    CLASSE: Tanque de um combustível
+    ================================
+    Controla capacidade, volume, reservas e entregas com uma trava
+    própria; as saídas confirmadas são aplicadas em lote.
+    """
+    def __init__(self, tipo_combustivel, capacidade=CAPACIDADE_PADRAO, volume=0):
+        """
+        Args:
+            tipo_combustivel (str): Combustível guardado (ex: "Gasolina")
+            capacidade (float): Capacidade em litros
+            volume (float): Volume inicial em litros
+        """
+        self.tipo_combustivel = tipo_combustivel
+        self.capacidade_ml = _para_mililitros(capacidade)
+        self._volume_ml = _para_mililitros(volume, aceitar_zero=True)
+        if self._volume_ml > self.capacidade_ml:
+            raise ValueError(f"Volume inicial do tanque de {tipo_combustivel} fora da capacidade!")
+        self._reservado_ml = 0
+        self._vendido_ml = 0
+        self._recebido_ml = 0
+        self._entregas = []
+        self._trava = threading.Lock()
+        # (mililitros vendidos, mililitros reservados) ainda não aplicados
+        self._pendentes = deque()
+
+    def _aplicar_pendentes(self):
+        """Aplica as confirmações/cancelamentos acumulados (chamado com a trava adquirida)"""
+        pendentes = self._pendentes
+        vendido = reservado = 0
+        while pendentes:
+            saida, liberado = pendentes.popleft()
+            vendido += saida
+            reservado += liberado
+        self._volume_ml -= vendido
+        self._vendido_ml += vendido
+        self._reservado_ml -= reservado
+
+    def reservar(self, litros):
+        """
+        Reserva volume para uma venda
+
+        Args:
+            litros (float): Volume da venda
+
+        Returns:
+            Reserva: Reserva a confirmar ou cancelar
+
+        Raises:
+            ValueError: Se a quantidade for inválida ou não houver estoque
+        """
+        mililitros = _para_mililitros(litros)
+        with self._trava:
+            if self._pendentes:
+                self._aplicar_pendentes()
+            disponivel = self._volume_ml - self._reservado_ml
+            if mililitros > disponivel:
+                raise ValueError(f"Estoque insuficiente de {self.tipo_combustivel}: "
+                                 f"{disponivel / 1000:.3f} L disponíveis!")
+            self._reservado_ml += mililitros
+        return Reserva(self, mililitros)
+
+    def confirmar(self, reserva, litros=None):
+        """
+        Confirma uma reserva: o volume sai do tanque (aplicado em lote, sem trava)
+
+        Args:
+            reserva (Reserva): Reserva obtida com reservar()
+            litros (float): Volume realmente vendido, se menor que o reservado
+                            (ex: cliente parou antes); padrão: o reservado
+
+        Raises:
+            ValueError: Se a reserva já terminou ou o volume passar do reservado
+        """
+        if not reserva.ativa or reserva.tanque is not self:
+            raise ValueError("Reserva já encerrada ou de outro tanque!")
+        vendido = reserva.mililitros if litros is None else _para_mililitros(litros)
+        if vendido > reserva.mililitros:
+            raise ValueError("Volume vendido maior que o reservado!")
+        reserva.ativa = False
+        self._pendentes.append((vendido, reserva.mililitros))
+
+    def cancelar(self, reserva):
+        """
+        Cancela uma reserva: o volume volta a ficar disponível
+
+        Raises:
+            ValueError: Se a reserva já terminou
+        """
+        if not reserva.ativa or reserva.tanque is not self:
+            raise ValueError("Reserva já encerrada ou de outro tanque!")
+        reserva.ativa = False
+        self._pendentes.append((0, reserva.mililitros))
+
+    def retirar(self, litros):
+        """
+        Reserva e confirma de uma vez (venda sem etapa intermediária)
+
+        Raises:
+            ValueError: Se não houver estoque
+        """
+        self.confirmar(self.reservar(litros))
+
+    def receber_entrega(self, litros, instante=None):
+        """
+        Registra uma entrega (descarga) de combustível
+
+        Args:
+            litros (float): Volume entregue
+            instante (float): Segundos desde 1970 (padrão: agora)
+
+        Raises:
+            ValueError: Se a entrega passar da capacidade do tanque
+        """
+        mililitros = _para_mililitros(litros)
+        with self._trava:
+            if self._pendentes:
+                self._aplicar_pendentes()
+            livre = self.capacidade_ml - self._volume_ml
+            if mililitros > livre:
+                raise ValueError(f"Entrega de {mililitros / 1000:.3f} L excede o espaço livre "
+                                 f"do tanque de {self.tipo_combustivel} ({livre / 1000:.3f} L)!")
+            self._volume_ml += mililitros
+            self._recebido_ml += mililitros
+            self._entregas.append((time.time() if instante is None else instante, mililitros / 1000))
+
+    def nivel(self):
+        """
+        Situação atual do tanque
+
+        Returns:
+            dict: capacidade, volume, reservado e disponível (litros), percentual
+                  de ocupação, totais vendido e recebido e quantidade de entregas
+        """
+        with self._trava:
+            if self._pendentes:
+                self._aplicar_pendentes()
+            return {
+                "combustivel": self.tipo_combustivel,
+                "capacidade": self.capacidade_ml / 1000,
+                "volume": self._volume_ml / 1000,
+                "reservado": self._reservado_ml / 1000,
+                "disponivel": (self._volume_ml - self._reservado_ml) / 1000,
+                "percentual": round(100 * self._volume_ml / self.capacidade_ml, 2),
+                "vendido": self._vendido_ml / 1000,
+                "recebido": self._recebido_ml / 1000,
+                "entregas": len(self._entregas),
+            }
+
+    def listar_entregas(self):
+        """
+        Returns:
+            list: Pares (instante, litros) das entregas recebidas
+        """
+        with self._trava:
+            return list(self._entregas)
+
+
+class EstoqueTanques:
+    """
+    CLASSE: Estoque de todos os tanques do posto
+    ============================================
+    Um tanque por combustível. O dicionário de tanques é trocado inteiro
+    ao adicionar um tanque (cópia na escrita), então a consulta do tanque
+    de uma venda não usa trava.
+    """
+    def __init__(self, capacidades=None, volumes=None):
+        """
+        Args:
+            capacidades (dict): {combustível: capacidade em litros}
+            volumes (dict): {combustível: volume inicial em litros}
+        """
+        self._trava = threading.Lock()
+        self._tanques = {}
+        volumes = volumes or {}
+        for nome, capacidade in (capacidades or {}).items():
+            self.adicionar_tanque(nome, capacidade, volumes.get(nome, 0))
+
+    def adicionar_tanque(self, tipo_combustivel, capacidade=CAPACIDADE_PADRAO, volume=0):
+        """
+        Instala o tanque de um combustível
+
+        Returns:
+            Tanque: Tanque criado
+
+        Raises:
+            ValueError: Se o combustível já tiver tanque
+        """
+        tanque = Tanque(tipo_combustivel, capacidade, volume)
+        with self._trava:
+            if tipo_combustivel in self._tanques:
+                raise ValueError(f"Combustível '{tipo_combustivel}' já possui tanque!")
+            tanques = dict(self._tanques)
+            tanques[tipo_combustivel] = tanque
+            self._tanques = tanques
+        return tanque
+
+    def tanque(self, tipo_combustivel):
+        """
+        Obtém o tanque de um combustível
+
+        Raises:
+            ValueError: Se o combustível não tiver tanque
+        """
+        tanque = self._tanques.get(tipo_combustivel)
+        if tanque is None:
+            raise ValueError(f"Combustível '{tipo_combustivel}' não possui tanque!")
+        return tanque
+
+    def reservar(self, tipo_combustivel, litros):
+        """Reserva volume no tanque do combustível (ver Tanque.reservar)"""
+        return self.tanque(tipo_combustivel).reservar(litros)
+
+    def receber_entrega(self, tipo_combustivel, litros, instante=None):
+        """Registra uma entrega no tanque do combustível (ver Tanque.receber_entrega)"""
+        self.tanque(tipo_combustivel).receber_entrega(litros, instante)
+
+    def processar_abastecimento(self, tipo_combustivel, quantidade_litros, forma_pagamento,
+                                processar=None):
+        """
+        FUNÇÃO PRINCIPAL: Venda com controle de estoque
+        ===============================================
+        1. Reserva o volume no tanque (falha se não houver estoque)
+        2. Processa a venda (cálculos de preço e desconto)
+        3. Confirma a reserva; se a venda falhar, cancela a reserva
+
+        Args:
+            tipo_combustivel (str): Tipo do combustível
+            quantidade_litros (float): Quantidade em litros
+            forma_pagamento (str): Forma de pagamento
+            processar (callable): Função de venda com a mesma assinatura
+                                  (padrão: abastecimento.processar_abastecimento;
+                                  ex: Posto.processar_abastecimento)
+
+        Se este estoque estiver ligado às vendas (abastecimento.configurar_estoque)
+        e processar não for informado, a própria venda movimenta o tanque.
+
+        Returns:
+            RegistroAbastecimento: Registro da venda
+
+        Raises:
+            ValueError: Se os dados forem inválidos ou não houver estoque
+        """
+        if processar is None and abastecimento.obter_estoque() is self:
+            return abastecimento.processar_abastecimento(tipo_combustivel, quantidade_litros,
+                                                         forma_pagamento)
+        reserva = self.reservar(tipo_combustivel, quantidade_litros)
+        try:
+            registro = (processar or abastecimento.processar_abastecimento)(
+                tipo_combustivel, quantidade_litros, forma_pagamento)
+        except BaseException:
+            reserva.cancelar()
+            raise
+        reserva.confirmar()
+        return registro
+
+    def niveis(self):
+        """
+        Returns:
+            dict: {combustível: Tanque.nivel()}
+        """
+        return {nome: tanque.nivel() for nome, tanque in self._tanques.items()}
+
+
+# ----------------------------------------------------------------------
+# MEDIÇÃO DE DISPUTA ENTRE BOMBAS
+# ----------------------------------------------------------------------
+class _TanqueTravaGlobal(Tanque):
+    """Tanque de referência: uma trava para tudo e saída aplicada na hora"""
+    _trava_global = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trava = _TanqueTravaGlobal._trava_global
+
+    def confirmar(self, reserva, litros=None):
+        with self._trava:
+            reserva.ativa = False
+            self._volume_ml -= reserva.mililitros
+            self._vendido_ml += reserva.mililitros
+            self._reservado_ml -= reserva.mililitros
+
+
+def medir_disputa(classe_tanque, bombas, vendas_por_bomba, tanques_distintos):
+    """
+    Mede a vazão de reserva + confirmação com várias bombas (threads)
+
+    Args:
+        classe_tanque (type): Tanque ou a referência com trava global
+        bombas (int): Quantidade de threads
+        vendas_por_bomba (int): Vendas de 1 litro feitas por cada bomba
+        tanques_distintos (bool): True = cada bomba usa um tanque próprio;
+                                  False = todas usam o mesmo tanque
+
+    Returns:
+        float: Vendas por segundo
+    """
+    capacidade = bombas * vendas_por_bomba
+    if tanques_distintos:
+        tanques = [classe_tanque(f"C{i}", vendas_por_bomba, vendas_por_bomba) for i in range(bombas)]
+    else:
+        tanques = [classe_tanque("C", capacidade, capacidade)] * bombas
+    largada = threading.Barrier(bombas + 1)
+
+    def _bomba(tanque):
+        largada.wait()
+        for _ in range(vendas_por_bomba):
+            tanque.confirmar(tanque.reservar(1))
+
+    threads = [threading.Thread(target=_bomba, args=(tanque,)) for tanque in tanques]
+    for thread in threads:
+        thread.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    segundos = time.perf_counter() - inicio
+    assert all(t.nivel()["volume"] == 0 for t in tanques), "estoque inconsistente"
+    return capacidade / segundos
+
+
+def verificar_sem_venda_a_mais(bombas=8, litros_no_tanque=1000):
+    """
+    Bombas tentam vender mais do que existe; confere que nada passou do estoque
+
+    Returns:
+        tuple: (vendas aceitas, vendas recusadas, volume final)
+    """
+    tanque = Tanque("Gasolina", litros_no_tanque, litros_no_tanque)
+    aceitas = [0] * bombas
+    recusadas = [0] * bombas
+
+    def _bomba(indice):
+        for _ in range(litros_no_tanque):   # cada bomba tenta vender o tanque inteiro
+            try:
+                tanque.retirar(1)
+                aceitas[indice] += 1
+            except ValueError:
+                recusadas[indice] += 1
+
+    threads = [threading.Thread(target=_bomba, args=(i,)) for i in range(bombas)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(aceitas), sum(recusadas), tanque.nivel()["volume"]
+
+
+def main():
+    """Mede a escala da disputa com 1, 2, 4 e 8 bombas"""
+    vendas = 20_000
+    print("=== DISPUTA ENTRE BOMBAS (reserva + confirmação de 1 L) ===")
+    print(f"{'bombas':>6} | {'mesmo tanque':>14} | {'tanques próprios':>16} | {'trava global':>14}")
+    for bombas in (1, 2, 4, 8):
+        mesmo = medir_disputa(Tanque, bombas, vendas, False)
+        proprios = medir_disputa(Tanque, bombas, vendas, True)
+        global_ = medir_disputa(_TanqueTravaGlobal, bombas, vendas, True)
+        print(f"{bombas:>6} | {mesmo:>10,.0f}/s | {proprios:>12,.0f}/s | {global_:>10,.0f}/s")
+
+    aceitas, recusadas, volume = verificar_sem_venda_a_mais()
+    print(f"\nVenda a mais: 8 bombas x 1000 tentativas em tanque de 1000 L -> "
+          f"{aceitas} aceitas, {recusadas} recusadas, volume final {volume} L")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Configuração dos testes automatizados (pytest)
+
+Os módulos do sistema ficam na raiz do projeto e são importados pelo
+nome (import combustivel, import pagamento...), como faz o menu.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import abastecimento  # noqa: E402
+import combustivel    # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def catalogo_isolado():
+    """Desfaz, ao fim de cada teste, alterações no catálogo, nos ouvintes e no estoque globais"""
+    precos = dict(combustivel.combustiveis_cadastrados)
+    ids = dict(combustivel._ids_combustivel)
+    nomes = list(combustivel._nomes_combustivel)
+    precos_por_id = list(combustivel._precos_por_id)
+    historico = dict(combustivel._historico_precos)
+    ouvintes_precos = list(combustivel._ouvintes_precos)
+    ouvintes_registros = list(abastecimento._ouvintes_registros)
+    ouvintes_lotes = list(abastecimento._ouvintes_lotes)
+    tabela = combustivel._tabela_atual
+    yield
+    combustivel.combustiveis_cadastrados.clear()
+    combustivel.combustiveis_cadastrados.update(precos)
+    combustivel._ids_combustivel.clear()
+    combustivel._ids_combustivel.update(ids)
+    combustivel._nomes_combustivel[:] = nomes
+    combustivel._precos_por_id[:] = precos_por_id
+    combustivel._historico_precos.clear()
+    combustivel._historico_precos.update(historico)
+    combustivel._ouvintes_precos[:] = ouvintes_precos
+    abastecimento._ouvintes_registros[:] = ouvintes_registros
+    abastecimento._ouvintes_lotes[:] = ouvintes_lotes
+    abastecimento.configurar_estoque(None)
+    combustivel._tabela_atual = tabela
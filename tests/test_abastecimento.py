@@ -0,0 +1,76 @@
+"""Testes do módulo abastecimento (venda única e processamento em lote)"""
+
+import pytest
+
+import abastecimento
+import combustivel
+
+
+@pytest.mark.parametrize("litros", ["nan", float("nan"), "inf", float("-inf"), 0, -5, "abc", None])
+def test_processar_abastecimento_rejeita_litros_invalidos(litros):
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimento("Gasolina", litros, "PIX")
+
+
+@pytest.mark.parametrize("litros", ["nan", float("inf"), 0])
+def test_processar_por_id_rejeita_litros_invalidos(litros):
+    id_gasolina = combustivel.obter_id_combustivel("Gasolina")
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimento_por_id(id_gasolina, litros, 2)
+
+
+@pytest.mark.parametrize("litros", ["nan", "inf", "-1"])
+def test_validar_dados_rejeita_litros_invalidos(litros):
+    valido, mensagem = abastecimento.validar_dados_abastecimento("Gasolina", litros, "PIX")
+    assert not valido
+    assert mensagem
+
+
+def test_processar_abastecimento_calcula_desconto():
+    registro = abastecimento.processar_abastecimento("Gasolina", "10", "PIX")
+    preco = combustivel.obter_preco_combustivel("Gasolina")
+    assert registro.quantidade_litros == 10.0
+    assert registro.valor_bruto == pytest.approx(10 * preco)
+    assert registro.valor_final == pytest.approx(registro.valor_bruto * 0.9)
+
+
+def test_lote_marca_linhas_invalidas_sem_excecao():
+    resultado = abastecimento.processar_abastecimentos_em_lote(
+        ["Gasolina", "Etanol", "Inexistente", "Diesel", "Diesel"],
+        [10, "nan", 5, "inf", 2],
+        ["PIX", "Dinheiro", "PIX", "PIX", "Boleto"],
+    )
+    assert list(resultado.validos) == [1, 0, 0, 0, 0]
+    assert resultado.indices_invalidos() == [1, 2, 3, 4]
+    assert resultado.quantidade_validos() == 1
+    assert resultado.total_final() == pytest.approx(resultado.valor_final[0])
+    assert all(valor == valor for valor in resultado.valor_final)   # sem nan
+
+
+@pytest.mark.parametrize("preco_ruim", [float("nan"), float("inf"), -4.5, 0.0])
+def test_lote_recusa_so_as_linhas_com_preco_invalido(preco_ruim):
+    precos = dict(combustivel.obter_tabela_precos().precos, Diesel=preco_ruim)
+    precos_por_id = [precos[combustivel.obter_nome_combustivel(i)] for i in range(len(precos))]
+    tabela = combustivel.TabelaPrecos(99, precos, precos_por_id)
+
+    por_nome = abastecimento.processar_abastecimentos_em_lote(
+        ["Diesel", "Gasolina"], [10, 10], ["PIX", "PIX"], tabela=tabela)
+    assert list(por_nome.validos) == [0, 1]
+    por_id = abastecimento.processar_abastecimentos_em_lote_por_id(
+        [combustivel.obter_id_combustivel("Diesel"), combustivel.obter_id_combustivel("Gasolina")],
+        [10, 10], [1, 1], tabela=tabela)
+    assert list(por_id.validos) == [0, 1]
+    assert por_id.valor_final[1] > 0
+
+
+def test_lote_exige_listas_do_mesmo_tamanho():
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimentos_em_lote(["Gasolina"], [1, 2], ["PIX"])
+
+
+def test_lote_por_id_ignora_ids_fora_da_tabela():
+    id_etanol = combustivel.obter_id_combustivel("Etanol")
+    resultado = abastecimento.processar_abastecimentos_em_lote_por_id(
+        [id_etanol, 9999, id_etanol], [10, 10, 10], [1, 1, 99])
+    assert list(resultado.validos) == [1, 0, 0]
+    assert resultado.tipos_combustivel == ["Etanol", None, "Etanol"]
@@ -0,0 +1,108 @@
+"""Testes da API REST (Flask); ignorados quando o Flask não está instalado"""
+
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+import combustivel  # noqa: E402
+import diario       # noqa: E402
+
+_CAMINHO_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "api", "app.py")
+
+
+@pytest.fixture
+def app_api(tmp_path, monkeypatch):
+    monkeypatch.setattr(diario, "PASTA_PADRAO", str(tmp_path / "diario"))
+    monkeypatch.setattr(diario, "_diario_padrao", None)
+    spec = importlib.util.spec_from_file_location("app_api_teste", _CAMINHO_APP)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    yield modulo
+    if diario._diario_padrao is not None:
+        diario._diario_padrao.fechar()
+
+
+@pytest.fixture
+def cliente(app_api):
+    return app_api.app.test_client()
+
+
+def test_etag_depende_do_conteudo_e_nao_da_versao(app_api):
+    tabela = combustivel.obter_tabela_precos()
+    mesma_depois_de_reiniciar = combustivel.TabelaPrecos(1, tabela.precos, tabela.precos_por_id)
+    outros_precos = combustivel.TabelaPrecos(
+        tabela.versao, {nome: preco + 1 for nome, preco in tabela.precos.items()},
+        [preco + 1 for preco in tabela.precos_por_id])
+    etag = app_api._etag_precos(tabela)
+    assert app_api._etag_precos(mesma_depois_de_reiniciar) == etag
+    assert app_api._etag_precos(outros_precos) != etag
+
+
+def test_listar_combustiveis_responde_304_com_etag(cliente):
+    primeira = cliente.get("/api/combustiveis")
+    assert primeira.status_code == 200
+    etag = primeira.headers["ETag"]
+    assert cliente.get("/api/combustiveis", headers={"If-None-Match": etag}).status_code == 304
+    combustivel.atualizar_preco_combustivel("Gasolina", 9.99)
+    assert cliente.get("/api/combustiveis", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.parametrize("rota, metodo", [
+    ("/api/combustiveis", "post"),
+    ("/api/combustiveis/Gasolina/preco", "put"),
+    ("/api/abastecimentos", "post"),
+    ("/api/abastecimentos/lote", "post"),
+])
+def test_corpo_que_nao_e_objeto_responde_400(cliente, rota, metodo):
+    resposta = getattr(cliente, metodo)(rota, json=[1, 2, 3])
+    assert resposta.status_code == 400
+
+
+@pytest.mark.parametrize("corpo", [
+    {"combustivel": ["x"], "litros": 10, "pagamento": "PIX"},
+    {"combustivel": "Gasolina", "litros": 10, "pagamento": {"a": 1}},
+    {"combustivel": "Gasolina", "litros": "nan", "pagamento": "PIX"},
+    {"combustivel": "Gasolina", "litros": 10, "pagamento": "PIX", "chave": [1]},
+])
+def test_abastecimento_com_campos_invalidos_responde_400(cliente, corpo):
+    assert cliente.post("/api/abastecimentos", json=corpo).status_code == 400
+
+
+def test_cadastro_com_nome_nulo_responde_400(cliente):
+    assert cliente.post("/api/combustiveis", json={"nome": None, "preco": 5}).status_code == 400
+
+
+@pytest.mark.parametrize("preco", ["nan", "NaN", "inf", "-Infinity", 0, -4.5])
+def test_preco_nao_finito_ou_nao_positivo_responde_400(cliente, preco):
+    assert cliente.post("/api/combustiveis", json={"nome": "GNV", "preco": preco}).status_code == 400
+    assert cliente.put("/api/combustiveis/Gasolina/preco", json={"preco": preco}).status_code == 400
+    assert not combustivel.validar_combustivel("GNV")
+    assert combustivel.obter_preco_combustivel("Gasolina") == 5.79
+
+
+def test_abastecimento_grava_e_repeticao_idempotente(cliente):
+    corpo = {"combustivel": "Gasolina", "litros": 10, "pagamento": "PIX"}
+    primeira = cliente.post("/api/abastecimentos", json=corpo, headers={"Idempotency-Key": "k1"})
+    repetida = cliente.post("/api/abastecimentos", json=corpo, headers={"Idempotency-Key": "k1"})
+    assert (primeira.status_code, repetida.status_code) == (201, 200)
+    assert primeira.get_json() == repetida.get_json()
+    vendas = cliente.get("/api/abastecimentos").get_json()
+    assert len(vendas) == 1
+
+
+def test_lote_marca_linhas_com_tipos_errados_como_invalidas(cliente):
+    resposta = cliente.post("/api/abastecimentos/lote", json={
+        "combustiveis": ["Gasolina", ["x"], "Etanol"],
+        "litros": [10, 10, 10],
+        "pagamentos": ["PIX", "PIX", 3],
+    })
+    assert resposta.status_code == 201
+    assert resposta.get_json()["invalidos"] == [1, 2]
+    assert cliente.post("/api/abastecimentos/lote",
+                        json={"combustiveis": "Gasolina", "litros": [1],
+                              "pagamentos": ["PIX"]}).status_code == 400
@@ -0,0 +1,107 @@
+"""Testes do armazenamento SQLite (catálogo, histórico e vendas)"""
+
+import sqlite3
+
+import pytest
+
+import abastecimento
+import banco
+import combustivel
+import relatorios
+
+
+@pytest.fixture
+def banco_dados(tmp_path):
+    dados = banco.BancoDados(str(tmp_path / "sistema.db"), tamanho_pool=2)
+    yield dados
+    dados.fechar()
+
+
+def test_conectar_catalogo_grava_e_recarrega_precos(banco_dados):
+    banco.conectar_catalogo(banco_dados)
+    combustivel.atualizar_preco_combustivel("Diesel", 6.49)
+    combustivel.cadastrar_combustivel("GNV", 4.29)
+
+    precos, historico = banco_dados.carregar_catalogo()
+    assert precos["Diesel"] == 6.49
+    assert precos["GNV"] == 4.29
+    assert historico["Diesel"][-1][1] == 6.49
+
+
+def test_falha_do_banco_vira_oserror_e_preco_nao_e_publicado(banco_dados, monkeypatch):
+    banco.conectar_catalogo(banco_dados)
+    preco_antes = combustivel.obter_preco_combustivel("Diesel")
+
+    def falhar(*args):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(banco_dados, "salvar_preco", falhar)
+
+    with pytest.raises(OSError):
+        combustivel.atualizar_preco_combustivel("Diesel", 9.99)
+    assert combustivel.obter_preco_combustivel("Diesel") == preco_antes
+
+
+def test_desconectar_catalogo(banco_dados):
+    banco.conectar_catalogo(banco_dados)
+    banco.desconectar_catalogo(banco_dados)
+    combustivel.atualizar_preco_combustivel("Diesel", 7.77)
+    assert banco_dados.carregar_catalogo()[0]["Diesel"] != 7.77
+
+
+def test_vendas_so_chegam_ao_banco_quando_conectadas(banco_dados):
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    assert banco_dados.contar_vendas() == 0
+
+    banco.conectar_vendas(banco_dados)
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    banco.desconectar_vendas(banco_dados)
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+
+    vendas = [relatorios.Venda._make(linha) for linha in banco_dados.iterar_vendas()]
+    assert len(vendas) == 1
+    assert vendas[0].valor_final == registro.valor_final
+
+
+def test_falha_ao_gravar_venda_vira_oserror(banco_dados, monkeypatch):
+    banco.conectar_vendas(banco_dados)
+
+    def falhar(registro):
+        raise sqlite3.OperationalError("disk I/O error")
+    monkeypatch.setattr(banco_dados, "inserir_venda", falhar)
+
+    with pytest.raises(OSError):
+        abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+
+
+def test_inserir_em_lote(banco_dados):
+    registros = [abastecimento.processar_abastecimento("Diesel", 5 + i, "PIX") for i in range(10)]
+    assert banco_dados.inserir_vendas(registros) == 10
+
+    resultado = abastecimento.processar_abastecimentos_em_lote(
+        ["Diesel", "Querosene"], [10, 10], ["PIX", "PIX"])
+    assert banco_dados.inserir_lote(resultado) == 1
+    assert banco_dados.contar_vendas() == 11
+    assert len(list(banco_dados.iterar_vendas(tamanho_bloco=3))) == 11
+
+
+def test_iterador_abandonado_nao_prende_conexao(tmp_path):
+    dados = banco.BancoDados(str(tmp_path / "sistema.db"), tamanho_pool=1)
+    try:
+        dados.inserir_vendas([abastecimento.processar_abastecimento("Diesel", 5 + i, "PIX")
+                              for i in range(5)])
+        abandonados = [dados.iterar_vendas(tamanho_bloco=2) for _ in range(3)]
+        for iterador in abandonados:
+            next(iterador)
+        assert dados.contar_vendas() == 5
+        assert [linha[2] for linha in abandonados[0]] == [6, 7, 8, 9]
+    finally:
+        dados.fechar()
+
+
+def test_fechar_para_de_ouvir(tmp_path):
+    dados = banco.BancoDados(str(tmp_path / "sistema.db"), tamanho_pool=1)
+    banco.conectar_catalogo(dados)
+    banco.conectar_vendas(dados)
+    dados.fechar()
+    combustivel.atualizar_preco_combustivel("Diesel", 6.0)
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX")
@@ -0,0 +1,60 @@
+"""Testes do harness de benchmark (carga, medição e detecção de regressão)"""
+
+import benchmark
+import combustivel
+import pagamento
+
+
+def test_gerar_carga_deterministica_pela_semente():
+    assert benchmark.gerar_carga(50, semente=7) == benchmark.gerar_carga(50, semente=7)
+    assert benchmark.gerar_carga(50, semente=7) != benchmark.gerar_carga(50, semente=8)
+
+
+def test_gerar_carga_respeita_fracoes():
+    validos = benchmark.gerar_carga(200, fracao_invalidos=0.0, fracao_desconto=1.0)
+    assert all(combustivel.validar_combustivel(t) and l > 0 and pagamento.tem_desconto(f)
+               for t, l, f in validos)
+
+    invalidos = benchmark.gerar_carga(200, fracao_invalidos=1.0)
+    assert not any(combustivel.validar_combustivel(t) and l > 0 and pagamento.validar_forma_pagamento(f)
+                   for t, l, f in invalidos)
+
+
+def test_medir_conta_value_error_como_operacao():
+    def falha(_):
+        raise ValueError("inválido")
+
+    resultado = benchmark.medir(falha, [(1,), (2,), (3,)])
+    assert resultado["operacoes"] == 3
+    assert set(resultado) == {"operacoes", "ops_por_segundo", "p50_us", "p99_us"}
+
+
+def test_medir_sem_operacoes():
+    assert benchmark.medir(lambda: None, [])["operacoes"] == 0
+
+
+def test_comparar_detecta_regressao_acima_do_limite():
+    base = {"casos": {"a": {"ops_por_segundo": 100.0}, "b": {"ops_por_segundo": 100.0},
+                      "zero": {"ops_por_segundo": 0.0}}}
+    atual = {"casos": {"a": {"ops_por_segundo": 95.0}, "b": {"ops_por_segundo": 80.0},
+                       "zero": {"ops_por_segundo": 10.0}, "novo": {"ops_por_segundo": 1.0}}}
+
+    linhas = {nome: regrediu for nome, _, _, _, regrediu in benchmark.comparar(base, atual, 0.10)}
+    assert linhas == {"a": False, "b": True}
+
+
+def test_executar_carga_pequena():
+    resultado = benchmark.executar(tamanho=40, fracao_invalidos=0.2)
+    assert resultado["metadados"]["tamanho"] == 40
+    assert resultado["casos"]["processar_abastecimento"]["operacoes"] == 40
+    assert resultado["casos"]["processar_lote"]["operacoes"] == 40
+
+
+def test_atualizacao_em_disputa_restaura_o_catalogo_sem_avisar():
+    antes = combustivel.exportar_catalogo()
+    avisos = []
+    combustivel.adicionar_ouvinte_precos(lambda *args: avisos.append(args))
+
+    resultado = benchmark.medir_atualizacao_em_disputa(benchmark.gerar_carga(40), threads_venda=1)
+    assert len(avisos) == resultado["operacoes"]   # só as atualizações medidas
+    assert combustivel.exportar_catalogo() == antes
@@ -0,0 +1,116 @@
+"""Testes da entrada assíncrona de eventos das bombas"""
+
+import asyncio
+import json
+
+import pytest
+
+import bombas_async
+
+
+async def _com_servidor(funcao, diario=None):
+    servidor = bombas_async.ServidorBombasAsync(diario=diario)
+    consumidor = asyncio.create_task(servidor.consumir())
+    try:
+        return servidor, await funcao(servidor)
+    finally:
+        consumidor.cancel()
+
+
+def test_evento_valido_e_invalido():
+    async def enviar(servidor):
+        return await asyncio.gather(
+            servidor.enviar(1, "Gasolina", 10, "PIX"),
+            servidor.enviar(2, "Querosene", 10, "PIX"),
+        )
+
+    servidor, (ok, rejeitado) = asyncio.run(_com_servidor(enviar))
+    assert ok[0].valor_final > 0
+    assert rejeitado[0] is None and "Querosene" in rejeitado[1]
+    assert (servidor.processados, servidor.rejeitados) == (1, 1)
+
+
+def test_evento_nao_hashable_nao_derruba_o_consumidor():
+    async def enviar(servidor):
+        ruim = await asyncio.wait_for(servidor.enviar(1, ["x"], 10, "PIX"), 2)
+        bom = await asyncio.wait_for(servidor.enviar(1, "Etanol", 5, "PIX"), 2)
+        return ruim, bom
+
+    servidor, (ruim, bom) = asyncio.run(_com_servidor(enviar))
+    assert ruim[0] is None
+    assert bom[0] is not None
+    assert servidor.rejeitados == 1
+
+
+def test_falha_no_diario_vai_para_o_futuro_e_o_laco_continua():
+    class DiarioQuebrado:
+        def __init__(self):
+            self.chamadas = 0
+
+        def registrar(self, registro):
+            self.chamadas += 1
+            if self.chamadas == 1:
+                raise OSError("disco cheio")
+
+        def sincronizar(self):
+            pass
+
+    async def enviar(servidor):
+        with pytest.raises(OSError):
+            await asyncio.wait_for(servidor.enviar(1, "Gasolina", 10, "PIX"), 2)
+        return await asyncio.wait_for(servidor.enviar(1, "Gasolina", 10, "PIX"), 2)
+
+    servidor, (registro, _) = asyncio.run(_com_servidor(enviar, DiarioQuebrado()))
+    assert registro is not None
+    assert servidor.processados == 1
+
+
+def test_conexao_responde_json_por_linha():
+    async def conversar(servidor):
+        tcp = await servidor.iniciar_tcp(porta=0)
+        porta = tcp.sockets[0].getsockname()[1]
+        leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+        linhas = [
+            {"bomba": 1, "combustivel": "Diesel", "litros": 20, "pagamento": "Dinheiro"},
+            {"bomba": 1, "combustivel": ["x"], "litros": 20, "pagamento": "PIX"},
+            [1, 2, 3],
+        ]
+        respostas = []
+        for linha in linhas:
+            escritor.write(json.dumps(linha).encode() + b"\n")
+            await escritor.drain()
+            respostas.append(json.loads(await asyncio.wait_for(leitor.readline(), 2)))
+        escritor.write(b"isto nao e json\n")
+        respostas.append(json.loads(await asyncio.wait_for(leitor.readline(), 2)))
+        escritor.close()
+        tcp.close()
+        await tcp.wait_closed()
+        return respostas
+
+    _, respostas = asyncio.run(_com_servidor(conversar))
+    assert [r["ok"] for r in respostas] == [True, False, False, False]
+    assert respostas[0]["combustivel"] == "Diesel"
+
+
+def test_simulador_gera_eventos_e_percentis():
+    async def simular(servidor):
+        return await bombas_async.simular_bombas(servidor, bombas=3, taxa=200, duracao=0.2,
+                                                 semente=1)
+
+    servidor, enviados = asyncio.run(_com_servidor(simular))
+    assert enviados > 0
+    assert servidor.processados == enviados
+    percentis = servidor.percentis()
+    assert percentis["p50"] <= percentis["p99"] <= percentis["maximo"]
+
+
+def test_latencias_guardadas_sao_limitadas(monkeypatch):
+    monkeypatch.setattr(bombas_async, "AMOSTRAS_LATENCIA", 5)
+
+    async def enviar(servidor):
+        for _ in range(12):
+            await servidor.enviar(1, "Gasolina", 10, "PIX")
+
+    servidor, _ = asyncio.run(_com_servidor(enviar))
+    assert servidor.processados == 12
+    assert len(servidor.latencias) == 5
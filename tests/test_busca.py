@@ -0,0 +1,137 @@
+"""Testes do índice de busca de combustíveis (prefixo, acentos, erros de digitação e páginas)"""
+
+import pytest
+
+import busca
+import combustivel
+
+
+@pytest.fixture(autouse=True)
+def indice_isolado(monkeypatch):
+    # o catálogo é restaurado a cada teste; o índice compartilhado também
+    monkeypatch.setattr(busca, "_indice_combustiveis", busca.IndiceBusca())
+
+
+def _catalogo(quantidade):
+    marcas = ["Shell", "Ipiranga", "Raízen", "Ale"]
+    produtos = ["Gasolina Comum", "Gasolina Aditivada", "Etanol Hidratado", "Diesel S10"]
+    return [f"{marcas[i % 4]} {produtos[i // 4 % 4]} Lote {i}" for i in range(quantidade)]
+
+
+def _todos(indice, consulta, tamanho_pagina=7):
+    nomes, pagina = [], 0
+    while True:
+        resultado = indice.buscar(consulta, pagina, tamanho_pagina)
+        nomes += resultado.nomes
+        if not resultado.tem_mais:
+            return nomes
+        pagina += 1
+
+
+def _por_prefixo(nomes, consulta):
+    termos = busca.normalizar(consulta).split()
+    return [nome for nome in nomes
+            if all(any(p.startswith(t) for p in busca.normalizar(nome).split()) for t in termos)]
+
+
+def test_normalizar_ignora_acentos_maiusculas_e_espacos():
+    assert busca.normalizar("  Étanol   ADITIVADO ") == "etanol aditivado"
+    assert busca.normalizar("Raízen") == busca.normalizar("RAIZEN")
+
+
+@pytest.mark.parametrize("consulta", ["etanol", "ETANOL", "Étanol", "etan"])
+def test_busca_sem_diferenca_de_acentos_e_maiusculas(consulta):
+    indice = busca.IndiceBusca(["Etanol", "Gasolina", "Étanol Aditivado"])
+    resultado = indice.buscar(consulta)
+    assert resultado.nomes == ["Etanol", "Étanol Aditivado"]
+    assert not resultado.aproximada
+
+
+def test_busca_por_prefixo_de_palavras_em_qualquer_ordem():
+    indice = busca.IndiceBusca(["Gasolina Comum", "Gasolina Aditivada", "Etanol Aditivado"])
+    assert indice.buscar("adit gas").nomes == ["Gasolina Aditivada"]
+    assert indice.buscar("").nomes == ["Gasolina Comum", "Gasolina Aditivada", "Etanol Aditivado"]
+
+
+def test_busca_tolera_erro_de_digitacao():
+    indice = busca.IndiceBusca(["Gasolina Aditivada", "Etanol Hidratado", "Diesel S10"])
+    resultado = indice.buscar("gasolna aditivda")
+    assert resultado.nomes == ["Gasolina Aditivada"]
+    assert resultado.aproximada
+    assert indice.corrigir("etanl") == ["etanol"]
+
+
+def test_busca_sem_resultado():
+    indice = busca.IndiceBusca(["Gasolina", "Diesel"])
+    assert indice.buscar("xyzw").nomes == []
+    assert indice.buscar("gasolina diesel").nomes == []
+    assert busca.IndiceBusca().buscar("gasolina").nomes == []
+
+
+def test_paginas_cobrem_todos_os_resultados_em_ordem():
+    nomes = _catalogo(50)
+    indice = busca.IndiceBusca(nomes)
+    assert _todos(indice, "gasolina") == _por_prefixo(nomes, "gasolina")
+
+    ultima = indice.buscar("gasolina", pagina=100)
+    assert ultima.nomes == [] and not ultima.tem_mais
+
+
+@pytest.mark.parametrize("pagina, tamanho", [(-1, 10), (0, 0)])
+def test_pagina_invalida_levanta_value_error(pagina, tamanho):
+    with pytest.raises(ValueError):
+        busca.IndiceBusca(["Diesel"]).buscar("diesel", pagina, tamanho)
+
+
+@pytest.mark.parametrize("consulta", ["gasolina", "gasolina shell", "shell adit", "lote 1", "1 2",
+                                      "raizen etanol lote", "gasolina diesel"])
+def test_mapas_de_bits_iguais_a_percorrer_ids(consulta, monkeypatch):
+    nomes = _catalogo(3000)
+    esperado = _por_prefixo(nomes, consulta)
+
+    percorrendo = busca.IndiceBusca(nomes)
+    monkeypatch.setattr(busca, "LIMITE_PERCORRER", 10**9)
+    monkeypatch.setattr(busca, "LIMITE_PALAVRAS_TERMO", 10**9)
+    assert _todos(percorrendo, consulta, 500) == esperado
+
+    com_mapas = busca.IndiceBusca(nomes)
+    monkeypatch.setattr(busca, "LIMITE_PERCORRER", 0)
+    monkeypatch.setattr(busca, "LIMITE_PALAVRAS_TERMO", 0)
+    assert _todos(com_mapas, consulta, 500) == esperado
+
+
+def test_mapa_em_cache_refeito_quando_o_indice_cresce(monkeypatch):
+    monkeypatch.setattr(busca, "LIMITE_PALAVRAS_TERMO", 0)
+    indice = busca.IndiceBusca(["Diesel S10", "Diesel S500"])
+    assert indice.buscar("diesel").nomes == ["Diesel S10", "Diesel S500"]
+    indice.adicionar("Diesel Aditivado")
+    assert indice.buscar("diesel").nomes == ["Diesel S10", "Diesel S500", "Diesel Aditivado"]
+
+
+def test_cache_de_mapas_limitado(monkeypatch):
+    monkeypatch.setattr(busca, "LIMITE_PALAVRAS_TERMO", 0)
+    monkeypatch.setattr(busca, "MAPAS_EM_CACHE", 2)
+    indice = busca.IndiceBusca(_catalogo(40))
+    for consulta in ("shell", "ale", "diesel", "etanol"):
+        indice.buscar(consulta)
+    assert len(indice._mapas) == 2
+
+
+def test_resolver_nome_exato_sem_acentos():
+    indice = busca.IndiceBusca(["Etanol", "Etanol Aditivado"])
+    assert indice.resolver("ETANOL") == ["Etanol"]
+    assert indice.resolver("etan") == []
+
+
+def test_indice_dos_combustiveis_acompanha_cadastros():
+    combustivel.cadastrar_combustivel("Gasolina Podium", 7.49)
+    assert busca.buscar_combustiveis("podium").nomes == ["Gasolina Podium"]
+    assert len(busca.obter_indice_combustiveis()) == len(combustivel.listar_precos_por_id())
+
+
+def test_resolver_combustivel():
+    combustivel.cadastrar_combustivel("Gasolina Podium", 7.49)
+    assert busca.resolver_combustivel("DIESEL") == "Diesel"
+    assert busca.resolver_combustivel("podum") == "Gasolina Podium"   # única sugestão
+    assert busca.resolver_combustivel("gas") is None                  # ambíguo
+    assert busca.resolver_combustivel("xyzw") is None
@@ -0,0 +1,109 @@
+"""Testes da tabela de preços versionada e do histórico de preços"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+import combustivel
+
+
+def test_tabela_publicada_nao_muda_apos_atualizacao():
+    antes = combustivel.obter_tabela_precos()
+    preco_antigo = antes.precos["Gasolina"]
+    assert combustivel.atualizar_preco_combustivel("Gasolina", preco_antigo + 1)
+    depois = combustivel.obter_tabela_precos()
+    assert depois.versao == antes.versao + 1
+    assert antes.precos["Gasolina"] == preco_antigo
+    assert depois.precos["Gasolina"] == preco_antigo + 1
+    with pytest.raises(TypeError):
+        antes.precos["Gasolina"] = 0.0
+
+
+def test_atualizar_preco_de_combustivel_inexistente_ou_invalido():
+    versao = combustivel.obter_tabela_precos().versao
+    assert not combustivel.atualizar_preco_combustivel("Querosene", 3.0)
+    assert not combustivel.atualizar_preco_combustivel("Gasolina", "abc")
+    assert combustivel.obter_tabela_precos().versao == versao
+
+
+@pytest.mark.parametrize("preco", [float("nan"), "inf", float("-inf"), 0, -4.5])
+def test_preco_nao_finito_ou_nao_positivo_e_recusado(preco):
+    versao = combustivel.obter_tabela_precos().versao
+    assert not combustivel.cadastrar_combustivel("GNV", preco)
+    assert not combustivel.atualizar_preco_combustivel("Gasolina", preco)
+    assert not combustivel.registrar_preco_historico("Etanol", preco, 10.0)
+    with pytest.raises(ValueError):
+        combustivel.carregar_precos({"Gasolina": preco})
+    assert not combustivel.validar_combustivel("GNV")
+    assert combustivel.obter_tabela_precos().versao == versao
+
+
+def test_cadastro_recebe_id_e_preco_por_id():
+    assert combustivel.cadastrar_combustivel("GNV", 4.20)
+    identificador = combustivel.obter_id_combustivel("GNV")
+    assert combustivel.obter_nome_combustivel(identificador) == "GNV"
+    assert combustivel.obter_preco_por_id(identificador) == 4.20
+    assert combustivel.validar_id_combustivel(identificador)
+
+
+def test_leitores_veem_tabelas_consistentes_durante_escritas():
+    combustivel.cadastrar_combustivel("A", 1.0)
+    combustivel.cadastrar_combustivel("B", 1.0)
+    parar = threading.Event()
+
+    def escrever():
+        valor = 1.0
+        while not parar.is_set():
+            valor += 1
+            combustivel.carregar_precos({"A": valor, "B": valor})
+
+    escritor = threading.Thread(target=escrever)
+    escritor.start()
+    try:
+        for _ in range(2000):
+            tabela = combustivel.obter_tabela_precos()
+            assert tabela.precos["A"] == tabela.precos["B"]
+    finally:
+        parar.set()
+        escritor.join()
+
+
+def test_preco_em_busca_o_preco_vigente_no_instante():
+    combustivel.cadastrar_combustivel("Diesel S10", 5.00)
+    assert combustivel.registrar_preco_historico("Diesel S10", 4.00, 100.0)
+    assert combustivel.registrar_preco_historico("Diesel S10", 4.50, datetime.fromtimestamp(200.0))
+    assert combustivel.preco_em("Diesel S10", 50.0) is None
+    assert combustivel.preco_em("Diesel S10", 100.0) == 4.00
+    assert combustivel.preco_em("Diesel S10", 199.9) == 4.00
+    assert combustivel.preco_em("Diesel S10", 250.0) == 4.50
+    # preço do histórico não altera o preço vigente
+    assert combustivel.obter_preco_combustivel("Diesel S10") == 5.00
+
+
+def test_precos_em_instantes_exige_ordem_crescente():
+    combustivel.registrar_preco_historico("Etanol", 3.00, 1000.0)
+    instantes = [10.0, 1000.0, 2000.0]
+    assert combustivel.precos_em_instantes("Etanol", instantes) == [
+        combustivel.preco_em("Etanol", i) for i in instantes]
+    with pytest.raises(ValueError):
+        combustivel.precos_em_instantes("Etanol", [2000.0, 10.0])
+
+
+def test_registrar_preco_historico_rejeita_dados_invalidos():
+    assert not combustivel.registrar_preco_historico("Etanol", "abc", 10.0)
+    assert not combustivel.registrar_preco_historico("Etanol", 3.0, "ontem")
+
+
+def test_ouvinte_que_falha_cancela_a_alteracao():
+    def falhar(*_):
+        raise ValueError("disco cheio")
+
+    preco = combustivel.obter_preco_combustivel("Gasolina")
+    versao = combustivel.obter_tabela_precos().versao
+    combustivel.adicionar_ouvinte_precos(falhar)
+    with pytest.raises(ValueError):
+        combustivel.atualizar_preco_combustivel("Gasolina", preco + 1)
+    combustivel.remover_ouvinte_precos(falhar)
+    assert combustivel.obter_preco_combustivel("Gasolina") == preco
+    assert combustivel.obter_tabela_precos().versao == versao
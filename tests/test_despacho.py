@@ -0,0 +1,100 @@
+"""Testes do despachante de pedidos das bombas (pool de threads)"""
+
+import queue
+import threading
+import time
+
+import pytest
+
+import despacho
+
+
+def test_processa_pedidos_e_conta_erros():
+    concluidos = []
+    with despacho.DespachanteBombas(trabalhadores=2,
+                                    ao_concluir=lambda b, r: concluidos.append(b)) as despachante:
+        bons = [despachante.enviar(bomba, "Gasolina", 10, "PIX") for bomba in range(8)]
+        ruim = despachante.enviar(1, "Querosene", 10, "PIX")
+        assert all(f.result(timeout=5).valor_final > 0 for f in bons)
+        with pytest.raises(ValueError):
+            ruim.result(timeout=5)
+        despachante.aguardar()
+        estatisticas = despachante.estatisticas()
+    assert estatisticas["enviados"] == 9
+    assert estatisticas["processados"] == 8
+    assert estatisticas["erros"] == 1
+    assert sorted(concluidos) == list(range(8))
+
+
+def test_entrada_nao_hashable_vira_erro_no_futuro():
+    with despacho.DespachanteBombas(trabalhadores=1) as despachante:
+        futuro = despachante.enviar(1, ["x"], 10, "PIX")
+        with pytest.raises(TypeError):
+            futuro.result(timeout=5)
+        assert despachante.enviar(1, "Etanol", 5, "PIX").result(timeout=5)
+
+
+def test_bomba_nao_hashable_nao_trava_fechar():
+    despachante = despacho.DespachanteBombas(trabalhadores=1)
+    with pytest.raises(TypeError):
+        despachante.enviar(["bomba"], "Diesel", 10, "PIX")
+
+    fechamento = threading.Thread(target=despachante.fechar, daemon=True)
+    fechamento.start()
+    fechamento.join(timeout=5)
+    assert not fechamento.is_alive()
+
+
+def test_ordem_por_bomba_e_preservada():
+    ordem = []
+    with despacho.DespachanteBombas(trabalhadores=4,
+                                    ao_concluir=lambda b, r: ordem.append((b, r.quantidade_litros))
+                                    ) as despachante:
+        for litros in range(1, 51):
+            despachante.enviar(7, "Diesel", litros, "Dinheiro")
+        despachante.aguardar()
+    assert [litros for bomba, litros in ordem if bomba == 7] == list(range(1, 51))
+
+
+def test_enviar_depois_de_fechar_lanca_runtime_error():
+    despachante = despacho.DespachanteBombas(trabalhadores=1, capacidade_fila=1)
+    despachante.fechar()
+    with pytest.raises(RuntimeError):
+        despachante.enviar(1, "Gasolina", 10, "PIX")
+    despachante.fechar()   # fechar de novo não faz nada
+
+
+def test_fila_cheia_sem_espera_lanca_queue_full():
+    liberar = threading.Event()
+    despachante = despacho.DespachanteBombas(trabalhadores=1, capacidade_fila=1,
+                                             ao_concluir=lambda b, r: liberar.wait(5))
+    try:
+        despachante.enviar(1, "Gasolina", 10, "PIX")   # ocupa a trabalhadora
+        with pytest.raises(queue.Full):
+            for _ in range(3):
+                despachante.enviar(1, "Gasolina", 10, "PIX", bloquear=False)
+        assert despachante.estatisticas()["rejeitados"] == 1
+    finally:
+        liberar.set()
+        despachante.fechar()
+
+
+def test_fechar_espera_envio_bloqueado_e_depois_recusa():
+    liberar = threading.Event()
+    despachante = despacho.DespachanteBombas(trabalhadores=1, capacidade_fila=1,
+                                             ao_concluir=lambda b, r: liberar.wait(5))
+    despachante.enviar(1, "Gasolina", 10, "PIX")
+    despachante.enviar(1, "Gasolina", 10, "PIX")
+    futuros = []
+    remetente = threading.Thread(
+        target=lambda: futuros.append(despachante.enviar(1, "Gasolina", 10, "PIX")))
+    remetente.start()
+    while not despachante._em_envio:   # remetente bloqueado na fila cheia
+        time.sleep(0.001)
+    fechamento = threading.Thread(target=despachante.fechar)
+    fechamento.start()
+    liberar.set()
+    remetente.join(5)
+    fechamento.join(5)
+    assert not fechamento.is_alive()
+    assert futuros[0].result(timeout=5).valor_final > 0
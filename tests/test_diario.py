@@ -0,0 +1,142 @@
+"""Testes do diário de abastecimentos (segmentos binários com commit em grupo)"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import abastecimento
+import diario
+
+
+def _venda(tipo="Gasolina", litros=10, forma="PIX"):
+    return abastecimento.processar_abastecimento(tipo, litros, forma)
+
+
+def test_gravar_e_ler_de_volta(tmp_path):
+    pasta = str(tmp_path / "diario")
+    with diario.DiarioAbastecimentos(pasta, registros_por_segmento=3) as escrita:
+        for litros in (1, 2, 3, 4, 5):
+            escrita.registrar(_venda(litros=litros))
+    leitor = diario.LeitorDiario(pasta)
+    assert len(leitor) == 5
+    assert diario.listar_segmentos(pasta) == [1, 2]
+    livro = leitor.carregar_livro()
+    assert [v.quantidade_litros for v in livro] == [1, 2, 3, 4, 5]
+    assert livro[0].tipo_combustivel == "Gasolina"
+
+
+def test_registrar_duravel_espera_o_fsync(tmp_path):
+    pasta = str(tmp_path / "diario")
+    # lote e intervalo grandes: sem duravel=True a venda ficaria só na memória
+    with diario.DiarioAbastecimentos(pasta, lote_commit=1000, intervalo_commit=0.2) as escrita:
+        escrita.registrar(_venda())
+        assert escrita.gravados == 0
+        escrita.registrar(_venda(), duravel=True)
+        assert escrita.gravados == 2
+        assert len(diario.LeitorDiario(pasta)) == 2
+
+
+def test_registrar_duravel_em_varias_threads_compartilha_commits(tmp_path):
+    pasta = str(tmp_path / "diario")
+    registro = _venda()
+    with diario.DiarioAbastecimentos(pasta, lote_commit=1000, intervalo_commit=0.05) as escrita:
+        threads = [threading.Thread(target=escrita.registrar, args=(registro, True))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert escrita.gravados == 20
+        assert escrita.total_commits < 20
+
+
+def test_registro_parcial_e_descartado_na_reabertura(tmp_path):
+    pasta = str(tmp_path / "diario")
+    with diario.DiarioAbastecimentos(pasta) as escrita:
+        escrita.registrar(_venda())
+    with open(os.path.join(pasta, "segmento-000001.bin"), "ab") as arquivo:
+        arquivo.write(b"\x00" * 7)
+    assert len(diario.LeitorDiario(pasta)) == 1
+    with diario.DiarioAbastecimentos(pasta) as escrita:
+        escrita.registrar(_venda(), duravel=True)
+    assert len(diario.LeitorDiario(pasta)) == 2
+
+
+class _ArquivoQueFalhaNoMeio:
+    """Grava metade do que recebe e falha, como um disco que enche no meio do write()"""
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+
+    def write(self, dados):
+        self._arquivo.write(bytes(dados[:len(dados) // 2]))
+        self._arquivo.flush()
+        raise OSError("disco cheio")
+
+    def __getattr__(self, nome):
+        return getattr(self._arquivo, nome)
+
+
+def test_commit_que_falha_no_meio_nao_duplica_registros(tmp_path):
+    pasta = str(tmp_path / "diario")
+    with diario.DiarioAbastecimentos(pasta, lote_commit=1000, intervalo_commit=60) as escrita:
+        escrita.registrar(_venda(litros=1), duravel=True)
+        escrita.registrar(_venda(litros=2))
+        escrita.registrar(_venda(litros=3))
+        escrita._arquivo = _ArquivoQueFalhaNoMeio(escrita._arquivo)
+        with pytest.raises(OSError):
+            escrita.sincronizar()
+        escrita.sincronizar()
+    livro = diario.LeitorDiario(pasta).carregar_livro()
+    assert [v.quantidade_litros for v in livro] == [1, 2, 3]
+
+
+def test_leitor_aberto_reconhece_combustivel_novo(tmp_path):
+    pasta = str(tmp_path / "diario")
+    with diario.DiarioAbastecimentos(pasta) as escrita:
+        escrita.registrar(_venda(), duravel=True)
+        leitor = diario.LeitorDiario(pasta)
+        escrita.registrar(_venda(tipo="Diesel", forma="Dinheiro"), duravel=True)
+    livro = leitor.carregar_livro()
+    assert [(v.tipo_combustivel, v.forma_pagamento) for v in livro] == [
+        ("Gasolina", "PIX"), ("Diesel", "Dinheiro")]
+
+
+def test_ids_acima_de_65535_cabem_no_registro():
+    dados = (0, 70_000, 300, 1, 1.0, 2.0, 2.0, 0.0, 2.0)
+    assert diario.FORMATO_REGISTRO.unpack(diario.FORMATO_REGISTRO.pack(*dados)) == dados
+
+
+def test_diario_de_formato_antigo_e_recusado(tmp_path):
+    pasta = tmp_path / "diario"
+    pasta.mkdir()
+    (pasta / diario.ARQUIVO_NOMES).write_text(
+        json.dumps({"combustiveis": ["Gasolina"], "pagamentos": ["PIX"]}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        diario.LeitorDiario(str(pasta))
+
+
+def test_diario_padrao_criado_uma_vez_com_threads(monkeypatch):
+    criados = []
+
+    class DiarioLento:
+        def __init__(self, pasta):
+            time.sleep(0.05)
+            criados.append(pasta)
+
+        def fechar(self):
+            pass
+
+    monkeypatch.setattr(diario, "DiarioAbastecimentos", DiarioLento)
+    monkeypatch.setattr(diario, "_diario_padrao", None)
+    obtidos = []
+    threads = [threading.Thread(target=lambda: obtidos.append(diario.obter_diario_padrao()))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(criados) == 1
+    assert all(obtido is obtidos[0] for obtido in obtidos)
@@ -0,0 +1,94 @@
+"""Testes do núcleo de dinheiro em inteiros e do seu uso no cálculo das vendas"""
+
+import random
+
+import pytest
+
+import abastecimento
+import combustivel
+import dinheiro
+import registros
+
+
+@pytest.mark.parametrize("modo, esperado", [
+    (dinheiro.MEIO_CIMA, [3, -3, 2, -2, 4]),
+    (dinheiro.MEIO_PAR, [2, -2, 2, -2, 4]),
+    (dinheiro.TRUNCAR, [2, -2, 2, -2, 3]),
+    (dinheiro.PARA_CIMA, [3, -3, 3, -3, 4]),
+])
+def test_dividir_arredondando_em_cada_modo(modo, esperado):
+    numeradores = [25, -25, 21, -21, 35]
+    assert [dinheiro.dividir_arredondando(n, 10, modo) for n in numeradores] == esperado
+
+
+@pytest.mark.parametrize("modo", [dinheiro.MEIO_CIMA, dinheiro.MEIO_PAR,
+                                  dinheiro.TRUNCAR, dinheiro.PARA_CIMA])
+def test_lote_igual_ao_calculo_individual(modo):
+    aleatorio = random.Random(5)
+    mililitros = [aleatorio.randrange(1, 80_000) for _ in range(500)]
+    precos = [aleatorio.randrange(300, 700) for _ in range(500)]
+    descontos = [aleatorio.choice((0, 1000, 1250)) for _ in range(500)]
+    bruto, desconto, final = dinheiro.precificar_lote(mililitros, precos, descontos, modo)
+    for i in range(500):
+        assert (bruto[i], desconto[i], final[i]) == dinheiro.precificar(
+            mililitros[i], precos[i], descontos[i], modo)
+
+
+def test_exemplo_do_modulo_e_preco_com_tres_casas():
+    assert dinheiro.precificar(30_000, 579, 1000) == (17370, 1737, 15633)
+    assert dinheiro.precificar(30_000, 5790, 1000, casas_preco=3) == (17370, 1737, 15633)
+    assert dinheiro.precificar(10_000, 5799, 0, casas_preco=3) == (5799, 0, 5799)
+    assert dinheiro.formatar_centavos(15633) == "R$ 156.33"
+    assert dinheiro.formatar_centavos(-5) == "R$ -0.05"
+
+
+@pytest.mark.parametrize("valor", ["abc", float("inf"), float("nan"), 1e300])
+def test_conversoes_invalidas_lancam_value_error(valor):
+    with pytest.raises(ValueError):
+        dinheiro.litros_para_mililitros(valor)
+
+
+def test_modo_desconhecido_e_colunas_de_tamanhos_diferentes():
+    with pytest.raises(ValueError):
+        dinheiro.dividir_arredondando(1, 2, "qualquer")
+    with pytest.raises(ValueError):
+        dinheiro.precificar_lote([1, 2], [3])
+
+
+def test_venda_guarda_valores_em_centavos_exatos():
+    combustivel.cadastrar_combustivel("Gasolina Teste", 5.799)
+    registro = abastecimento.processar_abastecimento("Gasolina Teste", 33.333, "PIX")
+    for valor in (registro.valor_bruto, registro.valor_desconto, registro.valor_final):
+        assert round(valor, 2) == valor
+    # 33,333 L × R$ 5,799 = R$ 193,298... -> 193,30; desconto 19,33; final 173,97
+    assert (registro.valor_bruto, registro.valor_desconto, registro.valor_final) == (
+        193.30, 19.33, 173.97)
+
+
+def test_soma_das_vendas_igual_a_soma_dos_cupons():
+    aleatorio = random.Random(11)
+    tipos = list(combustivel.listar_combustiveis())
+    livro = registros.LivroRegistros()
+    cupons = 0
+    for _ in range(2000):
+        registro = abastecimento.processar_abastecimento(
+            aleatorio.choice(tipos), round(aleatorio.uniform(1, 60), 3), "Dinheiro")
+        livro.adicionar(registro)
+        cupons += int(f"{registro.valor_final:.2f}".replace(".", ""))
+    assert round(livro.total_final() * 100) == cupons
+
+
+def test_lote_e_venda_unica_dao_os_mesmos_valores():
+    litros = [0.001, 1.005, 12.345, 59.999]
+    resultado = abastecimento.processar_abastecimentos_em_lote(
+        ["Etanol"] * 4, litros, ["Dinheiro"] * 4)
+    for i, quantidade in enumerate(litros):
+        registro = abastecimento.processar_abastecimento("Etanol", quantidade, "Dinheiro")
+        assert resultado.valor_final[i] == registro.valor_final
+        assert resultado.valor_desconto[i] == registro.valor_desconto
+
+
+def test_lote_marca_volume_nao_representavel_como_invalido():
+    resultado = abastecimento.processar_abastecimentos_em_lote(
+        ["Etanol", "Etanol"], [1e300, 10], ["PIX", "PIX"])
+    assert list(resultado.validos) == [0, 1]
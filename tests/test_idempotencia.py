@@ -0,0 +1,156 @@
+"""Testes das vendas idempotentes (cache de chaves com limite e validade)"""
+
+import threading
+import time
+
+import pytest
+
+import abastecimento
+import idempotencia
+
+
+class Relogio:
+    def __init__(self, agora=1000.0):
+        self.agora = agora
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def cache_padrao():
+    cache = idempotencia.CacheIdempotencia()
+    anterior = idempotencia.obter_cache_padrao()
+    idempotencia.configurar_cache_padrao(cache)
+    yield cache
+    idempotencia.configurar_cache_padrao(anterior)
+
+
+def test_repeticao_devolve_o_registro_original(cache_padrao):
+    primeiro = abastecimento.processar_abastecimento("Diesel", 10, "PIX", chave_idempotencia="b1-1")
+    repetido = abastecimento.processar_abastecimento("Diesel", 10, "PIX", chave_idempotencia="b1-1")
+    assert repetido is primeiro
+    assert cache_padrao.estatisticas()["acertos"] == 1
+
+
+def test_mesma_chave_com_outros_dados_e_conflito(cache_padrao):
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX", chave_idempotencia="b1-2")
+    with pytest.raises(ValueError, match="outros dados"):
+        abastecimento.processar_abastecimento("Diesel", 11, "PIX", chave_idempotencia="b1-2")
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimento_por_id(0, 10, 2, chave_idempotencia="b1-2")
+
+
+def test_venda_com_erro_libera_a_chave(cache_padrao):
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimento("Diesel", -1, "PIX", chave_idempotencia="b1-3")
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "PIX", chave_idempotencia="b1-3")
+    assert registro.quantidade_litros == 10
+
+
+def test_validade_e_capacidade():
+    relogio = Relogio()
+    cache = idempotencia.CacheIdempotencia(capacidade=2, validade=60, relogio=relogio)
+    chamadas = []
+
+    def vender(n):
+        chamadas.append(n)
+        return n
+
+    for chave in ("a", "b", "c"):
+        cache.executar(chave, (chave,), vender, chave)
+    assert cache.consultar("a") is None            # descartada pela capacidade
+    assert cache.executar("c", ("c",), vender, "c") == ("c", True)
+
+    relogio.agora += 61
+    assert cache.consultar("b") is None            # vencida
+    estatisticas = cache.estatisticas()
+    assert estatisticas["descartados"] == 1
+    assert estatisticas["expirados"] == 2
+    assert chamadas == ["a", "b", "c"]
+
+
+def test_pedidos_simultaneos_processam_uma_vez():
+    cache = idempotencia.CacheIdempotencia()
+    liberar = threading.Event()
+    chamadas = []
+
+    def vender():
+        chamadas.append(1)
+        liberar.wait(5)
+        return object()
+
+    resultados = []
+    threads = [threading.Thread(target=lambda: resultados.append(cache.executar("k", (), vender)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while cache.estatisticas()["esperas"] < 3:
+        time.sleep(0.001)
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(chamadas) == 1
+    assert len({id(registro) for registro, _ in resultados}) == 1
+    assert sorted(repetido for _, repetido in resultados) == [False, True, True, True]
+
+
+def test_indice_em_disco_sobrevive_ao_reinicio(tmp_path):
+    caminho = str(tmp_path / "idempotencia.jsonl")
+    relogio = Relogio()
+    with idempotencia.CacheIdempotencia(validade=60, caminho_indice=caminho, relogio=relogio) as cache:
+        original, _ = cache.executar("k1", ("Diesel", 10, "PIX"),
+                                     abastecimento.processar_abastecimento, "Diesel", 10, "PIX")
+        cache.executar("k2", ("Diesel", 5, "PIX"),
+                       abastecimento.processar_abastecimento, "Diesel", 5, "PIX")
+    with open(caminho, "a", encoding="utf-8") as arquivo:
+        arquivo.write('["k3", 99')   # queda no meio da gravação
+
+    relogio.agora += 30
+    with idempotencia.CacheIdempotencia(validade=60, caminho_indice=caminho, relogio=relogio) as cache:
+        recuperado, repetido = cache.executar("k1", ("Diesel", 10, "PIX"), pytest.fail)
+        assert repetido
+        assert recuperado.valor_final == original.valor_final
+        assert recuperado.data_abastecimento == original.data_abastecimento
+        assert recuperado.percentual_desconto == original.percentual_desconto
+        assert len(cache) == 2
+
+
+def test_compactacao_do_indice_fora_da_trava(tmp_path):
+    caminho = str(tmp_path / "idempotencia.jsonl")
+    relogio = Relogio()
+
+    def vender(cache, chave):
+        return cache.executar(chave, ("Diesel", 10, "PIX"),
+                              abastecimento.processar_abastecimento, "Diesel", 10, "PIX")
+
+    with idempotencia.CacheIdempotencia(capacidade=2, validade=60, caminho_indice=caminho,
+                                        relogio=relogio) as cache:
+        reescrever = cache._reescrever_indice
+
+        def reescrever_com_venda_no_meio(entradas):
+            assert not cache._trava.locked()
+            cache._reescrever_indice = reescrever
+            vender(cache, "durante")   # outra venda é atendida durante a reescrita
+            return reescrever(entradas)
+
+        for chave in ("k1", "k2", "k3", "k4"):
+            vender(cache, chave)
+        cache._reescrever_indice = reescrever_com_venda_no_meio
+        vender(cache, "k5")
+        assert cache._reescrever_indice == reescrever
+        with open(caminho, encoding="utf-8") as arquivo:
+            assert len(arquivo.readlines()) == 3   # k4, k5 e "durante"
+
+    with idempotencia.CacheIdempotencia(capacidade=2, validade=60, caminho_indice=caminho,
+                                        relogio=relogio) as cache:
+        assert cache.consultar("durante") is not None
+        assert cache.consultar("k5") is not None
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        idempotencia.CacheIdempotencia(capacidade=0)
+    with pytest.raises(ValueError):
+        idempotencia.CacheIdempotencia(validade=0)
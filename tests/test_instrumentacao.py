@@ -0,0 +1,93 @@
+"""Testes das métricas opcionais do caminho da venda"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+import abastecimento
+import instrumentacao
+
+
+@pytest.fixture(autouse=True)
+def metricas_zeradas():
+    instrumentacao.zerar()
+    yield
+    instrumentacao.desativar()
+    instrumentacao.zerar()
+
+
+def test_desligado_nao_coleta_nada():
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimento("Diesel", -1, "PIX")
+
+    dados = instrumentacao.fotografia()
+    assert dados["contadores"] == {}
+    assert all(etapa["quantidade"] == 0 for etapa in dados["etapas"].values())
+
+
+def test_ligado_conta_vendas_e_rejeicoes():
+    instrumentacao.ativar()
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimento("Diesel", float("nan"), "PIX")
+
+    dados = instrumentacao.fotografia()
+    assert dados["contadores"]["abastecimentos_processados"] == 1
+    assert dados["contadores"]["abastecimentos_rejeitados"] == 1
+    assert dados["etapas"]["validar"]["quantidade"] == 1
+    assert dados["etapas"]["montar_registro"]["quantidade"] == 1
+
+
+def test_histograma_percentis_e_resumo():
+    histograma = instrumentacao.Histograma()
+    assert histograma.percentil(0.99) == 0
+    for duracao in [150] * 99 + [3_000_000]:
+        histograma.registrar(duracao)
+
+    assert histograma.percentil(0.50) == 200          # limite superior do balde
+    assert histograma.percentil(1.0) == 3_000_000     # nunca acima do máximo
+    assert histograma.resumo()["quantidade"] == 100
+
+
+def test_histograma_acima_do_ultimo_limite_usa_maximo():
+    histograma = instrumentacao.Histograma()
+    histograma.registrar(instrumentacao.LIMITES_NS[-1] * 3)
+    assert histograma.percentil(0.5) == instrumentacao.LIMITES_NS[-1] * 3
+
+
+def test_publicar_envia_para_destinos():
+    recebidos = []
+    instrumentacao.adicionar_destino(recebidos.append)
+    try:
+        instrumentacao.contar("x", 2)
+        instrumentacao.publicar()
+    finally:
+        instrumentacao.remover_destino(recebidos.append)
+    instrumentacao.remover_destino(recebidos.append)   # remover de novo não falha
+
+    assert recebidos[0]["contadores"] == {"x": 2}
+
+
+def test_gravar_arquivo(tmp_path):
+    caminho = str(tmp_path / "metricas.json")
+    instrumentacao.contar("y")
+    instrumentacao.gravar_arquivo(caminho)
+    with open(caminho, encoding="utf-8") as arquivo:
+        assert json.load(arquivo)["contadores"] == {"y": 1}
+
+
+def test_servidor_http_responde_metricas():
+    servidor = instrumentacao.iniciar_servidor(porta=0)
+    try:
+        porta = servidor.server_address[1]
+        instrumentacao.contar("z")
+        with urllib.request.urlopen(f"http://127.0.0.1:{porta}/metricas") as resposta:
+            assert json.load(resposta)["contadores"] == {"z": 1}
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{porta}/outra")
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
@@ -0,0 +1,152 @@
+"""Testes da importação/exportação em massa (CSV, JSONL e formato colunar)"""
+
+import json
+
+import pytest
+
+import combustivel
+import intercambio
+import pagamento
+import relatorios
+from regras_desconto import MotorDescontos, RegraDesconto
+
+
+def _escrever(caminho, linhas):
+    caminho.write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return str(caminho)
+
+
+def _vendas(quantidade):
+    return [relatorios.Venda(1_700_000_000.0 + i, f"Comb{i % 3}", 10.0 + i, f"Pag{i % 2}",
+                             5.0, 50.0 + 5 * i, 0.0, 50.0 + 5 * i)
+            for i in range(quantidade)]
+
+
+@pytest.mark.parametrize("extensao", [".csv", ".jsonl", ".col"])
+def test_vendas_ida_e_volta(tmp_path, extensao):
+    caminho = str(tmp_path / f"vendas{extensao}")
+    vendas = _vendas(25)
+    assert intercambio.escrever_vendas(vendas, caminho) == 25
+    assert list(intercambio.ler_vendas(caminho, processos=1, linhas_por_bloco=7)) == vendas
+
+
+def test_colunar_ids_usam_inteiros_de_32_bits(tmp_path):
+    caminho = str(tmp_path / "vendas.col")
+    quantidade = 70_000   # mais nomes do que cabem em "H" (65 536)
+    vendas = (relatorios.Venda(1.0, f"C{i}", 1.0, f"P{i % 300}", 1.0, 1.0, 0.0, 1.0)
+              for i in range(quantidade))
+    with intercambio.EscritorColunar(caminho, linhas_por_grupo=30_000) as escritor:
+        escritor.escrever_muitas(vendas)
+
+    with intercambio.LeitorColunar(caminho) as leitor:
+        assert leitor.tipos["combustivel"] == leitor.tipos["pagamento"] == "I"
+        ids = leitor.ler_coluna("combustivel")
+        assert ids[-1] == quantidade - 1
+        assert leitor.dicionarios["pagamento"][leitor.ler_coluna("pagamento")[-1]] == "P99"
+
+
+def test_colunar_versao_nova_recusada(tmp_path):
+    caminho = tmp_path / "vendas.col"
+    intercambio.escrever_vendas(_vendas(2), str(caminho))
+    dados = bytearray(caminho.read_bytes())
+    dados[4] = 99
+    caminho.write_bytes(bytes(dados))
+    with pytest.raises(ValueError):
+        intercambio.LeitorColunar(str(caminho))
+
+
+def test_jsonl_invalido_gera_erro_com_numero_da_linha(tmp_path):
+    venda = json.dumps({"instante": 1_700_000_000, "combustivel": "Diesel", "litros": 10,
+                        "pagamento": "PIX", "valor_por_litro": 5.0})
+    caminho = _escrever(tmp_path / "vendas.jsonl", [venda, "{quebrado", "[1, 2]", "", venda])
+
+    with pytest.raises(ValueError, match="Linha 2"):
+        list(intercambio.ler_vendas(caminho, processos=1))
+
+    erros = []
+    vendas = list(intercambio.ler_vendas(caminho, processos=1, erros=erros))
+    assert len(vendas) == 2
+    assert [numero for numero, _ in erros] == [2, 3]
+
+
+def test_importar_combustiveis_recusa_linhas_invalidas(tmp_path):
+    for linha in ['{"nome": null, "preco": 4.5}', '{"nome": "GNV", "preco": NaN}',
+                  '{"nome": "GNV"}', "[1]", "{quebrado"]:
+        caminho = _escrever(tmp_path / "precos.jsonl", ['{"nome": "Etanol", "preco": 3.9}', linha])
+        with pytest.raises(ValueError, match="Linha 2"):
+            intercambio.importar_combustiveis(caminho)
+    assert not combustivel.validar_combustivel("None")
+    assert not combustivel.validar_combustivel("GNV")
+
+
+def test_combustiveis_ida_e_volta(tmp_path):
+    caminho = str(tmp_path / "precos.csv")
+    total = intercambio.exportar_combustiveis(caminho)
+    combustivel.atualizar_preco_combustivel("Diesel", 9.99)
+    assert intercambio.importar_combustiveis(caminho) == total
+    assert combustivel.obter_preco_combustivel("Diesel") != 9.99
+
+
+def test_importar_historico_em_blocos(tmp_path):
+    linhas = [json.dumps({"combustivel": "Diesel", "instante": 1_600_000_000 + i, "preco": 5 + i / 100})
+              for i in range(10)]
+    caminho = _escrever(tmp_path / "historico.jsonl", linhas)
+    versoes = []
+    combustivel.adicionar_ouvinte_precos(lambda *args: versoes.append(args))
+
+    assert intercambio.importar_historico(caminho, linhas_por_bloco=3) == 10
+    assert len(versoes) == 10
+    assert (1_600_000_009.0, 5.09) in combustivel.obter_historico_precos("Diesel")
+
+
+def test_importar_historico_invalido_nao_importa_nada(tmp_path):
+    linhas = [json.dumps({"combustivel": "Diesel", "instante": 1_600_000_000 + i, "preco": 5.0})
+              for i in range(5)]
+    linhas.append('{"combustivel": "Diesel", "instante": 1600000100, "preco": -1}')
+    caminho = _escrever(tmp_path / "historico.jsonl", linhas)
+    antes = combustivel.obter_historico_precos("Diesel")
+
+    with pytest.raises(ValueError, match="Linha 6"):
+        intercambio.importar_historico(caminho, linhas_por_bloco=2)
+    assert combustivel.obter_historico_precos("Diesel") == antes
+
+
+def test_importar_historico_junta_ao_catalogo_uma_unica_vez(tmp_path, monkeypatch):
+    linhas = [json.dumps({"combustivel": "Diesel", "instante": 1_600_000_000 + i % 6, "preco": 5.0})
+              for i in range(12)]
+    caminho = _escrever(tmp_path / "historico.jsonl", linhas)
+    cargas = []
+    carregar_precos = combustivel.carregar_precos
+    monkeypatch.setattr(combustivel, "carregar_precos",
+                        lambda *args, **kwargs: cargas.append(1) or carregar_precos(*args, **kwargs))
+
+    assert intercambio.importar_historico(caminho, linhas_por_bloco=2) == 12
+    assert cargas == [1]
+    importados = [par for par in combustivel.obter_historico_precos("Diesel") if par[0] < 1_700_000_000]
+    assert importados[-6:] == [(1_600_000_000.0 + i, 5.0) for i in range(6)]
+
+
+def test_leitura_paralela_igual_a_sequencial(tmp_path):
+    caminho = str(tmp_path / "vendas.jsonl")
+    vendas = _vendas(50)
+    intercambio.escrever_vendas(vendas, caminho)
+    with open(caminho, "a", encoding="utf-8") as arquivo:
+        arquivo.write("{quebrado\n")
+
+    erros = []
+    assert list(intercambio.ler_vendas(caminho, processos=2, linhas_por_bloco=8, erros=erros)) == vendas
+    assert [numero for numero, _ in erros] == [51]
+
+
+def test_leitura_paralela_usa_o_motor_de_descontos(tmp_path, monkeypatch):
+    monkeypatch.setattr(pagamento, "_motor_descontos", None)
+    monkeypatch.setattr(pagamento, "_ouvintes_descontos", [])
+    pagamento.configurar_motor_descontos(MotorDescontos([RegraDesconto("Gasolina", 0.05,
+                                                                       combustiveis=["Gasolina"])]))
+    linhas = [json.dumps({"instante": 1_700_000_000 + i, "combustivel": "Gasolina", "litros": 10,
+                          "pagamento": "Dinheiro", "valor_por_litro": 6.0}) for i in range(20)]
+    caminho = _escrever(tmp_path / "vendas.jsonl", linhas)
+
+    vendas = list(intercambio.ler_vendas(caminho, processos=2, linhas_por_bloco=4))
+    assert vendas == list(intercambio.ler_vendas(caminho, processos=1))
+    assert {venda.valor_desconto for venda in vendas} == {3.0}
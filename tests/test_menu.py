@@ -0,0 +1,168 @@
+"""Testes da interface de menu (telas, importação sob demanda e modo em lote)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import menu
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importar_menu_nao_carrega_modulos_do_sistema():
+    codigo = ("import sys, menu; "
+              "print(sorted(m for m in ('combustivel', 'pagamento', 'abastecimento', 'diario') "
+              "if m in sys.modules))")
+    saida = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True,
+                           text=True, check=True).stdout
+    assert saida.strip() == "[]"
+
+
+def test_limpar_tela_usa_ansi_sem_processo(capsys, monkeypatch):
+    def proibido(*args, **kwargs):
+        raise AssertionError("limpar_tela não deve criar processos")
+    monkeypatch.setattr(os, "system", proibido)
+    monkeypatch.setattr(subprocess, "run", proibido)
+
+    menu.limpar_tela()
+    assert capsys.readouterr().out == menu.LIMPAR_TELA
+
+
+def test_telas_fixas(capsys):
+    menu.exibir_cabecalho()
+    menu.exibir_menu_principal()
+    assert capsys.readouterr().out == menu.TELA_CABECALHO + menu.TELA_MENU_PRINCIPAL
+    assert menu.TELA_INICIAL.startswith(menu.LIMPAR_TELA)
+
+
+def _executar(linhas, diario_vendas=None):
+    import io
+    import json
+
+    saida = io.StringIO()
+    resumo = menu.executar_lote(io.StringIO("\n".join(linhas) + "\n"), saida, diario_vendas)
+    return resumo, [json.loads(linha) for linha in saida.getvalue().splitlines()]
+
+
+def test_lote_executa_comandos_texto_e_json():
+    resumo, resultados = _executar([
+        "# comentário",
+        "venda; Diesel; 10; PIX",
+        '{"op": "cadastrar", "nome": "GNV", "preco": 4.5}',
+        "preco; GNV; 4.9",
+    ])
+    assert resumo["sucessos"] == 3 and resumo["erros"] == 0
+    assert [r["linha"] for r in resultados] == [2, 3, 4]
+    assert resultados[2] == {"linha": 4, "op": "preco", "ok": True, "nome": "GNV", "preco": 4.9}
+
+
+def test_lote_erros_nao_interrompem_o_lote():
+    resumo, resultados = _executar([
+        "{nao e json",
+        "[1, 2]",
+        '{"op": "cadastrar", "nome": null, "preco": 4.5}',
+        '{"op": "cadastrar", "nome": ["GNV"], "preco": 4.5}',
+        '{"op": "venda", "combustivel": ["Diesel"], "litros": 10, "pagamento": "PIX"}',
+        '{"op": "venda", "combustivel": "Diesel", "litros": NaN, "pagamento": "PIX"}',
+        '{"op": "preco", "nome": "Diesel", "preco": NaN}',
+        '{"op": "preco", "nome": "Diesel", "preco": [1]}',
+        "sacar; 10",
+        "venda; Diesel; 10",
+        "venda; Diesel; 10; PIX",
+    ])
+    assert resumo["erros"] == 10 and resumo["sucessos"] == 1
+    assert all(not r["ok"] and r["erro"] for r in resultados[:-1])
+    assert resultados[-1]["ok"]
+
+
+def test_lote_nao_cadastra_nome_none():
+    import combustivel
+
+    _executar(['{"op": "cadastrar", "nome": null, "preco": 4.5}'])
+    assert not combustivel.validar_combustivel("None")
+
+
+def test_lote_grava_vendas_no_diario_e_sincroniza(tmp_path):
+    import diario
+
+    diario_vendas = diario.DiarioAbastecimentos(str(tmp_path / "diario"))
+    try:
+        resumo, _ = _executar(["venda; Diesel; 10; PIX", "venda; Diesel; -1; PIX"], diario_vendas)
+        assert resumo["sucessos"] == 1
+        assert diario_vendas.gravados == 1
+    finally:
+        diario_vendas.fechar()
+
+
+class _DiarioSemDisco:
+    """Diário cujo disco falha na segunda venda e na sincronização final"""
+    def __init__(self):
+        self.vendas = 0
+
+    def registrar(self, registro):
+        self.vendas += 1
+        if self.vendas == 2:
+            raise OSError("disco cheio")
+
+    def sincronizar(self):
+        raise OSError("disco cheio")
+
+
+def test_lote_falha_do_diario_afeta_so_o_comando():
+    resumo, resultados = _executar(["venda; Diesel; 10; PIX"] * 3, _DiarioSemDisco())
+    assert [r["ok"] for r in resultados] == [True, False, True]
+    assert "disco cheio" in resultados[1]["erro"]
+    assert resumo["erros"] == 1 and resumo["erro_diario"] == "disco cheio"
+
+
+@pytest.fixture
+def estado_nao_verificado(monkeypatch):
+    import recuperacao
+
+    chamadas = []
+    monkeypatch.setattr(menu, "_estado_verificado", False)
+    monkeypatch.setattr(recuperacao, "iniciar_padrao", lambda: chamadas.append(1))
+    return chamadas
+
+
+def test_main_nao_restaura_estado_antes_de_uma_tela_que_precise(estado_nao_verificado, monkeypatch):
+    respostas = iter(["4", "", "", "0"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(respostas))
+    menu.main()
+    assert estado_nao_verificado == []
+
+
+def test_garantir_estado_restaura_uma_unica_vez(estado_nao_verificado):
+    menu.garantir_estado()
+    menu.garantir_estado()
+    assert estado_nao_verificado == [1]
+
+
+@pytest.mark.parametrize("erro", [OSError("disco"), ValueError("json"), KeyError("livro")])
+def test_restaurar_estado_com_instantaneo_ruim_segue_com_catalogo_padrao(erro, monkeypatch, capsys):
+    import recuperacao
+
+    def falhar():
+        raise erro
+    monkeypatch.setattr(menu, "_estado_verificado", False)
+    monkeypatch.setattr(recuperacao, "iniciar_padrao", falhar)
+
+    assert menu.restaurar_estado() is False
+    capturado = capsys.readouterr()
+    assert "estado anterior não restaurado" in capturado.err
+    assert capturado.out == ""
+    menu.garantir_estado()   # não tenta de novo
+    assert capsys.readouterr().err == ""
+
+
+def test_main_lote_sem_diario_restaura_estado(estado_nao_verificado, tmp_path, capsys):
+    import argparse
+
+    comandos = tmp_path / "comandos.txt"
+    comandos.write_text("venda; Diesel; 10; PIX\n", encoding="utf-8")
+    argumentos = argparse.Namespace(lote=str(comandos), saida=None, sem_diario=True)
+    assert menu.main_lote(argumentos) == 0
+    assert estado_nao_verificado == [1]
+    assert '"ok": true' in capsys.readouterr().out
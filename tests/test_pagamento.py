@@ -0,0 +1,59 @@
+"""Testes do módulo pagamento e dos ids internos de combustível/pagamento"""
+
+import pytest
+
+import abastecimento
+import combustivel
+import pagamento
+
+
+@pytest.mark.parametrize("codigo", [1.0, True, "1", None, 0, 5, [1]])
+def test_validar_codigo_pagamento_exige_int(codigo):
+    assert not pagamento.validar_codigo_pagamento(codigo)
+
+
+def test_validar_codigo_pagamento_aceita_codigos_cadastrados():
+    assert all(pagamento.validar_codigo_pagamento(codigo) for codigo in pagamento.FORMAS_PAGAMENTO)
+
+
+@pytest.mark.parametrize("codigo", [1.0, True])
+def test_venda_por_id_rejeita_codigo_nao_inteiro(codigo):
+    with pytest.raises(ValueError):
+        abastecimento.processar_abastecimento_por_id(0, 10, codigo)
+
+
+@pytest.mark.parametrize("identificador", [True, 0.0, "0", -1, 10**6])
+def test_validar_id_combustivel_exige_int_no_intervalo(identificador):
+    assert not combustivel.validar_id_combustivel(identificador)
+
+
+def test_desconto_por_codigo_igual_ao_por_nome():
+    for codigo, nome in pagamento.listar_formas_pagamento().items():
+        assert (pagamento.calcular_desconto_por_codigo(100.0, codigo)
+                == pagamento.calcular_desconto(100.0, nome))
+    assert pagamento.calcular_desconto(100.0, "PIX") == pytest.approx(10.0)
+    assert pagamento.calcular_desconto(100.0, "Cartão de Crédito") == 0.0
+
+
+def test_lote_por_id_rejeita_codigo_booleano():
+    resultado = abastecimento.processar_abastecimentos_em_lote_por_id([0, 0], [10, 10], [True, 1])
+    assert list(resultado.validos) == [0, 1]
+
+
+def test_ouvinte_de_desconto_que_falha_cancela_a_alteracao(monkeypatch):
+    monkeypatch.setattr(pagamento, "PERCENTUAL_DESCONTO", 0.10)
+    monkeypatch.setattr(pagamento, "_ouvintes_descontos", [])
+    recebidos = []
+
+    def falhar(percentual, motor):
+        raise OSError("disco cheio")
+    pagamento.adicionar_ouvinte_descontos(lambda percentual, motor: recebidos.append((percentual, motor)))
+    pagamento.adicionar_ouvinte_descontos(falhar)
+
+    with pytest.raises(OSError):
+        pagamento.definir_percentual_desconto(0.3)
+    with pytest.raises(OSError):
+        pagamento.configurar_motor_descontos(object())
+    assert pagamento.obter_percentual_desconto() == 0.10
+    assert pagamento.obter_motor_descontos() is None
+    assert recebidos[0] == (0.3, None)
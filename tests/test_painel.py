@@ -0,0 +1,114 @@
+"""Testes do painel em tempo real (janelas deslizantes e fixas)"""
+
+from datetime import datetime
+
+import pytest
+
+import abastecimento
+import painel
+
+BASE = 1_700_000_040.0   # múltiplo de 60 s: começo de um minuto
+
+
+def _venda(p, instante, combustivel="Diesel", pagamento="PIX", litros=10.0, bruto=50.0,
+           desconto=5.0, final=45.0):
+    p.adicionar(instante, combustivel, pagamento, litros, bruto, desconto, final)
+
+
+def test_janela_de_um_minuto_desliza():
+    p = painel.Painel()
+    _venda(p, BASE)
+    _venda(p, BASE + 30)
+
+    assert p.consultar("1min", agora=BASE + 30)["vendas"] == 2
+    assert p.consultar("1min", agora=BASE + 61)["vendas"] == 1   # a primeira saiu
+    indicadores = p.consultar("1min", agora=BASE + 200)
+    assert indicadores["vendas"] == 0 and indicadores["receita"] == 0.0
+
+
+def test_indicadores_e_filtros():
+    p = painel.Painel()
+    _venda(p, BASE)
+    _venda(p, BASE + 1, combustivel="Gasolina", pagamento="Cartão de Crédito",
+           litros=20.0, bruto=120.0, desconto=0.0, final=120.0)
+
+    total = p.consultar("15min", agora=BASE + 2)
+    assert total["vendas"] == 2
+    assert total["receita"] == 165.0
+    assert total["razao_desconto"] == round(5 / 170, 4)
+    assert total["litros_por_minuto"] == round(30 / 15, 3)
+    assert total["ticket_medio"] == 82.5
+    assert p.consultar("15min", combustivel="Gasolina", agora=BASE + 2)["vendas"] == 1
+    assert p.consultar("15min", pagamento="PIX", agora=BASE + 2)["receita"] == 45.0
+    assert p.consultar("15min", combustivel="Etanol", agora=BASE + 2)["vendas"] == 0
+
+
+def test_venda_antiga_demais_e_ignorada():
+    p = painel.Painel()
+    _venda(p, BASE + 120)
+    _venda(p, BASE)   # fora da janela de 1 minuto (ainda dentro das outras)
+    assert p.consultar("1min", agora=BASE + 120)["vendas"] == 1
+    assert p.ignoradas == 3   # total, combustível e pagamento da janela de 1 minuto
+
+
+def test_turno_vira_e_recomeca():
+    manha = datetime(2024, 3, 10, 13, 59).timestamp()
+    tarde = datetime(2024, 3, 10, 14, 1).timestamp()
+    p = painel.Painel()
+    _venda(p, manha)
+    _venda(p, tarde)
+
+    assert p.consultar("turno", agora=tarde)["vendas"] == 1
+    assert p.consultar("dia", agora=tarde)["vendas"] == 2
+
+
+def test_turno_da_noite_comeca_na_vespera():
+    rotulo, inicio, fim = painel._periodo_turno(datetime(2024, 3, 11, 2, 0).timestamp(),
+                                                painel.relatorios.TURNOS_PADRAO)
+    assert rotulo == "2024-03-10 Noite"
+    assert datetime.fromtimestamp(inicio) == datetime(2024, 3, 10, 22, 0)
+    assert datetime.fromtimestamp(fim) == datetime(2024, 3, 11, 6, 0)
+
+
+def test_consultas_invalidas():
+    p = painel.Painel()
+    with pytest.raises(ValueError):
+        p.consultar("1h")
+    with pytest.raises(ValueError):
+        p.consultar("1min", combustivel="Diesel", pagamento="PIX")
+
+
+def test_fotografia_tem_todas_as_janelas_e_visoes():
+    p = painel.Painel()
+    _venda(p, BASE)
+    foto = p.fotografia(agora=BASE + 1)
+    assert set(foto) == set(painel.JANELAS)
+    assert foto["1min"]["combustivel"]["Diesel"]["vendas"] == 1
+    assert foto["dia"]["pagamento"]["PIX"]["vendas"] == 1
+
+
+def test_conectar_recebe_vendas_processadas():
+    p = painel.Painel()
+    painel.conectar(p)
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    painel.desconectar(p)
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+
+    indicadores = p.consultar("1min")
+    assert indicadores["vendas"] == 1
+    assert indicadores["receita"] == round(registro.valor_final, 2)
+
+
+def test_conectar_recebe_vendas_em_lote():
+    p = painel.Painel()
+    painel.conectar(p)
+    resultado = abastecimento.processar_abastecimentos_em_lote(
+        ["Diesel", "Gasolina", "Inexistente"], [10, 20, 5], ["PIX", "Cartão de Crédito", "PIX"])
+    abastecimento.processar_abastecimentos_em_lote_por_id([0], [5], [1])
+    painel.desconectar(p)
+    abastecimento.processar_abastecimentos_em_lote(["Diesel"], [10], ["PIX"])
+
+    dia = p.consultar("dia")
+    assert dia["vendas"] == 3
+    assert p.consultar("dia", combustivel="Diesel")["receita"] == round(resultado.valor_final[0], 2)
+    assert p.consultar("dia", combustivel="Inexistente")["vendas"] == 0
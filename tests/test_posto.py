@@ -0,0 +1,84 @@
+"""Testes dos postos independentes e do supervisor com um processo por shard"""
+
+import math
+
+import pytest
+
+import posto
+
+
+def test_posto_rejeita_vendas_invalidas_sem_parar():
+    loja = posto.Posto("P001")
+    loja.registrar_venda("Diesel", 10, "PIX")
+    for argumentos in [("Diesel", math.nan, "PIX"), ("Diesel", math.inf, "PIX"),
+                       (["Diesel"], 10, "PIX"), ("Diesel", 10, {"PIX"}), ("Querosene", 10, "PIX")]:
+        with pytest.raises((ValueError, TypeError)):
+            loja.registrar_venda(*argumentos)
+
+    resumo = loja.resumo()
+    assert resumo["vendas"] == 1
+    assert resumo["rejeitadas"] == 5
+
+
+@pytest.mark.parametrize("preco", [math.nan, math.inf, 0, -1, "abc", None])
+def test_catalogo_recusa_preco_invalido(preco):
+    catalogo = posto.CatalogoCombustiveis({"Diesel": 5.0})
+    assert not catalogo.cadastrar("GNV", preco)
+    assert not catalogo.atualizar_preco("Diesel", preco)
+    assert catalogo.obter_tabela().versao == 1
+
+
+def test_supervisor_isola_comandos_com_erro():
+    configuracoes = [{"codigo": "P001"}, {"codigo": "P002"}]
+    with posto.SupervisorPostos(configuracoes, processos=1, tamanho_lote=2) as supervisor:
+        supervisor.registrar_venda("P001", "Diesel", 10, "PIX")
+        supervisor.registrar_venda("P001", ["Diesel"], 10, "PIX")   # tipo errado
+        supervisor.cadastrar_combustivel("P001", ["GNV"], 4.0)      # nome não hasheável
+        supervisor.atualizar_preco("P001", "Querosene", 4.0)        # combustível inexistente
+        supervisor.atualizar_preco("P002", "Diesel", math.nan)
+        supervisor.registrar_venda("P002", "Diesel", 10, "PIX")
+        resumos = supervisor.resumos()
+
+    assert resumos["P001"]["vendas"] == 1
+    assert resumos["P001"]["rejeitadas"] == 1
+    assert resumos["P001"]["falhas"] == 2
+    assert resumos["P002"]["vendas"] == 1
+    assert resumos["P002"]["falhas"] == 1
+
+
+def test_supervisor_soma_os_postos():
+    configuracoes = [{"codigo": f"P{i:03d}"} for i in range(4)]
+    with posto.SupervisorPostos(configuracoes, processos=2) as supervisor:
+        for configuracao in configuracoes:
+            supervisor.registrar_venda(configuracao["codigo"], "Diesel", 10, "PIX")
+        geral = supervisor.resumo_geral()
+    assert geral["postos"] == 4
+    assert geral["vendas"] == 4
+    assert geral["rejeitadas"] == geral["falhas"] == 0
+
+
+def test_supervisor_falha_em_vez_de_travar_quando_processo_morre(monkeypatch):
+    monkeypatch.setattr(posto, "INTERVALO_VERIFICACAO", 0.05)
+    supervisor = posto.SupervisorPostos([{"codigo": "P001"}], processos=1)
+    supervisor._processos[0].terminate()
+    supervisor._processos[0].join()
+
+    with pytest.raises(RuntimeError):
+        supervisor.resumos()
+    with pytest.raises(RuntimeError):
+        supervisor.fechar()
+
+
+def test_supervisor_encerrado_recusa_comandos():
+    supervisor = posto.SupervisorPostos([{"codigo": "P001"}], processos=1)
+    supervisor.fechar()
+    supervisor.fechar()   # fechar de novo não faz nada
+    with pytest.raises(RuntimeError):
+        supervisor.registrar_venda("P001", "Diesel", 10, "PIX")
+
+
+def test_supervisor_valida_configuracao():
+    with pytest.raises(ValueError):
+        posto.SupervisorPostos([])
+    with pytest.raises(ValueError):
+        posto.SupervisorPostos([{"codigo": "P001"}, {"codigo": "P001"}])
@@ -0,0 +1,59 @@
+"""Testes dos recibos pré-compilados"""
+
+import io
+
+import abastecimento
+import recibo
+
+
+class FluxoContado(io.StringIO):
+    """StringIO que conta as chamadas de write()"""
+    def __init__(self):
+        super().__init__()
+        self.escritas = 0
+
+    def write(self, texto):
+        self.escritas += 1
+        return super().write(texto)
+
+
+def test_recibo_com_desconto_mostra_percentual_e_valores():
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    texto = recibo.renderizar_recibo(registro)
+    assert "Tipo de Combustível: Diesel" in texto
+    assert f"Desconto aplicado (10%): R$ {registro.valor_desconto:.2f}" in texto
+    assert f"TOTAL A PAGAR: R$ {registro.valor_final:.2f}" in texto
+
+
+def test_recibo_sem_desconto():
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "Cartão de Crédito")
+    assert "Desconto aplicado: R$ 0.00" in recibo.renderizar_recibo(registro)
+
+
+def test_escrever_recibo_usa_uma_unica_escrita():
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    destino = FluxoContado()
+    recibo.escrever_recibo(registro, destino)
+    assert destino.escritas == 1
+    assert destino.getvalue() == recibo.renderizar_recibo(registro)
+
+
+def test_escrever_recibos_em_blocos():
+    registros = [abastecimento.processar_abastecimento("Diesel", 1 + i % 7, "PIX")
+                 for i in range(recibo.RECIBOS_POR_BLOCO + 3)]
+    destino = FluxoContado()
+
+    assert recibo.escrever_recibos(registros, destino) == len(registros)
+    assert destino.escritas == 2
+    assert destino.getvalue() == "".join(map(recibo.renderizar_recibo, registros))
+
+
+def test_escrever_recibos_vazio_nao_escreve():
+    destino = FluxoContado()
+    assert recibo.escrever_recibos([], destino) == 0
+    assert destino.escritas == 0
+
+
+def test_modelo_reaproveitado_por_percentual():
+    assert recibo.obter_modelo(0.1) is recibo.obter_modelo(0.1)
+    assert recibo.obter_modelo(0.2).percentual_desconto == 0.2
@@ -0,0 +1,161 @@
+"""Testes da restauração do estado (instantâneos, registro de preços e desconto)"""
+
+import json
+import os
+
+import pytest
+
+import combustivel
+import pagamento
+import recuperacao
+from regras_desconto import MotorDescontos, RegraDesconto
+
+
+@pytest.fixture(autouse=True)
+def desconto_isolado(monkeypatch):
+    monkeypatch.setattr(pagamento, "PERCENTUAL_DESCONTO", 0.10)
+    monkeypatch.setattr(pagamento, "_motor_descontos", None)
+    monkeypatch.setattr(pagamento, "_ouvintes_descontos", [])
+
+
+@pytest.fixture
+def pastas(tmp_path):
+    (tmp_path / "diario").mkdir()
+    return str(tmp_path / "recuperacao"), str(tmp_path / "diario")
+
+
+def _nova(pastas):
+    pasta, pasta_diario = pastas
+    return recuperacao.Recuperacao(pasta=pasta, pasta_diario=pasta_diario)
+
+
+def _reescrever_instantaneo(pasta, numero, alterar):
+    caminho = os.path.join(pasta, recuperacao._nome_instantaneo(numero))
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    alterar(dados)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(dados, arquivo)
+
+
+@pytest.mark.parametrize("percentual", [0.0, 0.25, 1, "0.05"])
+def test_definir_percentual_desconto(percentual):
+    pagamento.definir_percentual_desconto(percentual)
+    assert pagamento.obter_percentual_desconto() == float(percentual)
+
+
+@pytest.mark.parametrize("percentual", [float("nan"), float("inf"), -0.1, 1.5, "dez", None, True])
+def test_definir_percentual_desconto_invalido_nao_altera(percentual):
+    with pytest.raises(ValueError):
+        pagamento.definir_percentual_desconto(percentual)
+    assert pagamento.obter_percentual_desconto() == 0.10
+
+
+def test_restaurar_instantaneo_e_precos_registrados(pastas):
+    origem = _nova(pastas)
+    origem.conectar()
+    try:
+        pagamento.definir_percentual_desconto(0.05)
+        origem.gravar_instantaneo()
+        combustivel.atualizar_preco_combustivel("Diesel", 7.77)
+    finally:
+        origem.fechar()
+
+    pagamento.definir_percentual_desconto(0.10)
+    estatisticas = _nova(pastas).restaurar()
+    assert estatisticas["instantaneo"] == 1
+    assert estatisticas["precos_repetidos"] == 1
+    assert combustivel.obter_preco_combustivel("Diesel") == 7.77
+    assert pagamento.obter_percentual_desconto() == 0.05
+
+
+def test_alteracoes_de_desconto_depois_do_instantaneo_sao_restauradas(pastas):
+    origem = _nova(pastas)
+    origem.conectar()
+    try:
+        pagamento.configurar_motor_descontos(MotorDescontos([RegraDesconto("Base", 0.05)],
+                                                            faixas_litros=(0, 50)))
+        origem.gravar_instantaneo()
+        pagamento.definir_percentual_desconto(0.2)
+        pagamento.obter_motor_descontos().definir_regra(
+            RegraDesconto("Diesel", 0.15, combustiveis=["Diesel"], prioridade=1))
+    finally:
+        origem.fechar()
+
+    pagamento.definir_percentual_desconto(0.10)
+    pagamento.configurar_motor_descontos(None)
+    _nova(pastas).restaurar()
+
+    motor = pagamento.obter_motor_descontos()
+    assert pagamento.obter_percentual_desconto() == 0.2
+    assert motor.faixas_litros == (0, 50)
+    assert [regra.nome for regra in motor.listar_regras()] == ["Base", "Diesel"]
+    assert motor.percentual(combustivel.obter_id_combustivel("Diesel"), 1, 10, 8) == 0.15
+
+
+def test_motor_do_instantaneo_e_restaurado(pastas):
+    pagamento.configurar_motor_descontos(MotorDescontos([RegraDesconto("Fiel", 0.2,
+                                                                       somente_fidelidade=True)]))
+    _nova(pastas).gravar_instantaneo()
+    pagamento.configurar_motor_descontos(None)
+
+    _nova(pastas).restaurar()
+    regra = pagamento.obter_motor_descontos().listar_regras()[0]
+    assert (regra.nome, regra.percentual, regra.somente_fidelidade) == ("Fiel", 0.2, True)
+
+
+def test_remover_motor_depois_do_instantaneo(pastas):
+    origem = _nova(pastas)
+    origem.conectar()
+    try:
+        pagamento.configurar_motor_descontos(MotorDescontos([RegraDesconto("Base", 0.05)]))
+        origem.gravar_instantaneo()
+        pagamento.configurar_motor_descontos(None)
+    finally:
+        origem.fechar()
+
+    pagamento.configurar_motor_descontos(MotorDescontos())
+    _nova(pastas).restaurar()
+    assert pagamento.obter_motor_descontos() is None
+
+
+def test_historico_no_instantaneo_e_limitado(pastas, monkeypatch):
+    monkeypatch.setattr(recuperacao, "HISTORICO_NO_INSTANTANEO", 3)
+    for instante in range(1, 11):
+        combustivel.registrar_preco_historico("Etanol", 3.0 + instante / 100, float(instante))
+
+    _nova(pastas).gravar_instantaneo()
+    with open(os.path.join(pastas[0], recuperacao._nome_instantaneo(1)), encoding="utf-8") as arquivo:
+        historico = json.load(arquivo)["catalogo"]["historico"]
+    assert max(map(len, historico.values())) == 3
+    assert historico["Etanol"][-1] == [10.0, 3.1]
+
+
+def test_restaurar_sem_instantaneo_mantem_catalogo(pastas):
+    precos, _ = combustivel.exportar_catalogo()
+    assert _nova(pastas).restaurar()["instantaneo"] is None
+    assert combustivel.exportar_catalogo()[0] == precos
+
+
+def test_instantaneo_que_nao_e_objeto_e_ignorado(pastas):
+    _nova(pastas).gravar_instantaneo()
+    with open(os.path.join(pastas[0], recuperacao._nome_instantaneo(2)), "w", encoding="utf-8") as arquivo:
+        arquivo.write("[1, 2, 3]")
+
+    assert _nova(pastas).restaurar()["instantaneo"] == 1
+
+
+def test_instantaneo_sem_campo_levanta_key_error(pastas):
+    _nova(pastas).gravar_instantaneo()
+    _reescrever_instantaneo(pastas[0], 1, lambda dados: dados.pop("livro"))
+    with pytest.raises(KeyError):
+        _nova(pastas).restaurar()
+
+
+def test_instantaneo_com_desconto_invalido_levanta_value_error(pastas):
+    _nova(pastas).gravar_instantaneo()
+    _reescrever_instantaneo(pastas[0], 1,
+                            lambda dados: dados["catalogo"].update(percentual_desconto=5))
+    with pytest.raises(ValueError):
+        _nova(pastas).restaurar()
+    assert pagamento.obter_percentual_desconto() == 0.10
@@ -0,0 +1,58 @@
+"""Testes do livro de registros compacto (colunas em arrays tipados)"""
+
+import pytest
+
+import abastecimento
+import registros
+
+
+def test_adicionar_e_ler_visao():
+    livro = registros.LivroRegistros()
+    registro = abastecimento.processar_abastecimento("Etanol", 20, "Cartão de Crédito")
+    indice = livro.adicionar(registro)
+    visao = livro[indice]
+    assert len(livro) == 1
+    assert visao.tipo_combustivel == "Etanol"
+    assert visao.forma_pagamento == "Cartão de Crédito"
+    assert visao.quantidade_litros == 20.0
+    assert visao.valor_final == pytest.approx(registro.valor_final)
+    assert livro[-1].valor_bruto == visao.valor_bruto
+    with pytest.raises(IndexError):
+        livro[1]
+
+
+def test_adicionar_lote_ignora_linhas_invalidas():
+    livro = registros.LivroRegistros()
+    resultado = abastecimento.processar_abastecimentos_em_lote(
+        ["Gasolina", "Inexistente", "Diesel"], [10, 10, 5], ["PIX", "PIX", "Dinheiro"])
+    assert livro.adicionar_lote(resultado, instante=0) == 2
+    assert [v.tipo_combustivel for v in livro] == ["Gasolina", "Diesel"]
+    assert livro.total_final() == pytest.approx(resultado.total_final())
+
+
+def test_ids_acima_de_65535_combustiveis_e_256_pagamentos():
+    livro = registros.LivroRegistros()
+    for i in range(70_000):
+        livro._anexar(f"Combustível {i}", 1.0, 5.0, 1, f"Pagamento {i % 300}",
+                      0, 5.0, 0.0, 5.0)
+    assert livro[69_999].tipo_combustivel == "Combustível 69999"
+    assert livro[299].forma_pagamento == "Pagamento 299"
+
+
+def test_recibo_da_visao_usa_o_percentual_da_venda(monkeypatch):
+    import pagamento
+    import recibo
+
+    monkeypatch.setattr(pagamento, "PERCENTUAL_DESCONTO", 0.05)
+    livro = registros.LivroRegistros()
+    registro = abastecimento.RegistroAbastecimento.de_valores(
+        "Diesel", 10, "PIX", 0, pagamento.obter_codigo_pagamento("PIX"), 6.0, 1, 0.15)
+    livro.adicionar(registro)
+    resultado = abastecimento.processar_abastecimentos_em_lote(["Diesel", "Diesel"], [10, 10],
+                                                              ["PIX", "Cartão de Crédito"])
+    livro.adicionar_lote(resultado)
+    livro._anexar("Diesel", 10, 6.0, 1, "PIX", 0, 60.0, 3.0, 57.0)   # linha do diário
+
+    assert [v.percentual_desconto for v in livro] == [0.15, 0.05, 0.0, None]
+    assert "Desconto aplicado (15%)" in recibo.renderizar_recibo(livro[0])
+    assert recibo.renderizar_recibo(livro[0]) == recibo.renderizar_recibo(registro)
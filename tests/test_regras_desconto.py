@@ -0,0 +1,148 @@
+"""Testes do motor de regras de desconto e da sua ligação com a venda"""
+
+import threading
+
+import pytest
+
+import abastecimento
+import combustivel
+import pagamento
+import recibo
+from regras_desconto import HORAS_DO_DIA, MotorDescontos, RegraDesconto, regras_padrao
+
+
+@pytest.fixture(autouse=True)
+def sem_motor():
+    yield
+    pagamento.configurar_motor_descontos(None)
+
+
+def _todas_consultas(motor):
+    return [(c, p, f, h, fiel,
+             motor.percentual(c, p, motor.faixas_litros[f], h, fidelidade=fiel))
+            for c in range(len(combustivel.obter_tabela_precos().precos_por_id))
+            for p in pagamento.listar_formas_pagamento()
+            for f in range(len(motor.faixas_litros))
+            for h in range(HORAS_DO_DIA)
+            for fiel in (False, True)]
+
+
+def _regras_variadas():
+    return [
+        RegraDesconto("Base", 0.05),
+        RegraDesconto("Volume", 0.08, faixas=[1], prioridade=1),
+        RegraDesconto("Happy hour", 0.12, horas=[14, 15], pagamentos=["PIX"]),
+        RegraDesconto("Fiel", 0.20, somente_fidelidade=True, prioridade=2),
+    ]
+
+
+def test_recompilacao_incremental_igual_a_completa():
+    incremental = MotorDescontos(_regras_variadas(), faixas_litros=(0, 50))
+    incremental.definir_regra(RegraDesconto("Volume", 0.09, faixas=[1], horas=[3], prioridade=3))
+    incremental.remover_regra("Happy hour")
+    incremental.definir_regra(RegraDesconto("Noite", 0.15, horas=[22, 23]))
+
+    regras = [r for r in _regras_variadas() if r.nome not in ("Volume", "Happy hour")]
+    regras += [RegraDesconto("Volume", 0.09, faixas=[1], horas=[3], prioridade=3),
+               RegraDesconto("Noite", 0.15, horas=[22, 23])]
+    completa = MotorDescontos(regras, faixas_litros=(0, 50))
+
+    assert _todas_consultas(incremental) == _todas_consultas(completa)
+
+
+def test_remover_regra_devolve_posicoes_ao_valor_anterior():
+    motor = MotorDescontos([RegraDesconto("Base", 0.05)])
+    motor.definir_regra(RegraDesconto("Forte", 0.30, combustiveis=["Diesel"], prioridade=5))
+    motor.remover_regra("Forte")
+    id_diesel = combustivel.obter_id_combustivel("Diesel")
+    assert motor.percentual(id_diesel, 1, 10, 8) == pytest.approx(0.05)
+
+
+@pytest.mark.parametrize("argumentos", [
+    (-1, 1, 10, 8), (10**6, 1, 10, 8), (0, 99, 10, 8), (0, -1, 10, 8),
+    (0, 1, 10, 24), (0, 1, 10, -1), (0.0, 1, 10, 8), (0, True, 10, 8),
+])
+def test_percentual_fora_da_tabela_levanta_value_error(argumentos):
+    with pytest.raises(ValueError):
+        MotorDescontos(regras_padrao()).percentual(*argumentos)
+
+
+def test_percentuais_lote_fora_da_tabela_levanta_value_error():
+    motor = MotorDescontos(regras_padrao())
+    with pytest.raises(ValueError):
+        motor.percentuais_lote([0, 0], [1, 1], [10, 10], [8, 24])
+    with pytest.raises(ValueError):
+        motor.percentuais_lote([0, -1], [1, 1], [10, 10], [8, 8])
+
+
+def test_consultas_durante_alteracoes_nunca_veem_tabela_pela_metade():
+    id_diesel = combustivel.obter_id_combustivel("Diesel")
+    motor = MotorDescontos([RegraDesconto("Base", 0.05)])
+    tabelas = motor.tabelas
+    parar = threading.Event()
+    vistos = set()
+    erros = []
+
+    def _vender():
+        try:
+            while not parar.is_set():
+                vistos.add(motor.percentual(id_diesel, 1, 10, 8))
+                vistos.update(motor.percentuais_lote([id_diesel], [1], [10], [8]))
+        except Exception as erro:
+            erros.append(erro)
+
+    leitor = threading.Thread(target=_vender)
+    leitor.start()
+    try:
+        for i in range(150):
+            motor.definir_regra(RegraDesconto("Forte", 0.30, combustiveis=["Diesel"], prioridade=5))
+            motor.remover_regra("Forte")
+            if i % 30 == 0:
+                combustivel.cadastrar_combustivel(f"Teste {i}", 5.0)   # força recompilação
+                motor.definir_regra(RegraDesconto("Base", 0.05))
+    finally:
+        parar.set()
+        leitor.join()
+
+    assert erros == []
+    assert vistos <= {0.05, 0.30}
+    assert tabelas.comum[tabelas.posicao(id_diesel, 1, 0, 8)] == 0.05   # publicada não muda
+
+
+def test_percentuais_lote_igual_a_consulta_unica():
+    motor = MotorDescontos(_regras_variadas(), faixas_litros=(0, 50))
+    colunas = ([0, 1, 2, 0], [1, 2, 4, 2], [10, 60, 5, 80], [14, 15, 3, 23])
+    esperado = [motor.percentual(*linha) for linha in zip(*colunas)]
+    assert list(motor.percentuais_lote(*colunas)) == pytest.approx(esperado)
+
+
+def test_venda_usa_motor_configurado():
+    id_diesel = combustivel.obter_id_combustivel("Diesel")
+    pagamento.configurar_motor_descontos(MotorDescontos(
+        [RegraDesconto("Diesel", 0.25, combustiveis=["Diesel"])]))
+
+    registro = abastecimento.processar_abastecimento_por_id(id_diesel, 10, 3)
+    assert registro.percentual_desconto == pytest.approx(0.25)
+    assert registro.valor_final == pytest.approx(registro.valor_bruto * 0.75, abs=0.01)
+    assert "Desconto aplicado (25%)" in recibo.renderizar_recibo(registro)
+
+
+def test_venda_sem_motor_mantem_regra_fixa():
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "Cartão de Crédito")
+    assert registro.percentual_desconto == 0.0
+    registro = abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    assert registro.percentual_desconto == pagamento.PERCENTUAL_DESCONTO
+
+
+def test_lotes_usam_motor_configurado():
+    pagamento.configurar_motor_descontos(MotorDescontos(
+        [RegraDesconto("Crédito", 0.02, pagamentos=["Cartão de Crédito"])]))
+
+    por_nome = abastecimento.processar_abastecimentos_em_lote(
+        ["Diesel", "Inexistente"], [10, 10], ["Cartão de Crédito", "Cartão de Crédito"])
+    por_id = abastecimento.processar_abastecimentos_em_lote_por_id([0, 0], [10, 10], [3, 1])
+
+    assert por_nome.valor_desconto[0] == pytest.approx(por_nome.valor_bruto[0] * 0.02, abs=0.01)
+    assert not por_nome.validos[1]
+    assert por_id.valor_desconto[0] == pytest.approx(por_id.valor_bruto[0] * 0.02, abs=0.01)
+    assert por_id.valor_desconto[1] == 0.0
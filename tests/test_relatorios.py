@@ -0,0 +1,107 @@
+"""Testes dos relatórios de vendas em fluxo"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+import abastecimento
+import combustivel
+import diario
+import pagamento
+import relatorios
+from regras_desconto import MotorDescontos, RegraDesconto
+
+
+def _instante(hora, dia=10):
+    return datetime(2025, 3, dia, hora, 30).timestamp()
+
+
+def test_csv_calcula_campos_ausentes_com_preco_vigente(tmp_path):
+    combustivel.registrar_preco_historico("Gasolina", 5.00, _instante(0))
+    combustivel.registrar_preco_historico("Gasolina", 6.00, _instante(12))
+    caminho = tmp_path / "vendas.csv"
+    caminho.write_text(
+        "instante,combustivel,litros,pagamento\n"
+        f"{_instante(10)},Gasolina,10,PIX\n"
+        f"{_instante(13)},Gasolina,10,Cartão de Crédito\n", encoding="utf-8")
+    vendas = list(relatorios.ler_csv(str(caminho)))
+    assert [v.valor_por_litro for v in vendas] == [5.00, 6.00]
+    assert vendas[0].valor_final == pytest.approx(45.0)
+    assert vendas[1].valor_desconto == 0.0
+
+
+def test_campos_ausentes_calculados_como_a_venda_ao_vivo(monkeypatch):
+    monkeypatch.setattr(pagamento, "PERCENTUAL_DESCONTO", 0.10)
+    monkeypatch.setattr(pagamento, "_motor_descontos", None)
+    campos = {"instante": _instante(10), "combustivel": "Gasolina", "litros": 30.0,
+              "pagamento": "PIX", "valor_por_litro": 5.79}
+    venda = relatorios._venda_de_campos(campos)
+    assert (venda.valor_bruto, venda.valor_desconto, venda.valor_final) == (173.7, 17.37, 156.33)
+
+    pagamento.configurar_motor_descontos(MotorDescontos([RegraDesconto("Gasolina", 0.05,
+                                                                       combustiveis=["Gasolina"])]))
+    venda = relatorios._venda_de_campos(dict(campos, pagamento="Dinheiro", valor_bruto=100.0))
+    assert (venda.valor_bruto, venda.valor_desconto, venda.valor_final) == (100.0, 5.0, 95.0)
+
+
+def test_relatorio_agrupa_por_combustivel_pagamento_e_hora(tmp_path):
+    caminho = tmp_path / "vendas.jsonl"
+    linhas = [
+        {"instante": _instante(8), "combustivel": "Etanol", "litros": 10, "pagamento": "PIX",
+         "valor_por_litro": 4.0},
+        {"instante": _instante(8), "combustivel": "Diesel", "litros": 5, "pagamento": "Dinheiro",
+         "valor_por_litro": 5.0, "valor_final": 20.0},
+        {"instante": _instante(20), "combustivel": "Etanol", "litros": 2, "pagamento": "PIX",
+         "valor_por_litro": 4.0},
+    ]
+    caminho.write_text("\n".join(json.dumps(l) for l in linhas) + "\n\n", encoding="utf-8")
+    relatorio = relatorios.RelatorioVendas().consumir(relatorios.ler_jsonl(str(caminho)))
+    resultado = relatorio.resultado()
+    assert resultado["vendas"] == 3
+    assert resultado["por_combustivel"]["Etanol"] == {"vendas": 2, "litros": 12.0, "receita": 43.2}
+    assert resultado["por_pagamento"]["Dinheiro"]["receita"] == 20.0
+    assert [h["hora"] for h in resultado["por_hora"]] == [8, 20]
+
+
+def test_turno_da_noite_conta_no_dia_em_que_comecou():
+    venda = relatorios.Venda(_instante(2, dia=11), "Gasolina", 1, "PIX", 5, 5, 0.5, 4.5)
+    grupos = relatorios.agregar_por_turno([venda])
+    assert list(grupos) == [(datetime(2025, 3, 10).date(), "Noite")]
+    assert relatorios.turno_da_hora(6) == "Manhã"
+    assert relatorios.turno_da_hora(23) == "Noite"
+
+
+def test_mesclar_e_estado_preservam_as_somas():
+    vendas = [relatorios.Venda(_instante(h), "Gasolina", 1, "PIX", 5, 5, 0.5, 4.5)
+              for h in range(6)]
+    a = relatorios.RelatorioVendas().consumir(vendas[:3])
+    b = relatorios.RelatorioVendas().consumir(vendas[3:])
+    total = relatorios.RelatorioVendas().consumir(vendas)
+    assert a.mesclar(b).resultado() == total.resultado()
+    copia = relatorios.RelatorioVendas.de_estado(json.loads(json.dumps(total.estado())))
+    assert copia.resultado() == total.resultado()
+
+
+def test_de_diario_e_de_registros_concordam(tmp_path):
+    registros = [abastecimento.processar_abastecimento("Gasolina", litros, "PIX")
+                 for litros in (5, 10, 15)]
+    pasta = str(tmp_path / "diario")
+    with diario.DiarioAbastecimentos(pasta) as escrita:
+        for registro in registros:
+            escrita.registrar(registro)
+    do_diario = relatorios.RelatorioVendas().consumir(relatorios.de_diario(pasta))
+    ao_vivo = relatorios.RelatorioVendas().consumir(relatorios.de_registros(registros))
+    assert do_diario.total_final == pytest.approx(ao_vivo.total_final)
+    assert do_diario.quantidade_vendas == 3
+
+
+def test_filtrar_periodo_e_semiaberto():
+    vendas = [relatorios.Venda(float(i), "Gasolina", 1, "PIX", 5, 5, 0, 5) for i in range(10)]
+    assert [v.instante for v in relatorios.filtrar_periodo(vendas, 3, 6)] == [3.0, 4.0, 5.0]
+
+
+def test_linha_sem_preco_no_instante_lanca_value_error():
+    with pytest.raises(ValueError):
+        relatorios._venda_de_campos({"instante": 0, "combustivel": "Inexistente",
+                                     "litros": 1, "pagamento": "PIX"})
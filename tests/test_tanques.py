@@ -0,0 +1,145 @@
+"""Testes do estoque dos tanques e da sua ligação com as vendas"""
+
+import math
+
+import pytest
+
+import abastecimento
+import combustivel
+import tanques
+
+
+@pytest.mark.parametrize("litros", [math.inf, -math.inf, math.nan, 0, -1, "abc", None])
+def test_reservar_recusa_volume_invalido_sem_overflow(litros):
+    tanque = tanques.Tanque("Diesel", 100, 50)
+    with pytest.raises(ValueError):
+        tanque.reservar(litros)
+
+
+@pytest.mark.parametrize("volume", [math.inf, math.nan, -1, 200])
+def test_volume_inicial_invalido(volume):
+    with pytest.raises(ValueError):
+        tanques.Tanque("Diesel", 100, volume)
+
+
+def test_entrega_respeita_capacidade():
+    tanque = tanques.Tanque("Diesel", 100, 90)
+    with pytest.raises(ValueError):
+        tanque.receber_entrega(11)
+    with pytest.raises(ValueError):
+        tanque.receber_entrega(math.inf)
+    tanque.receber_entrega(10, instante=1.0)
+    assert tanque.nivel()["volume"] == 100
+    assert tanque.listar_entregas() == [(1.0, 10.0)]
+
+
+def test_reserva_confirmar_e_cancelar():
+    tanque = tanques.Tanque("Diesel", 100, 10)
+    primeira = tanque.reservar(6)
+    with pytest.raises(ValueError):
+        tanque.reservar(5)                # só 4 L disponíveis
+    primeira.confirmar(4.5)               # cliente parou antes
+    segunda = tanque.reservar(5)
+    segunda.cancelar()
+    with pytest.raises(ValueError):
+        segunda.cancelar()                # reserva já encerrada
+
+    nivel = tanque.nivel()
+    assert nivel["volume"] == 5.5
+    assert nivel["reservado"] == 0
+    assert nivel["vendido"] == 4.5
+
+
+def test_bombas_concorrentes_nunca_vendem_alem_do_estoque():
+    aceitas, recusadas, volume = tanques.verificar_sem_venda_a_mais(bombas=4, litros_no_tanque=200)
+    assert aceitas == 200
+    assert recusadas == 4 * 200 - 200
+    assert volume == 0
+
+
+def test_vendas_unicas_movimentam_estoque_configurado():
+    estoque = tanques.EstoqueTanques({"Diesel": 100}, {"Diesel": 15})
+    abastecimento.configurar_estoque(estoque)
+
+    abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    abastecimento.processar_abastecimento_por_id(combustivel.obter_id_combustivel("Diesel"), 4, 1)
+    with pytest.raises(ValueError, match="Estoque insuficiente"):
+        abastecimento.processar_abastecimento("Diesel", 2, "PIX")
+    with pytest.raises(ValueError, match="não possui tanque"):
+        abastecimento.processar_abastecimento("Gasolina", 1, "PIX")
+
+    nivel = estoque.niveis()["Diesel"]
+    assert nivel["volume"] == 1
+    assert nivel["reservado"] == 0
+
+
+def test_venda_que_falha_devolve_a_reserva():
+    estoque = tanques.EstoqueTanques({"Diesel": 100}, {"Diesel": 15})
+    abastecimento.configurar_estoque(estoque)
+
+    def falhar(registro):
+        raise OSError("disco cheio")
+    abastecimento.adicionar_ouvinte_registros(falhar)
+
+    with pytest.raises(OSError):
+        abastecimento.processar_abastecimento("Diesel", 10, "PIX")
+    assert estoque.niveis()["Diesel"]["disponivel"] == 15
+
+
+def test_estoque_ligado_nao_baixa_duas_vezes():
+    estoque = tanques.EstoqueTanques({"Diesel": 100}, {"Diesel": 15})
+    abastecimento.configurar_estoque(estoque)
+    estoque.processar_abastecimento("Diesel", 10, "PIX")
+    assert estoque.niveis()["Diesel"]["volume"] == 5
+
+
+def test_estoque_com_funcao_de_venda_propria():
+    estoque = tanques.EstoqueTanques({"Diesel": 100}, {"Diesel": 15})
+    with pytest.raises(ValueError):
+        estoque.processar_abastecimento("Diesel", 10, "Cheque")
+    estoque.processar_abastecimento("Diesel", 10, "PIX")
+    assert estoque.niveis()["Diesel"]["volume"] == 5
+
+
+def test_lote_nao_vende_alem_do_estoque():
+    estoque = tanques.EstoqueTanques({"Diesel": 100}, {"Diesel": 10})
+    abastecimento.configurar_estoque(estoque)
+
+    resultado = abastecimento.processar_abastecimentos_em_lote(["Diesel"] * 3, [50] * 3, ["PIX"] * 3)
+    assert resultado.quantidade_validos() == 0
+    assert resultado.total_final() == 0
+    assert estoque.niveis()["Diesel"]["volume"] == 10
+
+
+def test_lote_baixa_as_linhas_que_cabem_no_tanque():
+    estoque = tanques.EstoqueTanques({"Diesel": 100}, {"Diesel": 15})
+    abastecimento.configurar_estoque(estoque)
+    id_diesel = combustivel.obter_id_combustivel("Diesel")
+
+    por_nome = abastecimento.processar_abastecimentos_em_lote(
+        ["Diesel", "Diesel", "Gasolina", "Diesel"], [6, 6, 1, 1], ["PIX"] * 4)
+    assert list(por_nome.validos) == [1, 1, 0, 1]          # Gasolina não tem tanque
+    por_id = abastecimento.processar_abastecimentos_em_lote_por_id([id_diesel] * 2, [1, 2], [1, 1])
+    assert list(por_id.validos) == [1, 0]
+
+    nivel = estoque.niveis()["Diesel"]
+    assert nivel["volume"] == 1
+    assert nivel["reservado"] == 0
+
+
+def test_lote_que_falha_devolve_as_reservas(monkeypatch):
+    estoque = tanques.EstoqueTanques({"Diesel": 100}, {"Diesel": 15})
+    abastecimento.configurar_estoque(estoque)
+
+    def falhar(*args):
+        raise MemoryError
+    monkeypatch.setattr(abastecimento, "_precificar_lote", falhar)
+    with pytest.raises(MemoryError):
+        abastecimento.processar_abastecimentos_em_lote(["Diesel"], [10], ["PIX"])
+    assert estoque.niveis()["Diesel"]["disponivel"] == 15
+
+
+def test_adicionar_tanque_duplicado():
+    estoque = tanques.EstoqueTanques({"Diesel": 100})
+    with pytest.raises(ValueError):
+        estoque.adicionar_tanque("Diesel")